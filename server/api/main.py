@@ -10,6 +10,7 @@ from .routers.admin import router as admin_router
 from .routers.books import router as books_router
 from .routers.kids import router as kids_router
 from .routers.start import router as start_router
+from .routers.usage import router as usage_router
 
 
 @asynccontextmanager
@@ -34,6 +35,7 @@ app.include_router(admin_router)
 app.include_router(books_router)
 app.include_router(kids_router)
 app.include_router(start_router)
+app.include_router(usage_router)
 
 
 @app.get("/health")
@@ -0,0 +1,106 @@
+"""Bot usage and what it costs, per book a household's kids read."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from loguru import logger
+from pydantic import BaseModel
+from supabase import Client, create_client
+
+from api.deps import get_authenticated_user_id
+from shared.config import settings
+
+router = APIRouter(
+    prefix="/usage",
+    tags=["usage"],
+    dependencies=[Depends(get_authenticated_user_id)],
+)
+
+
+class UsageLine(BaseModel):
+    state: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_prompt_tokens: int
+    tts_characters: int
+    stt_seconds: float
+    cost_usd: float
+
+
+class BookUsage(BaseModel):
+    book_id: str | None  # None: usage before a book was picked
+    title: str | None
+    sessions: int
+    cost_usd: float
+    cost_per_session_usd: float
+    lines: list[UsageLine]  # most expensive first
+
+
+def _supabase_client() -> Client:
+    if not settings.supabase.url or not settings.supabase.secret_key:
+        raise HTTPException(status_code=500, detail="Supabase is not configured.")
+    return create_client(settings.supabase.url, settings.supabase.secret_key)
+
+
+def usage_cost(row: dict) -> float:
+    """USD cost of a get_book_usage row at settings.pricing list prices."""
+    pricing = settings.pricing
+    prompt, cached, completion = pricing.llm_per_million_tokens.get(row["model"], (0.0, 0.0, 0.0))
+    uncached_tokens = row["prompt_tokens"] - row["cached_prompt_tokens"]
+    llm = (
+        uncached_tokens * prompt
+        + row["cached_prompt_tokens"] * cached
+        + row["completion_tokens"] * completion
+    ) / 1_000_000
+    tts = row["tts_characters"] * pricing.tts_per_million_characters / 1_000_000
+    stt = row["stt_seconds"] / 60 * pricing.stt_per_minute
+    return llm + tts + stt
+
+
+@router.get("/books", response_model=list[BookUsage])
+async def book_usage(
+    household_id: str,
+    user_id: str = Depends(get_authenticated_user_id),
+) -> list[BookUsage]:
+    """What reading each book has cost, split by conversation state and model; most
+    expensive book first."""
+    if household_id != user_id:
+        raise HTTPException(status_code=403, detail="Not your household")
+
+    client = _supabase_client()
+    try:
+        rows = client.rpc("get_book_usage", {"p_household_id": household_id}).execute().data
+    except Exception as exc:
+        logger.exception("Failed to fetch book usage")
+        raise HTTPException(status_code=500, detail="Failed to fetch usage.") from exc
+
+    books: dict[str | None, BookUsage] = {}
+    for row in rows or []:
+        book = books.get(row["book_id"])
+        if book is None:
+            book = books[row["book_id"]] = BookUsage(
+                book_id=row["book_id"],
+                title=row["title"],
+                sessions=row["book_sessions"],
+                cost_usd=0.0,
+                cost_per_session_usd=0.0,
+                lines=[],
+            )
+        line = UsageLine(
+            state=row["state"],
+            model=row["model"],
+            prompt_tokens=row["prompt_tokens"],
+            completion_tokens=row["completion_tokens"],
+            cached_prompt_tokens=row["cached_prompt_tokens"],
+            tts_characters=row["tts_characters"],
+            stt_seconds=row["stt_seconds"],
+            cost_usd=usage_cost(row),
+        )
+        book.lines.append(line)
+        book.cost_usd += line.cost_usd
+
+    for book in books.values():
+        book.lines.sort(key=lambda line: line.cost_usd, reverse=True)
+        book.cost_per_session_usd = book.cost_usd / book.sessions if book.sessions else 0.0
+    return sorted(books.values(), key=lambda book: book.cost_usd, reverse=True)
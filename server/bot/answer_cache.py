@@ -0,0 +1,221 @@
+"""AnswerCache — QA answers shared by every session reading the same book.
+
+Children reading the same book ask the same questions at the same points
+("who is the White Rabbit?"), and each one costs a full LLM turn over the QA
+prompt. Answers are keyed by ``(book_id, chunks_version, bucket, question)``:
+the bucket is the first chunk of the asker's chapter and the question is
+``question_key()`` of what the child said. Each entry remembers the passage
+the asker had reached when it was answered — the QA prompt never reaches past
+it — and is only served to a child who has read at least that far, so a
+cached answer cannot spoil the story.
+
+Tier 1 is a bounded in-process LRU. Tier 2, when a directory is configured,
+is one append-only JSON-lines file per book version, read back into memory
+the first time that version is asked about. Disk reads and appends run in a
+worker thread; appends happen in the background, after the answer is cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from loguru import logger
+
+from shared.config import settings
+
+try:
+    from .chapter_index import normalize
+except ImportError:
+    from chapter_index import normalize  # type: ignore[assignment]
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# Longer turns are conversation, not a stock question
+MAX_QUESTION_WORDS = 16
+
+# Dropped before keying: they don't change what is being asked
+_FILLER = frozenset(
+    {"actually", "hey", "hmm", "just", "like", "oh", "ok", "okay", "please", "so", "uh", "um"}
+)
+
+# A question that points back at the conversation ("why did she do that?") means
+# something else in every session, so it is never cached
+_REFERS_BACK = frozenset(
+    {"he", "him", "his", "she", "her", "it", "its", "they", "them", "that", "this", "those"}
+)
+
+
+def question_key(text: str) -> str | None:
+    """The normalized form ``text`` is cached under, or None if it should not be cached."""
+    words = [w for w in normalize(text).split() if w not in _FILLER]
+    if len(words) < 2 or len(words) > MAX_QUESTION_WORDS:
+        return None
+    if any(w in _REFERS_BACK for w in words):
+        return None
+    return " ".join(words)
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerKey:
+    book_id: str
+    chunks_version: int
+    bucket: int  # first chunk_index of the asker's chapter
+    question: str  # question_key() of what the child asked
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAnswer:
+    text: str
+    position: int  # chunk_index the asker had reached; the answer saw nothing past it
+
+
+@dataclass
+class AnswerCacheStats:
+    hits: int = 0
+    misses: int = 0
+    spoiler_guarded: int = 0  # cached, but answered further into the book than the asker
+    stores: int = 0
+    evictions: int = 0
+
+
+class AnswerCache:
+    """Answers keyed by AnswerKey: in-memory LRU over optional per-book JSON-lines files."""
+
+    def __init__(self, max_entries: int, cache_dir: Path | None = None):
+        self._max_entries = max_entries
+        self._cache_dir = cache_dir
+        self._memory: OrderedDict[AnswerKey, CachedAnswer] = OrderedDict()
+        self._loaded: set[tuple[str, int]] = set()
+        self._stats = AnswerCacheStats()
+        # Background appends, one at a time and in order: a new book version's
+        # first append deletes the files of the older ones
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-cache")
+        self._writes: set[asyncio.Future] = set()
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        return asdict(self._stats)
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache (0.0 before the first lookup)."""
+        lookups = self._stats.hits + self._stats.misses + self._stats.spoiler_guarded
+        return self._stats.hits / lookups if lookups else 0.0
+
+    async def get(self, key: AnswerKey, position: int) -> str | None:
+        """The cached answer for ``key`` if it is safe for a child at chunk ``position``."""
+        await self.load_book(key.book_id, key.chunks_version)
+        entry = self._memory.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if entry.position > position:
+            self._stats.spoiler_guarded += 1
+            return None
+        self._memory.move_to_end(key)
+        self._stats.hits += 1
+        return entry.text
+
+    def put(self, key: AnswerKey, text: str, position: int) -> None:
+        """Cache ``text`` as the answer given to a child at chunk ``position``.
+
+        The disk append runs in the background; never waits on the disk.
+        """
+        if not self._remember(key, CachedAnswer(text, position)):
+            return
+        self._stats.stores += 1
+        if self._cache_dir is not None:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._writer, self._append_disk, key, text, position
+            )
+            self._writes.add(future)
+            future.add_done_callback(self._writes.discard)
+
+    async def load_book(self, book_id: str, version: int) -> None:
+        """Read the answers cached on disk for a book version, once per process."""
+        if (book_id, version) in self._loaded:
+            return
+        self._loaded.add((book_id, version))
+        entries = await asyncio.to_thread(self._read_disk, book_id, version)
+        for key, entry in entries:
+            self._remember(key, entry)
+
+    async def drain(self) -> None:
+        """Wait for the appends still in flight."""
+        while self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Tier 1 — in-process LRU
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: AnswerKey, entry: CachedAnswer) -> bool:
+        """Keep ``entry`` unless an answer from earlier in the book is already held:
+        that one can be served to more children. Returns whether it was kept."""
+        current = self._memory.get(key)
+        if current is not None and current.position <= entry.position:
+            return False
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Tier 2 — append-only file per book version
+    # ------------------------------------------------------------------
+
+    def _path(self, book_id: str, version: int) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        safe_id = _UNSAFE_FILENAME_CHARS.sub("_", book_id)
+        return self._cache_dir / f"{safe_id}.{version}.jsonl"
+
+    def _read_disk(self, book_id: str, version: int) -> list[tuple[AnswerKey, CachedAnswer]]:
+        path = self._path(book_id, version)
+        if path is None or not path.exists():
+            return []
+        try:
+            entries = []
+            for line in path.read_text().splitlines():
+                row = json.loads(line)
+                key = AnswerKey(book_id, version, row["bucket"], row["question"])
+                entries.append((key, CachedAnswer(row["answer"], row["position"])))
+            return entries
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception(f"Discarding unreadable answer cache file {path}")
+            path.unlink(missing_ok=True)
+            return []
+
+    def _append_disk(self, key: AnswerKey, text: str, position: int) -> None:
+        path = self._path(key.book_id, key.chunks_version)
+        if path is None:
+            return
+        if not path.exists():
+            # A new version supersedes the answers cached for older ones
+            for stale in path.parent.glob(f"{path.name.split('.', 1)[0]}.*.jsonl"):
+                stale.unlink(missing_ok=True)
+        row = {"bucket": key.bucket, "question": key.question, "answer": text, "position": position}
+        try:
+            # One short line per append, so concurrent writers don't interleave
+            with open(path, "a") as f:
+                f.write(json.dumps(row) + "\n")
+        except OSError:
+            logger.exception(f"Failed to write answer cache file {path}")
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> AnswerCache:
+    cache_dir = settings.bot.answer_cache_dir
+    return AnswerCache(
+        max_entries=settings.bot.answer_cache_max_entries,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+    )
@@ -0,0 +1,164 @@
+"""BookCache — two-tier cache of loaded books for warm bot containers.
+
+Tier 1 is a bounded in-process LRU. Tier 2 is one file per book version under
+a shared directory, so every session process in the container can load a book
+another one has already fetched. Disk reads and writes run in a worker thread,
+off the event loop. Entries are keyed by
+``(book_id, chunks_version)``; ``upsert_chunks`` bumps ``books.chunks_version``,
+so validating an entry is just comparing the version from the metadata row.
+
+Books are held as ``ChunkStore`` objects. The file is a ChunkStore written out
+as-is (little-endian header)::
+
+    magic "RMBC" | format u32 | index_len u32 | index JSON | UTF-8 text buffer
+
+The index is ``ChunkStore.to_index()``; the buffer is decoded once and becomes
+the store's text, so a disk hit needs no per-chunk work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import struct
+import tempfile
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from loguru import logger
+
+from shared.config import settings
+
+try:
+    from .chunk_store import ChunkStore
+except ImportError:
+    from chunk_store import ChunkStore  # type: ignore[assignment]
+
+_MAGIC = b"RMBC"
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sII")
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+@dataclass
+class BookCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class BookCache:
+    """ChunkStores keyed by (book_id, chunks_version): in-memory LRU over an on-disk store."""
+
+    def __init__(self, max_books: int, cache_dir: Path | None = None):
+        self._max_books = max_books
+        self._cache_dir = cache_dir
+        self._memory: OrderedDict[tuple[str, int], ChunkStore] = OrderedDict()
+        self._stats = BookCacheStats()
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        return asdict(self._stats)
+
+    async def get(self, book_id: str, version: int) -> ChunkStore | None:
+        key = (book_id, version)
+        store = self._memory.get(key)
+        if store is not None:
+            self._memory.move_to_end(key)
+            self._stats.memory_hits += 1
+            return store
+
+        store = await asyncio.to_thread(self._read_disk, book_id, version)
+        if store is not None:
+            self._stats.disk_hits += 1
+            self._remember(key, store)
+            return store
+
+        self._stats.misses += 1
+        return None
+
+    async def put(self, book_id: str, version: int, store: ChunkStore) -> None:
+        self._remember((book_id, version), store)
+        await asyncio.to_thread(self._write_disk, book_id, version, store)
+
+    # ------------------------------------------------------------------
+    # Tier 1 — in-process LRU
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: tuple[str, int], store: ChunkStore) -> None:
+        # A new version supersedes every older one for the same book
+        for stale in [k for k in self._memory if k[0] == key[0] and k != key]:
+            del self._memory[stale]
+        self._memory[key] = store
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_books:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Tier 2 — shared on-disk store
+    # ------------------------------------------------------------------
+
+    def _path(self, book_id: str, version: int) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        safe_id = _UNSAFE_FILENAME_CHARS.sub("_", book_id)
+        return self._cache_dir / f"{safe_id}.{version}.bin"
+
+    def _read_disk(self, book_id: str, version: int) -> ChunkStore | None:
+        path = self._path(book_id, version)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = path.read_bytes()
+            magic, fmt, index_len = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC or fmt != _FORMAT_VERSION:
+                raise ValueError(f"unexpected header {magic!r} v{fmt}")
+            index_start = _HEADER.size
+            blob_start = index_start + index_len
+            index = json.loads(data[index_start:blob_start])
+            return ChunkStore.from_index(index, data[blob_start:].decode())
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            logger.exception(f"Discarding unreadable book cache file {path}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, book_id: str, version: int, store: ChunkStore) -> None:
+        path = self._path(book_id, version)
+        if path is None:
+            return
+
+        index_bytes = json.dumps(store.to_index()).encode()
+        blob = store.full_text.encode()
+
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(index_bytes)))
+                f.write(index_bytes)
+                f.write(blob)
+            os.replace(tmp_name, path)
+        except OSError:
+            logger.exception(f"Failed to write book cache file {path}")
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+
+        for stale in path.parent.glob(f"{path.name.split('.', 1)[0]}.*.bin"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_book_cache() -> BookCache:
+    cache_dir = settings.bot.book_cache_dir
+    return BookCache(
+        max_books=settings.bot.book_cache_max_books,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+    )
@@ -1,4 +1,7 @@
+import asyncio
 import os
+import time
+from uuid import uuid4
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -6,6 +9,7 @@ from pipecat.adapters.schemas.function_schema import FunctionSchema
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
+from pipecat.frames.frames import FunctionCallResultProperties
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -17,58 +21,91 @@ from pipecat.processors.aggregators.llm_response_universal import (
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.runner.types import RunnerArguments
 from pipecat.runner.utils import create_transport
-from pipecat.services.cartesia.tts import CartesiaTTSService
 from pipecat.services.deepgram.stt import DeepgramSTTService
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.base_transport import BaseTransport, TransportParams
 from pipecat.transports.daily.transport import DailyParams
 
+from shared.config import settings
+
 try:
-    from .library import Library
+    from .answer_cache import get_answer_cache
+    from .library import BOOK_SHORTLIST_SIZE, Book, Library
+    from .processors.context_compactor import ContextCompactor
     from .processors.frames import (
         BookSelectedFrame,
         EndSessionFrame,
         StartReadingFrame,
     )
-    from .processors.state_manager import BookReadingStateManager
+    from .processors.local_intent import LocalIntentProcessor
+    from .processors.playback_tracker import PlaybackTracker
+    from .processors.qa_context import QAContextProcessor
+    from .processors.state_manager import BookReadingStateManager, State, model_for_state
+    from .progress_checkpointer import get_progress_checkpointer
     from .prompt import BOOK_BROWSE_SYSTEM, BOOK_PRESELECTED_SYSTEM
+    from .session_timing import FirstSpeechObserver, SessionTimer
+    from .tts_cache import CachedCartesiaTTSService, get_tts_audio_cache
+    from .usage_meter import UsageObserver, get_usage_meter
 except ImportError:
-    from library import Library  # type: ignore[assignment]
+    from answer_cache import get_answer_cache  # type: ignore[assignment]
+    from library import BOOK_SHORTLIST_SIZE, Book, Library  # type: ignore[assignment]
+    from processors.context_compactor import ContextCompactor  # type: ignore[assignment]
     from processors.frames import (  # type: ignore[assignment]
         BookSelectedFrame,
         EndSessionFrame,
         StartReadingFrame,
     )
-    from processors.state_manager import BookReadingStateManager  # type: ignore[assignment]
+    from processors.local_intent import LocalIntentProcessor  # type: ignore[assignment]
+    from processors.playback_tracker import PlaybackTracker  # type: ignore[assignment]
+    from processors.qa_context import QAContextProcessor  # type: ignore[assignment]
+    from processors.state_manager import (  # type: ignore[assignment]
+        BookReadingStateManager,
+        State,
+        model_for_state,
+    )
+    from progress_checkpointer import get_progress_checkpointer  # type: ignore[assignment]
     from prompt import BOOK_BROWSE_SYSTEM, BOOK_PRESELECTED_SYSTEM  # type: ignore[assignment]
+    from session_timing import FirstSpeechObserver, SessionTimer  # type: ignore[assignment]
+    from tts_cache import (  # type: ignore[assignment]
+        CachedCartesiaTTSService,
+        get_tts_audio_cache,
+    )
+    from usage_meter import UsageObserver, get_usage_meter  # type: ignore[assignment]
 
 load_dotenv(override=True)
 
+DEMO_KID_ID = "demo_kid"
+STT_MODEL = "nova-3-general"
+
 
 def _build_tools(has_book: bool) -> ToolsSchema:
     tools = [
         FunctionSchema(
             name="select_book",
-            description="Select and load a book by its numeric index.",
+            description="Select and load a book by its numeric index or by its title.",
             properties={
                 "book_id": {
                     "type": "string",
-                    "description": "The numeric index of the book (e.g. '0') as shown in the book list.",
+                    "description": "The numeric index of the book (e.g. '0') as shown in the book list, or the title as the child said it (e.g. 'the hungry caterpillar') for a book that isn't listed.",
                 },
             },
             required=["book_id"],
         ),
         FunctionSchema(
             name="start_reading",
-            description="Start or resume reading the selected book aloud. If chunk_id is omitted, resumes from the current position.",
+            description="Start or resume reading the selected book aloud. If chapter and chunk_id are omitted, resumes from the current position.",
             properties={
                 "book_id": {
                     "type": "string",
                     "description": "The numeric index of the book (e.g. '0').",
                 },
+                "chapter": {
+                    "type": "string",
+                    "description": "A chapter the child asked for, as they said it (e.g. 'chapter 3', 'the tea party'). The system resolves it to the right place in the book.",
+                },
                 "chunk_id": {
                     "type": "integer",
-                    "description": "The chunk index to start reading from (0-based). Omit to resume from current position.",
+                    "description": "The chunk index to start reading from (0-based); use 0 to start over from the beginning.",
                 },
             },
             required=["book_id"],
@@ -82,15 +119,29 @@ def _build_tools(has_book: bool) -> ToolsSchema:
     ]
 
     if not has_book:
-        tools.insert(
-            0,
+        tools[:0] = [
             FunctionSchema(
                 name="list_books",
                 description="Fetch the list of available books for this child. Call this first when no book is pre-selected.",
                 properties={},
                 required=[],
             ),
-        )
+            FunctionSchema(
+                name="read_book",
+                description="Select a book and start reading it aloud right away, in one step. Resumes from the saved position unless a chapter is given.",
+                properties={
+                    "book_id": {
+                        "type": "string",
+                        "description": "The numeric index of the book (e.g. '0') as shown in the book list, or the title as the child said it.",
+                    },
+                    "chapter": {
+                        "type": "string",
+                        "description": "A chapter the child asked for, as they said it (e.g. 'chapter 3', 'the tea party').",
+                    },
+                },
+                required=["book_id"],
+            ),
+        ]
 
     return ToolsSchema(standard_tools=tools)
 
@@ -100,17 +151,27 @@ async def run_bot(
     runner_args: RunnerArguments,
     book_id: str | None = None,
     kid_id: str | None = None,
+    library: Library | None = None,
+    timer: SessionTimer | None = None,
 ):
-    """Pipeline: input -> STT -> user_agg -> LLM -> StateManager -> assistant_agg -> TTS -> output."""
+    """Pipeline: input -> STT -> user_agg -> LocalIntent -> ContextCompactor -> QAContext -> LLM
+    -> StateManager -> TTS -> output.
+
+    bot() passes a ``library`` that is already preloading ``book_id`` and the
+    session's ``timer``; both are created here when run_bot is called directly.
+    """
     logger.info(f"run_bot started with transport={type(transport).__name__}")
 
-    kid_id = kid_id or "demo_kid"
+    kid_id = kid_id or DEMO_KID_ID
+    timer = timer or SessionTimer()
 
     stt = DeepgramSTTService(
         api_key=os.environ["DEEPGRAM_API_KEY"],
+        settings=DeepgramSTTService.Settings(model=STT_MODEL),
     )
 
-    tts = CartesiaTTSService(
+    # Passages and fixed lines come from the TTS audio cache when already synthesized
+    tts = CachedCartesiaTTSService(
         api_key=os.environ["CARTESIA_API_KEY"],
         voice_id="4f7f1324-1853-48a6-b294-4e78e8036a83",
         model="sonic-2",
@@ -125,7 +186,8 @@ async def run_bot(
     llm = OpenAILLMService(
         api_key=os.environ["OPENAI_API_KEY"],
         settings=OpenAILLMService.Settings(
-            model="gpt-4",
+            # The state manager switches models as the session changes state
+            model=model_for_state(State.BOOK_SELECTION),
             system_instruction=system_prompt,
         ),
     )
@@ -145,8 +207,10 @@ async def run_bot(
     user_agg = agg_pair.user()
     assistant_agg = agg_pair.assistant()
 
-    library = Library(kid_id=kid_id)
+    if library is None:
+        library = Library(kid_id=kid_id)
     state_manager = BookReadingStateManager(library=library, context=context, llm=llm)
+    timer.mark("services_ready")
 
     # Pre-populate index map if book_id was provided
     if book_id:
@@ -155,13 +219,15 @@ async def run_bot(
     # -- Register function call handlers on the LLM --
 
     async def handle_list_books(params):
-        books_with_progress = library.get_books_with_progress()
+        books_with_progress = await library.get_books_with_progress()
         if not books_with_progress:
             await params.result_callback("No books available for this child.")
             return
 
+        # Only the likeliest picks go into the context; the rest are found by title
+        shortlist = books_with_progress[:BOOK_SHORTLIST_SIZE]
         lines = []
-        for i, b in enumerate(books_with_progress):
+        for i, b in enumerate(shortlist):
             idx = str(i)
             state_manager.populate_index(idx, b["id"])
             line = f'{idx}. "{b["title"]}"'
@@ -173,51 +239,108 @@ async def run_bot(
             else:
                 line += " (new)"
             lines.append(line)
+        others = len(books_with_progress) - len(shortlist)
+        if others:
+            lines.append(
+                f"...and {others} more. If the child asks for a book that isn't listed, "
+                "call select_book with the title they say."
+            )
 
+        # The child usually picks an in-progress or recent book: start fetching those now
+        library.prefetch_likely_books()
         await params.result_callback("Available books:\n" + "\n".join(lines))
 
-    async def handle_select_book(params):
-        raw_id = params.arguments["book_id"]
+    async def select_book(raw_id: str) -> tuple[Book | None, str]:
+        """Resolve an index, spoken title or id and load it; returns the book (or
+        None) and the result text for the LLM."""
         resolved_id = state_manager.resolve_book_id(raw_id)
-        book = library.initialize_book(resolved_id)
-        if book:
-            # Register index if not already mapped
-            if raw_id not in state_manager._book_index_map:
-                state_manager.populate_index(raw_id, resolved_id)
-
-            progress = library.current_chunk_index
-            if progress > 0:
-                chunk = library.current_chunk()
-                chunk_preview = chunk.text[:100] if chunk else ""
-                await params.result_callback(
-                    f'Book "{book.title}" loaded. '
-                    f"Child has progress — resuming at chunk {progress}. "
-                    f'Last passage: "{chunk_preview}..."'
+        if resolved_id == raw_id:
+            # Not a listed index: a spoken title (or a raw book id)
+            match = await library.match_book(raw_id)
+            if match is not None:
+                logger.info(f'[Bot] Title "{raw_id}" -> {match.title} ({match.score})')
+                resolved_id = match.book_id
+            elif close := await library.find_books(raw_id):
+                titles = ", ".join(f'"{m.title}"' for m in close)
+                return None, (
+                    f'No book clearly matches "{raw_id}". Closest titles: {titles}. '
+                    "Ask the child which one they mean."
                 )
-            else:
+        start = time.perf_counter()
+        book = await library.initialize_book(resolved_id)
+        timer.add_duration("select_book_wait", (time.perf_counter() - start) * 1000)
+        if not book:
+            return None, "Book not found."
+
+        # Register index if not already mapped
+        if raw_id not in state_manager._book_index_map:
+            state_manager.populate_index(raw_id, resolved_id)
+        await state_manager.queue_frame(
+            BookSelectedFrame(book_id=book.id, book_title=book.title),
+            FrameDirection.DOWNSTREAM,
+        )
+        logger.info(f"[Bot] BookSelected frame queued: {book.id}")
+
+        progress = library.current_chunk_index
+        if progress > 0:
+            chunk = await library.current_chunk()
+            chunk_preview = chunk.text[:100] if chunk else ""
+            return book, (
+                f'Book "{book.title}" loaded. '
+                f"Child has progress — resuming at chunk {progress}. "
+                f'Last passage: "{chunk_preview}..."'
+            )
+        return book, f'Book "{book.title}" loaded. This is a new book — no prior progress.'
+
+    async def start_reading(
+        params, book_id: str, chunk_index: int | None, chapter_ref: str | None, loaded: str = ""
+    ) -> None:
+        """Jump to ``chapter_ref`` if given, then hand reading over to the state manager.
+
+        The story starts without another LLM turn; only a chapter miss goes back
+        to the LLM so it can ask the child.
+        """
+        if chapter_ref:
+            chapter = await library.resolve_chapter(chapter_ref)
+            if chapter is None:
+                titles = ", ".join(f'"{c.title}"' for c in library.chapters if c.title)
                 await params.result_callback(
-                    f'Book "{book.title}" loaded. This is a new book — no prior progress.'
+                    f'{loaded}No chapter matches "{chapter_ref}". The chapters are: {titles}. '
+                    "Ask the child which one they mean."
                 )
-            await state_manager.queue_frame(
-                BookSelectedFrame(book_id=book.id, book_title=book.title),
-                FrameDirection.DOWNSTREAM,
-            )
-            logger.info(f"[Bot] BookSelected frame queued: {book.id}")
+                return
+            logger.info(f'[Bot] Chapter "{chapter_ref}" -> {chapter.title} (chunk {chapter.start})')
+            chunk_index = chapter.start
+            result = f'{loaded}Starting to read from "{chapter.title}".'
         else:
-            await params.result_callback("Book not found.")
-
-    async def handle_start_reading(params):
-        raw_id = params.arguments["book_id"]
-        resolved_id = state_manager.resolve_book_id(raw_id)
-        await params.result_callback("Starting to read.")
+            result = f"{loaded}Starting to read."
+        await params.result_callback(result, properties=FunctionCallResultProperties(run_llm=False))
         await state_manager.queue_frame(
-            StartReadingFrame(
-                book_id=resolved_id,
-                chunk_index=params.arguments.get("chunk_id"),
-            ),
+            StartReadingFrame(book_id=book_id, chunk_index=chunk_index),
             FrameDirection.DOWNSTREAM,
         )
-        logger.info(f"[Bot] StartReading frame queued: {resolved_id}")
+        logger.info(f"[Bot] StartReading frame queued: {book_id}")
+
+    async def handle_select_book(params):
+        _, result = await select_book(params.arguments["book_id"])
+        await params.result_callback(result)
+
+    async def handle_read_book(params):
+        book, result = await select_book(params.arguments["book_id"])
+        if book is None:
+            await params.result_callback(result)
+            return
+        await start_reading(
+            params, book.id, None, params.arguments.get("chapter"), loaded=f"{result} "
+        )
+
+    async def handle_start_reading(params):
+        await start_reading(
+            params,
+            state_manager.resolve_book_id(params.arguments["book_id"]),
+            params.arguments.get("chunk_id"),
+            params.arguments.get("chapter"),
+        )
 
     async def handle_end_session(params):
         await params.result_callback("Ending session.")
@@ -229,6 +352,7 @@ async def run_bot(
 
     if not book_id:
         llm.register_function("list_books", handle_list_books)
+        llm.register_function("read_book", handle_read_book)
     llm.register_function("select_book", handle_select_book)
     llm.register_function("start_reading", handle_start_reading)
     llm.register_function("end_session", handle_end_session)
@@ -238,14 +362,29 @@ async def run_bot(
             transport.input(),
             stt,
             user_agg,
+            LocalIntentProcessor(state_manager),
+            ContextCompactor(state_manager, budget_tokens=settings.bot.history_token_budget),
+            QAContextProcessor(state_manager),
             llm,
             state_manager,
             tts,
             transport.output(),
+            PlaybackTracker(state_manager),
             assistant_agg,
         ]
     )
 
+    # Tokens, TTS characters and STT seconds per state, flushed to session_usage
+    usage = UsageObserver(
+        get_usage_meter(),
+        session_id=uuid4().hex,
+        kid_id=kid_id,
+        library=library,
+        state_source=state_manager,
+        stt=stt,
+        stt_model=STT_MODEL,
+    )
+
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
@@ -253,6 +392,7 @@ async def run_bot(
             enable_metrics=True,
             enable_usage_metrics=True,
         ),
+        observers=[FirstSpeechObserver(timer, story_source=state_manager), usage],
     )
 
     async def send_disconnect():
@@ -268,20 +408,42 @@ async def run_bot(
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, participant):
         logger.info("Client connected — triggering greeting")
-        await state_manager.greet_child()
+        book_status = None
+        if book_id:
+            # Load the preselected book (usually already preloaded) before the first
+            # LLM turn, so the greeting can start reading without a select_book call
+            book, book_status = await select_book("0")
+            if book is None:
+                book_status = f"The pre-selected book could not be loaded: {book_status}"
+        await state_manager.greet_child(book_status)
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
         logger.info("Client disconnected — saving progress")
-        library.save_progress()
+        await library.save_progress()
         await task.cancel()
 
     runner = PipelineRunner(handle_sigint=runner_args.handle_sigint)
-    await runner.run(task)
+    try:
+        await runner.run(task)
+    finally:
+        # Shutdown path (SIGTERM, pipeline error): don't leave positions, usage, answers or
+        # audio queued
+        checkpointer = get_progress_checkpointer()
+        await checkpointer.flush()
+        await get_usage_meter().flush()
+        await get_answer_cache().drain()
+        tts_cache = get_tts_audio_cache()
+        await tts_cache.drain()
+        logger.info(f"Progress checkpointer stats: {checkpointer.stats()}")
+        logger.info(f"LLM stats per model: {state_manager.model_stats}")
+        logger.info(f"Session usage: {usage.totals}")
+        logger.info(f"TTS audio cache: {tts_cache.stats()} (hit rate {tts_cache.hit_rate():.0%})")
 
 
 async def bot(runner_args: RunnerArguments):
     """Main bot entry point — compatible with Pipecat Cloud, Modal, and local runner."""
+    timer = SessionTimer()
     body = runner_args.body or {}
     book_id = body.get("book_id")
     kid_id = body.get("kid_id")
@@ -301,9 +463,29 @@ async def bot(runner_args: RunnerArguments):
             video_in_enabled=False,
         ),
     }
+    # Fetch the preselected book while the transport and services spin up, so
+    # select_book completes from memory
+    library = Library(kid_id=kid_id or DEMO_KID_ID)
+    if book_id:
+
+        def on_preloaded(task: asyncio.Task) -> None:
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                # select_book loads it again and reports the failure to the child
+                logger.opt(exception=task.exception()).error(f"Preloading {book_id} failed")
+                return
+            if task.result() is not None:
+                timer.mark("book_ready")
+
+        library.preload_book(book_id).add_done_callback(on_preloaded)
+
     transport = await create_transport(runner_args, transport_params)
+    timer.mark("transport_ready")
     logger.info(f"Transport created: {type(transport).__name__}")
-    await run_bot(transport, runner_args, book_id=book_id, kid_id=kid_id)
+    await run_bot(
+        transport, runner_args, book_id=book_id, kid_id=kid_id, library=library, timer=timer
+    )
 
 
 if __name__ == "__main__":
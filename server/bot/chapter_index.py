@@ -0,0 +1,197 @@
+"""ChapterIndex — sorted chapter boundaries of a loaded book.
+
+Built once per load from the ChunkStore. Answers "which chapter is chunk N in"
+with a bisect over the boundary offsets, and resolves what a child actually
+says ("chapter three", "the pig one", "Pig and Peper") to a chapter, so
+start_reading can take a chapter reference instead of a raw chunk index.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_right
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+# A fuzzy name match must score at least this to count
+MIN_NAME_SCORE = 0.6
+
+_NUMBER_WORDS = {
+    word: n
+    for n, words in enumerate(
+        [
+            (),
+            ("one", "first"),
+            ("two", "second"),
+            ("three", "third"),
+            ("four", "fourth"),
+            ("five", "fifth"),
+            ("six", "sixth"),
+            ("seven", "seventh"),
+            ("eight", "eighth"),
+            ("nine", "ninth"),
+            ("ten", "tenth"),
+            ("eleven", "eleventh"),
+            ("twelve", "twelfth"),
+            ("thirteen", "thirteenth"),
+            ("fourteen", "fourteenth"),
+            ("fifteen", "fifteenth"),
+            ("sixteen", "sixteenth"),
+            ("seventeen", "seventeenth"),
+            ("eighteen", "eighteenth"),
+            ("nineteen", "nineteenth"),
+            ("twenty", "twentieth"),
+        ]
+    )
+    for word in words
+}
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+_ROMAN = re.compile(r"^[ivxlc]+$")
+_ORDINAL_DIGITS = re.compile(r"^(\d+)(?:st|nd|rd|th)?$")
+_CHAPTER_WORDS = {"chapter", "chap", "ch", "part"}
+_FILLER_WORDS = {"the", "a", "an", "and", "of", "number", "no", "one"}
+_TITLE_NUMBER = re.compile(r"^(?:chapter|chap|ch|part)?\s*([0-9]+|[ivxlc]+|[a-z]+)\b\s*(.*)$")
+
+
+@dataclass(frozen=True, slots=True)
+class Chapter:
+    number: int  # 1-based position in the book
+    title: str
+    start: int  # first chunk_index
+    end: int  # one past the last chunk_index
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def _parse_number(token: str, allow_roman: bool) -> int | None:
+    if token in _NUMBER_WORDS:
+        return _NUMBER_WORDS[token]
+    digits = _ORDINAL_DIGITS.match(token)
+    if digits:
+        return int(digits.group(1))
+    if allow_roman and _ROMAN.match(token):
+        total = 0
+        for ch, nxt in zip(token, token[1:] + " ", strict=True):
+            value = _ROMAN_VALUES[ch]
+            total += -value if nxt != " " and _ROMAN_VALUES[nxt] > value else value
+        return total
+    return None
+
+
+def _split_title(title: str) -> tuple[int | None, str]:
+    """("Chapter III. A Caucus-Race", ...) -> (3, "a caucus race")."""
+    norm = normalize(title)
+    match = _TITLE_NUMBER.match(norm)
+    if match and (norm.split(" ", 1)[0] in _CHAPTER_WORDS or match.group(1).isdigit()):
+        number = _parse_number(match.group(1), allow_roman=True)
+        if number is not None:
+            return number, match.group(2)
+    return None, norm
+
+
+def _content_words(text: str) -> set[str]:
+    return {w for w in text.split() if w not in _FILLER_WORDS and w not in _CHAPTER_WORDS}
+
+
+class ChapterIndex:
+    """Chapters of one book, ordered by their first chunk."""
+
+    __slots__ = ("_starts", "_chapters", "_title_numbers", "_names", "_total_chunks")
+
+    def __init__(self, boundaries: list[tuple[int, str]], total_chunks: int):
+        """``boundaries`` is (first chunk_index, title) per chapter, in book order."""
+        self._starts = [start for start, _ in boundaries]
+        self._total_chunks = total_chunks
+        ends = self._starts[1:] + [total_chunks]
+        self._chapters = [
+            Chapter(number=i + 1, title=title, start=start, end=end)
+            for i, ((start, title), end) in enumerate(zip(boundaries, ends, strict=False))
+        ]
+        self._title_numbers: dict[int, Chapter] = {}
+        self._names: list[tuple[str, Chapter]] = []
+        for chapter in self._chapters:
+            if not chapter.title:
+                continue
+            number, name = _split_title(chapter.title)
+            if number is not None:
+                self._title_numbers.setdefault(number, chapter)
+            self._names.append((name or normalize(chapter.title), chapter))
+
+    def __len__(self) -> int:
+        return len(self._chapters)
+
+    def __iter__(self):
+        return iter(self._chapters)
+
+    def first_chunks(self) -> dict[str, int]:
+        """Chapter title -> its first chunk_index (first occurrence wins)."""
+        first: dict[str, int] = {}
+        for chapter in self._chapters:
+            first.setdefault(chapter.title, chapter.start)
+        return first
+
+    def chapter_at(self, chunk_index: int) -> Chapter | None:
+        """The chapter containing ``chunk_index`` (bisect over boundary starts)."""
+        if chunk_index < 0 or chunk_index >= self._total_chunks:
+            return None
+        i = bisect_right(self._starts, chunk_index) - 1
+        return self._chapters[i] if i >= 0 else None
+
+    def resolve(self, reference: str | int) -> Chapter | None:
+        """Resolve a spoken chapter number or (possibly misheard) name to a chapter."""
+        if isinstance(reference, int):
+            return self._by_number(reference)
+        norm = normalize(reference)
+        if not norm:
+            return None
+
+        number = self._parse_reference_number(norm)
+        if number is not None:
+            return self._by_number(number)
+        # "Chapter VI, Pig and Pepper" — match on the name part
+        _, name = _split_title(norm)
+        return self._by_name(name or norm)
+
+    # ------------------------------------------------------------------
+    # Lookup strategies
+    # ------------------------------------------------------------------
+
+    def _parse_reference_number(self, norm: str) -> int | None:
+        tokens = norm.split()
+        mentions_chapter = any(t in _CHAPTER_WORDS for t in tokens)
+        rest = [t for t in tokens if t not in _CHAPTER_WORDS and t not in {"the", "number", "no"}]
+        if len(rest) != 1:
+            return None
+        return _parse_number(rest[0], allow_roman=mentions_chapter)
+
+    def _by_number(self, number: int) -> Chapter | None:
+        # Titles that carry their own number ("Chapter VI") win over book position,
+        # so "chapter six" finds Chapter VI even in an excerpt that starts at III
+        if self._title_numbers:
+            return self._title_numbers.get(number)
+        if 1 <= number <= len(self._chapters):
+            return self._chapters[number - 1]
+        return None
+
+    def _by_name(self, norm: str) -> Chapter | None:
+        words = _content_words(norm)
+        best: tuple[float, Chapter] | None = None
+        for name, chapter in self._names:
+            if norm == name:
+                return chapter
+            name_words = _content_words(name)
+            overlap = len(words & name_words) / len(words | name_words) if words else 0.0
+            score = max(SequenceMatcher(None, norm, name).ratio(), overlap)
+            if norm in name or (words and words <= name_words):
+                score = max(score, 0.9)
+            if best is None or score > best[0]:
+                best = (score, chapter)
+        if best is not None and best[0] >= MIN_NAME_SCORE:
+            return best[1]
+        return None
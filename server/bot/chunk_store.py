@@ -0,0 +1,341 @@
+"""ChunkStore — compact, array-backed storage for a loaded book's chunks.
+
+A book is held as one text buffer (every chunk's text joined by the same
+separator ``full_text`` uses) plus parallel arrays of buffer offsets, kinds and
+chapter ids, plus running token totals so the token count of any run of
+chunks is one subtraction. That makes the buffer itself the book's full text, so QA and
+FINISHED prompts reuse it instead of re-joining thousands of strings, and a
+5,000-chunk book costs a handful of objects instead of 5,000 models.
+
+Chunks are read through ``BookChunk`` views, which hold only the store and an
+index; a chunk's text is sliced out of the buffer when it is read. The store
+also carries the chapter summaries written at ingestion, when the book has them.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from shared.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from shared.book_bundle import BookBundle
+
+CHUNK_SEPARATOR = "\n\n"
+
+# Kind code for a slot whose row never arrived (a page that failed to load)
+_MISSING = 0xFF
+
+
+class ChunkKind(StrEnum):
+    CONTENT = "content"
+    CHAPTER_TITLE = "chapter_title"
+
+
+_KINDS = tuple(ChunkKind)
+# Keyed by the StrEnum members, which also match their plain-string row values
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+@dataclass(frozen=True, slots=True)
+class ChapterSummary:
+    chapter_index: int
+    chapter_title: str
+    first_chunk_index: int
+    summary: str  # what happens in this chapter
+    story_so_far: str  # the whole story through the end of this chapter
+
+
+class BookChunk:
+    """Read-only view of one chunk in a ChunkStore."""
+
+    __slots__ = ("_store", "chunk_index")
+
+    def __init__(self, store: ChunkStore, chunk_index: int):
+        self._store = store
+        self.chunk_index = chunk_index
+
+    @property
+    def text(self) -> str:
+        store = self._store
+        i = self.chunk_index - store._first_index
+        return store._text[store._starts[i] : store._ends[i]]
+
+    @property
+    def chunk_kind(self) -> ChunkKind:
+        return _KINDS[self._store._kinds[self.chunk_index - self._store._first_index]]
+
+    @property
+    def chapter_title(self) -> str:
+        store = self._store
+        return store._chapters[store._chapter_ids[self.chunk_index - store._first_index]]
+
+    @property
+    def chunk_hint(self) -> str:
+        return self._store._hints[self.chunk_index - self._store._first_index]
+
+    @property
+    def token_count(self) -> int:
+        return self._store.tokens_between(self.chunk_index, self.chunk_index)
+
+    def to_row(self) -> dict:
+        return {
+            "chunk_index": self.chunk_index,
+            "chunk_kind": self.chunk_kind.value,
+            "chapter_title": self.chapter_title,
+            "chunk_hint": self.chunk_hint,
+            "text": self.text,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BookChunk):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def __repr__(self) -> str:
+        return f"BookChunk(chunk_index={self.chunk_index}, chapter_title={self.chapter_title!r})"
+
+
+class ChunkStore:
+    """Chunks ``first_index .. first_index + len - 1`` of one book, packed into arrays."""
+
+    __slots__ = (
+        "_first_index",
+        "_text",
+        "_starts",
+        "_ends",
+        "_kinds",
+        "_chapter_ids",
+        "_chapters",
+        "_hints",
+        "_token_totals",
+        "_summaries",
+    )
+
+    def __init__(
+        self,
+        first_index: int,
+        text: str,
+        starts: array,
+        ends: array,
+        kinds: bytearray,
+        chapter_ids: array,
+        chapters: tuple[str, ...],
+        hints: tuple[str, ...],
+        token_counts: Iterable[int] | None = None,
+        summaries: Iterable[dict] = (),
+    ):
+        self._first_index = first_index
+        self._text = text
+        self._starts = starts
+        self._ends = ends
+        self._kinds = kinds
+        self._chapter_ids = chapter_ids
+        self._chapters = chapters
+        self._hints = hints
+        if token_counts is None:
+            token_counts = (estimate_tokens(text[s:e]) for s, e in zip(starts, ends, strict=True))
+        # _token_totals[i] is the token count of slots 0..i-1
+        totals = array("Q", [0])
+        running = 0
+        for count in token_counts:
+            running += count
+            totals.append(running)
+        self._token_totals = totals
+        self._summaries = tuple(
+            sorted(
+                (
+                    ChapterSummary(
+                        s["chapter_index"],
+                        s.get("chapter_title") or "",
+                        s["first_chunk_index"],
+                        s["summary"],
+                        s["story_so_far"],
+                    )
+                    for s in summaries
+                ),
+                key=lambda s: s.first_chunk_index,
+            )
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[dict],
+        first_index: int = 0,
+        count: int | None = None,
+        summaries: Iterable[dict] = (),
+    ) -> ChunkStore:
+        """Pack chunk rows (in any order) into a store covering ``count`` slots.
+
+        Slots with no row are kept as gaps: indexing them returns None. Rows
+        outside the covered range are ignored.
+        """
+        by_index = {row["chunk_index"]: row for row in rows}
+        if count is None:
+            count = max(by_index, default=first_index - 1) - first_index + 1
+
+        parts: list[str] = []
+        starts = [0] * count
+        ends = [0] * count
+        kinds = bytearray([_MISSING]) * count
+        chapter_ids = [0] * count
+        chapter_codes: dict[str, int] = {}
+        hints: list[str] = [""] * count
+        tokens = [0] * count
+        offset = 0
+        for i in range(count):
+            row = by_index.get(first_index + i)
+            if row is None:
+                starts[i] = ends[i] = offset
+                continue
+            if parts:
+                parts.append(CHUNK_SEPARATOR)
+                offset += len(CHUNK_SEPARATOR)
+            text = row["text"]
+            parts.append(text)
+            starts[i] = offset
+            offset += len(text)
+            ends[i] = offset
+            kinds[i] = _KIND_CODES[row.get("chunk_kind") or ChunkKind.CONTENT]
+            chapter_ids[i] = chapter_codes.setdefault(row["chapter_title"], len(chapter_codes))
+            hints[i] = row.get("chunk_hint") or ""
+            tokens[i] = row.get("token_count") or estimate_tokens(text)
+
+        return cls(
+            first_index,
+            "".join(parts),
+            array("I", starts),
+            array("I", ends),
+            kinds,
+            array("I", chapter_ids),
+            tuple(chapter_codes),
+            tuple(hints),
+            tokens,
+            summaries,
+        )
+
+    @classmethod
+    def from_index(cls, index: dict, text: str) -> ChunkStore:
+        """Rebuild a store from ``to_index()`` output and its text buffer."""
+        return cls(
+            index["first_index"],
+            text,
+            array("I", index["starts"]),
+            array("I", index["ends"]),
+            bytearray(index["kinds"]),
+            array("I", index["chapter_ids"]),
+            tuple(index["chapters"]),
+            tuple(index["hints"]),
+            index.get("token_counts"),
+            index.get("summaries", ()),
+        )
+
+    @classmethod
+    def from_bundle(cls, bundle: BookBundle) -> ChunkStore:
+        """Adopt a decoded book bundle: its text and offsets are already store-shaped."""
+        return cls(
+            0,
+            bundle.text,
+            array("I", bundle.starts),
+            array("I", bundle.ends),
+            bytearray(_KIND_CODES[kind] for kind in bundle.kinds),
+            array("I", bundle.chapter_ids),
+            tuple(bundle.chapters),
+            tuple(bundle.hints),
+            bundle.token_counts,
+            bundle.summaries,
+        )
+
+    def to_index(self) -> dict:
+        """Everything but the text buffer, as JSON-serialisable lists."""
+        return {
+            "first_index": self._first_index,
+            "starts": self._starts.tolist(),
+            "ends": self._ends.tolist(),
+            "kinds": list(self._kinds),
+            "chapter_ids": self._chapter_ids.tolist(),
+            "chapters": list(self._chapters),
+            "hints": list(self._hints),
+            "token_counts": [
+                self._token_totals[i + 1] - self._token_totals[i] for i in range(len(self._kinds))
+            ],
+            "summaries": [asdict(s) for s in self._summaries],
+        }
+
+    @property
+    def first_index(self) -> int:
+        return self._first_index
+
+    @property
+    def full_text(self) -> str:
+        """Every loaded chunk's text joined by CHUNK_SEPARATOR — the buffer itself."""
+        return self._text
+
+    @property
+    def summaries(self) -> tuple[ChapterSummary, ...]:
+        """Chapter summaries in book order; empty if the book has none."""
+        return self._summaries
+
+    @property
+    def missing(self) -> int:
+        return self._kinds.count(_MISSING)
+
+    def covers(self, chunk_index: int) -> bool:
+        return self._first_index <= chunk_index < self._first_index + len(self._kinds)
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __getitem__(self, chunk_index: int) -> BookChunk | None:
+        """The chunk at an absolute ``chunk_index``, or None if out of range or missing."""
+        if not self.covers(chunk_index):
+            return None
+        if self._kinds[chunk_index - self._first_index] == _MISSING:
+            return None
+        return BookChunk(self, chunk_index)
+
+    def __iter__(self):
+        for i in range(self._first_index, self._first_index + len(self._kinds)):
+            chunk = self[i]
+            if chunk is not None:
+                yield chunk
+
+    def tokens_between(self, first: int, last: int) -> int:
+        """Token count of chunks ``first..last`` (absolute, inclusive; clamped to the store)."""
+        lo = max(first - self._first_index, 0)
+        hi = min(last - self._first_index + 1, len(self._kinds))
+        if hi <= lo:
+            return 0
+        return self._token_totals[hi] - self._token_totals[lo]
+
+    def window_start(self, last: int, budget_tokens: int) -> int:
+        """Earliest chunk_index such that chunks from it through ``last`` fit ``budget_tokens``.
+
+        Never later than ``last`` itself, even if that one chunk is over budget.
+        """
+        end = min(last - self._first_index + 1, len(self._kinds))
+        if end <= 0:
+            return last
+        # First slot s with totals[end] - totals[s] <= budget
+        s = bisect_left(self._token_totals, self._token_totals[end] - budget_tokens, 0, end)
+        return self._first_index + min(s, end - 1)
+
+    def rows(self) -> list[dict]:
+        return [chunk.to_row() for chunk in self]
+
+    def chapter_boundaries(self) -> list[tuple[int, str]]:
+        """(first chunk_index, title) for each run of chunks sharing a chapter title."""
+        boundaries: list[tuple[int, str]] = []
+        previous = None
+        for i, code in enumerate(self._chapter_ids):
+            if self._kinds[i] == _MISSING or code == previous:
+                continue
+            boundaries.append((self._first_index + i, self._chapters[code]))
+            previous = code
+        return boundaries
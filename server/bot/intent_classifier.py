@@ -0,0 +1,190 @@
+"""Local intent classifier for the two commands a child gives mid-conversation.
+
+"keep reading" and "bye" would otherwise each cost a full LLM turn before the
+LLM calls start_reading / end_session. ``classify`` recognises them from a
+phrase lexicon with no network round trip, and only when the utterance is
+unambiguous: every word must belong to a command phrase or be filler
+("okay", "please", "can you"), only one kind of command may be present, and
+questions or negations ("don't keep reading") are never classified. Anything
+else returns None and goes to the LLM — a miss costs an LLM turn, a false hit
+would resume the story or hang up on the child, so precision wins.
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+
+try:
+    from .chapter_index import normalize
+except ImportError:
+    from chapter_index import normalize  # type: ignore[assignment]
+
+# Longer utterances are conversation, not a command
+MAX_COMMAND_WORDS = 10
+
+
+class Intent(StrEnum):
+    RESUME = "resume"
+    END = "end"
+
+
+_PHRASES: dict[Intent, tuple[str, ...]] = {
+    Intent.RESUME: (
+        "keep reading",
+        "keep going",
+        "keep read",
+        "go on",
+        "carry on",
+        "read on",
+        "continue",
+        "continue reading",
+        "continue the story",
+        "resume",
+        "resume reading",
+        "back to the story",
+        "back to the book",
+        "go back to the story",
+        "go back to reading",
+        "read more",
+        "read some more",
+        "next page",
+    ),
+    Intent.END: (
+        "bye",
+        "bye bye",
+        "goodbye",
+        "good bye",
+        "good night",
+        "goodnight",
+        "night night",
+        "see you",
+        "see ya",
+        "see you later",
+        "see you tomorrow",
+        "have to go",
+        "need to go",
+        "gotta go",
+    ),
+}
+
+# Words that may surround a command without changing it
+_FILLER = frozenset(
+    {
+        "a",
+        "again",
+        "all",
+        "alright",
+        "and",
+        "awesome",
+        "bit",
+        "can",
+        "cool",
+        "could",
+        "everybody",
+        "everyone",
+        "for",
+        "great",
+        "hmm",
+        "i",
+        "let",
+        "lets",
+        "m",
+        "more",
+        "nice",
+        "now",
+        "oh",
+        "ok",
+        "okay",
+        "please",
+        "right",
+        "s",
+        "so",
+        "soon",
+        "story",
+        "sure",
+        "thank",
+        "thanks",
+        "the",
+        "then",
+        "to",
+        "today",
+        "uh",
+        "um",
+        "umm",
+        "want",
+        "we",
+        "well",
+        "will",
+        "would",
+        "yay",
+        "yeah",
+        "yep",
+        "yes",
+        "you",
+    }
+)
+
+# Any of these makes the utterance a question or a negation: always the LLM's call
+_VETO = frozenset(
+    {
+        "what",
+        "why",
+        "who",
+        "how",
+        "where",
+        "when",
+        "which",
+        "not",
+        "no",
+        "dont",
+        "never",
+        "t",
+        "but",
+        "if",
+        "or",
+    }
+)
+
+# A question mark vetoes too, except after these: "can you keep going?" is a request
+_POLITE_OPENINGS = frozenset(
+    {("can", "you"), ("could", "you"), ("will", "you"), ("would", "you"), ("can", "we")}
+)
+
+
+def _build_index() -> dict[str, list[tuple[tuple[str, ...], Intent]]]:
+    """First word -> the phrases starting with it, as word tuples, longest first."""
+    index: dict[str, list[tuple[tuple[str, ...], Intent]]] = {}
+    for intent, phrases in _PHRASES.items():
+        for phrase in phrases:
+            words = tuple(phrase.split())
+            index.setdefault(words[0], []).append((words, intent))
+    for candidates in index.values():
+        candidates.sort(key=lambda c: len(c[0]), reverse=True)
+    return index
+
+
+_INDEX = _build_index()
+
+
+def classify(text: str) -> Intent | None:
+    """The command ``text`` unambiguously gives, or None if the LLM should handle it."""
+    words = normalize(text).split()
+    if not words or len(words) > MAX_COMMAND_WORDS:
+        return None
+    if "?" in text and tuple(words[:2]) not in _POLITE_OPENINGS:
+        return None
+    found: set[Intent] = set()
+    i = 0
+    while i < len(words):
+        for phrase, intent in _INDEX.get(words[i], ()):
+            if tuple(words[i : i + len(phrase)]) == phrase:
+                found.add(intent)
+                i += len(phrase)
+                break
+        else:
+            if words[i] in _VETO or words[i] not in _FILLER:
+                return None
+            i += 1
+    if len(found) != 1:
+        return None
+    return found.pop()
@@ -2,50 +2,199 @@
 
 from __future__ import annotations
 
-from enum import StrEnum
+import asyncio
+import math
+import time
 
 from loguru import logger
 from pydantic import BaseModel
 
+from shared.book_bundle import bundle_path, decode_bundle
+from shared.tokens import estimate_tokens
+
 try:
+    from .book_cache import get_book_cache
+    from .chapter_index import Chapter, ChapterIndex
+    from .chunk_store import BookChunk, ChunkKind, ChunkStore
+    from .passage_index import PassageIndex
+    from .progress_checkpointer import get_progress_checkpointer
     from .supabase_client import (
-        get_book_chunks,
+        CHUNK_PAGE_SIZE,
+        download_book_bundle,
+        get_book_chunk_count,
+        get_book_chunk_range,
         get_book_metadata,
-        get_chunk_at,
-        get_kid_progress,
+        get_chapter_summaries,
+        get_kid_household_id,
         get_reading_progress,
         list_books,
-        save_reading_progress,
+        list_books_with_progress,
     )
+    from .title_index import TitleIndex, TitleMatch
 except ImportError:
+    from book_cache import get_book_cache  # type: ignore[assignment]
+    from chapter_index import Chapter, ChapterIndex  # type: ignore[assignment]
+    from chunk_store import BookChunk, ChunkKind, ChunkStore  # type: ignore[assignment]
+    from passage_index import PassageIndex  # type: ignore[assignment]
+    from progress_checkpointer import get_progress_checkpointer  # type: ignore[assignment]
     from supabase_client import (  # type: ignore[assignment]
-        get_book_chunks,
+        CHUNK_PAGE_SIZE,
+        download_book_bundle,
+        get_book_chunk_count,
+        get_book_chunk_range,
         get_book_metadata,
-        get_chunk_at,
-        get_kid_progress,
+        get_chapter_summaries,
+        get_kid_household_id,
         get_reading_progress,
         list_books,
-        save_reading_progress,
+        list_books_with_progress,
     )
+    from title_index import TitleIndex, TitleMatch  # type: ignore[assignment]
+
+__all__ = [
+    "BOOK_SHORTLIST_SIZE",
+    "Book",
+    "BookChunk",
+    "ChunkKind",
+    "Library",
+    "TitleMatch",
+    "invalidate_book_list_cache",
+]
+
+# Book lists are cached per household for this long. Short enough that a book
+# uploaded mid-session shows up on the next menu, long enough that the end-of-book
+# menu and back-to-back sessions in a warm container skip the query.
+BOOK_LIST_TTL_SECS = 60.0
 
+# initialize_book loads this window around the resume position before returning;
+# the rest of the book streams in behind it as concurrent ranged requests.
+CHUNK_WINDOW_BEFORE = 2
+CHUNK_WINDOW_AFTER = 20
+CHUNK_FETCH_CONCURRENCY = 4
+CHUNK_FETCH_ATTEMPTS = 3
+# Pages that still fail are fetched again, after a pause growing up to this, until
+# the whole book is in: a chunk left out would otherwise read as the end of the book
+CHUNK_REFETCH_MAX_DELAY_SECS = 10.0
 
-class ChunkKind(StrEnum):
-    CONTENT = "content"
-    CHAPTER_TITLE = "chapter_title"
+# After list_books, this many likely picks are fetched in full in the background,
+# at most PREFETCH_CONCURRENCY books at a time.
+PREFETCH_MAX_BOOKS = 3
+PREFETCH_CONCURRENCY = 2
+
+# list_books shows the child only this many likely picks; the rest are found by title
+BOOK_SHORTLIST_SIZE = 5
 
 
 class Book(BaseModel):
     id: str
     title: str
     status: str
+    chunks_version: int = 0
+    storage_path: str = ""
+
+
+_book_list_cache: dict[str, tuple[float, list[Book]]] = {}
+# Spoken-title index per household, rebuilt whenever its book list changes
+_title_index_cache: dict[str, TitleIndex] = {}
+
+
+def _get_cached_book_list(household_id: str) -> list[Book] | None:
+    entry = _book_list_cache.get(household_id)
+    if entry is None:
+        return None
+    cached_at, books = entry
+    if time.monotonic() - cached_at > BOOK_LIST_TTL_SECS:
+        del _book_list_cache[household_id]
+        return None
+    return list(books)
+
+
+def _set_cached_book_list(household_id: str, books: list[Book]) -> None:
+    _book_list_cache[household_id] = (time.monotonic(), list(books))
+
+
+def invalidate_book_list_cache(household_id: str | None = None) -> None:
+    """Drop the cached book list for one household, or for all of them."""
+    if household_id is None:
+        _book_list_cache.clear()
+        _title_index_cache.clear()
+    else:
+        _book_list_cache.pop(household_id, None)
+        _title_index_cache.pop(household_id, None)
+
+
+def _rank_likely_picks(rows: list[dict]) -> list[str]:
+    """Book ids from the books-with-progress RPC, most likely pick first.
+
+    In-progress books come first, most recently read first; then the rest,
+    newest first. Timestamps are ISO strings from PostgREST, so they sort as text.
+    """
+    started = [r for r in rows if (r.get("current_chunk_index") or 0) > 0]
+    fresh = [r for r in rows if (r.get("current_chunk_index") or 0) == 0]
+    started.sort(key=lambda r: r.get("progress_updated_at") or "", reverse=True)
+    fresh.sort(key=lambda r: r.get("created_at") or "", reverse=True)
+    return [r["id"] for r in started + fresh]
+
+
+def _page_ranges(start: int, end: int) -> list[tuple[int, int]]:
+    return [(lo, min(lo + CHUNK_PAGE_SIZE, end)) for lo in range(start, end, CHUNK_PAGE_SIZE)]
 
 
-class BookChunk(BaseModel):
-    chunk_index: int
-    chunk_kind: ChunkKind = ChunkKind.CONTENT
-    chapter_title: str
-    chunk_hint: str = ""
-    text: str
+async def _fetch_bundle(book: Book) -> ChunkStore | None:
+    """Load a whole book from its compiled bundle in one storage GET.
+
+    Returns None if the book has no bundle for its current version or it can't
+    be read; callers then fall back to the chunk rows.
+    """
+    if book.chunks_version < 1 or not book.storage_path:
+        return None
+    path = bundle_path(book.storage_path, book.chunks_version)
+    try:
+        data = await download_book_bundle(path)
+        bundle = await asyncio.to_thread(decode_bundle, data)
+        if bundle.book_id != book.id or bundle.chunks_version != book.chunks_version:
+            raise ValueError(f"bundle is for {bundle.book_id} v{bundle.chunks_version}")
+        return ChunkStore.from_bundle(bundle)
+    except Exception as e:
+        logger.warning(f"No usable bundle for {book.id} at {path}, loading rows: {e}")
+        return None
+
+
+async def _fetch_summaries(book_id: str) -> list[dict]:
+    """The book's chapter summaries, or none if they can't be loaded (prompts fall back)."""
+    try:
+        return await get_chapter_summaries(book_id)
+    except Exception:
+        logger.exception(f"Failed to load chapter summaries of {book_id}")
+        return []
+
+
+async def _fetch_pages(
+    book_id: str, ranges: list[tuple[int, int]]
+) -> tuple[list[dict], list[tuple[int, int]]]:
+    """Fetch chunk rows for every range, a few pages at a time, retrying failed pages.
+
+    Returns the rows and the ranges that still failed after CHUNK_FETCH_ATTEMPTS.
+    """
+    rows: list[dict] = []
+    failed: list[tuple[int, int]] = []
+    semaphore = asyncio.Semaphore(CHUNK_FETCH_CONCURRENCY)
+
+    async def fetch(start: int, end: int) -> None:
+        async with semaphore:
+            for attempt in range(1, CHUNK_FETCH_ATTEMPTS + 1):
+                try:
+                    rows.extend(await get_book_chunk_range(book_id, start, end))
+                    return
+                except Exception:
+                    if attempt == CHUNK_FETCH_ATTEMPTS:
+                        logger.exception(f"Failed to load chunks {start}-{end} of {book_id}")
+                        failed.append((start, end))
+                        return
+                    await asyncio.sleep(0.2 * attempt)
+
+    await asyncio.gather(*(fetch(start, end) for start, end in ranges))
+    return rows, sorted(failed)
 
 
 class Library:
@@ -53,10 +202,19 @@ class Library:
 
     def __init__(self, kid_id: str):
         self._kid_id = kid_id
+        self._household_id: str | None = None
         self._book: Book | None = None
-        self._chunks: list[BookChunk] = []
+        # The whole book once loaded; until then, the window around the resume position
+        self._store: ChunkStore | None = None
+        self._window: ChunkStore | None = None
+        self._total_chunks = 0
         self._current_chunk_index = 0
-        self._chapter_map: dict[str, int] = {}
+        self._chapters = ChapterIndex([], 0)
+        self._passages: PassageIndex | None = None
+        self._loader_task: asyncio.Task | None = None
+        self._preload: tuple[str, asyncio.Task] | None = None
+        self._likely_picks: list[str] = []
+        self._prefetches: dict[str, asyncio.Task] = {}
 
     @property
     def book(self) -> Book | None:
@@ -72,75 +230,464 @@ class Library:
 
     @property
     def chapter_map(self) -> dict[str, int]:
-        return self._chapter_map
+        return self._chapters.first_chunks()
+
+    @property
+    def chapters(self) -> ChapterIndex:
+        """Chapter boundaries; empty until the whole book has loaded."""
+        return self._chapters
+
+    def current_chapter(self) -> Chapter | None:
+        return self._chapters.chapter_at(self._current_chunk_index)
+
+    async def resolve_chapter(self, reference: str | int) -> Chapter | None:
+        """Resolve a spoken chapter name or number, waiting for the full book if needed."""
+        await self._wait_fully_loaded()
+        return self._chapters.resolve(reference)
+
+    async def relevant_chunks(
+        self, query: str, k: int, up_to: int | None = None, exclude: frozenset[int] = frozenset()
+    ) -> list[BookChunk]:
+        """The ``k`` chunks that best match ``query`` (BM25), in book order.
+
+        Only chunks at or before ``up_to`` are candidates. Empty until the
+        whole book has loaded; the index is built on first use.
+        """
+        store = self._store
+        if store is None:
+            return []
+        index = self._passages
+        if index is None:
+            index = await asyncio.to_thread(PassageIndex, store)
+            if store is not self._store:  # a different book loaded meanwhile
+                return []
+            self._passages = index
+        hits = index.search(query, k, up_to=up_to, exclude=exclude)
+        return [store[i] for i in sorted(hits)]
 
     @property
     def total_chunks(self) -> int:
-        return len(self._chunks)
+        return self._total_chunks
+
+    async def resolve_household_id(self) -> str | None:
+        """The kid's household id (None for an unknown kid), looked up once."""
+        if self._household_id is None:
+            self._household_id = await get_kid_household_id(self._kid_id)
+        return self._household_id
+
+    async def list_books(self) -> list[Book]:
+        """Return the kid's household's ready books, served from a short-TTL cache."""
+        household_id = await self.resolve_household_id()
+        if household_id is None:
+            logger.warning(f"No household for kid {self._kid_id} — no books to list")
+            return []
+
+        books = _get_cached_book_list(household_id)
+        if books is None:
+            rows = await list_books(household_id)
+            books = [Book(**row) for row in rows]
+            _set_cached_book_list(household_id, books)
+        return books
 
-    def list_books(self) -> list[Book]:
-        rows = list_books()
-        return [Book(**row) for row in rows]
+    async def find_books(self, spoken: str, limit: int = 3) -> list[TitleMatch]:
+        """The household's books whose titles sound closest to ``spoken``, best first."""
+        return (await self._title_index()).search(spoken, limit)
 
-    def get_books_with_progress(self) -> list[dict]:
-        """Return books enriched with per-kid reading progress and chunk context."""
-        books = self.list_books()
-        progress_rows = get_kid_progress(self._kid_id)
-        progress_map = {r["book_id"]: r["current_chunk_index"] for r in progress_rows}
+    async def match_book(self, spoken: str) -> TitleMatch | None:
+        """The household book the child named, or None if no title matches clearly.
 
+        A raw book id matches itself.
+        """
+        index = await self._title_index()
+        return index.by_id(spoken) or index.best(spoken)
+
+    async def _title_index(self) -> TitleIndex:
+        books = await self.list_books()
+        pairs = [(b.id, b.title) for b in books]
+        if self._household_id is None:
+            return TitleIndex(pairs)
+        index = _title_index_cache.get(self._household_id)
+        if index is None or not index.built_from(pairs):
+            index = _title_index_cache[self._household_id] = TitleIndex(pairs)
+        return index
+
+    async def get_books_with_progress(self) -> list[dict]:
+        """Return books enriched with per-kid reading progress and chunk context,
+        likeliest pick first (see _rank_likely_picks)."""
+        rows = await list_books_with_progress(self._kid_id)
+        self._likely_picks = _rank_likely_picks(rows)
+        order = {book_id: i for i, book_id in enumerate(self._likely_picks)}
         result = []
-        for b in books:
-            entry: dict = {"id": b.id, "title": b.title, "status": b.status}
-            chunk_index = progress_map.get(b.id, 0)
+        for row in rows:
+            entry: dict = {"id": row["id"], "title": row["title"], "status": row["status"]}
+            chunk_index = row.get("current_chunk_index") or 0
             if chunk_index > 0:
                 entry["current_chunk_index"] = chunk_index
-                chunk = get_chunk_at(b.id, chunk_index)
-                if chunk:
-                    entry["chapter_title"] = chunk["chapter_title"]
-                    entry["chunk_text"] = chunk["text"]
+                if row.get("chunk_text") is not None:
+                    entry["chapter_title"] = row["chapter_title"]
+                    entry["chunk_text"] = row["chunk_text"]
             result.append(entry)
+        result.sort(key=lambda entry: order[entry["id"]])
+
+        # The RPC already returned the household's full list — seed the cache with it
+        if rows and rows[0].get("household_id"):
+            self._household_id = str(rows[0]["household_id"])
+            _set_cached_book_list(
+                self._household_id,
+                [Book(id=r["id"], title=r["title"], status=r["status"]) for r in rows],
+            )
         return result
 
-    def initialize_book(self, book_id: str) -> Book | None:
-        meta = get_book_metadata(book_id)
+    def preload_book(self, book_id: str) -> asyncio.Task:
+        """Start loading a book in the background; initialize_book(book_id) picks it up."""
+        task = asyncio.create_task(self._load_book(book_id))
+        self._preload = (book_id, task)
+        return task
+
+    def prefetch_likely_books(self) -> list[str]:
+        """Fetch the likeliest picks from the last book list in full, in the background.
+
+        initialize_book hands a finished prefetch over without a round trip and
+        cancels the others. Returns the ids being prefetched.
+        """
+        self.cancel_prefetches()
+        semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        picks = self._likely_picks[:PREFETCH_MAX_BOOKS]
+        for book_id in picks:
+            self._prefetches[book_id] = asyncio.create_task(self._prefetch(book_id, semaphore))
+        if picks:
+            logger.info(f"Prefetching likely picks: {picks}")
+        return picks
+
+    def cancel_prefetches(self) -> None:
+        prefetches, self._prefetches = self._prefetches, {}
+        for task in prefetches.values():
+            task.cancel()
+
+    async def initialize_book(self, book_id: str) -> Book | None:
+        """Load a book and the kid's position; returns once the window around it is loaded."""
+        prefetch = self._prefetches.pop(book_id, None)
+        self.cancel_prefetches()
+
+        preload, self._preload = self._preload, None
+        if preload is not None:
+            preload_id, task = preload
+            if preload_id == book_id:
+                try:
+                    return await task
+                except Exception:
+                    logger.exception(f"Preloading {book_id} failed — loading it again")
+            else:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+        if prefetch is not None and not prefetch.done():
+            # Still downloading the whole book — the windowed load gets reading sooner
+            prefetch.cancel()
+        elif prefetch is not None and not prefetch.cancelled() and prefetch.exception() is None:
+            prefetched = prefetch.result()
+            if prefetched is not None:
+                book, progress, store = prefetched
+                await self._cancel_loader()
+                self._book = book
+                self._install_store(store, progress)
+                logger.info(
+                    f"Book handed over from prefetch: {book.title}, "
+                    f"resuming at {self._current_chunk_index}"
+                )
+                return book
+        return await self._load_book(book_id)
+
+    async def _load_book(self, book_id: str) -> Book | None:
+        await self._cancel_loader()
+        meta, progress = await asyncio.gather(
+            get_book_metadata(book_id),
+            get_reading_progress(book_id, self._kid_id),
+        )
         if not meta:
             logger.error(f"Book not found: {book_id}")
             return None
 
         self._book = Book(**meta)
-        raw_chunks = get_book_chunks(book_id)
-        self._chunks = [BookChunk(**c) for c in raw_chunks]
-        self._chapter_map = {}
-        for chunk in self._chunks:
-            if chunk.chapter_title not in self._chapter_map:
-                self._chapter_map[chunk.chapter_title] = chunk.chunk_index
-        self._current_chunk_index = get_reading_progress(book_id, self._kid_id)
+        self._chapters = ChapterIndex([], 0)
+        self._store = self._window = self._passages = None
+        cache = get_book_cache()
+        cached = await cache.get(book_id, self._book.chunks_version)
 
-        if self._current_chunk_index >= len(self._chunks):
-            self._current_chunk_index = 0
+        if cached is None:
+            cached = await _fetch_bundle(self._book)
+            if cached is not None:
+                await cache.put(book_id, self._book.chunks_version, cached)
+
+        if cached is not None:
+            self._install_store(cached, progress)
+        else:
+            total = await get_book_chunk_count(book_id)
+            self._total_chunks = total
+            self._current_chunk_index = progress if progress < total else 0
+            window_start = max(0, self._current_chunk_index - CHUNK_WINDOW_BEFORE)
+            window_end = min(total, self._current_chunk_index + CHUNK_WINDOW_AFTER + 1)
+            window_rows, summaries = await asyncio.gather(
+                get_book_chunk_range(book_id, window_start, window_end),
+                _fetch_summaries(book_id),
+            )
+            if window_start > 0 or window_end < total:
+                self._window = ChunkStore.from_rows(
+                    window_rows, window_start, window_end - window_start, summaries
+                )
+                self._loader_task = asyncio.create_task(
+                    self._load_remaining(
+                        self._book, window_rows, window_start, window_end, summaries
+                    )
+                )
+            else:
+                await self._on_fully_loaded(self._book, window_rows, summaries)
 
         logger.info(
-            f"Book loaded: {self._book.title}, {len(self._chunks)} chunks, "
+            f"Book loaded: {self._book.title}, {self._total_chunks} chunks, "
             f"resuming at {self._current_chunk_index}"
+            + (" (rest streaming in)" if self._loader_task else "")
         )
+        logger.debug(f"Book cache stats: {cache.stats()}")
         return self._book
 
-    def current_chunk(self) -> BookChunk | None:
-        if not self._chunks or self._current_chunk_index >= len(self._chunks):
+    async def current_chunk(self) -> BookChunk | None:
+        return await self.chunk_at(self._current_chunk_index)
+
+    async def chunk_at(self, index: int) -> BookChunk | None:
+        """The chunk at ``index``, waiting for it if it hasn't streamed in yet."""
+        if index < 0 or index >= self._total_chunks:
             return None
-        return self._chunks[self._current_chunk_index]
+        if self._store is None:
+            if self._window is not None and self._window[index] is not None:
+                return self._window[index]
+            await self._wait_fully_loaded()
+        return self._store[index] if self._store is not None else None
+
+    def story_so_far(self, up_to: int, budget_tokens: int, since: int = 0) -> list[BookChunk]:
+        """The run of loaded chunks from ``since`` to ``up_to`` that fits ``budget_tokens``.
+
+        Always includes the chunk at ``up_to`` when it is loaded; never waits for
+        chunks that haven't streamed in yet.
+        """
+        store = self._store if self._store is not None else self._window
+        if store is None or store[up_to] is None:
+            return []
+        start = max(store.window_start(up_to, budget_tokens), min(since, up_to))
+        return [c for i in range(start, up_to + 1) if (c := store[i]) is not None]
+
+    def story_before(self, up_to: int) -> tuple[str, int]:
+        """The ingestion summary of the story before ``up_to``'s chapter, and where it stops.
+
+        Returns ``(summary, since)``: chunks from ``since`` on are not covered
+        by the summary. ``("", 0)`` when the book has no summaries. If
+        summarizing stopped before ``up_to``'s chapter, the last summary is
+        used whole and ``since`` is the first chunk after its chapter.
+        """
+        store = self._store if self._store is not None else self._window
+        chunk = store[up_to] if store is not None else None
+        if chunk is None:
+            return "", 0
+        current = previous = None
+        for summary in store.summaries:
+            if summary.first_chunk_index > up_to:
+                break
+            previous, current = current, summary
+        if current is None:
+            return "", 0
+        if chunk.chapter_title != current.chapter_title:
+            since = next(
+                (
+                    i
+                    for i in range(current.first_chunk_index + 1, up_to)
+                    if (c := store[i]) is not None and c.chapter_title != current.chapter_title
+                ),
+                up_to,
+            )
+            return current.story_so_far, since
+        return (previous.story_so_far if previous else ""), current.first_chunk_index
 
-    def advance_chunk(self) -> BookChunk | None:
-        self._current_chunk_index += 1
-        return self.current_chunk()
+    def book_summary(self, budget_tokens: int | None = None) -> str:
+        """The book as one ingestion summary per chapter; "" if it has none.
 
-    def full_text(self) -> str:
-        return "\n\n".join(c.text for c in self._chunks)
+        Over ``budget_tokens``, the running summary of the whole book is used
+        instead.
+        """
+        store = self._store if self._store is not None else self._window
+        summaries = store.summaries if store is not None else ()
+        if not summaries:
+            return ""
+        text = "\n".join(
+            f"{s.chapter_title}: {s.summary}" if s.chapter_title else s.summary
+            for s in summaries
+            if s.summary
+        )
+        if budget_tokens is not None and estimate_tokens(text) > budget_tokens:
+            return summaries[-1].story_so_far
+        return text
+
+    async def advance_chunk(self) -> BookChunk | None:
+        """Move on to the next chunk; None only once past the last chunk of the book."""
+        while True:
+            self._current_chunk_index += 1
+            self._checkpoint()
+            chunk = await self.current_chunk()
+            if chunk is not None or self._store is None:
+                return chunk
+            if self._current_chunk_index >= self._total_chunks:
+                return None
+            # Every page has loaded, so the book itself has no row here
+            logger.error(
+                f"Chunk {self._current_chunk_index} of {self._book.id} is missing — skipping it"
+            )
+
+    async def full_text(self) -> str:
+        await self._wait_fully_loaded()
+        return self._store.full_text if self._store is not None else ""
+
+    async def outline(self, budget_tokens: int | None = None) -> str:
+        """The book as its ingestion hints, one line per passage under chapter headings.
+
+        A compact stand-in for the full text in prompts about the whole book.
+        Over ``budget_tokens``, every chapter heading stays and the hints are
+        thinned evenly.
+        """
+        await self._wait_fully_loaded()
+        if self._store is None:
+            return ""
+        lines: list[tuple[bool, str]] = []  # (is_hint, line)
+        chapter = None
+        for chunk in self._store:
+            if chunk.chapter_title != chapter:
+                chapter = chunk.chapter_title
+                lines.append((False, chapter))
+            if chunk.chunk_kind is ChunkKind.CONTENT and chunk.chunk_hint:
+                lines.append((True, f"- {chunk.chunk_hint}"))
+        if budget_tokens is not None:
+            hint_tokens = sum(estimate_tokens(line) for is_hint, line in lines if is_hint)
+            room = budget_tokens - sum(
+                estimate_tokens(line) for is_hint, line in lines if not is_hint
+            )
+            if hint_tokens > room:
+                stride = math.ceil(hint_tokens / max(room, 1))
+                hints = (i for i, (is_hint, _) in enumerate(lines) if is_hint)
+                dropped = {i for n, i in enumerate(hints) if n % stride}
+                lines = [line for i, line in enumerate(lines) if i not in dropped]
+        return "\n".join(line for _, line in lines)
 
-    def save_progress(self) -> None:
-        if not self._book or not self._chunks:
+    async def save_progress(self) -> None:
+        """Record the current position and flush the progress queue."""
+        if not self._checkpoint():
             return
+        await get_progress_checkpointer().flush()
+
+    def _checkpoint(self) -> bool:
+        if not self._book or not self._total_chunks:
+            return False
+        get_progress_checkpointer().record(self._book.id, self._kid_id, self._current_chunk_index)
+        return True
+
+    # ------------------------------------------------------------------
+    # Windowed loading
+    # ------------------------------------------------------------------
+
+    async def _wait_fully_loaded(self) -> None:
+        if self._loader_task is not None:
+            # shield: a cancelled waiter must not cancel the shared loader
+            await asyncio.shield(self._loader_task)
+
+    async def _cancel_loader(self) -> None:
+        task, self._loader_task = self._loader_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _load_remaining(
+        self,
+        book: Book,
+        window_rows: list[dict],
+        window_start: int,
+        window_end: int,
+        summaries: list[dict],
+    ) -> None:
+        """Fetch every chunk outside the initial window, a few ranged pages at a time.
+
+        Pages that keep failing are fetched again until they load; readers
+        waiting on them wait too, rather than finding a gap.
+        """
+        ranges = _page_ranges(window_end, self._total_chunks) + _page_ranges(0, window_start)
+        rows = list(window_rows)
+        delay = 1.0
+        while True:
+            fetched, ranges = await _fetch_pages(book.id, ranges)
+            rows.extend(fetched)
+            if not ranges:
+                break
+            logger.warning(
+                f"{len(ranges)} pages of {book.id} still missing — fetching them again in "
+                f"{delay:.0f}s"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHUNK_REFETCH_MAX_DELAY_SECS)
+        await self._on_fully_loaded(book, rows, summaries)
+
+    def _install_store(self, store: ChunkStore, progress: int) -> None:
+        self._store, self._window, self._passages = store, None, None
+        self._total_chunks = len(store)
+        self._current_chunk_index = progress if progress < self._total_chunks else 0
+        self._chapters = ChapterIndex(store.chapter_boundaries(), self._total_chunks)
+
+    async def _prefetch(
+        self, book_id: str, semaphore: asyncio.Semaphore
+    ) -> tuple[Book, int, ChunkStore] | None:
+        """Fetch a whole book and the kid's position without touching the session state."""
         try:
-            save_reading_progress(self._book.id, self._kid_id, self._current_chunk_index)
+            async with semaphore:
+                meta, progress = await asyncio.gather(
+                    get_book_metadata(book_id),
+                    get_reading_progress(book_id, self._kid_id),
+                )
+                if not meta:
+                    return None
+                book = Book(**meta)
+                cache = get_book_cache()
+                store = await cache.get(book_id, book.chunks_version)
+                if store is None:
+                    store = await _fetch_bundle(book)
+                    if store is None:
+                        total = await get_book_chunk_count(book_id)
+                        (rows, failed), summaries = await asyncio.gather(
+                            _fetch_pages(book_id, _page_ranges(0, total)),
+                            _fetch_summaries(book_id),
+                        )
+                        if failed:
+                            return None
+                        store = await asyncio.to_thread(
+                            ChunkStore.from_rows, rows, 0, total, summaries
+                        )
+                        if store.missing:
+                            return None
+                    await cache.put(book_id, book.chunks_version, store)
+                return book, progress, store
         except Exception:
-            logger.exception("Failed to save reading progress")
+            # Speculative — a failure only means the pick loads the normal way
+            logger.exception(f"Prefetching {book_id} failed")
+            return None
+
+    async def _on_fully_loaded(self, book: Book, rows: list[dict], summaries: list[dict]) -> None:
+        """Pack the loaded rows into the book's ChunkStore; cache it if nothing is missing."""
+        store = await asyncio.to_thread(
+            ChunkStore.from_rows, rows, 0, self._total_chunks, summaries
+        )
+        self._store, self._window, self._passages = store, None, None
+        self._chapters = ChapterIndex(store.chapter_boundaries(), self._total_chunks)
+        if store.missing:
+            logger.warning(f"{store.missing} chunks of {book.id} have no row; not caching")
+            return
+        await get_book_cache().put(book.id, book.chunks_version, store)
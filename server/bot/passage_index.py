@@ -0,0 +1,108 @@
+"""PassageIndex — BM25 over a loaded book's chunks, for QA context.
+
+Instead of the whole book, a QA prompt carries the current passage plus the
+few earlier passages that best match what the child asked. Built once per
+loaded ChunkStore (a few ms for a novel) and queried per question; searches
+can be capped at the child's position so later passages never reach the LLM.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from collections import Counter
+
+try:
+    from .chunk_store import ChunkStore
+except ImportError:
+    from chunk_store import ChunkStore  # type: ignore[assignment]
+
+# Okapi BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Function words and question words carry no signal about which passage is meant
+_STOP_WORDS = frozenset(
+    """a about after again all am an and any are as at be because been before being but by
+    can could did do does doing down for from had has have he her here hers him his how i if
+    in into is it its just me more my no not now of off on once only or other our out over
+    own s same she so some such t than that the their them then there these they this those
+    through to too under until up very was we were what when where which while who whom why
+    will with would you your yours said says like tell know think happen happened happens
+    story book""".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased content words, with a plural "s" folded away."""
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+class PassageIndex:
+    """Inverted index of one ChunkStore's chunk texts, scored with BM25."""
+
+    __slots__ = ("_first_index", "_postings", "_lengths", "_avg_length")
+
+    def __init__(self, store: ChunkStore):
+        self._first_index = store.first_index
+        self._lengths = array("I", [0]) * len(store)
+        docs: dict[str, array] = {}
+        freqs: dict[str, array] = {}
+        for chunk in store:
+            doc = chunk.chunk_index - self._first_index
+            # The ingestion hint ("Alice cries a pool of tears") often names what the text implies
+            terms = Counter(tokenize(f"{chunk.text} {chunk.chunk_hint}"))
+            self._lengths[doc] = sum(terms.values())
+            for term, tf in terms.items():
+                if term not in docs:
+                    docs[term], freqs[term] = array("I"), array("I")
+                docs[term].append(doc)
+                freqs[term].append(tf)
+        self._postings = {term: (docs[term], freqs[term]) for term in docs}
+        total = sum(self._lengths)
+        self._avg_length = total / len(self._lengths) if total else 1.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def search(
+        self, query: str, k: int, up_to: int | None = None, exclude: frozenset[int] = frozenset()
+    ) -> list[int]:
+        """Chunk indices of the ``k`` best passages for ``query``, best first.
+
+        Only chunks at or before ``up_to`` (an absolute chunk_index) are
+        considered; chunks in ``exclude`` are skipped.
+        """
+        last = len(self._lengths) - 1 if up_to is None else up_to - self._first_index
+        n_docs = len(self._lengths)
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            docs, freqs = posting
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, tf in zip(docs, freqs, strict=True):
+                if doc > last:
+                    break  # postings are in book order
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc] / self._avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        hits = []
+        for doc, _ in ranked:
+            chunk_index = doc + self._first_index
+            if chunk_index not in exclude:
+                hits.append(chunk_index)
+                if len(hits) == k:
+                    break
+        return hits
@@ -1,7 +1,8 @@
 """BookReaderProcessor — sits between the LLM and the assistant aggregator.
 
 Implements the CONFIRM → READING → QA state machine **and** detects
-first-token intent markers (★/✓/○/◐) in the LLM's streamed response.
+intent markers (★/✓/○/◐) in the LLM's streamed response — only the first
+non-whitespace code point of a response can be a marker.
 
 Pipeline position:  STT → user_agg → LLM → **BookReaderProcessor** → assistant_agg → TTS
 
@@ -37,7 +38,8 @@ try:
     from ..prompt import (
         INTENT_INSTRUCTIONS_CONFIRM,
         INTENT_INSTRUCTIONS_QA,
-        READING_COMPANION_SYSTEM,
+        READING_COMPANION_POSITION,
+        READING_COMPANION_PREFIX,
     )
     from ..supabase_client import (
         get_book_chunks,
@@ -49,7 +51,8 @@ except ImportError:
     from prompt import (  # type: ignore[assignment]
         INTENT_INSTRUCTIONS_CONFIRM,
         INTENT_INSTRUCTIONS_QA,
-        READING_COMPANION_SYSTEM,
+        READING_COMPANION_POSITION,
+        READING_COMPANION_PREFIX,
     )
     from supabase_client import (  # type: ignore[assignment]
         get_book_chunks,
@@ -74,7 +77,22 @@ _MARKERS = {
 WAIT_SHORT_TIMEOUT = 5.0
 WAIT_LONG_TIMEOUT = 10.0
 
-_MARKER_BUFFER_LIMIT = 20
+
+class _MarkerState(enum.Enum):
+    """Where one streamed LLM response is in marker detection."""
+
+    SCANNING = "scanning"  # only whitespace so far; the marker may be next
+    STRIP_SPACE = "strip_space"  # after ✓: drop the space that separates it from the answer
+    PASS = "pass"  # resolved: forward frames untouched
+    SUPPRESS = "suppress"  # resolved: drop the rest of the response
+
+
+# Bound once: looking a member up on the Enum class costs more than the rest of
+# the per-token path
+_SCANNING = _MarkerState.SCANNING
+_STRIP_SPACE = _MarkerState.STRIP_SPACE
+_PASS = _MarkerState.PASS
+_SUPPRESS = _MarkerState.SUPPRESS
 
 
 class State(enum.Enum):
@@ -108,12 +126,14 @@ class BookReaderProcessor(FrameProcessor):
         self._current_chunk_index = 0
         self._book_title = ""
         self._full_book_text = ""
+        # Static head of the QA prompt (book text + instructions), rendered once per book
+        self._qa_prompt_prefix = ""
         self._chunks_read: list[int] = []
 
-        # Marker detection state (reset per LLM response)
-        self._marker_buffer = ""
-        self._marker_resolved = False
-        self._marker_suppressed = False
+        # Marker detection state (reset per LLM response). Whitespace-only frames
+        # that arrive before the first real code point are held until it resolves.
+        self._marker_state = _SCANNING
+        self._marker_held: list[LLMTextFrame] = []
 
     # ------------------------------------------------------------------
     # Book initialisation (can be called more than once to switch books)
@@ -129,15 +149,15 @@ class BookReaderProcessor(FrameProcessor):
         self._book_id = book_id
         self._chunks_read = []
 
-        meta = get_book_metadata(book_id)
+        meta = await get_book_metadata(book_id)
         if not meta:
             logger.error(f"Book not found: {book_id}")
             await self._assistant_says("Sorry, I couldn't find that book.")
             return
 
         self._book_title = meta["title"]
-        self._chunks = get_book_chunks(book_id)
-        self._current_chunk_index = get_reading_progress(book_id, self._kid_id)
+        self._chunks = await get_book_chunks(book_id)
+        self._current_chunk_index = await get_reading_progress(book_id, self._kid_id)
 
         if not self._chunks:
             logger.error(f"No chunks for book: {book_id}")
@@ -148,6 +168,13 @@ class BookReaderProcessor(FrameProcessor):
             self._current_chunk_index = 0
 
         self._full_book_text = "\n\n".join(c["text"] for c in self._chunks)
+        self._qa_prompt_prefix = (
+            READING_COMPANION_PREFIX.format(
+                title=self._book_title, full_book_text=self._full_book_text
+            )
+            + "\n\n"
+            + INTENT_INSTRUCTIONS_QA
+        )
 
         logger.info(
             f"Book loaded: {self._book_title}, {len(self._chunks)} chunks, "
@@ -194,14 +221,8 @@ class BookReaderProcessor(FrameProcessor):
         if self._current_chunk_index < len(self._chunks):
             current_preview = self._chunks[self._current_chunk_index]["text"][:200]
 
-        return (
-            READING_COMPANION_SYSTEM.format(
-                title=self._book_title,
-                full_book_text=self._full_book_text,
-                current_chunk_preview=current_preview,
-            )
-            + "\n\n"
-            + INTENT_INSTRUCTIONS_QA
+        return self._qa_prompt_prefix + READING_COMPANION_POSITION.format(
+            current_chunk_preview=current_preview
         )
 
     def _replace_system_prompt(self) -> None:
@@ -336,76 +357,91 @@ class BookReaderProcessor(FrameProcessor):
     # ------------------------------------------------------------------
 
     async def _handle_llm_text(self, frame: LLMTextFrame, direction: FrameDirection) -> None:
-        if self._marker_suppressed:
+        state = self._marker_state
+        if state is _PASS:
+            await self.push_frame(frame, direction)
+            return
+        if state is _SUPPRESS:
             return
 
-        if self._marker_resolved:
+        text = frame.text
+        if state is _STRIP_SPACE:
+            self._marker_state = _PASS
+            if text[:1] == " ":
+                if len(text) == 1:
+                    return
+                frame.text = text[1:]
             await self.push_frame(frame, direction)
             return
 
-        self._marker_buffer += frame.text
-        await self._try_detect_marker()
-
-    async def _try_detect_marker(self) -> None:
-        for marker, intent in _MARKERS.items():
-            if marker not in self._marker_buffer:
-                continue
-
-            self._marker_resolved = True
-
-            if intent == "affirm":
-                self._marker_suppressed = True
-                self._cancel_wait()
-                self._interrupted = False
-                logger.info(f"[{self._state.value}] Affirm intent — starting reading")
-                was_qa = self._state == State.QA
-                self._state = State.READING
-                self._replace_system_prompt()
-                transition = "OK, back to the story. " if was_qa else ""
-                await self._push_current_chunk(transition=transition)
-                return
+        # SCANNING: only the first non-whitespace code point of a response can be a marker
+        for i, ch in enumerate(text):
+            if not ch.isspace():
+                break
+        else:
+            self._marker_held.append(frame)
+            return
+
+        intent = _MARKERS.get(ch)
+        if intent is None:
+            self._marker_state = _PASS
+            await self._release_held_frames(direction)
+            await self.push_frame(frame, direction)
+            return
 
-            if intent == "answer":
-                idx = self._marker_buffer.index(marker) + len(marker)
-                remaining = self._marker_buffer[idx:]
-                if remaining.startswith(" "):
-                    remaining = remaining[1:]
-                if remaining:
-                    await self.push_frame(LLMTextFrame(text=remaining))
-                self._marker_buffer = ""
+        # Whitespace ahead of a marker is not part of the answer
+        self._marker_held.clear()
+        if intent == "answer":
+            rest = i + len(ch)
+            if rest == len(text):
+                self._marker_state = _STRIP_SPACE
                 return
+            self._marker_state = _PASS
+            if text[rest] == " ":
+                rest += 1
+                if rest == len(text):
+                    return
+            frame.text = text[rest:]
+            await self.push_frame(frame, direction)
+            return
 
-            # wait_short / wait_long
-            self._marker_suppressed = True
-            wait_type = "short" if intent == "wait_short" else "long"
-            await self._start_wait(wait_type)
+        self._marker_state = _SUPPRESS
+        if intent == "affirm":
+            self._cancel_wait()
+            self._interrupted = False
+            logger.info(f"[{self._state.value}] Affirm intent — starting reading")
+            was_qa = self._state == State.QA
+            self._state = State.READING
+            self._replace_system_prompt()
+            transition = "OK, back to the story. " if was_qa else ""
+            await self._push_current_chunk(transition=transition)
             return
 
-        # Graceful degradation: no marker found after enough text
-        if len(self._marker_buffer) > _MARKER_BUFFER_LIMIT:
-            logger.warning("No intent marker found in LLM response, passing through")
-            self._marker_resolved = True
-            await self.push_frame(LLMTextFrame(text=self._marker_buffer))
-            self._marker_buffer = ""
+        # wait_short / wait_long
+        wait_type = "short" if intent == "wait_short" else "long"
+        await self._start_wait(wait_type)
+
+    async def _release_held_frames(self, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        for held in self._marker_held:
+            await self.push_frame(held, direction)
+        self._marker_held.clear()
 
     async def _marker_flush_and_reset(self) -> None:
-        """Push any un-resolved buffer at end-of-response, then reset."""
-        if not self._marker_resolved and self._marker_buffer:
-            logger.warning("No intent marker found at end of LLM response, flushing buffer")
-            await self.push_frame(LLMTextFrame(text=self._marker_buffer))
-        self._marker_buffer = ""
-        self._marker_resolved = False
-        self._marker_suppressed = False
+        """Forward a response that never got past whitespace, then reset for the next one."""
+        if self._marker_state is _SCANNING and self._marker_held:
+            await self._release_held_frames()
+        self._marker_held.clear()
+        self._marker_state = _SCANNING
 
     # ------------------------------------------------------------------
     # Progress persistence
     # ------------------------------------------------------------------
 
-    def save_progress(self) -> None:
+    async def save_progress(self) -> None:
         """Save current reading position to Supabase. Call on disconnect."""
         if not self._chunks or not self._book_id:
             return
         try:
-            save_reading_progress(self._book_id, self._kid_id, self._current_chunk_index)
+            await save_reading_progress(self._book_id, self._kid_id, self._current_chunk_index)
         except Exception:
             logger.exception("Failed to save reading progress")
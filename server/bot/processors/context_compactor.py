@@ -0,0 +1,146 @@
+"""ContextCompactor — keeps the conversation history small in long reading sessions.
+
+Every passage the state manager reads aloud is recorded by the assistant
+aggregator as an assistant turn, so after an hour of reading the history holds
+most of the book, sent again with every question. Before each LLM turn this
+processor replaces runs of read-aloud turns with a one-line note (passage range,
+chapter, ingestion hint of the last passage) and then drops the oldest history
+until it fits a token budget. Dialogue with the child is kept verbatim.
+
+Pipeline: STT -> user_agg -> LocalIntent -> **ContextCompactor** -> QAContext -> LLM -> ...
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from shared.tokens import estimate_message_tokens
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ..chunk_store import BookChunk
+    from .state_manager import BookReadingStateManager
+
+# Spoken text comes back from TTS with its own spacing and punctuation, so
+# passages are matched on their first letters and digits only
+_KEY_CHARS = 48
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+READ_ALOUD_NOTE = "Read aloud earlier:"
+
+
+def passage_key(text: str) -> str:
+    """Matching key for a passage and the assistant turn that spoke it."""
+    return _NON_ALNUM.sub("", text[: _KEY_CHARS * 2].lower())[:_KEY_CHARS]
+
+
+def _read_aloud_note(chunks: list[BookChunk]) -> dict:
+    first, last = chunks[0].chunk_index, chunks[-1].chunk_index
+    span = f"passage {first}" if first == last else f"passages {first}-{last}"
+    chapters = list(dict.fromkeys(c.chapter_title for c in chunks if c.chapter_title))
+    if chapters:
+        span += " of " + ", ".join(f'"{title}"' for title in chapters)
+    note = f"{READ_ALOUD_NOTE} {span}."
+    if chunks[-1].chunk_hint:
+        note += f" It ended with: {chunks[-1].chunk_hint}"
+    return {"role": "system", "content": note}
+
+
+def _is_note(message: object) -> bool:
+    return (
+        isinstance(message, dict)
+        and message.get("role") == "system"
+        and str(message.get("content", "")).startswith(READ_ALOUD_NOTE)
+    )
+
+
+def compact_history(
+    messages: list,
+    read_aloud: Callable[[str], BookChunk | None],
+    budget_tokens: int,
+) -> list | None:
+    """History with read-aloud turns folded into notes, trimmed to ``budget_tokens``.
+
+    ``read_aloud`` maps an assistant turn's text to the passage it spoke, or
+    None for real dialogue. Returns None when nothing needed to change.
+    """
+    compacted: list = []
+    run: list[BookChunk] = []
+    changed = False
+    for message in messages:
+        chunk = None
+        if isinstance(message, dict) and message.get("role") == "assistant":
+            content = message.get("content")
+            if isinstance(content, str) and not message.get("tool_calls"):
+                chunk = read_aloud(content)
+        if chunk is not None:
+            run.append(chunk)
+            changed = True
+            continue
+        if run:
+            compacted.append(_read_aloud_note(run))
+            run = []
+        compacted.append(message)
+    if run:
+        compacted.append(_read_aloud_note(run))
+
+    # Tool results must stay with the call that produced them, so history is
+    # trimmed in units of one message plus the tool messages that follow it
+    units: list[list] = []
+    for message in compacted:
+        if units and isinstance(message, dict) and message.get("role") == "tool":
+            units[-1].append(message)
+        else:
+            units.append([message])
+    sizes = [sum(estimate_message_tokens(m) for m in unit) for unit in units]
+    total = sum(sizes)
+    if total > budget_tokens:
+        # Oldest notes go first, then the oldest dialogue; the latest turn always stays
+        droppable = [i for i in range(len(units) - 1) if _is_note(units[i][0])]
+        droppable += [i for i in range(len(units) - 1) if not _is_note(units[i][0])]
+        dropped = set()
+        for i in droppable:
+            if total <= budget_tokens:
+                break
+            dropped.add(i)
+            total -= sizes[i]
+        units = [unit for i, unit in enumerate(units) if i not in dropped]
+        changed = True
+
+    if not changed:
+        return None
+    return [message for unit in units for message in unit]
+
+
+class ContextCompactor(FrameProcessor):
+    """Compacts the shared LLMContext history before each LLM turn."""
+
+    def __init__(self, state_manager: BookReadingStateManager, budget_tokens: int, **kwargs):
+        super().__init__(**kwargs)
+        self._state_manager = state_manager
+        self._budget_tokens = budget_tokens
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            messages = frame.context.get_messages()
+            compacted = compact_history(
+                messages, self._state_manager.read_aloud_chunk, self._budget_tokens
+            )
+            if compacted is not None:
+                before = sum(estimate_message_tokens(m) for m in messages)
+                after = sum(estimate_message_tokens(m) for m in compacted)
+                logger.info(
+                    f"[ContextCompactor] history {len(messages)} -> {len(compacted)} messages, "
+                    f"~{before} -> ~{after} tokens"
+                )
+                frame.context.set_messages(compacted)
+
+        await self.push_frame(frame, direction)
@@ -14,9 +14,25 @@ class StartReadingFrame(DataFrame):
 @dataclass
 class EndSessionFrame(DataFrame):
     reason: str = "user_goodbye"
+    # Spoken before disconnecting; empty when the LLM already said goodbye
+    farewell: str = ""
 
 
 @dataclass
 class BookSelectedFrame(DataFrame):
     book_id: str = ""
     book_title: str = ""
+
+
+@dataclass
+class CachedAnswerFrame(DataFrame):
+    # A QA answer from the answer cache, spoken in place of an LLM turn
+    text: str = ""
+
+
+@dataclass
+class ChunkPlayedFrame(DataFrame):
+    # Pushed right after a read-aloud chunk's speech; it leaves transport.output
+    # once that audio has been played, and PlaybackTracker hands it back
+    chunk_index: int = 0
+    reading_run: int = 0  # which start_reading the chunk was queued by
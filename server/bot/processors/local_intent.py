@@ -0,0 +1,88 @@
+"""LocalIntentProcessor — answers "keep reading" and "bye" without an LLM turn.
+
+In QA and FINISHED every utterance normally goes to the LLM, so resuming the
+story or leaving costs a full LLM round trip before start_reading / end_session
+fires. This processor sits right after the user aggregator: when the child's
+completed turn is an unambiguous command (``intent_classifier.classify``) it
+queues the StartReadingFrame / EndSessionFrame the function call would have
+queued and drops the turn; anything else goes on to the LLM unchanged.
+
+Pipeline: STT -> user_agg -> **LocalIntent** -> ContextCompactor -> QAContext -> LLM -> ...
+"""
+
+from __future__ import annotations
+
+import time
+
+from loguru import logger
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+try:
+    from ..intent_classifier import Intent, classify
+    from .frames import EndSessionFrame, StartReadingFrame
+    from .qa_context import last_user_text
+    from .state_manager import FAREWELL, BookReadingStateManager, State
+except ImportError:
+    from intent_classifier import Intent, classify  # type: ignore[assignment]
+    from processors.frames import EndSessionFrame, StartReadingFrame  # type: ignore[assignment]
+    from processors.qa_context import last_user_text  # type: ignore[assignment]
+    from processors.state_manager import (  # type: ignore[assignment]
+        FAREWELL,
+        BookReadingStateManager,
+        State,
+    )
+
+# States each command is handled locally in; elsewhere the LLM decides. Resuming
+# from FINISHED means picking a book or restarting, so that stays with the LLM.
+_LOCAL_STATES = {
+    Intent.RESUME: frozenset({State.QA}),
+    Intent.END: frozenset({State.QA, State.FINISHED}),
+}
+
+
+class LocalIntentProcessor(FrameProcessor):
+    """Turns unambiguous resume / goodbye turns into state manager frames."""
+
+    def __init__(self, state_manager: BookReadingStateManager, **kwargs):
+        super().__init__(**kwargs)
+        self._state_manager = state_manager
+        self._counts = {"resume": 0, "end": 0, "llm": 0}
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """User turns handled locally per intent, and passed on to the LLM ("llm")."""
+        return self._counts
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+
+        if (
+            isinstance(frame, LLMContextFrame)
+            and direction == FrameDirection.DOWNSTREAM
+            and await self._handled_locally(last_user_text(frame.context))
+        ):
+            return
+
+        await self.push_frame(frame, direction)
+
+    async def _handled_locally(self, text: str) -> bool:
+        state = self._state_manager.state
+        if not text or state not in (State.QA, State.FINISHED):
+            return False
+        start = time.perf_counter()
+        intent = classify(text)
+        if intent is None or state not in _LOCAL_STATES[intent]:
+            self._counts["llm"] += 1
+            return False
+        if intent == Intent.RESUME:
+            command = StartReadingFrame(book_id=self._state_manager.book_id)
+        else:
+            command = EndSessionFrame(reason="user_goodbye", farewell=FAREWELL)
+        self._counts[intent.value] += 1
+        logger.info(
+            f"[LocalIntent] {text[:60]!r} -> {intent.value} "
+            f"in {(time.perf_counter() - start) * 1000:.2f}ms, skipping the LLM"
+        )
+        await self._state_manager.queue_frame(command, FrameDirection.DOWNSTREAM)
+        return True
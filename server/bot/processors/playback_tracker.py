@@ -0,0 +1,38 @@
+"""PlaybackTracker — tells the state manager when a read-aloud chunk has been heard.
+
+In read-ahead mode the state manager pushes a ChunkPlayedFrame right after
+each chunk's speech. TTS and the output transport keep it behind that speech
+and let it through only once the audio has been played, so when it comes out
+of transport.output the child has heard the whole chunk. This processor sits
+right after the output and queues it back to the state manager.
+
+Pipeline: ... -> StateManager -> TTS -> transport.output -> **PlaybackTracker** -> assistant_agg
+"""
+
+from __future__ import annotations
+
+from pipecat.frames.frames import Frame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+try:
+    from .frames import ChunkPlayedFrame
+    from .state_manager import BookReadingStateManager
+except ImportError:
+    from processors.frames import ChunkPlayedFrame  # type: ignore[assignment]
+    from processors.state_manager import BookReadingStateManager  # type: ignore[assignment]
+
+
+class PlaybackTracker(FrameProcessor):
+    """Returns ChunkPlayedFrames to the state manager once their audio has played."""
+
+    def __init__(self, state_manager: BookReadingStateManager, **kwargs):
+        super().__init__(**kwargs)
+        self._state_manager = state_manager
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, ChunkPlayedFrame) and direction == FrameDirection.DOWNSTREAM:
+            await self._state_manager.queue_frame(frame, FrameDirection.DOWNSTREAM)
+            return
+        await self.push_frame(frame, direction)
@@ -0,0 +1,72 @@
+"""QAContextProcessor — refreshes the QA prompt once the child's question is known.
+
+The state manager sits after the LLM and switches to QA on UserStartedSpeaking,
+before anything has been transcribed. This processor sits between the user
+aggregator and the LLM, so it sees each completed user turn first: in QA or
+FINISHED it asks the state manager for a prompt with the passages that match
+what the child said, and pushes that ahead of the context frame the LLM runs on.
+A question already answered for another child at this point in the book is
+answered from the state manager's answer cache instead, and the turn is dropped.
+
+Pipeline: STT -> user_agg -> **QAContext** -> LLM -> StateManager -> ...
+"""
+
+from __future__ import annotations
+
+from loguru import logger
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+try:
+    from .state_manager import BookReadingStateManager
+except ImportError:
+    from processors.state_manager import BookReadingStateManager  # type: ignore[assignment]
+
+
+def last_user_text(context: LLMContext) -> str:
+    """Text of the user turn that ends ``context``.
+
+    Returns "" when the last message is not from the user (a system or assistant
+    message pushed after the child spoke), so an earlier question is never
+    answered or acted on twice.
+    """
+    messages = context.get_messages()
+    if not messages:
+        return ""
+    message = messages[-1]
+    if not isinstance(message, dict) or message.get("role") != "user":
+        return ""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part.get("text", "")
+            for part in content
+            if isinstance(part, dict) and part.get("type") == "text"
+        )
+    return ""
+
+
+class QAContextProcessor(FrameProcessor):
+    """Swaps in question-specific QA context right before the LLM answers."""
+
+    def __init__(self, state_manager: BookReadingStateManager, **kwargs):
+        super().__init__(**kwargs)
+        self._state_manager = state_manager
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            question = last_user_text(frame.context)
+            if question:
+                if await self._state_manager.answer_from_cache(question):
+                    return
+                update = await self._state_manager.question_prompt(question)
+                if update is not None:
+                    logger.debug(f"[QAContext] Prompt refreshed for: {question[:60]}")
+                    await self.push_frame(update, direction)
+
+        await self.push_frame(frame, direction)
@@ -1,15 +1,17 @@
 """BookReadingStateManager — function-call-driven state machine.
 
 Replaces marker-based BookReaderProcessor with LLM function calls for
-state transitions.  Sits between LLM and assistant aggregator in the pipeline.
+state transitions.  Sits between the LLM and TTS in the pipeline.
 
-Pipeline: STT -> user_agg -> LLM -> **StateManager** -> assistant_agg -> TTS -> output
+Pipeline: transport.input -> STT -> user_agg -> LocalIntent -> ContextCompactor -> QAContext
+-> LLM -> **StateManager** -> TTS -> transport.output -> PlaybackTracker -> assistant_agg
 """
 
 from __future__ import annotations
 
 import asyncio
 import enum
+from collections import OrderedDict, deque
 from collections.abc import Callable, Coroutine
 from typing import Any
 
@@ -17,35 +19,72 @@ from loguru import logger
 from pipecat.frames.frames import (
     BotStoppedSpeakingFrame,
     Frame,
+    FunctionCallsStartedFrame,
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMMessagesAppendFrame,
+    LLMTextFrame,
     LLMUpdateSettingsFrame,
+    MetricsFrame,
     TTSSpeakFrame,
     UserStartedSpeakingFrame,
 )
+from pipecat.metrics.metrics import LLMUsageMetricsData, TTFBMetricsData
 from pipecat.processors.aggregators.llm_context import LLMContext
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.services.llm_service import LLMService
 
+from shared.config import settings
+from shared.tokens import estimate_tokens
+
 try:
-    from ..library import Library
-    from ..prompt import FINISHED_SYSTEM, QA_SYSTEM, READING_SYSTEM
-    from .frames import EndSessionFrame, StartReadingFrame
+    from ..answer_cache import AnswerCache, AnswerKey, get_answer_cache, question_key
+    from ..library import BOOK_SHORTLIST_SIZE, BookChunk, Library
+    from ..prompt import (
+        FINISHED_SYSTEM_CONTEXT,
+        FINISHED_SYSTEM_PREFIX,
+        QA_SYSTEM_CONTEXT,
+        QA_SYSTEM_PREFIX,
+        READING_SYSTEM,
+    )
+    from .context_compactor import passage_key
+    from .frames import (
+        CachedAnswerFrame,
+        ChunkPlayedFrame,
+        EndSessionFrame,
+        StartReadingFrame,
+    )
 except ImportError:
-    from library import Library  # type: ignore[assignment]
+    from answer_cache import (  # type: ignore[assignment]
+        AnswerCache,
+        AnswerKey,
+        get_answer_cache,
+        question_key,
+    )
+    from library import BOOK_SHORTLIST_SIZE, BookChunk, Library  # type: ignore[assignment]
+    from processors.context_compactor import passage_key  # type: ignore[assignment]
     from processors.frames import (  # type: ignore[assignment]
+        CachedAnswerFrame,
+        ChunkPlayedFrame,
         EndSessionFrame,
         StartReadingFrame,
     )
     from prompt import (  # type: ignore[assignment]
-        FINISHED_SYSTEM,
-        QA_SYSTEM,
+        FINISHED_SYSTEM_CONTEXT,
+        FINISHED_SYSTEM_PREFIX,
+        QA_SYSTEM_CONTEXT,
+        QA_SYSTEM_PREFIX,
         READING_SYSTEM,
     )
 
 IDLE_TIMEOUT_SECS = 60
 
+FAREWELL = "It was lovely reading with you! Bye for now, see you next time!"
+
+# A question's QA prompt carries this many earlier passages retrieved for it
+# (plus the previous and current passage)
+QA_TOP_PASSAGES = 4
+
 
 class State(enum.Enum):
     BOOK_SELECTION = "book_selection"
@@ -54,10 +93,31 @@ class State(enum.Enum):
     FINISHED = "finished"
 
 
+def model_for_state(state: State) -> str:
+    """The LLM model turns in ``state`` run on: chit-chat on a fast model, QA on a strong one."""
+    return settings.bot.llm_state_models.get(state.value, settings.bot.llm_model)
+
+
+# Rendered static prompt prefixes, keyed by (book_id, chunks_version, state) and
+# shared across sessions; the FINISHED one holds the whole book outline
+PROMPT_PREFIX_CACHE_SIZE = 32
+_prompt_prefix_cache: OrderedDict[tuple[str, int, State], str] = OrderedDict()
+
+
 class BookReadingStateManager(FrameProcessor):
     """Function-call-driven state machine for book reading sessions."""
 
-    def __init__(self, library: Library, context: LLMContext, llm: LLMService, **kwargs):
+    def __init__(
+        self,
+        library: Library,
+        context: LLMContext,
+        llm: LLMService,
+        prompt_token_budget: int | None = None,
+        answer_cache: AnswerCache | None = None,
+        models: dict[State, str] | None = None,
+        read_ahead_chunks: int | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._library = library
         self._context = context
@@ -70,6 +130,41 @@ class BookReadingStateManager(FrameProcessor):
         self._idle_task: asyncio.Task | None = None
         self._idle_event: asyncio.Event = asyncio.Event()
         self._book_index_map: dict[str, str] = {}
+        # Book text (passages, outline) a QA / FINISHED system prompt may carry
+        self._prompt_token_budget = (
+            settings.bot.prompt_token_budget if prompt_token_budget is None else prompt_token_budget
+        )
+        # System prompt sizes per state: {"prompts", "total", "max"} estimated tokens
+        self._prompt_tokens: dict[str, dict[str, int]] = {}
+        self._finished_prefix = ""
+        self._finished_fields: dict[str, str] = {}
+        # QA prompt for the passage being read, rendered while it plays:
+        # (book_id, chunk_index, prompt)
+        self._qa_ready: tuple[str, int, str] | None = None
+        self._qa_task: asyncio.Task | None = None
+        # Passages read aloud this session, by passage_key(), so ContextCompactor
+        # can recognise them in the history
+        self._read_aloud: dict[str, BookChunk] = {}
+        self._answer_cache = answer_cache or get_answer_cache()
+        # The QA question the LLM is answering, to cache its answer:
+        # (key, chunk_index asked at, answer text so far)
+        self._answer_capture: tuple[AnswerKey, int, list[str]] | None = None
+        self._models = models or {state: model_for_state(state) for state in State}
+        # run_bot creates the LLM on the BOOK_SELECTION model
+        self._model = self._models[State.BOOK_SELECTION]
+        # LLM latency and token use per model: {"ttfb_samples", "ttfb_ms_total",
+        # "ttfb_ms_max", "prompt_tokens", "completion_tokens", "cached_prompt_tokens"}
+        self._model_stats: dict[str, dict[str, float]] = {}
+        # Passages handed to TTS beyond the one playing; 0 reads each one only
+        # after BotStoppedSpeaking for the one before
+        self._read_ahead = (
+            settings.bot.read_ahead_chunks if read_ahead_chunks is None else read_ahead_chunks
+        )
+        # chunk_index of every passage handed to TTS and not heard yet; the first
+        # is the one playing, and stays the library's current chunk until heard
+        self._queued_chunks: deque[int] = deque()
+        # Bumped on every start_reading, so ChunkPlayedFrames of an earlier run are ignored
+        self._reading_run = 0
 
     # ------------------------------------------------------------------
     # Book index resolution
@@ -87,6 +182,31 @@ class BookReadingStateManager(FrameProcessor):
     def state(self) -> State:
         return self._state
 
+    @property
+    def book_id(self) -> str:
+        """The loaded book's id, or "" before one is selected."""
+        book = self._library.book
+        return book.id if book else ""
+
+    @property
+    def prompt_token_stats(self) -> dict[str, dict[str, int]]:
+        """Estimated system prompt tokens per state: prompts sent, total and max."""
+        return self._prompt_tokens
+
+    @property
+    def model(self) -> str:
+        """The LLM model the state manager last switched to."""
+        return self._model
+
+    @property
+    def model_stats(self) -> dict[str, dict[str, float]]:
+        """LLM time to first byte and token use per model, from the LLM's metrics."""
+        return self._model_stats
+
+    def read_aloud_chunk(self, text: str) -> BookChunk | None:
+        """The passage this session read aloud as ``text``, if any."""
+        return self._read_aloud.get(passage_key(text))
+
     def set_disconnect_callback(self, callback: Callable[[], Coroutine[Any, Any, None]]) -> None:
         self._disconnect_callback = callback
 
@@ -94,17 +214,24 @@ class BookReadingStateManager(FrameProcessor):
     # Public entry points
     # ------------------------------------------------------------------
 
-    async def greet_child(self) -> None:
-        """Push a greeting nudge. The system prompt is already set at context creation."""
+    async def greet_child(self, book_status: str | None = None) -> None:
+        """Push a greeting nudge. The system prompt is already set at context creation.
+
+        ``book_status`` describes a book loaded before the child joined, so the
+        first LLM turn can act on it without a select_book round trip.
+        """
         await self._stop_idle_timer()
         self._state = State.BOOK_SELECTION
 
+        content = "The child has joined. Greet them warmly."
+        if book_status:
+            content += f"\n{book_status}"
         await self.push_frame(
             LLMMessagesAppendFrame(
                 messages=[
                     {
                         "role": "system",
-                        "content": "The child has joined. Greet them warmly.",
+                        "content": content,
                     }
                 ],
                 run_llm=True,
@@ -112,6 +239,56 @@ class BookReadingStateManager(FrameProcessor):
             FrameDirection.UPSTREAM,
         )
 
+    async def answer_from_cache(self, question: str) -> bool:
+        """Speak the cached answer to ``question`` if there is one the child may hear.
+
+        Called by QAContextProcessor before the LLM runs; on a miss the LLM's answer
+        is cached once it has been streamed.
+        """
+        self._answer_capture = None
+        key = self._answer_key(question)
+        if key is None:
+            return False
+        position = self._library.current_chunk_index
+        answer = await self._answer_cache.get(key, position)
+        if answer is None:
+            self._answer_capture = (key, position, [])
+            return False
+        logger.info(
+            f"[StateManager] Cached answer for {question[:60]!r} "
+            f"(hit rate {self._answer_cache.hit_rate():.0%}), skipping the LLM"
+        )
+        await self.queue_frame(CachedAnswerFrame(text=answer), FrameDirection.DOWNSTREAM)
+        return True
+
+    async def question_prompt(self, question: str) -> LLMUpdateSettingsFrame | None:
+        """System prompt update carrying the passages that match the child's question.
+
+        Called by QAContextProcessor before the LLM answers; None outside QA/FINISHED.
+        """
+        if self._state == State.QA:
+            prompt = await self._qa_prompt(question)
+        elif self._state == State.FINISHED and self._finished_fields:
+            chunks = self._fit(
+                await self._library.relevant_chunks(question, QA_TOP_PASSAGES),
+                self._prompt_token_budget // 2,
+            )
+            passages = ""
+            if chunks:
+                passages = (
+                    "\nPassages that relate to what the child just said:\n---\n"
+                    f"{self._format_passages(chunks)}\n---"
+                )
+            prompt = self._finished_prefix + FINISHED_SYSTEM_CONTEXT.format(
+                passages=passages, **self._finished_fields
+            )
+        else:
+            return None
+        if not prompt:
+            return None
+        self._record_prompt_tokens(prompt)
+        return LLMUpdateSettingsFrame(delta=self._settings_delta(prompt))
+
     # ------------------------------------------------------------------
     # Frame processing
     # ------------------------------------------------------------------
@@ -139,6 +316,18 @@ class BookReadingStateManager(FrameProcessor):
             await self._handle_bot_stopped_speaking(frame, direction)
             return
 
+        if isinstance(frame, ChunkPlayedFrame):
+            await self._handle_chunk_played(frame)
+            return
+
+        if isinstance(frame, CachedAnswerFrame):
+            await self._assistant_says(frame.text)
+            return
+
+        if isinstance(frame, MetricsFrame):
+            self._record_model_metrics(frame)
+        elif self._answer_capture is not None:
+            self._capture_answer(frame, *self._answer_capture)
         await self.push_frame(frame, direction)
 
     # ------------------------------------------------------------------
@@ -160,6 +349,8 @@ class BookReadingStateManager(FrameProcessor):
         logger.info(f"{self._state.value} -> READING at chunk {self._library.current_chunk_index}")
         self._state = State.READING
         self._interrupted = False
+        self._queued_chunks.clear()
+        self._reading_run += 1
         await self._replace_system_prompt(READING_SYSTEM)
         await self._push_current_chunk()
 
@@ -167,25 +358,30 @@ class BookReadingStateManager(FrameProcessor):
         await self._stop_idle_timer()
         logger.info(f"{self._state.value} -> shutdown (reason={frame.reason})")
         self._shutdown_pending = True
+        if frame.farewell:
+            # Disconnects once the farewell has been spoken (BotStoppedSpeaking)
+            await self._assistant_says(frame.farewell)
 
     async def _handle_user_interrupt(
         self, frame: UserStartedSpeakingFrame, direction: FrameDirection
     ) -> None:
+        self._answer_capture = None  # an interrupted answer is not worth keeping
         if self._state == State.READING:
             logger.info("User interrupted during reading -> QA")
             self._state = State.QA
             self._reading_tts_active = False
             self._interrupted = True
-
-            book = self._library.book
-            chunk = self._library.current_chunk()
-            if book and chunk:
-                prompt = QA_SYSTEM.format(
-                    title=book.title,
-                    full_book_text=self._library.full_text(),
-                    current_chunk_preview=chunk.text[:200],
-                    chapter_map=self._format_chapter_map(),
-                )
+            # The interruption drops the passages queued behind the one being heard;
+            # progress stays on that one
+            self._queued_chunks.clear()
+
+            # The question isn't transcribed yet: start from where the child is;
+            # question_prompt() adds the passages that match once it is
+            prompt = self._take_ready_qa_prompt()
+            if prompt is None:
+                await self._cancel_qa_precompute()
+                prompt = await self._qa_prompt()
+            if prompt:
                 await self._replace_system_prompt(prompt)
 
         elif self._state == State.FINISHED:
@@ -209,15 +405,47 @@ class BookReadingStateManager(FrameProcessor):
             self._interrupted = False
             return
 
-        if self._state == State.READING and self._reading_tts_active:
+        if self._state == State.READING and self._reading_tts_active and not self._read_ahead:
             self._reading_tts_active = False
-            chunk = self._library.advance_chunk()
+            chunk = await self._library.advance_chunk()
             if chunk:
                 await self._push_current_chunk()
             else:
                 logger.info("End of book reached -> FINISHED")
                 await self._enter_finished()
 
+    async def _handle_chunk_played(self, frame: ChunkPlayedFrame) -> None:
+        """The passage playing has been heard: move on to the one already queued behind it."""
+        if (
+            self._state != State.READING
+            or frame.reading_run != self._reading_run
+            or not self._queued_chunks
+            or self._queued_chunks[0] != frame.chunk_index
+        ):
+            return
+        self._queued_chunks.popleft()
+        chunk = await self._library.advance_chunk()
+        if not chunk:
+            logger.info("End of book reached -> FINISHED")
+            self._reading_tts_active = False
+            await self._enter_finished()
+            return
+        if not self._queued_chunks:
+            # It wasn't loaded in time to be queued: this is a gap the child hears
+            logger.info(f"Read-ahead missed chunk {chunk.chunk_index}")
+            await self._speak_chunk(chunk)
+        await self._precompute_qa_prompt()
+        await self._fill_read_ahead()
+
+    async def _fill_read_ahead(self) -> None:
+        """Hand TTS the passages after the one playing, up to the read-ahead depth."""
+        run = self._reading_run
+        while self._queued_chunks and len(self._queued_chunks) <= self._read_ahead:
+            chunk = await self._library.chunk_at(self._queued_chunks[-1] + 1)
+            if chunk is None or self._state != State.READING or run != self._reading_run:
+                return
+            await self._speak_chunk(chunk)
+
     # ------------------------------------------------------------------
     # FINISHED state
     # ------------------------------------------------------------------
@@ -225,15 +453,21 @@ class BookReadingStateManager(FrameProcessor):
     async def _enter_finished(self) -> None:
         self._state = State.FINISHED
         book = self._library.book
-        books = self._library.list_books()
+        books = await self._library.list_books()
 
         if len(books) > 1:
             other_books = [b for b in books if not book or b.id != book.id]
             hints = []
-            for i, b in enumerate(other_books, len(self._book_index_map)):
+            shortlist = other_books[:BOOK_SHORTLIST_SIZE]
+            for i, b in enumerate(shortlist, len(self._book_index_map)):
                 idx = str(i)
                 self._book_index_map[idx] = b.id
                 hints.append(f'{idx}. "{b.title}"')
+            if len(other_books) > len(shortlist):
+                hints.append(
+                    f"...or any of {len(other_books) - len(shortlist)} more: "
+                    "call select_book with the title the child says."
+                )
             another_book_hint = (
                 "If they want a different book, call select_book(index) with one of:\n"
                 + "\n".join(hints)
@@ -252,13 +486,15 @@ class BookReadingStateManager(FrameProcessor):
                     book_index = idx
                     break
 
-        prompt = FINISHED_SYSTEM.format(
-            title=book.title if book else "the book",
-            full_book_text=self._library.full_text(),
-            book_index=book_index,
-            another_book_hint=another_book_hint,
+        self._finished_prefix = await self._prompt_prefix(State.FINISHED)
+        self._finished_fields = {
+            "book_index": book_index,
+            "another_book_hint": another_book_hint,
+        }
+        await self._replace_system_prompt(
+            self._finished_prefix
+            + FINISHED_SYSTEM_CONTEXT.format(passages="", **self._finished_fields)
         )
-        await self._replace_system_prompt(prompt)
 
         await self.push_frame(
             LLMMessagesAppendFrame(
@@ -310,9 +546,7 @@ class BookReadingStateManager(FrameProcessor):
                 logger.info(
                     f"Idle timeout ({IDLE_TIMEOUT_SECS}s) in FINISHED — initiating shutdown"
                 )
-                await self._assistant_says(
-                    "It was lovely reading with you! Bye for now, see you next time!"
-                )
+                await self._assistant_says(FAREWELL)
                 self._shutdown_pending = True
             return
 
@@ -323,39 +557,250 @@ class BookReadingStateManager(FrameProcessor):
 
     async def cleanup(self) -> None:
         await self._stop_idle_timer()
+        await self._cancel_qa_precompute()
         await super().cleanup()
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
-    def _format_chapter_map(self) -> str:
-        chapter_map = self._library.chapter_map
-        if not chapter_map:
+    async def _qa_prompt(self, question: str | None = None) -> str | None:
+        """QA prompt: the ingestion summary of earlier chapters, the current chapter
+        windowed back from the current passage to the prompt token budget, plus the
+        earlier passages that best match ``question``. Nothing past the current
+        passage is included."""
+        book = self._library.book
+        chunk = await self._library.current_chunk()
+        if not book or not chunk:
+            return None
+        index = chunk.chunk_index
+        summary, since = self._library.story_before(index)
+        story_summary = (
+            f"\n\nThe story before this chapter, in short:\n{summary}" if summary else ""
+        )
+        budget = self._prompt_token_budget - estimate_tokens(story_summary)
+        matches: list[BookChunk] = []
+        if question:
+            # Matches get at most half the budget; the window takes the rest
+            found = await self._library.relevant_chunks(
+                question, QA_TOP_PASSAGES, up_to=index, exclude=frozenset({index - 1, index})
+            )
+            matches = self._fit(found, budget // 2)
+            budget -= sum(c.token_count for c in matches)
+        window = self._library.story_so_far(index, budget, since=since) or [chunk]
+        chunks = [c for c in matches if c.chunk_index < window[0].chunk_index] + window
+        return await self._prompt_prefix(State.QA) + QA_SYSTEM_CONTEXT.format(
+            story_summary=story_summary,
+            passages=self._format_passages(chunks, current=index),
+            chapter_context=self._format_chapter_context(),
+        )
+
+    def _answer_key(self, question: str) -> AnswerKey | None:
+        """Where the answer to ``question`` is cached; None outside QA or if it isn't cacheable."""
+        book = self._library.book
+        normalized = question_key(question)
+        if self._state != State.QA or book is None or normalized is None:
+            return None
+        chapter = self._library.current_chapter()
+        bucket = chapter.start if chapter else 0
+        return AnswerKey(book.id, book.chunks_version, bucket, normalized)
+
+    def _capture_answer(
+        self, frame: Frame, key: AnswerKey, position: int, parts: list[str]
+    ) -> None:
+        """Collect the LLM's answer to the pending question; cache it when it completes."""
+        if isinstance(frame, LLMTextFrame):
+            parts.append(frame.text)
+        elif isinstance(frame, FunctionCallsStartedFrame):
+            self._answer_capture = None  # acted on the turn rather than answering it
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self._answer_capture = None
+            answer = "".join(parts).strip()
+            if answer and self._state == State.QA:
+                self._answer_cache.put(key, answer, position)
+
+    async def _prompt_prefix(self, state: State) -> str:
+        """The static, book-dependent head of the ``state`` prompt, rendered once per book."""
+        book = self._library.book
+        if book is None:  # only FINISHED can be entered without a loaded book
+            return FINISHED_SYSTEM_PREFIX.format(title="the book", book_outline="")
+        key = (book.id, book.chunks_version, state)
+        prefix = _prompt_prefix_cache.get(key)
+        if prefix is not None:
+            _prompt_prefix_cache.move_to_end(key)
+            return prefix
+        if state == State.FINISHED:
+            budget = self._prompt_token_budget
+            prefix = FINISHED_SYSTEM_PREFIX.format(
+                title=book.title,
+                book_outline=self._library.book_summary(budget)
+                or await self._library.outline(budget),
+            )
+        else:
+            prefix = QA_SYSTEM_PREFIX.format(title=book.title)
+        _prompt_prefix_cache[key] = prefix
+        while len(_prompt_prefix_cache) > PROMPT_PREFIX_CACHE_SIZE:
+            _prompt_prefix_cache.popitem(last=False)
+        return prefix
+
+    # ------------------------------------------------------------------
+    # QA prompt precompute (rendered while a passage is read aloud)
+    # ------------------------------------------------------------------
+
+    async def _precompute_qa_prompt(self) -> None:
+        """Render the QA prompt for the current passage in the background."""
+        await self._cancel_qa_precompute()
+        self._qa_ready = None
+        render = self._render_qa_prompt()
+        try:
+            self._qa_task = self.create_task(render, name="qa_precompute")
+        except Exception:
+            # Fallback when TaskManager isn't initialized (e.g. unit tests)
+            self._qa_task = asyncio.create_task(render)
+
+    async def _render_qa_prompt(self) -> None:
+        book = self._library.book
+        index = self._library.current_chunk_index
+        prompt = await self._qa_prompt()
+        if prompt and book is not None:
+            self._qa_ready = (book.id, index, prompt)
+        if book is not None:
+            # The first question then finds the book's cached answers in memory
+            await self._answer_cache.load_book(book.id, book.chunks_version)
+
+    def _take_ready_qa_prompt(self) -> str | None:
+        """The precomputed QA prompt, if it is for where the child is now."""
+        ready, self._qa_ready = self._qa_ready, None
+        book = self._library.book
+        if ready is None or book is None:
+            return None
+        book_id, index, prompt = ready
+        if book_id != book.id or index != self._library.current_chunk_index:
+            return None
+        return prompt
+
+    async def _cancel_qa_precompute(self) -> None:
+        if not self._qa_task:
+            return
+        if not self._qa_task.done():
+            try:
+                await self.cancel_task(self._qa_task)
+            except Exception:
+                self._qa_task.cancel()
+        self._qa_task = None
+
+    @staticmethod
+    def _fit(chunks: list[BookChunk], budget_tokens: int) -> list[BookChunk]:
+        """The chunks, in order, that fit ``budget_tokens`` together."""
+        fitted, spent = [], 0
+        for chunk in chunks:
+            if spent + chunk.token_count <= budget_tokens:
+                fitted.append(chunk)
+                spent += chunk.token_count
+        return fitted
+
+    @staticmethod
+    def _format_passages(chunks: list, current: int | None = None) -> str:
+        """Passages in book order under their chapter headings; gaps marked with "..."."""
+        parts: list[str] = []
+        chapter = None
+        previous = None
+        for chunk in chunks:
+            if chunk.chapter_title != chapter:
+                chapter = chunk.chapter_title
+                parts.append(f"[{chapter}]")
+            elif previous is not None and chunk.chunk_index != previous + 1:
+                parts.append("...")
+            label = (
+                " (the passage the child was listening to)" if chunk.chunk_index == current else ""
+            )
+            parts.append(f"{chunk.text}{label}")
+            previous = chunk.chunk_index
+        return "\n\n".join(parts)
+
+    def _format_chapter_context(self) -> str:
+        chapter = self._library.current_chapter()
+        if chapter is None or not chapter.title:
             return ""
-        lines = [f'- "{title}" -> chunk_id={idx}' for title, idx in chapter_map.items()]
-        return "\nChapter map:\n" + "\n".join(lines)
+        total = len(self._library.chapters)
+        return f'\nThe child is in chapter {chapter.number} of {total}: "{chapter.title}".'
 
-    async def _replace_system_prompt(self, prompt: str) -> None:
+    def _record_prompt_tokens(self, prompt: str) -> None:
+        tokens = estimate_tokens(prompt)
+        stats = self._prompt_tokens.setdefault(
+            self._state.value, {"prompts": 0, "total": 0, "max": 0}
+        )
+        stats["prompts"] += 1
+        stats["total"] += tokens
+        stats["max"] = max(stats["max"], tokens)
+        logger.info(f"System prompt ({self._state.value}): ~{tokens} tokens")
+
+    def _record_model_metrics(self, frame: MetricsFrame) -> None:
+        for data in frame.data:
+            if data.model not in self._models.values():
+                continue  # STT / TTS metrics, or an LLM model this session never routes to
+            stats = self._model_stats.setdefault(
+                data.model,
+                {
+                    "ttfb_samples": 0,
+                    "ttfb_ms_total": 0.0,
+                    "ttfb_ms_max": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_prompt_tokens": 0,
+                },
+            )
+            if isinstance(data, TTFBMetricsData):
+                ms = data.value * 1000
+                stats["ttfb_samples"] += 1
+                stats["ttfb_ms_total"] += ms
+                stats["ttfb_ms_max"] = max(stats["ttfb_ms_max"], ms)
+                logger.debug(f"LLM TTFB ({data.model}): {ms:.0f}ms")
+            elif isinstance(data, LLMUsageMetricsData):
+                stats["prompt_tokens"] += data.value.prompt_tokens
+                stats["completion_tokens"] += data.value.completion_tokens
+                stats["cached_prompt_tokens"] += data.value.cache_read_input_tokens or 0
+
+    def _settings_delta(self, prompt: str):
+        """LLM settings for the current state: its system prompt, plus its model on a switch."""
+        fields = {"system_instruction": prompt}
+        model = self._models[self._state]
+        if model != self._model:
+            logger.info(f"LLM model for {self._state.value}: {self._model} -> {model}")
+            fields["model"] = self._model = model
         # `Settings` lives on concrete LLMService subclasses (e.g. OpenAILLMService),
         # not on the base class — so the attribute is duck-typed here.
+        return self._llm.Settings(**fields)  # ty: ignore[unresolved-attribute]
+
+    async def _replace_system_prompt(self, prompt: str) -> None:
+        self._record_prompt_tokens(prompt)
         await self.push_frame(
-            LLMUpdateSettingsFrame(
-                delta=self._llm.Settings(system_instruction=prompt),  # ty: ignore[unresolved-attribute]
-            ),
+            LLMUpdateSettingsFrame(delta=self._settings_delta(prompt)),
             FrameDirection.UPSTREAM,
         )
 
     async def _push_current_chunk(self) -> None:
-        chunk = self._library.current_chunk()
+        chunk = await self._library.current_chunk()
         if not chunk:
             logger.info("No chunk available -> FINISHED")
             await self._enter_finished()
             return
 
-        logger.info(f"Reading chunk {chunk.chunk_index}: {chunk.text[:60]}...")
         self._reading_tts_active = True
+        await self._speak_chunk(chunk)
+        await self._precompute_qa_prompt()
+        await self._fill_read_ahead()
+
+    async def _speak_chunk(self, chunk: BookChunk) -> None:
+        logger.info(f"Reading chunk {chunk.chunk_index}: {chunk.text[:60]}...")
+        self._read_aloud[passage_key(chunk.text)] = chunk
         await self._assistant_says(chunk.text)
+        if self._read_ahead:
+            self._queued_chunks.append(chunk.chunk_index)
+            await self.push_frame(
+                ChunkPlayedFrame(chunk_index=chunk.chunk_index, reading_run=self._reading_run),
+                FrameDirection.DOWNSTREAM,
+            )
 
     async def _assistant_says(self, text: str) -> None:
         """Send text via TTS, wrapped so it gets recorded in conversation context."""
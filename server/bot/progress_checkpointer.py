@@ -0,0 +1,63 @@
+"""ProgressCheckpointer — process-wide write-behind queue for reading progress.
+
+Library records the kid's position every time it advances a chunk. Records are
+coalesced per ``(book_id, kid_id)`` — only the latest position survives — and
+written as one bulk upsert when the flush timer fires, or when a session ends.
+A crashed container loses at most one flush interval of progress instead of the
+whole session, without one write per chunk read.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from shared.config import settings
+
+try:
+    from .supabase_client import save_reading_progress_batch
+    from .write_behind import WriteBehindQueue, WriteBehindStats
+except ImportError:
+    from supabase_client import save_reading_progress_batch  # type: ignore[assignment]
+    from write_behind import WriteBehindQueue, WriteBehindStats  # type: ignore[assignment]
+
+
+@dataclass
+class ProgressCheckpointerStats(WriteBehindStats):
+    coalesced: int = 0
+
+
+class ProgressCheckpointer(WriteBehindQueue[tuple[str, str], int]):
+    """Coalesces progress updates and flushes them in bulk on a timer."""
+
+    rows_name = "reading progress rows"
+
+    def __init__(self, flush_interval_secs: float):
+        super().__init__(flush_interval_secs, ProgressCheckpointerStats())
+
+    def record(self, book_id: str, kid_id: str, chunk_index: int) -> None:
+        """Queue the kid's latest position; never waits on the network."""
+        key = (book_id, kid_id)
+        if key in self._pending:
+            self._stats.coalesced += 1
+        self._pending[key] = chunk_index
+        self._recorded()
+
+    def _rows(self, batch: dict[tuple[str, str], int]) -> list[dict]:
+        return [
+            {"book_id": book_id, "kid_id": kid_id, "current_chunk_index": chunk_index}
+            for (book_id, kid_id), chunk_index in batch.items()
+        ]
+
+    async def _save(self, rows: list[dict]) -> None:
+        await save_reading_progress_batch(rows)
+
+    def _requeue(self, batch: dict[tuple[str, str], int]) -> None:
+        # Put the batch back for the next flush, unless a newer position arrived
+        for key, chunk_index in batch.items():
+            self._pending.setdefault(key, chunk_index)
+
+
+@lru_cache(maxsize=1)
+def get_progress_checkpointer() -> ProgressCheckpointer:
+    return ProgressCheckpointer(flush_interval_secs=settings.bot.progress_flush_interval_secs)
@@ -0,0 +1,88 @@
+"""SessionTimer — wall-clock milestones of one bot session, from bot() to the story.
+
+bot() marks when the transport and services are ready and when the preloaded
+book lands; selecting a book records how long it had to wait for it.
+FirstSpeechObserver marks the first BotStartedSpeakingFrame and the first one
+that carries story audio, and logs the summary, including how much of the book
+fetch was hidden behind setup.
+"""
+
+from __future__ import annotations
+
+import time
+
+from loguru import logger
+from pipecat.frames.frames import BotStartedSpeakingFrame, TTSSpeakFrame
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.processors.frame_processor import FrameProcessor
+
+
+class SessionTimer:
+    """Named milestones in milliseconds since the timer was created."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._marks: dict[str, float] = {}
+        self._durations: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """Record the first time ``name`` happens; later marks are ignored."""
+        self._marks.setdefault(name, (time.perf_counter() - self._start) * 1000)
+
+    def add_duration(self, name: str, ms: float) -> None:
+        """Record how long the first occurrence of ``name`` took; later ones are ignored."""
+        self._durations.setdefault(name, ms)
+
+    def get(self, name: str) -> float | None:
+        return self._marks.get(name, self._durations.get(name))
+
+    def preload_saved_ms(self) -> float | None:
+        """Book fetch time that overlapped setup instead of delaying select_book."""
+        fetch_ms = self._marks.get("book_ready")
+        if fetch_ms is None:
+            return None
+        return max(0.0, fetch_ms - self._durations.get("select_book_wait", 0.0))
+
+    def summary(self) -> str:
+        parts = [
+            f"{name}={ms:.0f}ms" for name, ms in sorted(self._marks.items(), key=lambda m: m[1])
+        ]
+        parts += [f"{name}={ms:.0f}ms" for name, ms in self._durations.items()]
+        saved = self.preload_saved_ms()
+        if saved is not None:
+            parts.append(f"preload_saved={saved:.0f}ms")
+        return " ".join(parts)
+
+
+class FirstSpeechObserver(BaseObserver):
+    """Marks ``first_speech`` on the session's first BotStartedSpeakingFrame, and
+    ``first_story_audio`` on the first one after ``story_source`` queues text to speak.
+
+    Logs the timings at each of the two milestones.
+    """
+
+    def __init__(self, timer: SessionTimer, story_source: FrameProcessor | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._timer = timer
+        self._story_source = story_source
+        self._seen = False
+        self._story_queued = False
+        self._story_heard = False
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+        if isinstance(frame, TTSSpeakFrame):
+            if self._story_source is not None and data.source is self._story_source:
+                self._story_queued = True
+                self._timer.mark("story_queued")
+            return
+        if not isinstance(frame, BotStartedSpeakingFrame):
+            return
+        if not self._seen:
+            self._seen = True
+            self._timer.mark("first_speech")
+            logger.info(f"Session bootstrap timings: {self._timer.summary()}")
+        if self._story_queued and not self._story_heard:
+            self._story_heard = True
+            self._timer.mark("first_story_audio")
+            logger.info(f"Time to first story audio: {self._timer.summary()}")
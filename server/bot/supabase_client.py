@@ -1,43 +1,144 @@
-"""Supabase data access for the reading bot."""
+"""Supabase data access for the reading bot.
+
+Every function is a coroutine on the shared async client, so database round
+trips never stall the event loop that moves audio frames.
+"""
 
 from __future__ import annotations
 
+import asyncio
+
 from loguru import logger
+from postgrest import CountMethod
+
+from shared.config import settings
+from shared.supabase import get_async_client
+
+CHUNK_COLUMNS = "chunk_index, chunk_kind, chapter_title, chunk_hint, text, token_count"
 
-from shared.supabase import get_client
+# Rows per ranged chunk request — well under PostgREST's default max-rows (1000).
+CHUNK_PAGE_SIZE = 200
+
+
+async def get_kid_household_id(kid_id: str) -> str | None:
+    """Return the household_id a kid belongs to, or None if the kid doesn't exist."""
+    resp = await get_async_client().table("kids").select("household_id").eq("id", kid_id).execute()
+    if not resp.data:
+        return None
+    return resp.data[0]["household_id"]
 
 
-def list_books() -> list[dict]:
-    """Return all books where status='ready'."""
-    resp = get_client().table("books").select("id, title, status").eq("status", "ready").execute()
+async def list_books(household_id: str) -> list[dict]:
+    """Return the household's books where status='ready'."""
+    resp = await (
+        get_async_client()
+        .table("books")
+        .select("id, title, status")
+        .eq("household_id", household_id)
+        .eq("status", "ready")
+        .execute()
+    )
     return resp.data or []
 
 
-def get_book_metadata(book_id: str) -> dict | None:
-    """Return {id, title, status} or None."""
-    resp = get_client().table("books").select("id, title, status").eq("id", book_id).execute()
+async def get_book_metadata(book_id: str) -> dict | None:
+    """Return {id, title, status, chunks_version, storage_path} or None."""
+    resp = (
+        await get_async_client()
+        .table("books")
+        .select("id, title, status, chunks_version, storage_path")
+        .eq("id", book_id)
+        .execute()
+    )
     if not resp.data:
         return None
     return resp.data[0]
 
 
-def get_book_chunks(book_id: str) -> list[dict]:
-    """Fetch all chunks ordered by chunk_index."""
+async def get_book_chunk_count(book_id: str) -> int:
+    """Return the number of chunks a book has (HEAD request, no rows transferred)."""
     resp = (
-        get_client()
+        await get_async_client()
         .table("book_chunks")
-        .select("chunk_index, chunk_kind, chapter_title, chunk_hint, text")
+        .select("chunk_index", count=CountMethod.exact, head=True)
         .eq("book_id", book_id)
+        .execute()
+    )
+    return resp.count or 0
+
+
+async def get_book_chunk_range(book_id: str, start: int, end: int) -> list[dict]:
+    """Fetch chunks with start <= chunk_index < end, ordered by chunk_index.
+
+    Keep ``end - start`` at or below CHUNK_PAGE_SIZE: PostgREST silently
+    truncates responses at its max-rows limit.
+    """
+    resp = (
+        await get_async_client()
+        .table("book_chunks")
+        .select(CHUNK_COLUMNS)
+        .eq("book_id", book_id)
+        .gte("chunk_index", start)
+        .lt("chunk_index", end)
         .order("chunk_index")
         .execute()
     )
     return resp.data or []
 
 
-def get_reading_progress(book_id: str, kid_id: str) -> int:
-    """Return current_chunk_index, default 0."""
+async def get_book_chunks(book_id: str) -> list[dict]:
+    """Fetch all chunks ordered by chunk_index, as concurrent ranged pages."""
+    total = await get_book_chunk_count(book_id)
+    pages = await asyncio.gather(
+        *(
+            get_book_chunk_range(book_id, start, min(start + CHUNK_PAGE_SIZE, total))
+            for start in range(0, total, CHUNK_PAGE_SIZE)
+        )
+    )
+    return [row for page in pages for row in page]
+
+
+async def get_chapter_summaries(book_id: str) -> list[dict]:
+    """Fetch the book's chapter summaries ordered by chapter_index (empty if it has none)."""
     resp = (
-        get_client()
+        await get_async_client()
+        .table("book_chapter_summaries")
+        .select("chapter_index, chapter_title, first_chunk_index, summary, story_so_far")
+        .eq("book_id", book_id)
+        .order("chapter_index")
+        .execute()
+    )
+    return resp.data or []
+
+
+async def download_book_bundle(path: str) -> bytes:
+    """Download a compiled book bundle from the books bucket in one GET."""
+    return await get_async_client().storage.from_(settings.supabase.books_bucket).download(path)
+
+
+async def download_tts_audio(path: str) -> bytes:
+    """Download cached TTS audio from the TTS cache bucket."""
+    bucket = settings.supabase.tts_cache_bucket
+    return await get_async_client().storage.from_(bucket).download(path)
+
+
+async def upload_tts_audio(path: str, audio: bytes) -> None:
+    """Upload TTS audio to the TTS cache bucket, replacing any object at ``path``."""
+    await (
+        get_async_client()
+        .storage.from_(settings.supabase.tts_cache_bucket)
+        .upload(
+            path=path,
+            file=audio,
+            file_options={"content-type": "application/octet-stream", "upsert": "true"},
+        )
+    )
+
+
+async def get_reading_progress(book_id: str, kid_id: str) -> int:
+    """Return current_chunk_index, default 0."""
+    resp = await (
+        get_async_client()
         .table("reading_progress")
         .select("current_chunk_index")
         .eq("book_id", book_id)
@@ -49,42 +150,54 @@ def get_reading_progress(book_id: str, kid_id: str) -> int:
     return resp.data[0]["current_chunk_index"]
 
 
-def get_kid_progress(kid_id: str) -> list[dict]:
-    """Return all reading progress rows for a kid: [{book_id, current_chunk_index}, ...]."""
-    resp = (
-        get_client()
+async def list_books_with_progress(kid_id: str) -> list[dict]:
+    """Return the kid's household's ready books with progress and resume chunk, in one call.
+
+    Rows: {id, household_id, title, status, created_at, current_chunk_index,
+    progress_updated_at, chapter_title, chunk_text}. progress_updated_at,
+    chapter_title and chunk_text are null for books the kid hasn't started.
+    """
+    resp = await get_async_client().rpc("get_books_with_progress", {"p_kid_id": kid_id}).execute()
+    return resp.data or []
+
+
+async def save_reading_progress(book_id: str, kid_id: str, chunk_index: int) -> None:
+    """Upsert reading_progress row."""
+    await (
+        get_async_client()
         .table("reading_progress")
-        .select("book_id, current_chunk_index")
-        .eq("kid_id", kid_id)
+        .upsert(
+            {
+                "book_id": book_id,
+                "kid_id": kid_id,
+                "current_chunk_index": chunk_index,
+                "updated_at": "now()",
+            },
+            on_conflict="book_id,kid_id",
+        )
         .execute()
     )
-    return resp.data or []
+    logger.info(f"Saved progress: book={book_id} session={kid_id} chunk={chunk_index}")
 
 
-def get_chunk_at(book_id: str, chunk_index: int) -> dict | None:
-    """Fetch a single chunk from book_chunks by book_id and chunk_index."""
-    resp = (
-        get_client()
-        .table("book_chunks")
-        .select("chapter_title, chunk_hint, text")
-        .eq("book_id", book_id)
-        .eq("chunk_index", chunk_index)
+async def save_reading_progress_batch(rows: list[dict]) -> None:
+    """Upsert many reading_progress rows ({book_id, kid_id, current_chunk_index}) at once."""
+    if not rows:
+        return
+    await (
+        get_async_client()
+        .table("reading_progress")
+        .upsert(
+            [{**row, "updated_at": "now()"} for row in rows],
+            on_conflict="book_id,kid_id",
+        )
         .execute()
     )
-    if not resp.data:
-        return None
-    return resp.data[0]
 
 
-def save_reading_progress(book_id: str, kid_id: str, chunk_index: int) -> None:
-    """Upsert reading_progress row."""
-    get_client().table("reading_progress").upsert(
-        {
-            "book_id": book_id,
-            "kid_id": kid_id,
-            "current_chunk_index": chunk_index,
-            "updated_at": "now()",
-        },
-        on_conflict="book_id,kid_id",
-    ).execute()
-    logger.info(f"Saved progress: book={book_id} session={kid_id} chunk={chunk_index}")
+async def save_session_usage_batch(rows: list[dict]) -> None:
+    """Insert session_usage rows (usage to add, keyed by session, kid, household, book,
+    state and model) in one request."""
+    if not rows:
+        return
+    await get_async_client().table("session_usage").insert(rows).execute()
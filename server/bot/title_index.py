@@ -0,0 +1,160 @@
+"""TitleIndex — fuzzy spoken-title search over one household's books.
+
+Lets select_book take whatever the child said ("the hungry catapiller one",
+"grufalo") instead of an index into a list the LLM has to carry around, so
+list_books only needs to show a short ranked shortlist.
+
+Titles are matched two ways and the better score wins: character trigrams of
+the whole normalized title (typos, run-together words, partial titles), and a
+per-word phonetic key (misheard or mispronounced words). An inverted index
+over both keeps a search to the titles that share at least one of them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+try:
+    from .chapter_index import normalize
+except ImportError:
+    from chapter_index import normalize  # type: ignore[assignment]
+
+# best() only commits to a title scoring at least this, and clearly ahead of the runner-up
+MIN_TITLE_SCORE = 0.5
+MIN_TITLE_MARGIN = 0.1
+# search() drops candidates below this — they're noise, not suggestions
+MIN_SUGGEST_SCORE = 0.25
+
+_STOP_WORDS = {"the", "a", "an", "and", "of", "book", "story", "one", "about", "with", "that"}
+_DIGRAPHS = (
+    ("ph", "f"),
+    ("th", "f"),
+    ("ck", "k"),
+    ("gh", "g"),
+    ("kn", "n"),
+    ("wr", "r"),
+    ("sh", "s"),
+)
+_VOWELS = set("aeiouy")
+_SOUND_CLASSES = {
+    **dict.fromkeys("bp", "p"),
+    **dict.fromkeys("fv", "f"),
+    **dict.fromkeys("cgkqx", "k"),
+    **dict.fromkeys("sz", "s"),
+    **dict.fromkeys("dt", "t"),
+    **dict.fromkeys("mn", "n"),
+    "l": "l",
+    "r": "r",
+    "j": "k",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TitleMatch:
+    book_id: str
+    title: str
+    score: float
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _sound_key(word: str) -> str:
+    """Phonetic skeleton of a word: "caterpillar" and "catapiller" both give "ktpl".
+
+    Sound-alike consonants share a class, vowels vanish after the first letter,
+    and an "r" is dropped unless a vowel follows it, as most children say it.
+    A plural "s" is ignored.
+    """
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for digraph, sound in _DIGRAPHS:
+        word = word.replace(digraph, sound)
+    key: list[str] = [_SOUND_CLASSES.get(word[0], "a" if word[0] in _VOWELS else word[0])]
+    for i in range(1, len(word)):
+        ch = word[i]
+        sound = ch if ch.isdigit() else _SOUND_CLASSES.get(ch, "")
+        if sound == "r" and word[i + 1 : i + 2] not in _VOWELS:
+            continue
+        if sound and key[-1] != sound:
+            key.append(sound)
+    return "".join(key)
+
+
+def _content_words(norm: str) -> list[str]:
+    words = [w for w in norm.split() if w not in _STOP_WORDS and len(w) > 2]
+    return words or norm.split()
+
+
+class TitleIndex:
+    """Spoken-title lookup for a fixed list of (book_id, title) pairs."""
+
+    __slots__ = ("_key", "_ids", "_titles", "_norms", "_grams", "_sounds", "_postings")
+
+    def __init__(self, books: Iterable[tuple[str, str]]):
+        self._key = tuple(books)
+        self._ids = [book_id for book_id, _ in self._key]
+        self._titles = [title for _, title in self._key]
+        self._norms = [normalize(title) for title in self._titles]
+        self._grams = [_trigrams(norm) for norm in self._norms]
+        self._sounds = [frozenset(map(_sound_key, _content_words(n))) for n in self._norms]
+        self._postings: dict[str, list[int]] = {}
+        for i in range(len(self._key)):
+            for term in self._grams[i] | {f"#{s}" for s in self._sounds[i]}:
+                self._postings.setdefault(term, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self._key)
+
+    def __contains__(self, book_id: object) -> bool:
+        return book_id in self._ids
+
+    def by_id(self, book_id: str) -> TitleMatch | None:
+        """An exact match for a raw book id, so ids pass through title lookup untouched."""
+        if book_id not in self._ids:
+            return None
+        return TitleMatch(book_id, self._titles[self._ids.index(book_id)], 1.0)
+
+    def built_from(self, books: Iterable[tuple[str, str]]) -> bool:
+        """Whether this index was built from exactly these (book_id, title) pairs."""
+        return self._key == tuple(books)
+
+    def search(self, spoken: str, limit: int = 3) -> list[TitleMatch]:
+        """The ``limit`` titles closest to what the child said, best first."""
+        norm = normalize(spoken)
+        if not norm:
+            return []
+        grams = _trigrams(norm)
+        words = [_sound_key(w) for w in _content_words(norm)]
+        candidates: set[int] = set()
+        for term in grams | {f"#{s}" for s in words}:
+            candidates.update(self._postings.get(term, ()))
+
+        matches = []
+        for i in candidates:
+            score = self._score(i, norm, grams, words)
+            if score >= MIN_SUGGEST_SCORE:
+                matches.append(TitleMatch(self._ids[i], self._titles[i], round(score, 3)))
+        matches.sort(key=lambda m: -m.score)
+        return matches[:limit]
+
+    def best(self, spoken: str) -> TitleMatch | None:
+        """The title the child meant, or None if nothing matches clearly enough."""
+        top = self.search(spoken, limit=2)
+        if not top or top[0].score < MIN_TITLE_SCORE:
+            return None
+        if len(top) > 1 and top[0].score < 1.0 and top[0].score - top[1].score < MIN_TITLE_MARGIN:
+            return None
+        return top[0]
+
+    def _score(self, i: int, norm: str, grams: frozenset[str], words: list[str]) -> float:
+        if norm == self._norms[i]:
+            return 1.0
+        title_grams = self._grams[i]
+        dice = 2 * len(grams & title_grams) / (len(grams) + len(title_grams))
+        # Share of the child's words that sound like a word of the title
+        coverage = sum(w in self._sounds[i] for w in words) / len(words)
+        return max(dice, 0.8 * coverage + 0.2 * dice)
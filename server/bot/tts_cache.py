@@ -0,0 +1,320 @@
+"""TTSAudioCache — synthesized speech shared by every session, keyed by what was said.
+
+Every child who hears a passage of a popular book has it synthesized again, and
+so does every fixed line (the farewell, a cached QA answer). Speech depends
+only on the voice, the model, the language, the sample rate and the text, so
+the PCM the TTS service produced is stored under the SHA-256 of those
+(``tts_cache_key``) and played back from there the next time.
+
+Tier 1 is one raw PCM file per key under a shared directory, trimmed back to a
+size cap oldest-read first. Tier 2, when a bucket is configured, is the same
+file in Supabase Storage, so a cold container starts with what every other
+container has already synthesized. Writes to both happen in the background,
+after the audio has been handed on.
+
+``AudioCacheTTSMixin`` puts the cache in front of any pipecat TTSService: the
+text of each TTSSpeakFrame is looked up, a hit is streamed out as
+TTSAudioRawFrames without calling the provider, and a miss is synthesized live
+and stored once the provider says it is done. LLM-streamed speech is never
+cached. ``CachedCartesiaTTSService`` is the Cartesia service with the cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import AsyncGenerator
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from loguru import logger
+from pipecat.frames.frames import (
+    ErrorFrame,
+    Frame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStoppedFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.cartesia.tts import CartesiaTTSService
+from pipecat.services.tts_service import TTSService
+
+from shared.config import settings
+
+try:
+    from .supabase_client import download_tts_audio, upload_tts_audio
+except ImportError:
+    from supabase_client import download_tts_audio, upload_tts_audio  # type: ignore[assignment]
+
+
+def tts_cache_key(voice: str, model: str, language: str, sample_rate: int, text: str) -> str:
+    """The key speech of ``text`` is cached under: a hex SHA-256 of everything it depends on."""
+    payload = json.dumps([voice, model, language, sample_rate, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class TTSAudioCacheStats:
+    disk_hits: int = 0
+    bucket_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    seconds_served: float = 0.0  # audio played from the cache instead of synthesized
+
+
+class TTSAudioCache:
+    """PCM audio keyed by tts_cache_key(): files under ``cache_dir`` over an optional bucket."""
+
+    def __init__(
+        self,
+        cache_dir: Path | None,
+        max_disk_bytes: int,
+        bucket: bool = False,
+    ):
+        self._cache_dir = cache_dir
+        self._max_disk_bytes = max_disk_bytes
+        self._bucket = bucket
+        self._stats = TTSAudioCacheStats()
+        # Background writes, kept referenced until they finish
+        self._writes: set[asyncio.Task] = set()
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def stats(self) -> dict[str, int | float]:
+        return asdict(self._stats)
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from either tier (0.0 before the first lookup)."""
+        hits = self._stats.disk_hits + self._stats.bucket_hits
+        lookups = hits + self._stats.misses
+        return hits / lookups if lookups else 0.0
+
+    async def get(self, key: str) -> bytes | None:
+        """The cached audio for ``key``, from disk or else the bucket; None on a miss."""
+        audio = await asyncio.to_thread(self._read_disk, key)
+        if audio is not None:
+            self._stats.disk_hits += 1
+            return audio
+
+        audio = await self._download(key)
+        if audio is not None:
+            self._stats.bucket_hits += 1
+            self._spawn(asyncio.to_thread(self._write_disk, key, audio))
+            return audio
+
+        self._stats.misses += 1
+        return None
+
+    def put(self, key: str, audio: bytes) -> None:
+        """Store ``audio`` in both tiers in the background; never waits on disk or network."""
+        if self._cache_dir is None and not self._bucket:
+            return
+        self._stats.stores += 1
+        self._spawn(self._store(key, audio))
+
+    def record_served(self, seconds: float) -> None:
+        self._stats.seconds_served += seconds
+
+    async def drain(self) -> None:
+        """Wait for the writes still in flight."""
+        while self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _store(self, key: str, audio: bytes) -> None:
+        await asyncio.to_thread(self._write_disk, key, audio)
+        await self._upload(key, audio)
+
+    # ------------------------------------------------------------------
+    # Tier 1 — shared on-disk store
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path | None:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f"{key}.pcm"
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # trimming drops the files read least recently
+            return audio
+        except OSError:
+            logger.exception(f"Discarding unreadable TTS cache file {path}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_name, path)
+        except OSError:
+            logger.exception(f"Failed to write TTS cache file {path}")
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        if self._cache_dir is None:
+            return
+        files = []
+        for entry in os.scandir(self._cache_dir):
+            if entry.name.endswith(".pcm"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # removed by another process
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self._max_disk_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+            self._stats.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Tier 2 — Supabase Storage bucket
+    # ------------------------------------------------------------------
+
+    async def _download(self, key: str) -> bytes | None:
+        if not self._bucket:
+            return None
+        try:
+            return await download_tts_audio(f"{key}.pcm")
+        except Exception as e:
+            # Not there yet is the common case; a real outage shows as a 0% bucket hit rate
+            logger.debug(f"TTS audio {key} not in the bucket: {e}")
+            return None
+
+    async def _upload(self, key: str, audio: bytes) -> None:
+        if not self._bucket:
+            return
+        try:
+            await upload_tts_audio(f"{key}.pcm", audio)
+        except Exception:
+            logger.exception(f"Failed to upload TTS audio {key}")
+
+
+@lru_cache(maxsize=1)
+def get_tts_audio_cache() -> TTSAudioCache:
+    cache_dir = settings.bot.tts_cache_dir
+    return TTSAudioCache(
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        max_disk_bytes=settings.bot.tts_cache_max_disk_mb * 1024 * 1024,
+        bucket=bool(settings.supabase.tts_cache_bucket),
+    )
+
+
+class AudioCacheTTSMixin(TTSService):
+    """Serves TTSSpeakFrame speech from a TTSAudioCache; list it before the TTS service class.
+
+    Relies on the TTSService audio-context API: a hit's frames are yielded from
+    run_tts like an HTTP service's, and a miss's audio is recorded as the
+    provider appends it to its context, until its TTSStoppedFrame.
+    """
+
+    def __init__(self, *args, audio_cache: TTSAudioCache | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._audio_cache = audio_cache or get_tts_audio_cache()
+        self._speaking_fixed_text = False  # a TTSSpeakFrame is being synthesized
+        # Live syntheses being recorded: context_id -> (cache key, PCM so far)
+        self._recording: dict[str, tuple[str, bytearray]] = {}
+        # Contexts played from the cache, which the provider never saw
+        self._served: set[str] = set()
+
+    def audio_cache_key(self, text: str) -> str:
+        voice, model, language = self._settings.voice, self._settings.model, self._settings.language
+        return tts_cache_key(str(voice), str(model), str(language), self.sample_rate, text)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if not isinstance(frame, TTSSpeakFrame):
+            await super().process_frame(frame, direction)
+            return
+        # Only fixed text is worth caching: LLM turns are never said twice
+        self._speaking_fixed_text = True
+        try:
+            await super().process_frame(frame, direction)
+        finally:
+            self._speaking_fixed_text = False
+
+    async def run_tts(self, text: str, context_id: str) -> AsyncGenerator[Frame | None, None]:
+        live = super().run_tts(text, context_id)
+        if not self._speaking_fixed_text:
+            async for frame in live:
+                yield frame
+            return
+
+        key = self.audio_cache_key(text)
+        audio = await self._audio_cache.get(key)
+        if audio is None:
+            self._recording[context_id] = (key, bytearray())
+            async for frame in live:
+                yield frame
+            return
+
+        await live.aclose()
+        self._served.add(context_id)
+        seconds = len(audio) / (self.sample_rate * 2)  # 16-bit mono
+        self._audio_cache.record_served(seconds)
+        logger.debug(f"{self}: {seconds:.1f}s of speech from the TTS cache [{text[:60]}]")
+        step = self.chunk_size
+        for start in range(0, len(audio), step):
+            yield TTSAudioRawFrame(
+                audio=audio[start : start + step],
+                sample_rate=self.sample_rate,
+                num_channels=1,
+                context_id=context_id,
+            )
+
+    async def append_to_audio_context(self, context_id: str, frame):
+        recording = self._recording.get(context_id)
+        if recording is not None:
+            if isinstance(frame, TTSAudioRawFrame):
+                recording[1].extend(frame.audio)
+            elif isinstance(frame, TTSStoppedFrame):
+                del self._recording[context_id]
+                key, audio = recording
+                if audio:
+                    self._audio_cache.put(key, bytes(audio))
+            elif isinstance(frame, ErrorFrame):
+                del self._recording[context_id]
+        await super().append_to_audio_context(context_id, frame)
+
+    async def flush_audio(self, context_id: str | None = None):
+        if context_id is not None and context_id in self._served:
+            return  # the provider has no such context to flush
+        await super().flush_audio(context_id)
+
+    async def on_audio_context_interrupted(self, context_id: str):
+        # Audio cut short is never stored
+        self._recording.pop(context_id, None)
+        self._served.discard(context_id)
+        await super().on_audio_context_interrupted(context_id)
+
+    async def on_audio_context_completed(self, context_id: str):
+        self._recording.pop(context_id, None)
+        self._served.discard(context_id)
+        await super().on_audio_context_completed(context_id)
+
+
+class CachedCartesiaTTSService(AudioCacheTTSMixin, CartesiaTTSService):
+    """CartesiaTTSService that plays fixed text from the TTS audio cache."""
@@ -0,0 +1,192 @@
+"""UsageMeter — process-wide write-behind queue for LLM / TTS / STT usage.
+
+UsageObserver watches one session's pipeline and turns what the services
+report into usage: LLM tokens and TTS characters from the MetricsFrames they
+emit (``enable_usage_metrics``), STT seconds from the audio handed to the STT
+service, added up as it streams and recorded once per turn. Each sample is attributed to the session, kid, household, book,
+state and model it was spent on. The meter adds samples with the same key
+together and inserts them into ``session_usage`` in one batch when the flush
+timer fires or a session ends; ``get_book_usage`` sums the rows back up per
+book, state and model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+
+from loguru import logger
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    InputAudioRawFrame,
+    MetricsFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import LLMUsageMetricsData, TTSUsageMetricsData
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.services.stt_service import STTService
+
+from shared.config import settings
+
+try:
+    from .library import Library
+    from .supabase_client import save_session_usage_batch
+    from .write_behind import WriteBehindQueue
+except ImportError:
+    from library import Library  # type: ignore[assignment]
+    from supabase_client import save_session_usage_batch  # type: ignore[assignment]
+    from write_behind import WriteBehindQueue  # type: ignore[assignment]
+
+
+@dataclass(frozen=True, slots=True)
+class UsageKey:
+    session_id: str
+    kid_id: str
+    household_id: str | None
+    book_id: str | None  # None before a book is selected
+    state: str  # State.value of the session when the usage happened
+    model: str
+
+
+@dataclass(slots=True)
+class Usage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    tts_characters: int = 0
+    stt_seconds: float = 0.0
+
+    def add(self, other: Usage) -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class UsageMeter(WriteBehindQueue[UsageKey, Usage]):
+    """Sums usage per UsageKey and flushes it in bulk on a timer."""
+
+    rows_name = "session usage rows"
+
+    def record(self, key: UsageKey, usage: Usage) -> None:
+        """Add ``usage`` to what ``key`` has spent; never waits on the network."""
+        total = self._pending.get(key)
+        if total is None:
+            self._pending[key] = total = Usage()
+        total.add(usage)
+        self._recorded()
+
+    def _rows(self, batch: dict[UsageKey, Usage]) -> list[dict]:
+        # One session_usage row per key
+        return [{**asdict(key), **asdict(usage)} for key, usage in batch.items()]
+
+    async def _save(self, rows: list[dict]) -> None:
+        await save_session_usage_batch(rows)
+
+    def _requeue(self, batch: dict[UsageKey, Usage]) -> None:
+        # Usage is additive: fold the batch back into whatever arrived since
+        for key, usage in batch.items():
+            self._pending.setdefault(key, Usage()).add(usage)
+
+
+@lru_cache(maxsize=1)
+def get_usage_meter() -> UsageMeter:
+    return UsageMeter(flush_interval_secs=settings.bot.usage_flush_interval_secs)
+
+
+class UsageObserver(BaseObserver):
+    """Records one session's LLM tokens, TTS characters and STT audio seconds.
+
+    ``state_source`` is the session's state manager: usage is charged to the
+    book and state it is in. Audio counts as STT usage of ``stt_model`` when it
+    is pushed into ``stt``; it is added up as it streams and recorded at the end
+    of each user turn, with other usage, and when the pipeline ends.
+    """
+
+    def __init__(
+        self,
+        meter: UsageMeter,
+        session_id: str,
+        kid_id: str,
+        library: Library,
+        state_source,
+        stt: STTService | None = None,
+        stt_model: str = "",
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._meter = meter
+        self._session_id = session_id
+        self._kid_id = kid_id
+        self._library = library
+        self._state_source = state_source
+        self._stt = stt
+        self._stt_model = stt_model
+        # Seconds of audio sent to the STT since they were last recorded
+        self._stt_seconds = 0.0
+        # The kid's household, looked up once on the first usage recorded
+        self._household: asyncio.Task | None = None
+        self._totals = Usage()
+
+    @property
+    def totals(self) -> dict[str, int | float]:
+        """Everything this session has used so far."""
+        return asdict(self._totals)
+
+    async def on_push_frame(self, data: FramePushed):
+        frame = data.frame
+        if isinstance(frame, InputAudioRawFrame):
+            # Arrives every few ms: only count it here
+            if self._stt is not None and data.destination is self._stt:
+                self._stt_seconds += frame.num_frames / frame.sample_rate
+            return
+        if isinstance(frame, UserStoppedSpeakingFrame | EndFrame | CancelFrame):
+            await self._record_stt()
+            return
+        if not isinstance(frame, MetricsFrame):
+            return
+        await self._record_stt()
+        for metric in frame.data:
+            # A MetricsFrame is pushed on at every hop: count it where it was produced
+            if metric.processor != data.source.name:
+                continue
+            if isinstance(metric, LLMUsageMetricsData):
+                tokens = metric.value
+                usage = Usage(
+                    prompt_tokens=tokens.prompt_tokens,
+                    completion_tokens=tokens.completion_tokens,
+                    cached_prompt_tokens=tokens.cache_read_input_tokens or 0,
+                )
+            elif isinstance(metric, TTSUsageMetricsData):
+                usage = Usage(tts_characters=metric.value)
+            else:
+                continue
+            await self._record(metric.model or "", usage)
+
+    async def _record_stt(self) -> None:
+        seconds, self._stt_seconds = self._stt_seconds, 0.0
+        if seconds:
+            await self._record(self._stt_model, Usage(stt_seconds=seconds))
+
+    async def _record(self, model: str, usage: Usage) -> None:
+        if self._household is None:
+            self._household = asyncio.create_task(self._lookup_household())
+        household_id = await self._household
+        key = UsageKey(
+            session_id=self._session_id,
+            kid_id=self._kid_id,
+            household_id=household_id,
+            book_id=self._state_source.book_id or None,
+            state=self._state_source.state.value,
+            model=model,
+        )
+        self._totals.add(usage)
+        self._meter.record(key, usage)
+
+    async def _lookup_household(self) -> str | None:
+        try:
+            return await self._library.resolve_household_id()
+        except Exception:
+            # Usage is still recorded; the household then comes from the book
+            logger.exception(f"Failed to look up the household of kid {self._kid_id}")
+            return None
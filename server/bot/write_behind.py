@@ -0,0 +1,118 @@
+"""WriteBehindQueue — base of the process-wide write-behind queues.
+
+Sessions record writes without waiting on the network. Pending writes are kept
+per key, folded together by the subclass, and written as one bulk request when
+the flush timer fires or a session flushes on the way out. A failed batch is
+folded back into what arrived since and retried on the next flush.
+
+Subclasses say how a batch becomes rows (``_rows``), where the rows go
+(``_save``) and how a failed batch goes back (``_requeue``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Generic, TypeVar
+
+from loguru import logger
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class WriteBehindStats:
+    recorded: int = 0
+    flushes: int = 0
+    rows_written: int = 0
+    failures: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+
+
+class WriteBehindQueue(ABC, Generic[K, V]):
+    """Pending writes keyed by ``K``, flushed in bulk on a timer."""
+
+    # What a row is, for log lines ("Flushed 3 <rows_name>")
+    rows_name = "rows"
+
+    def __init__(self, flush_interval_secs: float, stats: WriteBehindStats | None = None):
+        self._flush_interval_secs = flush_interval_secs
+        self._pending: dict[K, V] = {}
+        self._stats = stats or WriteBehindStats()
+        # The timer and the lock belong to the loop they were made on; a process-wide
+        # queue outlives loops (tests, runners), so both are remade when it changes
+        self._timer: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._flush_lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def stats(self) -> dict[str, int | float]:
+        return asdict(self._stats)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> None:
+        """Write every pending entry in one bulk request."""
+        async with self._lock():
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            rows = self._rows(batch)
+            start = time.perf_counter()
+            try:
+                await self._save(rows)
+            except Exception:
+                self._stats.failures += 1
+                self._requeue(batch)
+                logger.exception(f"Failed to flush {len(rows)} {self.rows_name}")
+                self._arm_timer()
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self._stats.flushes += 1
+        self._stats.rows_written += len(rows)
+        self._stats.last_batch_size = len(rows)
+        self._stats.max_batch_size = max(self._stats.max_batch_size, len(rows))
+        self._stats.last_flush_ms = elapsed_ms
+        self._stats.max_flush_ms = max(self._stats.max_flush_ms, elapsed_ms)
+        logger.info(f"Flushed {len(rows)} {self.rows_name} in {elapsed_ms:.1f}ms")
+
+    def _recorded(self) -> None:
+        """Count a write the subclass has folded into ``_pending`` and make sure it flushes."""
+        self._stats.recorded += 1
+        self._arm_timer()
+
+    @abstractmethod
+    def _rows(self, batch: dict[K, V]) -> list[dict]: ...
+
+    @abstractmethod
+    async def _save(self, rows: list[dict]) -> None: ...
+
+    @abstractmethod
+    def _requeue(self, batch: dict[K, V]) -> None:
+        """Fold a batch that failed to write back into ``_pending``."""
+
+    def _lock(self) -> asyncio.Lock:
+        # Serialises flushes so an older batch can never land after a newer one
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._flush_lock_loop is not loop:
+            self._flush_lock, self._flush_lock_loop = asyncio.Lock(), loop
+        return self._flush_lock
+
+    def _arm_timer(self) -> None:
+        loop = asyncio.get_running_loop()
+        timer = self._timer
+        if timer is None or timer.done() or timer.get_loop() is not loop:
+            self._timer = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self._flush_interval_secs)
+            await self.flush()
@@ -0,0 +1,131 @@
+"""Benchmark the bot's "books with progress" lookup as the library grows.
+
+Compares the legacy N+1 access pattern (list_books + get_kid_progress + one
+get_chunk_at per started book) against the single get_books_with_progress RPC
+that Library.get_books_with_progress now uses.
+
+Each PostgREST round trip is simulated with a fixed network latency plus a
+small per-row transfer cost, so the script runs without a database and the
+numbers isolate the effect of the round-trip count.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_books_with_progress.py
+    uv run python scripts/benchmark_books_with_progress.py --rtt-ms 40 --sizes 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from bot.library import Library
+
+
+class _SimulatedPostgrest:
+    """Fake data layer: every call sleeps one round trip plus per-row transfer time."""
+
+    def __init__(self, n_books: int, started_ratio: float, rtt_s: float, per_row_s: float):
+        self.rtt_s = rtt_s
+        self.per_row_s = per_row_s
+        self.round_trips = 0
+        self.books = [
+            {"id": f"book_{i:04d}", "title": f"Book {i}", "status": "ready"} for i in range(n_books)
+        ]
+        n_started = int(n_books * started_ratio)
+        self.progress = {b["id"]: 5 for b in self.books[:n_started]}
+
+    def _round_trip(self, rows: int) -> None:
+        self.round_trips += 1
+        time.sleep(self.rtt_s + rows * self.per_row_s)
+
+    def list_books(self) -> list[dict]:
+        self._round_trip(len(self.books))
+        return list(self.books)
+
+    def get_kid_progress(self, kid_id: str) -> list[dict]:
+        self._round_trip(len(self.progress))
+        return [{"book_id": k, "current_chunk_index": v} for k, v in self.progress.items()]
+
+    def get_chunk_at(self, book_id: str, chunk_index: int) -> dict | None:
+        self._round_trip(1)
+        return {"chapter_title": "Chapter I", "chunk_hint": "", "text": "Once upon a time."}
+
+    def list_books_with_progress(self, kid_id: str) -> list[dict]:
+        self._round_trip(len(self.books))
+        rows = []
+        for b in self.books:
+            idx = self.progress.get(b["id"], 0)
+            rows.append(
+                {
+                    **b,
+                    "current_chunk_index": idx,
+                    "chapter_title": "Chapter I" if idx else None,
+                    "chunk_text": "Once upon a time." if idx else None,
+                }
+            )
+        return rows
+
+
+def _legacy_books_with_progress(db: _SimulatedPostgrest, kid_id: str) -> list[dict]:
+    """The pre-RPC implementation, kept here only as the benchmark baseline."""
+    books = db.list_books()
+    progress_map = {r["book_id"]: r["current_chunk_index"] for r in db.get_kid_progress(kid_id)}
+    result = []
+    for b in books:
+        entry: dict = dict(b)
+        chunk_index = progress_map.get(b["id"], 0)
+        if chunk_index > 0:
+            entry["current_chunk_index"] = chunk_index
+            chunk = db.get_chunk_at(b["id"], chunk_index)
+            if chunk:
+                entry["chapter_title"] = chunk["chapter_title"]
+                entry["chunk_text"] = chunk["text"]
+        result.append(entry)
+    return result
+
+
+def _time_legacy(db: _SimulatedPostgrest) -> tuple[float, int]:
+    db.round_trips = 0
+    start = time.perf_counter()
+    _legacy_books_with_progress(db, "kid")
+    return time.perf_counter() - start, db.round_trips
+
+
+def _time_rpc(db: _SimulatedPostgrest) -> tuple[float, int]:
+    async def list_books_with_progress(kid_id: str) -> list[dict]:
+        return db.list_books_with_progress(kid_id)
+
+    db.round_trips = 0
+    start = time.perf_counter()
+    with patch("bot.library.list_books_with_progress", list_books_with_progress):
+        asyncio.run(Library(kid_id="kid").get_books_with_progress())
+    return time.perf_counter() - start, db.round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 30, 60, 100])
+    parser.add_argument("--started-ratio", type=float, default=1.0)
+    parser.add_argument("--rtt-ms", type=float, default=25.0)
+    parser.add_argument("--per-row-us", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"rtt={args.rtt_ms}ms per_row={args.per_row_us}us started={args.started_ratio:.0%}")
+    print(f"{'books':>6} | {'legacy trips':>12} {'legacy ms':>10} | {'rpc trips':>9} {'rpc ms':>8}")
+    for n in args.sizes:
+        db = _SimulatedPostgrest(
+            n, args.started_ratio, args.rtt_ms / 1000, args.per_row_us / 1_000_000
+        )
+        legacy_s, legacy_trips = _time_legacy(db)
+        rpc_s, rpc_trips = _time_rpc(db)
+        print(
+            f"{n:>6} | {legacy_trips:>12} {legacy_s * 1000:>10.1f} | "
+            f"{rpc_trips:>9} {rpc_s * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
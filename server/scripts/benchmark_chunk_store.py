@@ -0,0 +1,126 @@
+"""Benchmark the bot's in-memory book representation on a long synthetic book.
+
+Compares the previous representation — a list of pydantic BookChunk models
+plus a "\\n\\n".join on every full_text() call — against the array-backed
+ChunkStore that Library now keeps.
+
+Reports retained memory (tracemalloc) and the latency of building the book,
+producing its full text (what every QA/FINISHED prompt needs) and reading
+chunks one by one (what READING does).
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_chunk_store.py
+    uv run python scripts/benchmark_chunk_store.py --chunks 20000 --chars 800
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from pydantic import BaseModel
+
+from bot.chunk_store import ChunkKind, ChunkStore
+
+
+class _LegacyBookChunk(BaseModel):
+    """The pre-ChunkStore model, kept here only as the benchmark baseline."""
+
+    chunk_index: int
+    chunk_kind: ChunkKind = ChunkKind.CONTENT
+    chapter_title: str
+    chunk_hint: str = ""
+    text: str
+
+
+def _synthetic_rows(n_chunks: int, chars: int, chunks_per_chapter: int) -> list[dict]:
+    words = "the quick brown rabbit hurried down the long dark hole ".split()
+    rows = []
+    for i in range(n_chunks):
+        chapter = f"Chapter {i // chunks_per_chapter + 1}"
+        if i % chunks_per_chapter == 0:
+            rows.append(
+                {
+                    "chunk_index": i,
+                    "chunk_kind": "chapter_title",
+                    "chapter_title": chapter,
+                    "chunk_hint": f"Start of chapter: {chapter}",
+                    "text": chapter,
+                }
+            )
+            continue
+        text = " ".join(words[(i + j) % len(words)] for j in range(chars // 5))[:chars]
+        rows.append(
+            {
+                "chunk_index": i,
+                "chunk_kind": "content",
+                "chapter_title": chapter,
+                "chunk_hint": f"Something happens in passage {i}.",
+                "text": f"{i}: {text}",
+            }
+        )
+    return rows
+
+
+def _measure_build(build, make_rows) -> tuple[object, float, int]:
+    """Build a book from freshly fetched rows; report build time and what stays alive."""
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows()
+    start = time.perf_counter()
+    book = build(rows)
+    elapsed = time.perf_counter() - start
+    del rows
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return book, elapsed, retained
+
+
+def _per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--chars", type=int, default=600)
+    parser.add_argument("--chunks-per-chapter", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    def build_legacy(rows):
+        return [_LegacyBookChunk(**r) for r in rows]
+
+    def build_store(rows):
+        return ChunkStore.from_rows(rows)
+
+    def make_rows():
+        return _synthetic_rows(args.chunks, args.chars, args.chunks_per_chapter)
+
+    legacy, legacy_build_s, legacy_bytes = _measure_build(build_legacy, make_rows)
+    store, store_build_s, store_bytes = _measure_build(build_store, make_rows)
+
+    legacy_full_s = _per_call(lambda: "\n\n".join(c.text for c in legacy), args.repeat)
+    store_full_s = _per_call(lambda: store.full_text, args.repeat)
+    legacy_read_s = _per_call(lambda: [legacy[i].text for i in range(len(legacy))], 5)
+    store_read_s = _per_call(lambda: [store[i].text for i in range(len(store))], 5)
+
+    print(f"{args.chunks} chunks x ~{args.chars} chars")
+    print(f"{'':>22} | {'models':>10} | {'ChunkStore':>10}")
+    print(f"{'retained MiB':>22} | {legacy_bytes / 2**20:>10.2f} | {store_bytes / 2**20:>10.2f}")
+    print(f"{'build ms':>22} | {legacy_build_s * 1e3:>10.2f} | {store_build_s * 1e3:>10.2f}")
+    print(f"{'full_text() ms':>22} | {legacy_full_s * 1e3:>10.3f} | {store_full_s * 1e3:>10.3f}")
+    print(
+        f"{'read every chunk ms':>22} | {legacy_read_s * 1e3:>10.2f} | {store_read_s * 1e3:>10.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the local resume / goodbye classifier against the labelled utterances.
+
+Reports precision and recall per intent on
+tests/bot/intent_utterances/labelled_utterances.json and the classifier's time
+per utterance. The resume latency it replaces is modeled, not measured: an LLM
+turn (--llm-ms, time to the start_reading tool call) against a local
+classification; reading resumes the same way after both.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_local_intent.py
+    uv run python scripts/benchmark_local_intent.py --llm-ms 1500 --runs 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from bot.intent_classifier import Intent, classify
+
+UTTERANCES = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "bot"
+    / "intent_utterances"
+    / "labelled_utterances.json"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--llm-ms", type=float, default=1200.0, help="LLM turn up to the tool call, ms"
+    )
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+    utterances = json.loads(UTTERANCES.read_text())
+
+    print(f"{len(utterances)} labelled utterances")
+    print(
+        f"{'intent':>8} | {'labelled':>8} {'local':>6} {'correct':>7} | {'precision':>9} {'recall':>6}"
+    )
+    for intent in Intent:
+        labelled = sum(u["label"] == intent.value for u in utterances)
+        predicted = [u for u in utterances if classify(u["text"]) == intent]
+        correct = sum(u["label"] == intent.value for u in predicted)
+        print(
+            f"{intent.value:>8} | {labelled:>8} {len(predicted):>6} {correct:>7} | "
+            f"{correct / max(len(predicted), 1):>9.0%} {correct / max(labelled, 1):>6.0%}"
+        )
+
+    times = []
+    for u in utterances:
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            classify(u["text"])
+        times.append((time.perf_counter() - start) / args.runs * 1e6)
+    local_ms = max(times) / 1000
+    print(
+        f"classify: median {statistics.median(times):.1f}us, max {max(times):.1f}us per utterance"
+    )
+    print(f"resume after 'keep reading': LLM ~{args.llm_ms:.0f}ms -> local <{local_ms:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
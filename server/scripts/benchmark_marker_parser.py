@@ -0,0 +1,166 @@
+"""Benchmark per-frame overhead of BookReaderProcessor's intent-marker parsing.
+
+Streams LLM responses through BookReaderProcessor._handle_llm_text and
+compares the previous parser (grow a string buffer, rescan it for all four
+markers on every frame, push re-created LLMTextFrames) with the current one
+(a state machine over the first non-whitespace code point that forwards the
+original frames).
+
+The responses are built from the recorded Alice excerpt
+(tests/workers/recordings): each is a passage split into word-sized deltas the
+way a chat completion streams them, led by one of the markers — alone in its
+own frame, glued to the first word, after a newline frame — or by none.
+"Head" times only the first four frames of each response, where the marker is
+resolved; after that both parsers forward frames the same way. Times are the
+best of --runs with the garbage collector off. "New frames" counts
+LLMTextFrames pushed downstream that are not the frames the LLM produced.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_marker_parser.py
+    uv run python scripts/benchmark_marker_parser.py --responses 200 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import re
+import time
+from pathlib import Path
+
+from loguru import logger
+from pipecat.frames.frames import LLMTextFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+from bot.processors.book_reader import (
+    _MARKERS,
+    INTENT_ANSWER,
+    BookReaderProcessor,
+)
+
+ALICE_CHUNKS = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "workers"
+    / "recordings"
+    / "alice_in_wonderland"
+    / "expected_chunks.json"
+)
+_DELTA = re.compile(r"\s*\S+")
+_LEGACY_BUFFER_LIMIT = 20
+
+
+class _LegacyBookReader(BookReaderProcessor):
+    """The parser as it was: buffer every frame's text until a marker turns up."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._marker_buffer = ""
+        self._marker_resolved = False
+        self._marker_suppressed = False
+
+    async def _handle_llm_text(self, frame, direction):
+        if self._marker_suppressed:
+            return
+        if self._marker_resolved:
+            await self.push_frame(frame, direction)
+            return
+        self._marker_buffer += frame.text
+        await self._try_detect_marker()
+
+    async def _try_detect_marker(self):
+        for marker, intent in _MARKERS.items():
+            if marker not in self._marker_buffer:
+                continue
+            self._marker_resolved = True
+            if intent == "answer":
+                idx = self._marker_buffer.index(marker) + len(marker)
+                remaining = self._marker_buffer[idx:]
+                if remaining.startswith(" "):
+                    remaining = remaining[1:]
+                if remaining:
+                    await self.push_frame(LLMTextFrame(text=remaining))
+                self._marker_buffer = ""
+                return
+            self._marker_suppressed = True  # affirm / wait: not exercised here
+            return
+        if len(self._marker_buffer) > _LEGACY_BUFFER_LIMIT:
+            self._marker_resolved = True
+            await self.push_frame(LLMTextFrame(text=self._marker_buffer))
+            self._marker_buffer = ""
+
+    async def _marker_flush_and_reset(self):
+        if not self._marker_resolved and self._marker_buffer:
+            await self.push_frame(LLMTextFrame(text=self._marker_buffer))
+        self._marker_buffer = ""
+        self._marker_resolved = False
+        self._marker_suppressed = False
+
+
+def _responses(count: int) -> list[list[str]]:
+    """Answer-like token streams; the marker leads in a few different framings."""
+    rows = json.loads(ALICE_CHUNKS.read_text())
+    passages = [r["text"] for r in rows if r.get("chunk_kind") != "chapter_title"]
+    leads = (
+        lambda d: [INTENT_ANSWER, *d],
+        lambda d: [f"{INTENT_ANSWER}{d[0]}", *d[1:]],
+        lambda d: ["\n", INTENT_ANSWER, *d],
+        lambda d: d,
+    )
+    streams = []
+    for n in range(count):
+        deltas = _DELTA.findall(passages[n % len(passages)][:600])
+        streams.append(leads[n % len(leads)](deltas))
+    return streams
+
+
+async def _run(cls, streams: list[list[str]], runs: int) -> dict:
+    processor = cls(kid_id="kid", context=LLMContext())
+    pushed = []
+
+    async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+        pushed.append(frame)
+
+    processor.push_frame = push_frame
+    best = float("inf")
+    new_frames = 0
+    n_frames = sum(len(s) for s in streams)
+    for _ in range(runs):
+        frames = [[LLMTextFrame(text=t) for t in s] for s in streams]
+        originals = {id(f) for stream in frames for f in stream}
+        pushed.clear()
+        gc.disable()
+        start = time.perf_counter()
+        for stream in frames:
+            for frame in stream:
+                await processor._handle_llm_text(frame, FrameDirection.DOWNSTREAM)
+            await processor._marker_flush_and_reset()
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+        new_frames = sum(id(f) not in originals for f in pushed)
+    return {"ns": best / n_frames * 1e9, "new": new_frames}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    logger.remove()
+    streams = _responses(args.responses)
+    heads = [s[:4] for s in streams]
+
+    print(f"{len(streams)} responses, {sum(len(s) for s in streams)} frames")
+    print(f"{'parser':>8} | {'ns/frame':>8} {'head ns/frame':>13} | {'new frames':>10}")
+    for name, cls in (("old", _LegacyBookReader), ("new", BookReaderProcessor)):
+        full = asyncio.run(_run(cls, streams, args.runs))
+        head = asyncio.run(_run(cls, heads, args.runs))
+        print(f"{name:>8} | {full['ns']:>8.0f} {head['ns']:>13.0f} | {full['new']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Benchmark QA prompt size and modeled time to first token on the recorded Alice book.
+
+Puts the real Library and state manager at several positions in the recorded
+Alice excerpt (tests/workers/recordings) and, for a set of child questions,
+compares the QA system prompt that used to be sent (the whole book text) with
+the current one (the story so far, windowed back from the current passage to
+the prompt token budget, plus the BM25 matches up to the child's position).
+
+Prompt tokens are counted with tiktoken (cl100k_base) when it is installed,
+otherwise estimated at 4 characters per token. Time to first token is modeled
+as prompt prefill at --prefill-tps tokens/s plus, for the new prompt, the
+measured retrieval time; it is not a measurement against a live LLM.
+"Future" counts prompts carrying text from after the child's position.
+
+The recording has no ingestion-time chapter summaries; --summaries stands in
+for them with each chapter's chunk hints (summary: its first three hints;
+story so far: the last eight chapter summaries), so the QA prompt quotes only
+the current chapter verbatim.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_qa_context.py
+    uv run python scripts/benchmark_qa_context.py --prefill-tps 3000 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.book_cache import BookCache
+from bot.library import Library
+from bot.processors.state_manager import BookReadingStateManager, State
+
+ALICE_CHUNKS = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "workers"
+    / "recordings"
+    / "alice_in_wonderland"
+    / "expected_chunks.json"
+)
+BOOK_ID = "alice"
+POSITIONS = (10, 20, 30, 36)
+QUESTIONS = (
+    "why did alice drink from the bottle?",
+    "what happened to the mouse?",
+    "who is the duchess?",
+    "why is everyone so wet?",
+    "what is the cat grinning about?",
+)
+
+# The QA prompt before passage retrieval: the full book plus a 200-char preview
+_FULL_TEXT_QA = """You are a friendly reading companion for children.
+You are currently reading the book "{title}" with the child.
+Here is the full book text for reference:
+
+---
+{full_book_text}
+---
+
+The child was listening to the passage around: "{current_chunk_preview}"
+
+The child interrupted to ask a question or make a comment.
+Answer warmly and concisely based on the book content (1-3 sentences).
+Keep answers age-appropriate and brief.
+
+When the child explicitly wants to continue reading (e.g. "keep reading",
+"go on", "back to the story"), call start_reading(index) to resume from the current position.
+Do NOT call start_reading unless the child clearly asks to continue.
+To jump to a chapter, call start_reading(index, chapter=...) with the chapter name
+or number the child asked for, as they said it — the system finds the chapter.
+{chapter_context}
+
+If the child hints at leaving or saying goodbye, first ask a short confirmation
+(e.g. "Would you like to say goodbye for now, or is there something else you'd
+like to do — maybe pick a different book?"). Only call end_session() after
+the child clearly confirms they want to leave."""
+
+
+def _token_counter():
+    try:
+        import tiktoken
+    except ImportError:
+        return (lambda text: len(text) // 4), "chars/4 estimate"
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return (lambda text: len(encoding.encode(text))), "tiktoken cl100k_base"
+
+
+def _stand_in_summaries(rows: list[dict]) -> list[dict]:
+    chapters: list[dict] = []
+    for row in rows:
+        if not chapters or chapters[-1]["chapter_title"] != row["chapter_title"]:
+            chapters.append(
+                {
+                    "chapter_index": len(chapters),
+                    "chapter_title": row["chapter_title"],
+                    "first_chunk_index": row["chunk_index"],
+                    "hints": [],
+                }
+            )
+        if row.get("chunk_kind") != "chapter_title" and row.get("chunk_hint"):
+            chapters[-1]["hints"].append(row["chunk_hint"])
+    summaries = []
+    for chapter in chapters:
+        summary = " ".join(chapter.pop("hints")[:3])
+        story = " ".join(s["summary"] for s in summaries[-7:]) + " " + summary
+        summaries.append({**chapter, "summary": summary, "story_so_far": story.strip()})
+    return summaries
+
+
+def _patches(rows: list[dict], progress: int, summaries: list[dict]):
+    async def chunk_range(book_id, start, end):
+        return rows[start:end]
+
+    return patch.multiple(
+        "bot.library",
+        get_book_metadata=AsyncMock(
+            return_value={"id": BOOK_ID, "title": "Alice in Wonderland", "status": "ready"}
+        ),
+        get_reading_progress=AsyncMock(return_value=progress),
+        get_book_chunk_count=AsyncMock(return_value=len(rows)),
+        get_book_chunk_range=AsyncMock(side_effect=chunk_range),
+        get_chapter_summaries=AsyncMock(return_value=summaries),
+        get_book_cache=lambda: BookCache(max_books=4),
+    )
+
+
+def _has_future_text(prompt: str, rows: list[dict], position: int) -> bool:
+    return any(row["text"] in prompt for row in rows[position + 1 :] if len(row["text"]) > 80)
+
+
+async def _measure(
+    rows: list[dict], position: int, runs: int, count, summaries: list[dict]
+) -> list[dict]:
+    library = Library(kid_id="kid")
+    with _patches(rows, position, summaries):
+        await library.initialize_book(BOOK_ID)
+        full_text = await library.full_text()
+    sm = BookReadingStateManager(library=library, context=MagicMock(), llm=MagicMock())
+    sm._state = State.QA
+    chunk = await library.current_chunk()
+    old = _FULL_TEXT_QA.format(
+        title=library.book.title,
+        full_book_text=full_text,
+        current_chunk_preview=chunk.text[:200],
+        chapter_context=sm._format_chapter_context(),
+    )
+    await library.relevant_chunks("warm up", 1)  # index build happens once per load
+
+    results = []
+    for question in QUESTIONS:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            new = await sm._qa_prompt(question)
+            times.append(time.perf_counter() - start)
+        results.append(
+            {
+                "old_tokens": count(old),
+                "new_tokens": count(new),
+                "retrieval_ms": statistics.median(times) * 1000,
+                "old_future": _has_future_text(old, rows, position),
+                "new_future": _has_future_text(new, rows, position),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--prefill-tps", type=float, default=5000.0, help="LLM prompt prefill, tokens/s"
+    )
+    parser.add_argument("--base-ms", type=float, default=250.0, help="LLM TTFT with no prompt")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--summaries", action="store_true", help="stand in chapter summaries from chunk hints"
+    )
+    args = parser.parse_args()
+    rows = json.loads(ALICE_CHUNKS.read_text())
+    summaries = _stand_in_summaries(rows) if args.summaries else []
+    count, counter_name = _token_counter()
+
+    def ttft(tokens: int, extra_ms: float = 0.0) -> float:
+        return args.base_ms + tokens / args.prefill_tps * 1000 + extra_ms
+
+    print(
+        f"{len(rows)} chunks, {sum(len(r['text']) for r in rows)} chars; tokens: {counter_name}; "
+        f"prefill={args.prefill_tps:.0f} tok/s base={args.base_ms:.0f}ms; "
+        f"chapter summaries: {'stand-in' if summaries else 'none'}"
+    )
+    print(
+        f"{'position':>8} | {'old tok':>7} {'new tok':>7} {'cut':>5} | "
+        f"{'old ttft':>8} {'new ttft':>8} | {'bm25 ms':>7} | {'future old/new':>14}"
+    )
+    all_old, all_new = [], []
+    for position in POSITIONS:
+        results = asyncio.run(_measure(rows, position, args.runs, count, summaries))
+        old_tok = statistics.mean(r["old_tokens"] for r in results)
+        new_tok = statistics.mean(r["new_tokens"] for r in results)
+        retrieval = statistics.mean(r["retrieval_ms"] for r in results)
+        old_future = sum(r["old_future"] for r in results)
+        new_future = sum(r["new_future"] for r in results)
+        all_old.append(old_tok)
+        all_new.append(new_tok)
+        print(
+            f"{position:>8} | {old_tok:>7.0f} {new_tok:>7.0f} {1 - new_tok / old_tok:>5.0%} | "
+            f"{ttft(old_tok):>6.0f}ms {ttft(new_tok, retrieval):>6.0f}ms | {retrieval:>7.2f} | "
+            f"{old_future:>6}/{new_future}"
+        )
+    old_tok, new_tok = statistics.mean(all_old), statistics.mean(all_new)
+    print(
+        f"{'mean':>8} | {old_tok:>7.0f} {new_tok:>7.0f} {1 - new_tok / old_tok:>5.0%} | "
+        f"{ttft(old_tok):>6.0f}ms {ttft(new_tok):>6.0f}ms |"
+    )
+
+
+if __name__ == "__main__":
+    main()
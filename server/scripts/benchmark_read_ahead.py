@@ -0,0 +1,172 @@
+"""Benchmark the silence between read-aloud passages, with and without read-ahead.
+
+Drives the real Library and state manager through the recorded Alice excerpt
+(tests/workers/recordings) into a fake TTS + output transport standing in for
+the rest of the pipeline:
+
+- a TTSSpeakFrame's first audio is ready --ttfb-ms after it is pushed;
+- audio plays in order, one passage after the other, at --speedup times real
+  speaking speed (15 characters a second), so a run doesn't take minutes;
+- a ChunkPlayedFrame comes back to the state manager once the audio before it
+  has played (what PlaybackTracker does after transport.output);
+- after 0.35s of silence the output reports BotStoppedSpeakingFrame, as
+  pipecat's BaseOutputTransport does (BOT_VAD_STOP_SECS).
+
+The gap is the silence between the end of one passage and the start of the
+next. It doesn't depend on how long passages are, as long as each one plays
+longer than the TTS takes to start the next (--ttfb-ms).
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_read_ahead.py
+    uv run python scripts/benchmark_read_ahead.py --ttfb-ms 600 --passages 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from loguru import logger
+from pipecat.frames.frames import BotStoppedSpeakingFrame, Frame, TTSSpeakFrame
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_output import BOT_VAD_STOP_SECS
+
+from bot.book_cache import BookCache
+from bot.library import Library
+from bot.processors.frames import ChunkPlayedFrame, StartReadingFrame
+from bot.processors.state_manager import BookReadingStateManager
+
+ALICE_CHUNKS = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "workers"
+    / "recordings"
+    / "alice_in_wonderland"
+    / "expected_chunks.json"
+)
+BOOK_ID = "alice"
+START_CHUNK = 1
+CHARS_PER_SEC = 15.0
+
+
+class _FakeVoice:
+    """TTS + output transport: plays what the state manager pushes, in order."""
+
+    def __init__(self, sm: BookReadingStateManager, ttfb: float, speedup: float, passages: int):
+        self._sm = sm
+        self._ttfb = ttfb
+        self._speedup = speedup
+        self._passages = passages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._last_end: float | None = None  # when the last passage finished playing
+        self._tasks: set[asyncio.Task] = set()
+        self.gaps: list[float] = []
+        self.done = asyncio.Event()
+
+    async def push_frame(self, frame: Frame, direction=FrameDirection.DOWNSTREAM):
+        if direction != FrameDirection.DOWNSTREAM:
+            return
+        now = asyncio.get_running_loop().time()
+        if isinstance(frame, TTSSpeakFrame):
+            await self._queue.put((now + self._ttfb, frame))
+        elif isinstance(frame, ChunkPlayedFrame):
+            await self._queue.put((now, frame))
+
+    async def play(self) -> None:
+        loop = asyncio.get_running_loop()
+        speaking = False
+        while True:
+            timeout = None
+            if speaking:
+                timeout = max(0.0, self._last_end + BOT_VAD_STOP_SECS - loop.time())
+            try:
+                ready_at, frame = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                speaking = False
+                self._deliver(BotStoppedSpeakingFrame())
+                continue
+
+            if isinstance(frame, ChunkPlayedFrame):
+                self._deliver(frame)
+                continue
+
+            await asyncio.sleep(max(0.0, ready_at - loop.time()))
+            start = loop.time()
+            if self._last_end is not None:
+                self.gaps.append(start - self._last_end)
+                if len(self.gaps) >= self._passages - 1:
+                    self.done.set()
+                    return
+            speaking = True
+            await asyncio.sleep(len(frame.text) / CHARS_PER_SEC / self._speedup)
+            self._last_end = loop.time()
+
+    def _deliver(self, frame: Frame) -> None:
+        # The state manager gets it through its own input queue, like queue_frame
+        task = asyncio.create_task(self._sm.process_frame(frame, FrameDirection.UPSTREAM))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+async def _measure(rows: list[dict], read_ahead: int, ttfb: float, speedup: float, passages: int):
+    async def chunk_range(book_id, start, end):
+        return rows[start:end]
+
+    with patch.multiple(
+        "bot.library",
+        get_book_metadata=AsyncMock(
+            return_value={"id": BOOK_ID, "title": "Alice in Wonderland", "status": "ready"}
+        ),
+        get_reading_progress=AsyncMock(return_value=START_CHUNK),
+        get_book_chunk_count=AsyncMock(return_value=len(rows)),
+        get_book_chunk_range=AsyncMock(side_effect=chunk_range),
+        get_chapter_summaries=AsyncMock(return_value=[]),
+        get_book_cache=lambda: BookCache(max_books=4),
+    ):
+        library = Library(kid_id="kid")
+        await library.initialize_book(BOOK_ID)
+        await library.full_text()
+        library._checkpoint = lambda: None  # no progress writes from a benchmark
+
+        sm = BookReadingStateManager(
+            library=library, context=MagicMock(), llm=MagicMock(), read_ahead_chunks=read_ahead
+        )
+        voice = _FakeVoice(sm, ttfb, speedup, passages)
+        sm.push_frame = voice.push_frame
+        player = asyncio.create_task(voice.play())
+        await sm.process_frame(StartReadingFrame(book_id=BOOK_ID), FrameDirection.DOWNSTREAM)
+        await voice.done.wait()
+        player.cancel()
+        await sm._cancel_qa_precompute()
+    return voice.gaps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttfb-ms", type=float, default=300.0)
+    parser.add_argument("--speedup", type=float, default=40.0)
+    parser.add_argument("--passages", type=int, default=8)
+    args = parser.parse_args()
+    logger.remove()
+    rows = json.loads(ALICE_CHUNKS.read_text())
+
+    print(
+        f"{args.passages} passages from chunk {START_CHUNK}, TTS TTFB {args.ttfb_ms:.0f}ms, "
+        f"BotStoppedSpeaking after {BOT_VAD_STOP_SECS * 1000:.0f}ms of silence"
+    )
+    print(f"{'mode':>12} | {'median gap ms':>13} {'max gap ms':>10}")
+    for name, read_ahead in (("wait", 0), ("read-ahead", 1)):
+        gaps = asyncio.run(
+            _measure(rows, read_ahead, args.ttfb_ms / 1000, args.speedup, args.passages)
+        )
+        gaps_ms = [g * 1000 for g in gaps]
+        print(f"{name:>12} | {statistics.median(gaps_ms):>13.1f} {max(gaps_ms):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark time to first story audio for the session opening.
+
+Replays the opening of a session with the real Library against a simulated
+data layer and compares the old tool-call sequences with the current ones:
+
+  preselected, old:  connect -> LLM: select_book("0") -> load -> LLM: start_reading("0") -> TTS
+  preselected, new:  connect -> load (preloaded) -> LLM: greeting + start_reading("0") -> TTS
+  browse pick, old:  child picks -> LLM: select_book -> load -> LLM: start_reading -> TTS
+  browse pick, new:  child picks -> LLM: read_book -> load -> TTS
+
+Each LLM turn (completion up to the tool call, plus the tool round trip) is a
+fixed sleep, as is each PostgREST round trip and the TTS time to first audio,
+so the numbers isolate the effect of the number of sequential LLM turns.
+The preselected clock starts when bot() starts (the preload runs during setup);
+the browse clock starts when the child has said which book they want.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_session_opening.py
+    uv run python scripts/benchmark_session_opening.py --llm-ms 600 --rtt-ms 40 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import AsyncMock, patch
+
+from bot.book_cache import BookCache
+from bot.library import Library
+
+BOOK_ID = "book_0001"
+N_CHUNKS = 400
+
+
+class _SimulatedBackend:
+    """Fake data layer: every call sleeps one PostgREST round trip."""
+
+    def __init__(self, rtt_s: float):
+        self.rtt_s = rtt_s
+        self.chunks = [
+            {
+                "chunk_index": i,
+                "chunk_kind": "content",
+                "chapter_title": f"Chapter {i // 40 + 1}",
+                "chunk_hint": "",
+                "text": f"Passage {i} of the story. " * 8,
+            }
+            for i in range(N_CHUNKS)
+        ]
+
+    async def _round_trip(self) -> None:
+        await asyncio.sleep(self.rtt_s)
+
+    async def get_book_metadata(self, book_id: str) -> dict:
+        await self._round_trip()
+        return {"id": book_id, "title": "The Story", "status": "ready", "chunks_version": 1}
+
+    async def get_reading_progress(self, book_id: str, kid_id: str) -> int:
+        await self._round_trip()
+        return 0
+
+    async def get_book_chunk_count(self, book_id: str) -> int:
+        await self._round_trip()
+        return len(self.chunks)
+
+    async def get_book_chunk_range(self, book_id: str, start: int, end: int) -> list[dict]:
+        await self._round_trip()
+        return self.chunks[start:end]
+
+    def patches(self):
+        return patch.multiple(
+            "bot.library",
+            get_book_metadata=self.get_book_metadata,
+            get_reading_progress=self.get_reading_progress,
+            get_book_chunk_count=self.get_book_chunk_count,
+            get_book_chunk_range=self.get_book_chunk_range,
+            get_chapter_summaries=AsyncMock(return_value=[]),
+            get_book_cache=lambda: BookCache(max_books=4),
+        )
+
+
+async def _preselected(combined: bool, setup_s: float, llm_s: float, tts_s: float) -> float:
+    start = time.perf_counter()
+    library = Library(kid_id="kid")
+    library.preload_book(BOOK_ID)
+    await asyncio.sleep(setup_s)  # transport + services spin up; client connects
+    if combined:
+        await library.initialize_book(BOOK_ID)  # before greet_child
+        await asyncio.sleep(llm_s)  # greeting + start_reading("0")
+    else:
+        await asyncio.sleep(llm_s)  # greeting + select_book("0")
+        await library.initialize_book(BOOK_ID)
+        await asyncio.sleep(llm_s)  # intro + start_reading("0")
+    await library.current_chunk()
+    await asyncio.sleep(tts_s)
+    await library._cancel_loader()
+    return time.perf_counter() - start
+
+
+async def _browse_pick(combined: bool, llm_s: float, tts_s: float) -> float:
+    start = time.perf_counter()
+    library = Library(kid_id="kid")
+    await asyncio.sleep(llm_s)  # select_book(i) or read_book(i)
+    await library.initialize_book(BOOK_ID)
+    if not combined:
+        await asyncio.sleep(llm_s)  # intro + start_reading(i)
+    await library.current_chunk()
+    await asyncio.sleep(tts_s)
+    await library._cancel_loader()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-ms", type=float, default=900.0, help="one LLM turn incl. tool call")
+    parser.add_argument("--rtt-ms", type=float, default=30.0)
+    parser.add_argument("--setup-ms", type=float, default=600.0, help="transport + services")
+    parser.add_argument("--tts-ms", type=float, default=250.0, help="TTS time to first audio")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    llm_s, tts_s = args.llm_ms / 1000, args.tts_ms / 1000
+    backend = _SimulatedBackend(args.rtt_ms / 1000)
+
+    async def run(scenario) -> float:
+        with backend.patches():
+            times = [await scenario() for _ in range(args.runs)]
+        return statistics.median(times) * 1000
+
+    scenarios = [
+        ("preselected", 2, 1, lambda c: _preselected(c, args.setup_ms / 1000, llm_s, tts_s)),
+        ("browse pick", 2, 1, lambda c: _browse_pick(c, llm_s, tts_s)),
+    ]
+    print(
+        f"llm={args.llm_ms}ms rtt={args.rtt_ms}ms setup={args.setup_ms}ms "
+        f"tts={args.tts_ms}ms runs={args.runs}"
+    )
+    print(
+        f"{'flow':>12} | {'old turns':>9} {'old ms':>8} | "
+        f"{'new turns':>9} {'new ms':>8} | {'saved':>7}"
+    )
+    for name, old_turns, new_turns, scenario in scenarios:
+        old_ms = asyncio.run(run(lambda: scenario(False)))
+        new_ms = asyncio.run(run(lambda: scenario(True)))
+        print(
+            f"{name:>12} | {old_turns:>9} {old_ms:>8.0f} | {new_turns:>9} {new_ms:>8.0f} | "
+            f"{old_ms - new_ms:>6.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark time to first audio and TTS characters billed, with and without the TTS cache.
+
+Several sessions read the same opening passages of the recorded Alice excerpt
+(tests/workers/recordings) and end on the farewell, the way children reading a
+popular book do. Each utterance is a TTSSpeakFrame through a pipeline of a fake
+TTS service and a probe that timestamps the first audio frame:
+
+- the fake TTS waits --ttfb-ms, then yields the passage as 16-bit PCM at
+  15 characters a second of speech (silence; only its size matters);
+- "cached" puts the same fake behind AudioCacheTTSMixin with a disk tier in a
+  temporary directory (no bucket), starting empty.
+
+"Billed chars" are the characters sent to the fake provider.
+
+Usage:
+    cd server
+    uv run python scripts/benchmark_tts_cache.py
+    uv run python scripts/benchmark_tts_cache.py --sessions 10 --passages 6 --ttfb-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+from pipecat.frames.frames import EndFrame, Frame, TTSAudioRawFrame, TTSSpeakFrame, TTSStoppedFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.settings import TTSSettings
+from pipecat.services.tts_service import TTSService
+
+from bot.processors.state_manager import FAREWELL
+from bot.tts_cache import AudioCacheTTSMixin, TTSAudioCache
+
+ALICE_CHUNKS = (
+    Path(__file__).resolve().parent.parent
+    / "tests"
+    / "workers"
+    / "recordings"
+    / "alice_in_wonderland"
+    / "expected_chunks.json"
+)
+SAMPLE_RATE = 24000
+CHARS_PER_SEC = 15.0
+
+
+class _FakeTTS(TTSService):
+    def __init__(self, ttfb: float, **kwargs):
+        super().__init__(
+            sample_rate=SAMPLE_RATE,
+            push_start_frame=True,
+            push_stop_frames=True,
+            settings=TTSSettings(model="fake-1", voice="narrator", language=None),
+            **kwargs,
+        )
+        self._ttfb = ttfb
+        self.billed_chars = 0
+
+    async def run_tts(self, text: str, context_id: str):
+        self.billed_chars += len(text)
+        await asyncio.sleep(self._ttfb)
+        samples = int(len(text) / CHARS_PER_SEC * SAMPLE_RATE)
+        yield TTSAudioRawFrame(
+            audio=bytes(samples * 2), sample_rate=SAMPLE_RATE, num_channels=1, context_id=context_id
+        )
+
+
+class _CachedFakeTTS(AudioCacheTTSMixin, _FakeTTS):
+    pass
+
+
+class _FirstAudioProbe(FrameProcessor):
+    """Timestamps the first audio frame of each utterance and signals when it ends."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_audio: float | None = None
+        self.stopped = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TTSAudioRawFrame) and self.first_audio is None:
+            self.first_audio = time.perf_counter()
+        elif isinstance(frame, TTSStoppedFrame):
+            self.stopped.set()
+        await self.push_frame(frame, direction)
+
+
+async def _session(tts: _FakeTTS, texts: list[str]) -> list[float]:
+    probe = _FirstAudioProbe()
+    task = PipelineTask(Pipeline([tts, probe]), cancel_on_idle_timeout=False)
+    runner = asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+    await asyncio.sleep(0.01)
+    latencies = []
+    for text in texts:
+        probe.first_audio = None
+        probe.stopped.clear()
+        sent = time.perf_counter()
+        await task.queue_frame(TTSSpeakFrame(text=text))
+        await probe.stopped.wait()
+        latencies.append(probe.first_audio - sent)
+    await task.queue_frame(EndFrame())
+    await runner
+    return latencies
+
+
+async def _measure(texts: list[str], sessions: int, ttfb: float, cached: bool) -> dict:
+    latencies: list[float] = []
+    billed = 0
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TTSAudioCache(cache_dir=Path(cache_dir), max_disk_bytes=1 << 30)
+        for _ in range(sessions):
+            tts = _CachedFakeTTS(ttfb, audio_cache=cache) if cached else _FakeTTS(ttfb)
+            latencies += await _session(tts, texts)
+            await cache.drain()
+            billed += tts.billed_chars
+    return {
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "billed": billed,
+        "hit_rate": cache.hit_rate(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--passages", type=int, default=4)
+    parser.add_argument("--ttfb-ms", type=float, default=300.0)
+    args = parser.parse_args()
+    logger.remove()
+    rows = json.loads(ALICE_CHUNKS.read_text())
+    passages = [r["text"] for r in rows if r.get("chunk_kind") != "chapter_title"]
+    texts = [*passages[: args.passages], FAREWELL]
+
+    print(
+        f"{args.sessions} sessions x {len(texts)} utterances "
+        f"({sum(map(len, texts))} chars each), TTS TTFB {args.ttfb_ms:.0f}ms"
+    )
+    print(f"{'tts':>8} | {'first audio ms':>14} {'p95 ms':>7} | {'billed chars':>12} {'hits':>5}")
+    for name, cached in (("live", False), ("cached", True)):
+        r = asyncio.run(_measure(texts, args.sessions, args.ttfb_ms / 1000, cached))
+        print(
+            f"{name:>8} | {r['median_ms']:>14.1f} {r['p95_ms']:>7.1f} | "
+            f"{r['billed']:>12} {r['hit_rate']:>5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
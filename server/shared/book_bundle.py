@@ -0,0 +1,168 @@
+"""Compiled per-book bundle: one immutable storage object holding a whole book.
+
+The worker publishes a bundle next to the book's PDF every time it rewrites
+``book_chunks``; the bot loads a book from it in a single storage GET instead
+of paging through rows. The rows stay the source of truth for queries.
+
+Layout (little-endian)::
+
+    magic "RMBK" | format u32 | index_len u32 | zlib( index JSON | UTF-8 text )
+
+The text is every chunk's text joined by ``separator``; the index holds, per
+chunk, the character offsets of its text plus its kind, chapter, hint and token
+count, the chapter boundaries, and the chapter summaries written at ingestion
+(bundles published before token counts were added get estimates on decode;
+before summaries, none). Bundles are keyed by ``chunks_version`` in
+their path, so a published bundle never changes.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+
+from shared.tokens import estimate_tokens
+
+BUNDLE_SEPARATOR = "\n\n"
+BUNDLE_CACHE_CONTROL = "31536000"  # immutable: a new version gets a new path
+
+_MAGIC = b"RMBK"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+
+
+@dataclass
+class BookBundle:
+    book_id: str
+    chunks_version: int
+    text: str
+    starts: list[int]
+    ends: list[int]
+    kinds: list[str]
+    chapter_ids: list[int]
+    chapters: list[str]
+    hints: list[str]
+    token_counts: list[int]
+    chapter_boundaries: list[tuple[int, int]]  # (first chunk_index, chapter id)
+    # book_chapter_summaries rows without book_id, in chapter order
+    summaries: list[dict] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def bundle_path(storage_path: str, chunks_version: int) -> str:
+    """Bundle object path for a book, next to its PDF: ``.../bundle.v<version>.rmbk``."""
+    parent = str(PurePosixPath(storage_path).parent)
+    return f"{parent}/bundle.v{chunks_version}.rmbk"
+
+
+def build_bundle(
+    book_id: str, chunks_version: int, rows: list[dict], summaries: list[dict] | None = None
+) -> BookBundle:
+    """Pack chunk rows (each with chunk_index, chunk_kind, chapter_title, chunk_hint, text,
+    and optionally token_count) and the book's chapter summary rows.
+
+    Rows must cover chunk indices 0..n-1 exactly once.
+    """
+    rows = sorted(rows, key=lambda r: r["chunk_index"])
+    if [r["chunk_index"] for r in rows] != list(range(len(rows))):
+        raise ValueError(f"Chunk indices of {book_id} are not contiguous from 0")
+
+    parts: list[str] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    chapter_codes: dict[str, int] = {}
+    chapter_ids: list[int] = []
+    boundaries: list[tuple[int, int]] = []
+    offset = 0
+    for row in rows:
+        if parts:
+            parts.append(BUNDLE_SEPARATOR)
+            offset += len(BUNDLE_SEPARATOR)
+        parts.append(row["text"])
+        starts.append(offset)
+        offset += len(row["text"])
+        ends.append(offset)
+        code = chapter_codes.setdefault(row["chapter_title"], len(chapter_codes))
+        if not chapter_ids or chapter_ids[-1] != code:
+            boundaries.append((row["chunk_index"], code))
+        chapter_ids.append(code)
+
+    return BookBundle(
+        book_id=book_id,
+        chunks_version=chunks_version,
+        text="".join(parts),
+        starts=starts,
+        ends=ends,
+        kinds=[r.get("chunk_kind") or "content" for r in rows],
+        chapter_ids=chapter_ids,
+        chapters=list(chapter_codes),
+        hints=[r.get("chunk_hint") or "" for r in rows],
+        token_counts=[r.get("token_count") or estimate_tokens(r["text"]) for r in rows],
+        chapter_boundaries=boundaries,
+        summaries=[
+            {k: v for k, v in s.items() if k != "book_id"}
+            for s in sorted(summaries or (), key=lambda s: s["chapter_index"])
+        ],
+    )
+
+
+def encode_bundle(bundle: BookBundle) -> bytes:
+    index = json.dumps(
+        {
+            "book_id": bundle.book_id,
+            "chunks_version": bundle.chunks_version,
+            "separator": BUNDLE_SEPARATOR,
+            "starts": bundle.starts,
+            "ends": bundle.ends,
+            "kinds": bundle.kinds,
+            "chapter_ids": bundle.chapter_ids,
+            "chapters": bundle.chapters,
+            "hints": bundle.hints,
+            "token_counts": bundle.token_counts,
+            "chapter_boundaries": bundle.chapter_boundaries,
+            "summaries": bundle.summaries,
+        },
+        separators=(",", ":"),
+    ).encode()
+    body = zlib.compress(index + bundle.text.encode(), level=9)
+    return _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(index)) + body
+
+
+def decode_bundle(data: bytes) -> BookBundle:
+    """Parse an encoded bundle; raises ValueError if it is not a readable bundle."""
+    try:
+        magic, fmt, index_len = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or fmt != _FORMAT_VERSION:
+            raise ValueError(f"unexpected bundle header {magic!r} v{fmt}")
+        body = zlib.decompress(data[_HEADER.size :])
+        index = json.loads(body[:index_len])
+        if index["separator"] != BUNDLE_SEPARATOR:
+            raise ValueError(f"unexpected chunk separator {index['separator']!r}")
+        text = body[index_len:].decode()
+        token_counts = index.get("token_counts")
+        if token_counts is None:  # published before token counts were added
+            token_counts = [
+                estimate_tokens(text[s:e])
+                for s, e in zip(index["starts"], index["ends"], strict=True)
+            ]
+        return BookBundle(
+            book_id=index["book_id"],
+            chunks_version=index["chunks_version"],
+            text=text,
+            starts=index["starts"],
+            ends=index["ends"],
+            kinds=index["kinds"],
+            chapter_ids=index["chapter_ids"],
+            chapters=index["chapters"],
+            hints=index["hints"],
+            token_counts=token_counts,
+            chapter_boundaries=[tuple(b) for b in index["chapter_boundaries"]],
+            summaries=index.get("summaries", []),
+        )
+    except (struct.error, zlib.error, KeyError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"unreadable bundle: {e}") from e
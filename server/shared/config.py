@@ -48,6 +48,7 @@ class SupabaseSettings(LazySecretsSettings):
     url: str = ""
     secret_key: str = "${SUPABASE_SECRET_KEY}"
     books_bucket: str = "readme_dev"
+    tts_cache_bucket: str = ""  # set to share synthesized speech across containers
 
 
 class DailySettings(LazySecretsSettings):
@@ -65,6 +66,37 @@ class KeysSettings(LazySecretsSettings):
 
 class BotSettings(BaseModel):
     start_url: str = "http://bot:7860/start"
+    book_cache_max_books: int = 16
+    book_cache_dir: str = "/tmp/readme_book_cache"  # empty disables the on-disk tier
+    progress_flush_interval_secs: float = 5.0
+    usage_flush_interval_secs: float = 30.0
+    # Passages handed to TTS while the one before is still playing; 0 waits for each to end
+    read_ahead_chunks: int = 1
+    history_token_budget: int = 3000  # conversation history sent with each LLM turn
+    prompt_token_budget: int = 2000  # book text in each QA / FINISHED system prompt
+    # LLM model per state (book_selection, reading, qa, finished); others use llm_model
+    llm_model: str = "gpt-4"
+    llm_state_models: dict[str, str] = {
+        "book_selection": "gpt-4o-mini",
+        "reading": "gpt-4o-mini",
+        "finished": "gpt-4o-mini",
+    }
+    answer_cache_max_entries: int = 4096  # QA answers shared across sessions
+    answer_cache_dir: str = ""  # set to persist cached QA answers across restarts
+    tts_cache_dir: str = "/tmp/readme_tts_cache"  # empty disables the on-disk tier
+    tts_cache_max_disk_mb: int = 2048
+
+
+class PricingSettings(BaseModel):
+    """List prices usage is costed at; set them to the plans in use."""
+
+    # USD per million tokens: (prompt, cached prompt, completion); unlisted models cost 0
+    llm_per_million_tokens: dict[str, tuple[float, float, float]] = {
+        "gpt-4": (30.0, 30.0, 60.0),
+        "gpt-4o-mini": (0.15, 0.075, 0.6),
+    }
+    tts_per_million_characters: float = 40.0
+    stt_per_minute: float = 0.0077
 
 
 class ModalSettings(LazySecretsSettings):
@@ -106,6 +138,7 @@ class Settings(BaseSettings):
     daily: DailySettings = DailySettings()
     keys: KeysSettings = KeysSettings()
     bot: BotSettings = BotSettings()
+    pricing: PricingSettings = PricingSettings()
     modal: ModalSettings = ModalSettings()
     upload: UploadSettings = UploadSettings()
     admin: AdminSettings = AdminSettings()
@@ -4,11 +4,38 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from supabase import Client, create_client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, create_client
 
 from shared.config import settings
 
+# One pooled HTTP/2 connection set per process. PostgREST and Storage requests
+# are multiplexed over a handful of kept-alive connections instead of paying a
+# TLS handshake per query.
+_ASYNC_HTTP_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=120,
+)
+_ASYNC_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
 
 @lru_cache(maxsize=1)
 def get_client() -> Client:
     return create_client(settings.supabase.url, settings.supabase.secret_key)
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> AsyncClient:
+    """Asyncio-native client for code running on an event loop (the bot)."""
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=_ASYNC_HTTP_LIMITS,
+        timeout=_ASYNC_HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+    return AsyncClient(
+        settings.supabase.url,
+        settings.supabase.secret_key,
+        options=AsyncClientOptions(httpx_client=http_client),
+    )
@@ -0,0 +1,33 @@
+"""Token estimates shared by the ingestion worker and the bot.
+
+The bot talks to more than one LLM provider and no tokenizer is a dependency,
+so counts are the usual ~4 characters per token estimate. They are used for
+budgeting and metrics, where being consistent matters more than being exact.
+"""
+
+from __future__ import annotations
+
+CHARS_PER_TOKEN = 4
+# Role markers and separators the chat format adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of ``text`` (0 for an empty string)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: object) -> int:
+    """Estimated token count of one chat message, tool calls included."""
+    if not isinstance(message, dict):
+        return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(str(message))
+    content = message.get("content")
+    if isinstance(content, list):
+        text = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    else:
+        text = content or ""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(text)
+    for call in message.get("tool_calls") or ():
+        function = call.get("function", {}) if isinstance(call, dict) else {}
+        tokens += estimate_tokens(function.get("name", "") + function.get("arguments", ""))
+    return tokens
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.routers.usage import usage_cost
+from tests.api.conftest import TEST_USER_ID
+
+client = TestClient(app)
+
+
+def _row(book_id, state, model, **usage):
+    return {
+        "book_id": book_id,
+        "title": {"b1": "Alice", "b2": "The Fox", None: None}[book_id],
+        "book_sessions": {"b1": 2, "b2": 1, None: 3}[book_id],
+        "state": state,
+        "model": model,
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "cached_prompt_tokens": usage.get("cached_prompt_tokens", 0),
+        "tts_characters": usage.get("tts_characters", 0),
+        "stt_seconds": usage.get("stt_seconds", 0.0),
+    }
+
+
+ROWS = [
+    _row("b1", "qa", "gpt-4", prompt_tokens=100_000, completion_tokens=10_000),
+    _row("b1", "reading", "sonic-2", tts_characters=50_000),
+    _row("b1", "reading", "nova-3", stt_seconds=600.0),
+    _row("b2", "finished", "gpt-4o-mini", prompt_tokens=20_000, completion_tokens=1_000),
+    _row(None, "book_selection", "gpt-4o-mini", prompt_tokens=4_000, completion_tokens=500),
+]
+
+
+def _get_usage(rows, household_id=TEST_USER_ID):
+    with patch("api.routers.usage._supabase_client") as mock_sb:
+        mock_sb.return_value.rpc.return_value.execute.return_value = MagicMock(data=rows)
+        resp = client.get("/usage/books", params={"household_id": household_id})
+    return resp, mock_sb.return_value
+
+
+def test_usage_cost_prices_each_service():
+    assert usage_cost(ROWS[0]) == pytest.approx(100_000 * 30e-6 + 10_000 * 60e-6)
+    assert usage_cost(ROWS[1]) == pytest.approx(50_000 * 40e-6)
+    assert usage_cost(ROWS[2]) == pytest.approx(10 * 0.0077)
+
+
+def test_cached_prompt_tokens_are_priced_at_the_cached_rate():
+    row = _row("b2", "qa", "gpt-4o-mini", prompt_tokens=1_000_000, cached_prompt_tokens=800_000)
+    assert usage_cost(row) == pytest.approx(200_000 * 0.15e-6 + 800_000 * 0.075e-6)
+
+
+def test_book_usage_groups_rows_per_book_most_expensive_first():
+    resp, sb = _get_usage(ROWS)
+
+    assert resp.status_code == 200
+    sb.rpc.assert_called_once_with("get_book_usage", {"p_household_id": TEST_USER_ID})
+    books = resp.json()
+    assert [b["book_id"] for b in books] == ["b1", "b2", None]
+    alice = books[0]
+    assert alice["title"] == "Alice"
+    assert alice["sessions"] == 2
+    assert [line["model"] for line in alice["lines"]] == ["gpt-4", "sonic-2", "nova-3"]
+    assert alice["cost_usd"] == pytest.approx(sum(usage_cost(r) for r in ROWS[:3]))
+    assert alice["cost_per_session_usd"] == pytest.approx(alice["cost_usd"] / 2)
+
+
+def test_book_usage_of_another_household_is_forbidden():
+    resp, sb = _get_usage(ROWS, household_id="someone-elses-household")
+
+    assert resp.status_code == 403
+    sb.rpc.assert_not_called()
+
+
+def test_book_usage_without_any_usage_is_empty():
+    resp, _ = _get_usage([])
+
+    assert resp.status_code == 200
+    assert resp.json() == []
@@ -1,5 +1,8 @@
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
 
 # Ensure server/ is FIRST on sys.path so `bot` resolves to server/bot/ (package)
 # and not the repo-root bot.py shim that other test modules add via their sys.path hacks.
@@ -13,3 +16,56 @@ sys.path.insert(0, _server_dir)
 for key in list(sys.modules):
     if key == "bot" or key.startswith("bot."):
         del sys.modules[key]
+
+
+@pytest.fixture(autouse=True)
+def _clear_book_list_cache():
+    from bot.library import invalidate_book_list_cache
+
+    invalidate_book_list_cache()
+    yield
+    invalidate_book_list_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_prompt_prefix_cache():
+    from bot.processors.state_manager import _prompt_prefix_cache
+
+    _prompt_prefix_cache.clear()
+    yield
+    _prompt_prefix_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_book_cache():
+    """Each test gets an empty, memory-only book cache."""
+    from bot.book_cache import BookCache
+
+    with patch("bot.library.get_book_cache", return_value=BookCache(max_books=4)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_answer_cache():
+    """Each test gets an empty, memory-only QA answer cache."""
+    from bot.answer_cache import AnswerCache
+
+    with patch(
+        "bot.processors.state_manager.get_answer_cache",
+        return_value=AnswerCache(max_entries=64),
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+async def progress_checkpointer():
+    """Each test gets its own progress queue; the bulk upsert is mocked out."""
+    from bot.progress_checkpointer import ProgressCheckpointer
+
+    checkpointer = ProgressCheckpointer(flush_interval_secs=60.0)
+    with (
+        patch("bot.library.get_progress_checkpointer", return_value=checkpointer),
+        patch("bot.progress_checkpointer.save_reading_progress_batch", AsyncMock()),
+    ):
+        yield checkpointer
+        await checkpointer.flush()
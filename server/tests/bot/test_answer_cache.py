@@ -0,0 +1,99 @@
+"""Unit tests for AnswerCache."""
+
+from __future__ import annotations
+
+from bot.answer_cache import AnswerCache, AnswerKey, question_key
+
+KEY = AnswerKey("book_001", 1, 0, "who is the white rabbit")
+
+
+class TestQuestionKey:
+    def test_normalizes_case_punctuation_and_filler(self):
+        assert question_key("Um, who is the White Rabbit?") == "who is the white rabbit"
+        assert question_key("who is the white rabbit") == "who is the white rabbit"
+
+    def test_questions_that_point_back_at_the_conversation_are_not_keyed(self):
+        assert question_key("why did she do that?") is None
+        assert question_key("what is it?") is None
+
+    def test_too_short_or_too_long_is_not_keyed(self):
+        assert question_key("why?") is None
+        assert question_key("and " * 20 + "why is the cat grinning") is None
+
+
+class TestAnswerCache:
+    async def test_hit_after_put(self):
+        cache = AnswerCache(max_entries=4)
+        cache.put(KEY, "A rabbit in a waistcoat.", position=3)
+
+        assert await cache.get(KEY, position=3) == "A rabbit in a waistcoat."
+        assert await cache.get(KEY, position=10) == "A rabbit in a waistcoat."
+        assert cache.stats()["hits"] == 2
+
+    async def test_spoiler_guard_hides_answers_from_further_on(self):
+        cache = AnswerCache(max_entries=4)
+        cache.put(KEY, "A rabbit in a waistcoat.", position=3)
+
+        assert await cache.get(KEY, position=2) is None
+        assert cache.stats()["spoiler_guarded"] == 1
+
+    async def test_the_answer_from_earliest_in_the_book_is_kept(self):
+        cache = AnswerCache(max_entries=4)
+        cache.put(KEY, "later answer", position=5)
+        cache.put(KEY, "earlier answer", position=2)
+        cache.put(KEY, "even later answer", position=8)
+
+        assert await cache.get(KEY, position=9) == "earlier answer"
+        assert cache.stats()["stores"] == 2
+
+    async def test_other_versions_miss(self):
+        cache = AnswerCache(max_entries=4)
+        cache.put(KEY, "answer", position=0)
+
+        assert await cache.get(AnswerKey("book_001", 2, 0, KEY.question), position=0) is None
+
+    async def test_lru_eviction(self):
+        cache = AnswerCache(max_entries=2)
+        keys = [AnswerKey("book_001", 1, 0, f"question {i}") for i in range(3)]
+        for key in keys:
+            cache.put(key, "answer", position=0)
+
+        assert await cache.get(keys[0], position=0) is None
+        assert cache.stats()["evictions"] == 1
+
+    async def test_hit_rate(self):
+        cache = AnswerCache(max_entries=4)
+        assert cache.hit_rate() == 0.0
+        await cache.get(KEY, position=0)
+        cache.put(KEY, "answer", position=0)
+        await cache.get(KEY, position=0)
+
+        assert cache.hit_rate() == 0.5
+
+
+class TestAnswerCacheDisk:
+    async def test_answers_survive_a_restart(self, tmp_path):
+        cache = AnswerCache(max_entries=4, cache_dir=tmp_path)
+        cache.put(KEY, "answer", position=3)
+        await cache.drain()
+
+        restarted = AnswerCache(max_entries=4, cache_dir=tmp_path)
+
+        assert await restarted.get(KEY, position=3) == "answer"
+        assert await restarted.get(KEY, position=2) is None
+
+    async def test_new_version_replaces_the_old_file(self, tmp_path):
+        cache = AnswerCache(max_entries=4, cache_dir=tmp_path)
+        cache.put(KEY, "old", position=0)
+        cache.put(AnswerKey("book_001", 2, 0, KEY.question), "new", position=0)
+        await cache.drain()
+
+        assert [p.name for p in tmp_path.iterdir()] == ["book_001.2.jsonl"]
+
+    async def test_unreadable_file_is_discarded(self, tmp_path):
+        (tmp_path / "book_001.1.jsonl").write_text("not json\n")
+
+        cache = AnswerCache(max_entries=4, cache_dir=tmp_path)
+
+        assert await cache.get(KEY, position=0) is None
+        assert not (tmp_path / "book_001.1.jsonl").exists()
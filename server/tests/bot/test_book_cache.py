@@ -0,0 +1,94 @@
+"""Unit tests for the two-tier BookCache."""
+
+from __future__ import annotations
+
+from bot.book_cache import BookCache
+from bot.chunk_store import ChunkStore
+
+ROWS = [
+    {
+        "chunk_index": 0,
+        "chunk_kind": "chapter_title",
+        "chapter_title": "Chapter I",
+        "chunk_hint": "Start of chapter: Chapter I",
+        "text": "Chapter I",
+    },
+    {
+        "chunk_index": 1,
+        "chunk_kind": "content",
+        "chapter_title": "Chapter I",
+        "chunk_hint": "Alice sees a rabbit — «vite»!",
+        "text": "Once upon a time, a rabbit ran past. «Oh dear!»",
+    },
+]
+STORE = ChunkStore.from_rows(ROWS)
+
+
+class TestBookCacheMemoryTier:
+    async def test_miss_then_hit(self):
+        cache = BookCache(max_books=2)
+        assert await cache.get("b1", 1) is None
+        await cache.put("b1", 1, STORE)
+        assert (await cache.get("b1", 1)).rows() == ROWS
+        assert cache.stats() == {"memory_hits": 1, "disk_hits": 0, "misses": 1, "evictions": 0}
+
+    async def test_version_mismatch_is_a_miss(self):
+        cache = BookCache(max_books=2)
+        await cache.put("b1", 1, STORE)
+        assert await cache.get("b1", 2) is None
+        assert cache.stats()["misses"] == 1
+
+    async def test_new_version_replaces_old_entry_without_eviction(self):
+        cache = BookCache(max_books=2)
+        await cache.put("b1", 1, STORE)
+        await cache.put("b1", 2, ChunkStore.from_rows(ROWS[:1]))
+        assert (await cache.get("b1", 2)).rows() == ROWS[:1]
+        assert await cache.get("b1", 1) is None
+        assert cache.stats()["evictions"] == 0
+
+    async def test_least_recently_used_book_is_evicted(self):
+        cache = BookCache(max_books=2)
+        await cache.put("b1", 1, STORE)
+        await cache.put("b2", 1, STORE)
+        await cache.get("b1", 1)  # b2 is now least recently used
+        await cache.put("b3", 1, STORE)
+        assert await cache.get("b2", 1) is None
+        assert (await cache.get("b1", 1)).rows() == ROWS
+        assert cache.stats()["evictions"] == 1
+
+
+class TestBookCacheDiskTier:
+    async def test_other_process_reads_from_disk(self, tmp_path):
+        await BookCache(max_books=2, cache_dir=tmp_path).put("b1", 3, STORE)
+
+        other = BookCache(max_books=2, cache_dir=tmp_path)
+        assert (await other.get("b1", 3)).rows() == ROWS
+        assert other.stats()["disk_hits"] == 1
+        # Promoted into memory for the next lookup
+        assert (await other.get("b1", 3)).rows() == ROWS
+        assert other.stats()["memory_hits"] == 1
+
+    async def test_memory_eviction_falls_back_to_disk(self, tmp_path):
+        cache = BookCache(max_books=1, cache_dir=tmp_path)
+        await cache.put("b1", 1, STORE)
+        await cache.put("b2", 1, STORE)
+        assert (await cache.get("b1", 1)).rows() == ROWS
+        assert cache.stats()["disk_hits"] == 1
+
+    async def test_new_version_removes_old_file(self, tmp_path):
+        cache = BookCache(max_books=2, cache_dir=tmp_path)
+        await cache.put("b1", 1, STORE)
+        await cache.put("b1", 2, STORE)
+        assert sorted(p.name for p in tmp_path.glob("*.bin")) == ["b1.2.bin"]
+
+    async def test_corrupt_file_is_discarded_as_miss(self, tmp_path):
+        (tmp_path / "b1.1.bin").write_bytes(b"not a cache file")
+        cache = BookCache(max_books=2, cache_dir=tmp_path)
+        assert await cache.get("b1", 1) is None
+        assert not (tmp_path / "b1.1.bin").exists()
+        assert cache.stats()["misses"] == 1
+
+    async def test_unsafe_book_id_stays_inside_cache_dir(self, tmp_path):
+        cache = BookCache(max_books=2, cache_dir=tmp_path)
+        await cache.put("../escape", 1, STORE)
+        assert [p.parent for p in tmp_path.glob("*.bin")] == [tmp_path]
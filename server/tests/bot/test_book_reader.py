@@ -7,7 +7,7 @@ and the interruption guard.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from pipecat.frames.frames import (
@@ -96,10 +96,10 @@ def _patch_supabase(progress: int = 0):
     """Return a context manager that patches all Supabase calls."""
     return patch.multiple(
         "bot.processors.book_reader",
-        get_book_metadata=MagicMock(return_value=FAKE_META),
-        get_book_chunks=MagicMock(return_value=FAKE_CHUNKS),
-        get_reading_progress=MagicMock(return_value=progress),
-        save_reading_progress=MagicMock(),
+        get_book_metadata=AsyncMock(return_value=FAKE_META),
+        get_book_chunks=AsyncMock(return_value=FAKE_CHUNKS),
+        get_reading_progress=AsyncMock(return_value=progress),
+        save_reading_progress=AsyncMock(),
     )
 
 
@@ -193,6 +193,26 @@ async def test_system_prompt_updates_on_qa_transition(processor, collector):
     assert "EXPLICITLY asks to resume" in messages[0]["content"]
 
 
+@pytest.mark.asyncio
+async def test_qa_system_prompt_keeps_the_book_in_a_stable_prefix(processor, collector):
+    """Only the passage preview at the end changes as reading moves on."""
+    processor.push_frame = collector
+
+    with _patch_supabase():
+        await processor.initialize_book("book_demo_001")
+    processor._state = State.QA
+
+    first = processor.get_system_prompt()
+    processor._current_chunk_index += 1
+    second = processor.get_system_prompt()
+
+    assert first.startswith(processor._qa_prompt_prefix)
+    assert second.startswith(processor._qa_prompt_prefix)
+    assert "EXPLICITLY asks to resume" in processor._qa_prompt_prefix
+    assert first != second
+    assert first.endswith('"')
+
+
 @pytest.mark.asyncio
 async def test_system_prompt_updates_on_affirm(processor, collector):
     """When affirm marker detected, system prompt should update for reading state."""
@@ -387,7 +407,7 @@ async def test_wait_long_marker_suppresses(processor, collector):
 
 @pytest.mark.asyncio
 async def test_no_marker_graceful_fallthrough(processor, collector):
-    """When no marker is found after buffer limit, text passes through."""
+    """A response that does not open with a marker passes through unchanged."""
     processor.push_frame = collector
 
     with _patch_supabase():
@@ -442,6 +462,64 @@ async def test_marker_resets_on_response_end(processor, collector):
     assert texts[0].text == "Here is the answer."
 
 
+async def _stream(processor, *texts: str) -> list[LLMTextFrame]:
+    frames = [LLMTextFrame(text=t) for t in texts]
+    for frame in frames:
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+    return frames
+
+
+@pytest.mark.asyncio
+async def test_marker_split_from_its_answer_across_frames(processor, collector):
+    """Leading whitespace, the marker and its space may each arrive in their own frame."""
+    processor.push_frame = collector
+
+    frames = await _stream(processor, " ", "\n", INTENT_ANSWER, " ", "The", " rabbit.")
+
+    assert collector.llm_text_frames() == frames[4:]
+    assert [f.text for f in collector.llm_text_frames()] == ["The", " rabbit."]
+
+
+@pytest.mark.asyncio
+async def test_answer_space_in_the_next_frame_is_stripped(processor, collector):
+    processor.push_frame = collector
+
+    await _stream(processor, INTENT_ANSWER, " Yes", "!")
+
+    assert [f.text for f in collector.llm_text_frames()] == ["Yes", "!"]
+
+
+@pytest.mark.asyncio
+async def test_unmarked_response_forwards_the_original_frames(processor, collector):
+    processor.push_frame = collector
+
+    frames = await _stream(processor, " ", "Hello", " there ★")
+
+    assert all(a is b for a, b in zip(collector.llm_text_frames(), frames, strict=True))
+    assert frames[2].text == " there ★"  # only the first code point can be a marker
+
+
+@pytest.mark.asyncio
+async def test_whitespace_only_response_is_flushed_at_the_end(processor, collector):
+    processor.push_frame = collector
+
+    frames = await _stream(processor, " ", "\n")
+    await processor.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+
+    assert collector.llm_text_frames() == frames
+
+
+@pytest.mark.asyncio
+async def test_wait_marker_after_whitespace_drops_the_response(processor, collector):
+    processor.push_frame = collector
+
+    await _stream(processor, "  ", INTENT_WAIT_SHORT, " hmm")
+
+    assert collector.llm_text_frames() == []
+    assert processor._wait_task is not None
+    processor._cancel_wait()
+
+
 # ======================================================================
 # Reading / TTS flow
 # ======================================================================
@@ -548,20 +626,20 @@ async def test_chunks_read_tracked_on_advance(processor, collector):
 
 @pytest.mark.asyncio
 async def test_save_progress(processor):
-    mock_save = MagicMock()
+    mock_save = AsyncMock()
     with patch.multiple(
         "bot.processors.book_reader",
-        get_book_metadata=MagicMock(return_value=FAKE_META),
-        get_book_chunks=MagicMock(return_value=FAKE_CHUNKS),
-        get_reading_progress=MagicMock(return_value=0),
+        get_book_metadata=AsyncMock(return_value=FAKE_META),
+        get_book_chunks=AsyncMock(return_value=FAKE_CHUNKS),
+        get_reading_progress=AsyncMock(return_value=0),
         save_reading_progress=mock_save,
     ):
         await processor.initialize_book("book_demo_001")
 
         processor._current_chunk_index = 5
-        processor.save_progress()
+        await processor.save_progress()
 
-        mock_save.assert_called_once_with("book_demo_001", "test_kid", 5)
+        mock_save.assert_awaited_once_with("book_demo_001", "test_kid", 5)
 
 
 # ======================================================================
@@ -0,0 +1,93 @@
+"""Unit tests for the chapter boundary index."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.chapter_index import ChapterIndex, normalize
+
+# Chapter headings of the recorded Alice excerpt (tests/workers/recordings)
+ALICE = ChapterIndex(
+    [
+        (0, "Chapter I. Down the Rabbit-Hole"),
+        (12, "Chapter III. A Caucus-Race and a Long Tale"),
+        (25, "Chapter VI. Pig and Pepper"),
+    ],
+    total_chunks=37,
+)
+
+UNNUMBERED = ChapterIndex(
+    [(0, "The Storm"), (5, "Lost at Sea"), (9, "Home Again")],
+    total_chunks=12,
+)
+
+
+class TestChapterAt:
+    @pytest.mark.parametrize(
+        ("chunk_index", "title"),
+        [
+            (0, "Chapter I. Down the Rabbit-Hole"),
+            (11, "Chapter I. Down the Rabbit-Hole"),
+            (12, "Chapter III. A Caucus-Race and a Long Tale"),
+            (36, "Chapter VI. Pig and Pepper"),
+        ],
+    )
+    def test_bisects_to_containing_chapter(self, chunk_index, title):
+        assert ALICE.chapter_at(chunk_index).title == title
+
+    def test_out_of_range(self):
+        assert ALICE.chapter_at(-1) is None
+        assert ALICE.chapter_at(37) is None
+
+    def test_chapter_span_and_number(self):
+        chapter = ALICE.chapter_at(20)
+        assert (chapter.number, chapter.start, chapter.end) == (2, 12, 25)
+
+    def test_empty_index(self):
+        empty = ChapterIndex([], 0)
+        assert len(empty) == 0
+        assert empty.chapter_at(0) is None
+        assert empty.resolve("chapter 1") is None
+
+
+class TestResolve:
+    @pytest.mark.parametrize(
+        ("reference", "start"),
+        [
+            ("chapter 3", 12),
+            ("Chapter three", 12),
+            ("the third chapter", 12),
+            ("chapter VI", 25),
+            ("6", 25),
+            ("Pig and Pepper", 25),
+            ("pig and peper", 25),
+            ("the pig one", 25),
+            ("the caucus race", 12),
+            ("down the rabbit hole", 0),
+            ("Chapter VI. Pig and Pepper", 25),
+        ],
+    )
+    def test_numbered_titles(self, reference, start):
+        assert ALICE.resolve(reference).start == start
+
+    def test_number_missing_from_excerpt_is_not_guessed(self):
+        # The excerpt has no Chapter II — don't fall back to the second chapter
+        assert ALICE.resolve("chapter 2") is None
+
+    def test_unrelated_name_is_none(self):
+        assert ALICE.resolve("the mad hatter's tea party") is None
+        assert ALICE.resolve("") is None
+
+    @pytest.mark.parametrize(
+        ("reference", "start"),
+        [("chapter 2", 5), ("second", 5), (3, 9), ("home again", 9), ("lost at see", 5)],
+    )
+    def test_unnumbered_titles_use_book_order(self, reference, start):
+        assert UNNUMBERED.resolve(reference).start == start
+
+    def test_plain_word_is_not_read_as_roman_numeral(self):
+        assert UNNUMBERED.resolve("mix") is None
+
+
+def test_normalize():
+    assert normalize("  Chapter III. A Caucus-Race — «Élan»! ") == "chapter iii a caucus race elan"
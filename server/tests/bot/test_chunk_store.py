@@ -0,0 +1,155 @@
+"""Unit tests for the array-backed ChunkStore."""
+
+from __future__ import annotations
+
+from bot.chunk_store import CHUNK_SEPARATOR, BookChunk, ChapterSummary, ChunkKind, ChunkStore
+from shared.book_bundle import build_bundle, decode_bundle, encode_bundle
+from shared.tokens import estimate_tokens
+
+ROWS = [
+    {
+        "chunk_index": 0,
+        "chunk_kind": "chapter_title",
+        "chapter_title": "Chapter I",
+        "chunk_hint": "Start of chapter: Chapter I",
+        "text": "Chapter I",
+    },
+    {
+        "chunk_index": 1,
+        "chunk_kind": "content",
+        "chapter_title": "Chapter I",
+        "chunk_hint": "Alice sees a rabbit",
+        "text": "Once upon a time, a rabbit ran past. «Oh dear!»",
+    },
+    {
+        "chunk_index": 2,
+        "chunk_kind": "chapter_title",
+        "chapter_title": "Chapter II",
+        "chunk_hint": "Start of chapter: Chapter II",
+        "text": "Chapter II",
+    },
+]
+
+SUMMARIES = [
+    {
+        "chapter_index": 1,
+        "chapter_title": "Chapter II",
+        "first_chunk_index": 2,
+        "summary": "Nothing yet.",
+        "story_so_far": "A rabbit ran past.",
+    },
+    {
+        "chapter_index": 0,
+        "chapter_title": "Chapter I",
+        "first_chunk_index": 0,
+        "summary": "A rabbit runs past.",
+        "story_so_far": "A rabbit ran past.",
+    },
+]
+
+
+class TestChunkStore:
+    def test_views_read_back_every_field(self):
+        store = ChunkStore.from_rows(ROWS)
+        chunk = store[1]
+        assert isinstance(chunk, BookChunk)
+        assert chunk.chunk_index == 1
+        assert chunk.chunk_kind is ChunkKind.CONTENT
+        assert chunk.chapter_title == "Chapter I"
+        assert chunk.chunk_hint == "Alice sees a rabbit"
+        assert chunk.text == ROWS[1]["text"]
+        assert store.rows() == ROWS
+
+    def test_rows_may_arrive_out_of_order(self):
+        assert ChunkStore.from_rows(reversed(ROWS)).rows() == ROWS
+
+    def test_full_text_is_the_buffer(self):
+        store = ChunkStore.from_rows(ROWS)
+        assert store.full_text == CHUNK_SEPARATOR.join(r["text"] for r in ROWS)
+        assert store.full_text is store.full_text
+
+    def test_out_of_range_is_none(self):
+        store = ChunkStore.from_rows(ROWS)
+        assert store[-1] is None
+        assert store[3] is None
+
+    def test_window_uses_absolute_indices(self):
+        store = ChunkStore.from_rows(ROWS[1:], first_index=1, count=2)
+        assert store[0] is None
+        assert store[2].text == "Chapter II"
+        assert store.covers(1) and not store.covers(0)
+
+    def test_gaps_are_missing_and_skipped_by_full_text(self):
+        store = ChunkStore.from_rows([ROWS[0], ROWS[2]], count=3)
+        assert len(store) == 3
+        assert store.missing == 1
+        assert store[1] is None
+        assert store.full_text == f"Chapter I{CHUNK_SEPARATOR}Chapter II"
+        assert [c.chunk_index for c in store] == [0, 2]
+
+    def test_chapter_boundaries_point_at_first_chunk(self):
+        store = ChunkStore.from_rows(ROWS)
+        assert store.chapter_boundaries() == [(0, "Chapter I"), (2, "Chapter II")]
+
+    def test_index_round_trip(self):
+        store = ChunkStore.from_rows([ROWS[0], ROWS[2]], count=3)
+        restored = ChunkStore.from_index(store.to_index(), store.full_text)
+        assert restored.rows() == store.rows()
+        assert restored.missing == 1
+
+    def test_index_round_trip_keeps_token_counts(self):
+        store = ChunkStore.from_rows([{**ROWS[1], "token_count": 99}, ROWS[0]])
+        index = store.to_index()
+        assert ChunkStore.from_index(index, store.full_text)[1].token_count == 99
+        del index["token_counts"]  # written before token counts were stored
+        restored = ChunkStore.from_index(index, store.full_text)
+        assert restored[1].token_count == estimate_tokens(ROWS[1]["text"])
+
+    def test_token_counts_come_from_rows_or_estimates(self):
+        store = ChunkStore.from_rows([{**ROWS[0], "token_count": 7}, ROWS[1]])
+        assert store[0].token_count == 7
+        assert store[1].token_count == estimate_tokens(ROWS[1]["text"])
+
+    def test_tokens_between_is_inclusive_and_clamped(self):
+        rows = [{**row, "token_count": 10 * (i + 1)} for i, row in enumerate(ROWS)]
+        store = ChunkStore.from_rows(rows[1:], first_index=1)
+        assert store.tokens_between(1, 2) == 50
+        assert store.tokens_between(0, 9) == 50
+        assert store.tokens_between(2, 1) == 0
+
+    def test_window_start_fits_the_budget(self):
+        rows = [
+            {"chunk_index": i, "chapter_title": "Ch", "text": "x", "token_count": 100}
+            for i in range(10)
+        ]
+        store = ChunkStore.from_rows(rows)
+        assert store.window_start(9, 350) == 7
+        assert store.window_start(9, 300) == 7
+        assert store.window_start(2, 10_000) == 0
+        assert store.window_start(9, 50) == 9  # the last chunk always counts
+
+    def test_views_compare_by_content(self):
+        assert ChunkStore.from_rows(ROWS)[1] == ChunkStore.from_rows(ROWS)[1]
+        assert ChunkStore.from_rows(ROWS)[0] != ChunkStore.from_rows(ROWS)[1]
+
+    def test_bundle_matches_rows(self):
+        bundle = decode_bundle(encode_bundle(build_bundle("b1", 1, ROWS)))
+        store = ChunkStore.from_bundle(bundle)
+        assert store.rows() == ROWS
+        assert store.full_text == ChunkStore.from_rows(ROWS).full_text
+        assert store.chapter_boundaries() == [(0, "Chapter I"), (2, "Chapter II")]
+
+    def test_summaries_are_kept_in_book_order(self):
+        store = ChunkStore.from_rows(ROWS, summaries=SUMMARIES)
+        assert [s.chapter_title for s in store.summaries] == ["Chapter I", "Chapter II"]
+        assert store.summaries[0] == ChapterSummary(**SUMMARIES[1])
+        assert ChunkStore.from_rows(ROWS).summaries == ()
+
+    def test_summaries_survive_index_and_bundle(self):
+        store = ChunkStore.from_rows(ROWS, summaries=SUMMARIES)
+        index = store.to_index()
+        assert ChunkStore.from_index(index, store.full_text).summaries == store.summaries
+        del index["summaries"]  # written before summaries were stored
+        assert ChunkStore.from_index(index, store.full_text).summaries == ()
+        bundle = decode_bundle(encode_bundle(build_bundle("b1", 1, ROWS, SUMMARIES)))
+        assert ChunkStore.from_bundle(bundle).summaries == store.summaries
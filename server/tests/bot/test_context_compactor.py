@@ -0,0 +1,122 @@
+"""Unit tests for the ContextCompactor."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+from bot.chunk_store import ChunkStore
+from bot.processors.context_compactor import (
+    READ_ALOUD_NOTE,
+    ContextCompactor,
+    compact_history,
+    passage_key,
+)
+
+STORE = ChunkStore.from_rows(
+    [
+        {
+            "chunk_index": i,
+            "chapter_title": "Chapter I" if i < 3 else "Chapter II",
+            "chunk_hint": f"Hint {i}.",
+            "text": f"Passage number {i} of the story, where something long happens. " * 4,
+        }
+        for i in range(6)
+    ]
+)
+READ = {passage_key(chunk.text): chunk for chunk in STORE}
+
+
+def _read_aloud(text: str):
+    return READ.get(passage_key(text))
+
+
+def _spoken(i: int) -> dict:
+    # TTS hands back the words with its own spacing
+    return {"role": "assistant", "content": "  ".join(STORE[i].text.split())}
+
+
+def _user(text: str) -> dict:
+    return {"role": "user", "content": text}
+
+
+class TestCompactHistory:
+    def test_runs_of_read_aloud_turns_become_one_note(self):
+        messages = [_spoken(0), _spoken(1), _spoken(2), _spoken(3), _user("who is that?")]
+
+        compacted = compact_history(messages, _read_aloud, budget_tokens=10_000)
+
+        assert len(compacted) == 2
+        note = compacted[0]["content"]
+        assert note.startswith(READ_ALOUD_NOTE)
+        assert 'passages 0-3 of "Chapter I", "Chapter II"' in note
+        assert "Hint 3." in note
+        assert compacted[1] == _user("who is that?")
+
+    def test_dialogue_is_kept_verbatim(self):
+        answer = {"role": "assistant", "content": "The rabbit is late for a party!"}
+        messages = [_spoken(0), _user("why is he running?"), answer, _spoken(1), _user("ok")]
+
+        compacted = compact_history(messages, _read_aloud, budget_tokens=10_000)
+
+        assert compacted[1:3] == [_user("why is he running?"), answer]
+        assert [m["role"] for m in compacted] == ["system", "user", "assistant", "system", "user"]
+
+    def test_nothing_to_do_returns_none(self):
+        messages = [_user("hello"), {"role": "assistant", "content": "Hi!"}]
+        assert compact_history(messages, _read_aloud, budget_tokens=10_000) is None
+
+    def test_budget_drops_notes_before_dialogue(self):
+        messages = [_user("hello " * 20), _spoken(0), _user("what now?")]
+
+        compacted = compact_history(messages, _read_aloud, budget_tokens=45)
+
+        assert compacted == [_user("hello " * 20), _user("what now?")]
+
+    def test_budget_keeps_the_latest_turn(self):
+        latest = _user("a very long question " * 50)
+        compacted = compact_history([_user("hi"), latest], _read_aloud, budget_tokens=10)
+        assert compacted == [latest]
+
+    def test_tool_results_are_dropped_with_their_call(self):
+        call = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "c1", "function": {"name": "list_books", "arguments": "{}"}}],
+        }
+        result = {"role": "tool", "tool_call_id": "c1", "content": "0. The Rabbit " * 30}
+        messages = [call, result, _user("the rabbit one")]
+
+        compacted = compact_history(messages, _read_aloud, budget_tokens=20)
+
+        assert compacted == [_user("the rabbit one")]
+
+    def test_compacting_twice_is_stable(self):
+        messages = [_spoken(0), _spoken(1), _user("more")]
+        once = compact_history(messages, _read_aloud, budget_tokens=10_000)
+        assert compact_history(once, _read_aloud, budget_tokens=10_000) is None
+
+
+class TestContextCompactor:
+    async def test_rewrites_the_shared_context(self):
+        state_manager = MagicMock()
+        state_manager.read_aloud_chunk = _read_aloud
+        processor = ContextCompactor(state_manager, budget_tokens=10_000)
+        pushed: list[Frame] = []
+
+        async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+            pushed.append(frame)
+
+        processor.push_frame = push_frame
+        context = LLMContext(messages=[_spoken(0), _spoken(1), _user("why?")])
+        frame = LLMContextFrame(context)
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+        messages = context.get_messages()
+        assert len(messages) == 2
+        assert messages[0]["content"].startswith(READ_ALOUD_NOTE)
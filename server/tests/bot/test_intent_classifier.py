@@ -0,0 +1,67 @@
+"""Unit tests for the local resume / goodbye intent classifier."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bot.intent_classifier import MAX_COMMAND_WORDS, Intent, classify
+
+# Labelled utterances: label is "resume", "end", or null for "the LLM's call"
+UTTERANCES = json.loads(
+    (Path(__file__).parent / "intent_utterances" / "labelled_utterances.json").read_text()
+)
+
+
+def _scores(intent: Intent) -> tuple[float, float]:
+    """(precision, recall) of ``classify`` for ``intent`` over the labelled set."""
+    predicted = [u for u in UTTERANCES if classify(u["text"]) == intent]
+    actual = [u for u in UTTERANCES if u["label"] == intent.value]
+    hits = sum(u["label"] == intent.value for u in predicted)
+    return hits / max(len(predicted), 1), hits / max(len(actual), 1)
+
+
+class TestLabelledSet:
+    @pytest.mark.parametrize("intent", list(Intent))
+    def test_precision_is_perfect(self, intent):
+        # A false hit resumes the story or hangs up on the child
+        precision, _ = _scores(intent)
+        assert precision == 1.0
+
+    @pytest.mark.parametrize("intent", list(Intent))
+    def test_recall_covers_common_phrasings(self, intent):
+        _, recall = _scores(intent)
+        assert recall >= 0.9
+
+    def test_set_has_every_label(self):
+        labels = {u["label"] for u in UTTERANCES}
+        assert labels == {"resume", "end", None}
+
+
+class TestClassify:
+    def test_filler_around_a_command(self):
+        assert classify("Okay, um, keep reading please!") is Intent.RESUME
+
+    def test_longest_phrase_wins(self):
+        assert classify("see you later") is Intent.END
+        assert classify("go back to the story") is Intent.RESUME
+
+    def test_polite_question_is_a_request(self):
+        assert classify("Can you keep going?") is Intent.RESUME
+        assert classify("Keep going?") is None
+
+    def test_negation_goes_to_the_llm(self):
+        assert classify("don't keep reading") is None
+        assert classify("I dont want to go on") is None
+
+    def test_mixed_commands_go_to_the_llm(self):
+        assert classify("keep reading, bye") is None
+
+    def test_unknown_words_go_to_the_llm(self):
+        assert classify("keep reading about the cat") is None
+
+    def test_long_or_empty_utterances_go_to_the_llm(self):
+        assert classify("") is None
+        assert classify(" ".join(["please"] * MAX_COMMAND_WORDS) + " keep reading") is None
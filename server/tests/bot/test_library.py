@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+from supabase import AsyncClient, AsyncClientOptions
 
+from bot import library as library_module
 from bot.library import Book, BookChunk, Library
+from shared.book_bundle import build_bundle, encode_bundle
 
 FAKE_BOOKS = [
     {"id": "book_001", "title": "The Rabbit", "status": "ready"},
@@ -36,115 +42,960 @@ FAKE_CHUNKS = [
     },
 ]
 
+SUMMARIES = [
+    {
+        "chapter_index": 0,
+        "chapter_title": "Chapter I",
+        "first_chunk_index": 0,
+        "summary": "A rabbit appears.",
+        "story_so_far": "A rabbit appeared.",
+    },
+    {
+        "chapter_index": 1,
+        "chapter_title": "Chapter II",
+        "first_chunk_index": 2,
+        "summary": "The story ends.",
+        "story_so_far": "A rabbit appeared, then the story ended.",
+    },
+]
+
+
+FAKE_BOOKS_WITH_PROGRESS = [
+    {
+        "id": "book_001",
+        "title": "The Rabbit",
+        "household_id": "hh1",
+        "status": "ready",
+        "current_chunk_index": 1,
+        "chapter_title": "Chapter I",
+        "chunk_text": "There was a rabbit.",
+    },
+    {
+        "id": "book_002",
+        "title": "The Fox",
+        "household_id": "hh1",
+        "status": "ready",
+        "current_chunk_index": 0,
+        "chapter_title": None,
+        "chunk_text": None,
+    },
+]
 
-def _patch_supabase(progress: int = 0, meta=FAKE_META, chunks=FAKE_CHUNKS, books=FAKE_BOOKS):
+
+def _chunk_source(chunks=FAKE_CHUNKS, summaries=()) -> dict[str, AsyncMock]:
+    """Mocks for the count + ranged chunk and summary fetches, served from in-memory lists."""
+
+    async def fake_range(book_id, start, end):
+        return [c for c in chunks if start <= c["chunk_index"] < end]
+
+    return {
+        "get_book_chunk_count": AsyncMock(return_value=len(chunks)),
+        "get_book_chunk_range": AsyncMock(side_effect=fake_range),
+        "get_chapter_summaries": AsyncMock(return_value=list(summaries)),
+    }
+
+
+def _patch_supabase(
+    progress: int = 0,
+    meta=FAKE_META,
+    chunks=FAKE_CHUNKS,
+    books=FAKE_BOOKS,
+    books_with_progress=FAKE_BOOKS_WITH_PROGRESS,
+):
     return patch.multiple(
         "bot.library",
-        list_books=MagicMock(return_value=books),
-        get_book_metadata=MagicMock(return_value=meta),
-        get_book_chunks=MagicMock(return_value=chunks),
-        get_reading_progress=MagicMock(return_value=progress),
-        save_reading_progress=MagicMock(),
+        get_kid_household_id=AsyncMock(return_value="hh1"),
+        list_books=AsyncMock(return_value=books),
+        list_books_with_progress=AsyncMock(return_value=books_with_progress),
+        get_book_metadata=AsyncMock(return_value=meta),
+        **_chunk_source(chunks),
+        get_reading_progress=AsyncMock(return_value=progress),
     )
 
 
 class TestLibraryListBooks:
-    def test_list_books_returns_book_models(self):
+    async def test_list_books_returns_book_models(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase():
-            books = lib.list_books()
+            books = await lib.list_books()
         assert len(books) == 2
         assert all(isinstance(b, Book) for b in books)
         assert books[0].title == "The Rabbit"
 
-    def test_list_books_empty(self):
+    async def test_list_books_empty(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase(books=[]):
-            books = lib.list_books()
+            books = await lib.list_books()
+        assert books == []
+
+    async def test_list_books_scoped_to_kid_household(self):
+        lib = Library(kid_id="kid1")
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=AsyncMock(return_value="hh1"),
+            list_books=mock_list,
+        ):
+            await lib.list_books()
+        mock_list.assert_called_once_with("hh1")
+
+    async def test_list_books_unknown_kid_returns_empty(self):
+        lib = Library(kid_id="ghost")
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=AsyncMock(return_value=None),
+            list_books=mock_list,
+        ):
+            books = await lib.list_books()
         assert books == []
+        mock_list.assert_not_called()
+
+
+class TestBookListCache:
+    async def test_second_call_is_served_from_cache(self):
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=AsyncMock(return_value="hh1"),
+            list_books=mock_list,
+        ):
+            await Library(kid_id="kid1").list_books()
+            books = await Library(kid_id="kid2").list_books()
+        assert [b.id for b in books] == ["book_001", "book_002"]
+        mock_list.assert_called_once()
+
+    async def test_expired_entry_is_refetched(self):
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        lib = Library(kid_id="kid1")
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=AsyncMock(return_value="hh1"),
+            list_books=mock_list,
+        ):
+            await lib.list_books()
+            cached_at, books = library_module._book_list_cache["hh1"]
+            library_module._book_list_cache["hh1"] = (
+                cached_at - library_module.BOOK_LIST_TTL_SECS - 1,
+                books,
+            )
+            await lib.list_books()
+        assert mock_list.call_count == 2
+
+    async def test_books_with_progress_seeds_cache(self):
+        lib = Library(kid_id="kid1")
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        mock_household = AsyncMock(return_value="hh1")
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=mock_household,
+            list_books=mock_list,
+            list_books_with_progress=AsyncMock(return_value=FAKE_BOOKS_WITH_PROGRESS),
+        ):
+            await lib.get_books_with_progress()
+            books = await lib.list_books()
+        assert [b.title for b in books] == ["The Rabbit", "The Fox"]
+        mock_list.assert_not_called()
+        mock_household.assert_not_called()
+
+    async def test_invalidate_drops_household_entry(self):
+        mock_list = AsyncMock(return_value=FAKE_BOOKS)
+        lib = Library(kid_id="kid1")
+        with patch.multiple(
+            "bot.library",
+            get_kid_household_id=AsyncMock(return_value="hh1"),
+            list_books=mock_list,
+        ):
+            await lib.list_books()
+            library_module.invalidate_book_list_cache("hh1")
+            await lib.list_books()
+        assert mock_list.call_count == 2
+
+
+class TestLibraryGetBooksWithProgress:
+    async def test_in_progress_book_carries_resume_context(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            books = await lib.get_books_with_progress()
+        assert books[0] == {
+            "id": "book_001",
+            "title": "The Rabbit",
+            "status": "ready",
+            "current_chunk_index": 1,
+            "chapter_title": "Chapter I",
+            "chunk_text": "There was a rabbit.",
+        }
+
+    async def test_new_book_has_no_progress_keys(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            books = await lib.get_books_with_progress()
+        assert books[1] == {"id": "book_002", "title": "The Fox", "status": "ready"}
+
+    async def test_uses_single_rpc_for_the_kid(self):
+        lib = Library(kid_id="kid1")
+        mock_rpc = AsyncMock(return_value=FAKE_BOOKS_WITH_PROGRESS)
+        mock_list = AsyncMock()
+        with patch.multiple("bot.library", list_books=mock_list, list_books_with_progress=mock_rpc):
+            await lib.get_books_with_progress()
+        mock_rpc.assert_called_once_with("kid1")
+        mock_list.assert_not_called()
+
+
+class TestLibraryTitleSearch:
+    SHELF = [
+        {"id": "b1", "title": "The Very Hungry Caterpillar", "status": "ready"},
+        {"id": "b2", "title": "The Gruffalo", "status": "ready"},
+        {"id": "b3", "title": "Where the Wild Things Are", "status": "ready"},
+    ]
+
+    async def test_match_book_by_spoken_title(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books=self.SHELF):
+            match = await lib.match_book("the hungry catapiller")
+        assert match is not None
+        assert match.book_id == "b1"
+
+    async def test_raw_book_id_matches_itself(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books=self.SHELF):
+            match = await lib.match_book("b3")
+        assert (match.book_id, match.score) == ("b3", 1.0)
+
+    async def test_find_books_suggests_close_titles(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books=self.SHELF):
+            assert await lib.match_book("harry potter") is None
+            matches = await lib.find_books("wild thing")
+        assert matches[0].book_id == "b3"
+
+    async def test_index_is_reused_until_the_book_list_changes(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books=self.SHELF):
+            first = await lib._title_index()
+            assert await lib._title_index() is first
+        library_module.invalidate_book_list_cache()
+        with _patch_supabase(books=self.SHELF[:2]):
+            assert await lib._title_index() is not first
+            assert await lib.match_book("wild things") is None
 
 
 class TestLibraryInitializeBook:
-    def test_initialize_loads_metadata_and_chunks(self):
+    async def test_initialize_loads_metadata_and_chunks(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase():
-            book = lib.initialize_book("book_001")
+            book = await lib.initialize_book("book_001")
         assert book is not None
         assert book.title == "The Rabbit"
         assert lib.total_chunks == 3
         assert lib.current_chunk_index == 0
 
-    def test_initialize_with_progress(self):
+    async def test_initialize_with_progress(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase(progress=2):
-            lib.initialize_book("book_001")
+            await lib.initialize_book("book_001")
         assert lib.current_chunk_index == 2
 
-    def test_initialize_clamps_progress_past_end(self):
+    async def test_initialize_clamps_progress_past_end(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase(progress=99):
-            lib.initialize_book("book_001")
+            await lib.initialize_book("book_001")
         assert lib.current_chunk_index == 0
 
-    def test_initialize_missing_book_returns_none(self):
+    async def test_reload_same_version_skips_chunk_download(self):
+        source = _chunk_source()
+        with patch.multiple(
+            "bot.library",
+            get_book_metadata=AsyncMock(return_value={**FAKE_META, "chunks_version": 2}),
+            get_reading_progress=AsyncMock(return_value=0),
+            **source,
+        ):
+            await Library(kid_id="kid1").initialize_book("book_001")
+            lib = Library(kid_id="kid2")
+            await lib.initialize_book("book_001")
+        source["get_book_chunk_range"].assert_awaited_once()
+        assert lib.total_chunks == 3
+
+    async def test_bumped_version_redownloads_chunks(self):
+        mock_meta = AsyncMock(
+            side_effect=[{**FAKE_META, "chunks_version": 1}, {**FAKE_META, "chunks_version": 2}]
+        )
+        with patch.multiple(
+            "bot.library",
+            get_book_metadata=mock_meta,
+            get_reading_progress=AsyncMock(return_value=0),
+            **_chunk_source(),
+        ):
+            await Library(kid_id="kid1").initialize_book("book_001")
+        with patch.multiple(
+            "bot.library",
+            get_book_metadata=mock_meta,
+            get_reading_progress=AsyncMock(return_value=0),
+            **_chunk_source(FAKE_CHUNKS[:1]),
+        ):
+            lib = Library(kid_id="kid1")
+            await lib.initialize_book("book_001")
+        assert lib.total_chunks == 1
+
+    async def test_initialize_missing_book_returns_none(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase(meta=None):
-            result = lib.initialize_book("nonexistent")
+            result = await lib.initialize_book("nonexistent")
         assert result is None
         assert lib.book is None
 
 
 class TestLibraryChunkNavigation:
-    def test_current_chunk(self):
+    async def test_current_chunk(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase():
-            lib.initialize_book("book_001")
-        chunk = lib.current_chunk()
+            await lib.initialize_book("book_001")
+        chunk = await lib.current_chunk()
         assert isinstance(chunk, BookChunk)
         assert chunk.text == "Once upon a time."
 
-    def test_advance_chunk(self):
+    async def test_advance_chunk(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase():
-            lib.initialize_book("book_001")
-        chunk = lib.advance_chunk()
+            await lib.initialize_book("book_001")
+        chunk = await lib.advance_chunk()
         assert chunk is not None
         assert chunk.chunk_index == 1
         assert lib.current_chunk_index == 1
 
-    def test_advance_past_end_returns_none(self):
+    async def test_advance_past_end_returns_none(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase(progress=2):
-            lib.initialize_book("book_001")
-        chunk = lib.advance_chunk()
+            await lib.initialize_book("book_001")
+        chunk = await lib.advance_chunk()
         assert chunk is None
 
-    def test_full_text(self):
+    async def test_full_text(self):
         lib = Library(kid_id="kid1")
         with _patch_supabase():
-            lib.initialize_book("book_001")
-        text = lib.full_text()
+            await lib.initialize_book("book_001")
+        text = await lib.full_text()
         assert "Once upon a time." in text
         assert "The end." in text
 
+    async def test_full_text_is_built_once_per_load(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+        assert await lib.full_text() is await lib.full_text()
+
+    async def test_relevant_chunks_in_book_order(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        chunks = await lib.relevant_chunks("the rabbit begins", 2)
+        assert [c.chunk_index for c in chunks] == [0, 1]
+
+    async def test_relevant_chunks_stop_at_up_to(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert await lib.relevant_chunks("the end", 3, up_to=1) == []
+        assert [c.chunk_index for c in await lib.relevant_chunks("the end", 3)] == [2]
+
+    async def test_story_so_far_fits_the_budget(self):
+        chunks = [{**c, "token_count": 10} for c in FAKE_CHUNKS]
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(chunks=chunks):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert [c.chunk_index for c in lib.story_so_far(2, 20)] == [1, 2]
+        assert [c.chunk_index for c in lib.story_so_far(1, 1_000)] == [0, 1]
+        assert [c.chunk_index for c in lib.story_so_far(2, 1)] == [2]
+
+    async def test_story_so_far_uses_the_loaded_window(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=250, chunks=LONG_BOOK):
+            await lib.initialize_book("book_001")
+            window = lib.story_so_far(250, 1_000_000)
+            await lib._cancel_loader()
+        assert window[0].chunk_index == 250 - library_module.CHUNK_WINDOW_BEFORE
+        assert window[-1].chunk_index == 250
+
+    async def test_story_so_far_can_start_at_a_chapter(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert [c.chunk_index for c in lib.story_so_far(1, 1_000, since=1)] == [1]
+        assert [c.chunk_index for c in lib.story_so_far(1, 1_000, since=5)] == [1]
+
+    async def test_story_before_summarizes_earlier_chapters(self):
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(),
+            patch.multiple("bot.library", **_chunk_source(FAKE_CHUNKS, SUMMARIES)),
+        ):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert lib.story_before(1) == ("", 0)
+        assert lib.story_before(2) == ("A rabbit appeared.", 2)
+
+    async def test_story_before_past_the_last_summary_uses_it_whole(self):
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(),
+            patch.multiple("bot.library", **_chunk_source(FAKE_CHUNKS, SUMMARIES[:1])),
+        ):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        # Chapter I is covered by its summary; the raw text starts after it
+        assert lib.story_before(2) == ("A rabbit appeared.", 2)
+
+    async def test_story_before_two_chapters_past_the_last_summary(self):
+        chunks = [
+            *FAKE_CHUNKS,
+            {**FAKE_CHUNKS[2], "chunk_index": 3},
+            {**FAKE_CHUNKS[2], "chunk_index": 4, "chapter_title": "Chapter III"},
+        ]
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(chunks=chunks),
+            patch.multiple("bot.library", **_chunk_source(chunks, SUMMARIES[:1])),
+        ):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert lib.story_before(4) == ("A rabbit appeared.", 2)
+
+    async def test_story_before_without_summaries(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert lib.story_before(2) == ("", 0)
+        assert lib.book_summary() == ""
+
+    async def test_book_summary_lists_chapters_or_falls_back_to_the_story(self):
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(),
+            patch.multiple("bot.library", **_chunk_source(FAKE_CHUNKS, SUMMARIES)),
+        ):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert lib.book_summary() == ("Chapter I: A rabbit appears.\nChapter II: The story ends.")
+        assert lib.book_summary(budget_tokens=5) == "A rabbit appeared, then the story ended."
+
+    async def test_summaries_load_with_the_window(self):
+        summaries = [{**SUMMARIES[0], "chapter_title": "Chapter 0"}]
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(progress=250),
+            patch.multiple("bot.library", **_chunk_source(LONG_BOOK, summaries)),
+        ):
+            await lib.initialize_book("book_001")
+            assert lib.book_summary() == "Chapter 0: A rabbit appears."
+            await lib.full_text()
+        assert lib.book_summary() == "Chapter 0: A rabbit appears."
+
+    async def test_failed_summary_fetch_still_loads_the_book(self):
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(),
+            patch("bot.library.get_chapter_summaries", AsyncMock(side_effect=RuntimeError)),
+        ):
+            book = await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert book is not None
+        assert lib.book_summary() == ""
+
+    async def test_outline_thins_hints_to_fit_a_budget(self):
+        chunks = [
+            {
+                "chunk_index": i,
+                "chapter_title": f"Chapter {i // 10}",
+                "chunk_hint": f"Something happens in passage number {i}.",
+                "text": f"Passage {i}.",
+            }
+            for i in range(40)
+        ]
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(chunks=chunks):
+            await lib.initialize_book("book_001")
+            full = await lib.outline()
+            short = await lib.outline(budget_tokens=150)
+        assert len(short) < len(full)
+        assert all(f"Chapter {n}" in short for n in range(4))
+        assert sum(line.startswith("- ") for line in short.splitlines()) < 40
+
+    async def test_outline_lists_hints_under_chapters(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            await lib.initialize_book("book_001")
+            outline = await lib.outline()
+        assert outline == (
+            "Chapter I\n- The story begins.\n- The rabbit appears.\nChapter II\n- The story ends."
+        )
+
+
+LONG_BOOK = [
+    {"chunk_index": i, "chapter_title": f"Chapter {i // 100}", "text": f"Passage {i}."}
+    for i in range(450)
+]
+
+
+class TestLibraryWindowedLoading:
+    async def test_returns_after_window_and_streams_rest_in_pages(self):
+        source = _chunk_source(LONG_BOOK)
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=300), patch.multiple("bot.library", **source):
+            await lib.initialize_book("book_001")
+            first_call = source["get_book_chunk_range"].await_args_list[0]
+            assert first_call.args == (
+                "book_001",
+                300 - library_module.CHUNK_WINDOW_BEFORE,
+                300 + library_module.CHUNK_WINDOW_AFTER + 1,
+            )
+            assert (await lib.current_chunk()).text == "Passage 300."
+            text = await lib.full_text()
+
+        assert lib.total_chunks == 450
+        assert text.count("Passage") == 450
+        for call in source["get_book_chunk_range"].await_args_list:
+            _, start, end = call.args
+            assert end - start <= library_module.CHUNK_PAGE_SIZE
+
+    async def test_advance_waits_for_chunk_outside_window(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=0), patch.multiple("bot.library", **_chunk_source(LONG_BOOK)):
+            await lib.initialize_book("book_001")
+            lib.current_chunk_index = 420
+            chunk = await lib.advance_chunk()
+        assert chunk is not None
+        assert chunk.chunk_index == 421
+
+    async def test_chapter_map_complete_once_loaded(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=0), patch.multiple("bot.library", **_chunk_source(LONG_BOOK)):
+            await lib.initialize_book("book_001")
+            await lib.full_text()
+        assert lib.chapter_map == {f"Chapter {n}": n * 100 for n in range(5)}
+
+    async def test_resolve_chapter_waits_for_the_whole_book(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=0), patch.multiple("bot.library", **_chunk_source(LONG_BOOK)):
+            await lib.initialize_book("book_001")
+            assert len(lib.chapters) == 0  # only the window is loaded so far
+            chapter = await lib.resolve_chapter("chapter 3")
+        assert chapter is not None
+        assert (chapter.title, chapter.start, chapter.end) == ("Chapter 3", 300, 400)
+        lib.current_chunk_index = 250
+        assert lib.current_chapter().title == "Chapter 2"
+
+    async def test_fully_loaded_book_is_cached(self):
+        source = _chunk_source(LONG_BOOK)
+        with _patch_supabase(progress=0), patch.multiple("bot.library", **source):
+            first = Library(kid_id="kid1")
+            await first.initialize_book("book_001")
+            await first.full_text()
+            calls = source["get_book_chunk_range"].await_count
+            await Library(kid_id="kid2").initialize_book("book_001")
+        assert source["get_book_chunk_range"].await_count == calls
+
+    async def test_failed_page_is_retried(self):
+        source = _chunk_source(LONG_BOOK)
+        fake_range = source["get_book_chunk_range"].side_effect
+        failures = iter([True])
+
+        async def flaky_range(book_id, start, end):
+            if start >= 200 and next(failures, False):
+                raise RuntimeError("connection reset")
+            return await fake_range(book_id, start, end)
+
+        source["get_book_chunk_range"] = AsyncMock(side_effect=flaky_range)
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(progress=0),
+            patch.multiple("bot.library", **source),
+            patch("bot.library.asyncio.sleep", AsyncMock()),
+        ):
+            await lib.initialize_book("book_001")
+            text = await lib.full_text()
+        assert text.count("Passage") == 450
+
+    async def test_page_failing_past_its_retries_is_fetched_again(self):
+        source = _chunk_source(LONG_BOOK)
+        fake_range = source["get_book_chunk_range"].side_effect
+        failures = iter([True] * (2 * library_module.CHUNK_FETCH_ATTEMPTS))
+
+        async def flaky_range(book_id, start, end):
+            if start <= 221 < end and next(failures, False):
+                raise RuntimeError("connection reset")
+            return await fake_range(book_id, start, end)
+
+        source["get_book_chunk_range"] = AsyncMock(side_effect=flaky_range)
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(progress=0),
+            patch.multiple("bot.library", **source),
+            patch("bot.library.asyncio.sleep", AsyncMock()),
+        ):
+            await lib.initialize_book("book_001")
+            lib.current_chunk_index = 220
+            chunk = await lib.advance_chunk()
+            text = await lib.full_text()
+        # Never mistaken for the end of the book
+        assert chunk is not None
+        assert chunk.chunk_index == 221
+        assert text.count("Passage") == 450
+
+    async def test_advance_skips_a_chunk_the_book_has_no_row_for(self):
+        rows = [c for c in LONG_BOOK if c["chunk_index"] != 300]
+        source = {**_chunk_source(rows), "get_book_chunk_count": AsyncMock(return_value=450)}
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=0), patch.multiple("bot.library", **source):
+            await lib.initialize_book("book_001")
+            lib.current_chunk_index = 299
+            chunk = await lib.advance_chunk()
+        assert chunk.chunk_index == 301
+        assert lib.current_chunk_index == 301
+
+
+class TestLibraryPreload:
+    async def test_initialize_book_reuses_the_preload(self):
+        mock_meta = AsyncMock(return_value=FAKE_META)
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(progress=1), patch("bot.library.get_book_metadata", mock_meta):
+            preload = lib.preload_book("book_001")
+            await preload
+            book = await lib.initialize_book("book_001")
+        assert book is preload.result()
+        mock_meta.assert_awaited_once()
+        assert lib.current_chunk_index == 1
+
+    async def test_initialize_book_waits_for_preload_in_flight(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase():
+            lib.preload_book("book_001")
+            book = await lib.initialize_book("book_001")
+        assert book is not None
+        assert (await lib.current_chunk()).text == "Once upon a time."
+
+    async def test_different_book_cancels_the_preload(self):
+        mock_meta = AsyncMock(return_value=FAKE_META)
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(), patch("bot.library.get_book_metadata", mock_meta):
+            preload = lib.preload_book("book_999")
+            await lib.initialize_book("book_001")
+        assert preload.cancelled()
+        assert mock_meta.await_args_list[-1].args == ("book_001",)
+
+    async def test_failed_preload_falls_back_to_a_fresh_load(self):
+        mock_meta = AsyncMock(side_effect=[RuntimeError("timeout"), FAKE_META])
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(), patch("bot.library.get_book_metadata", mock_meta):
+            lib.preload_book("book_001")
+            book = await lib.initialize_book("book_001")
+        assert book is not None
+        assert mock_meta.await_count == 2
+
+
+def _menu_row(book_id: str, created_at: str, progress: int = 0, read_at: str | None = None):
+    return {
+        "id": book_id,
+        "title": book_id.title(),
+        "household_id": "hh1",
+        "status": "ready",
+        "created_at": created_at,
+        "current_chunk_index": progress,
+        "progress_updated_at": read_at,
+        "chapter_title": "Chapter I" if progress else None,
+        "chunk_text": "There was a rabbit." if progress else None,
+    }
+
+
+MENU = [
+    _menu_row("oldest", "2026-01-01T00:00:00+00:00"),
+    _menu_row("read_long_ago", "2026-02-01T00:00:00+00:00", 4, "2026-03-01T00:00:00+00:00"),
+    _menu_row("newest", "2026-09-01T00:00:00+00:00"),
+    _menu_row("read_yesterday", "2026-04-01T00:00:00+00:00", 2, "2026-10-16T00:00:00+00:00"),
+    _menu_row("middle", "2026-05-01T00:00:00+00:00"),
+]
+
+
+class TestLibraryPrefetch:
+    def test_ranks_in_progress_by_recency_then_newest(self):
+        assert library_module._rank_likely_picks(MENU) == [
+            "read_yesterday",
+            "read_long_ago",
+            "newest",
+            "middle",
+            "oldest",
+        ]
+
+    async def test_books_with_progress_come_back_likeliest_first(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books_with_progress=MENU):
+            books = await lib.get_books_with_progress()
+        assert [b["id"] for b in books] == library_module._rank_likely_picks(MENU)
+
+    async def test_prefetches_top_picks_with_bounded_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_meta(book_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {**FAKE_META, "id": book_id}
+
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(books_with_progress=MENU),
+            patch("bot.library.get_book_metadata", AsyncMock(side_effect=slow_meta)),
+        ):
+            await lib.get_books_with_progress()
+            picks = lib.prefetch_likely_books()
+            await asyncio.gather(*lib._prefetches.values())
+
+        assert picks == ["read_yesterday", "read_long_ago", "newest"]
+        assert len(picks) == library_module.PREFETCH_MAX_BOOKS
+        assert max_in_flight == library_module.PREFETCH_CONCURRENCY
+
+    async def test_select_hands_over_completed_prefetch_without_round_trips(self):
+        lib = Library(kid_id="kid1")
+        mock_meta = AsyncMock(side_effect=lambda book_id: {**FAKE_META, "id": book_id})
+        mock_progress = AsyncMock(return_value=1)
+        with (
+            _patch_supabase(books_with_progress=MENU),
+            patch.multiple(
+                "bot.library", get_book_metadata=mock_meta, get_reading_progress=mock_progress
+            ),
+        ):
+            await lib.get_books_with_progress()
+            lib.prefetch_likely_books()
+            prefetches = dict(lib._prefetches)
+            await asyncio.gather(*prefetches.values())
+            calls = mock_meta.await_count
+
+            book = await lib.initialize_book("read_long_ago")
+
+        assert book.id == "read_long_ago"
+        assert mock_meta.await_count == calls
+        assert lib.current_chunk_index == 1
+        assert (await lib.current_chunk()).text == "There was a rabbit."
+        assert lib.chapter_map == {"Chapter I": 0, "Chapter II": 2}
+        assert lib._prefetches == {}
+
+    async def test_select_cancels_other_and_in_flight_prefetches(self):
+        release = asyncio.Event()
+
+        async def blocked_meta(book_id):
+            await release.wait()
+            return {**FAKE_META, "id": book_id}
+
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books_with_progress=MENU):
+            await lib.get_books_with_progress()
+            with patch("bot.library.get_book_metadata", AsyncMock(side_effect=blocked_meta)):
+                lib.prefetch_likely_books()
+                prefetches = dict(lib._prefetches)
+                await asyncio.sleep(0)
+            book = await lib.initialize_book("read_yesterday")
+            await asyncio.gather(*prefetches.values(), return_exceptions=True)
+
+        assert book is not None
+        assert all(task.cancelled() for task in prefetches.values())
+
+    async def test_failed_prefetch_falls_back_to_normal_load(self):
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(books_with_progress=MENU):
+            await lib.get_books_with_progress()
+            with patch("bot.library.get_book_chunk_count", AsyncMock(side_effect=RuntimeError)):
+                lib.prefetch_likely_books()
+                await asyncio.gather(*lib._prefetches.values())
+            book = await lib.initialize_book("newest")
+        assert book is not None
+        assert lib.total_chunks == 3
+
+
+BUNDLED_META = {
+    **FAKE_META,
+    "chunks_version": 2,
+    "storage_path": "households/hh1/books/book_001/rabbit.pdf",
+}
+
+
+class TestLibraryBundleLoading:
+    async def test_loads_whole_book_from_bundle_in_one_get(self):
+        bundle = encode_bundle(build_bundle("book_001", 2, FAKE_CHUNKS))
+        mock_download = AsyncMock(return_value=bundle)
+        rows = _chunk_source()
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(progress=1, meta=BUNDLED_META),
+            patch.multiple("bot.library", download_book_bundle=mock_download, **rows),
+        ):
+            await lib.initialize_book("book_001")
+            full_text = await lib.full_text()
+
+        mock_download.assert_awaited_once_with("households/hh1/books/book_001/bundle.v2.rmbk")
+        rows["get_book_chunk_count"].assert_not_awaited()
+        rows["get_book_chunk_range"].assert_not_awaited()
+        assert lib.total_chunks == 3
+        assert (await lib.current_chunk()).text == "There was a rabbit."
+        assert full_text == "Once upon a time.\n\nThere was a rabbit.\n\nThe end."
+        assert lib.chapter_map == {"Chapter I": 0, "Chapter II": 2}
+
+    async def test_missing_bundle_falls_back_to_rows(self):
+        rows = _chunk_source()
+        missing = AsyncMock(side_effect=RuntimeError("Object not found"))
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(meta=BUNDLED_META),
+            patch.multiple("bot.library", download_book_bundle=missing, **rows),
+        ):
+            await lib.initialize_book("book_001")
+        rows["get_book_chunk_range"].assert_awaited()
+        assert lib.total_chunks == 3
+
+    async def test_bundle_for_another_version_is_ignored(self):
+        stale = encode_bundle(build_bundle("book_001", 1, FAKE_CHUNKS[:1]))
+        lib = Library(kid_id="kid1")
+        with (
+            _patch_supabase(meta=BUNDLED_META),
+            patch("bot.library.download_book_bundle", AsyncMock(return_value=stale)),
+        ):
+            await lib.initialize_book("book_001")
+        assert lib.total_chunks == 3
+
+    async def test_unversioned_book_skips_the_bundle(self):
+        mock_download = AsyncMock()
+        lib = Library(kid_id="kid1")
+        with _patch_supabase(), patch("bot.library.download_book_bundle", mock_download):
+            await lib.initialize_book("book_001")
+        mock_download.assert_not_awaited()
+
 
 class TestLibrarySaveProgress:
-    def test_save_progress_calls_supabase(self):
+    async def test_save_progress_flushes_current_position(self):
         lib = Library(kid_id="kid1")
-        mock_save = MagicMock()
-        with patch.multiple(
-            "bot.library",
-            list_books=MagicMock(),
-            get_book_metadata=MagicMock(return_value=FAKE_META),
-            get_book_chunks=MagicMock(return_value=FAKE_CHUNKS),
-            get_reading_progress=MagicMock(return_value=0),
-            save_reading_progress=mock_save,
+        mock_save = AsyncMock()
+        with (
+            _patch_supabase(),
+            patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save),
         ):
-            lib.initialize_book("book_001")
+            await lib.initialize_book("book_001")
             lib.current_chunk_index = 2
-            lib.save_progress()
-        mock_save.assert_called_once_with("book_001", "kid1", 2)
+            await lib.save_progress()
+        mock_save.assert_awaited_once_with(
+            [{"book_id": "book_001", "kid_id": "kid1", "current_chunk_index": 2}]
+        )
+
+    async def test_advance_records_without_writing(self, progress_checkpointer):
+        lib = Library(kid_id="kid1")
+        mock_save = AsyncMock()
+        with (
+            _patch_supabase(),
+            patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save),
+        ):
+            await lib.initialize_book("book_001")
+            await lib.advance_chunk()
+            await lib.advance_chunk()
+            mock_save.assert_not_awaited()
+            assert progress_checkpointer.pending == 1
+            await lib.save_progress()
+        mock_save.assert_awaited_once_with(
+            [{"book_id": "book_001", "kid_id": "kid1", "current_chunk_index": 2}]
+        )
 
-    def test_save_progress_noop_without_book(self):
+    async def test_save_progress_noop_without_book(self, progress_checkpointer):
         lib = Library(kid_id="kid1")
-        lib.save_progress()  # should not raise
+        await lib.save_progress()  # should not raise
+        assert progress_checkpointer.pending == 0
+
+
+# Each simulated round trip is an await of SIMULATED_RTT_SECS. If the client
+# blocked the loop instead, nothing else could run while a request was in flight.
+SIMULATED_RTT_SECS = 0.05
+
+
+def _slow_postgrest_client(
+    round_trips: list[list[str]], ticks: list[int], ticks_per_request: list[int]
+) -> AsyncClient:
+    """Real async Supabase client whose HTTP transport answers after a simulated RTT.
+
+    Appends to ``round_trips`` one list per round trip: the requests that were
+    in flight together, as "METHOD table". Appends to ``ticks_per_request`` how
+    far the ``ticks[0]`` counter moved while each request was in flight.
+    """
+    tables = {
+        "books": [{**FAKE_META, "chunks_version": 1}],
+        "book_chunks": FAKE_CHUNKS,
+        "reading_progress": [{"current_chunk_index": 1}],
+        "book_chapter_summaries": [],
+    }
+    in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight
+        table = request.url.path.rsplit("/", 1)[-1]
+        if in_flight == 0:
+            round_trips.append([])
+        round_trips[-1].append(f"{request.method} {table}")
+        in_flight += 1
+        sent_at = ticks[0]
+        try:
+            await asyncio.sleep(SIMULATED_RTT_SECS)
+        finally:
+            in_flight -= 1
+            ticks_per_request.append(ticks[0] - sent_at)
+        if request.method == "HEAD":
+            rows = len(tables[table])
+            return httpx.Response(200, headers={"content-range": f"0-{rows - 1}/{rows}"})
+        return httpx.Response(
+            200,
+            content=json.dumps(tables[table]),
+            headers={"content-type": "application/json"},
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncClient(
+        "http://supabase.test",
+        "test-key",
+        options=AsyncClientOptions(httpx_client=http_client),
+    )
+
+
+class TestLibraryEventLoop:
+    async def test_initialize_book_never_blocks_the_event_loop(self):
+        round_trips: list[list[str]] = []
+        ticks = [0]
+        ticks_per_request: list[int] = []
+        client = _slow_postgrest_client(round_trips, ticks, ticks_per_request)
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                ticks[0] += 1
+
+        lib = Library(kid_id="kid1")
+        with patch("bot.supabase_client.get_async_client", return_value=client):
+            monitor = asyncio.create_task(ticker())
+            book = await lib.initialize_book("book_001")
+            done.set()
+            await monitor
+
+        assert book is not None
+        assert lib.total_chunks == 3
+        assert lib.current_chunk_index == 1
+        # Metadata and progress are fetched concurrently, then the chunk count, then
+        # the window around the resume position together with the chapter summaries
+        assert [sorted(r) for r in round_trips] == [
+            ["GET books", "GET reading_progress"],
+            ["HEAD book_chunks"],
+            ["GET book_chapter_summaries", "GET book_chunks"],
+        ]
+        # The ticker kept running while every request was in flight
+        assert len(ticks_per_request) == 5
+        assert all(moved > 0 for moved in ticks_per_request)
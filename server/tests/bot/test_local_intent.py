@@ -0,0 +1,100 @@
+"""Unit tests for the LocalIntentProcessor."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+from bot.processors.frames import EndSessionFrame, StartReadingFrame
+from bot.processors.local_intent import LocalIntentProcessor
+from bot.processors.state_manager import FAREWELL, State
+
+
+def _make_processor(state: State):
+    state_manager = MagicMock()
+    state_manager.state = state
+    state_manager.book_id = "book_001"
+    state_manager.queue_frame = AsyncMock()
+    processor = LocalIntentProcessor(state_manager)
+    pushed: list[Frame] = []
+
+    async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+        pushed.append(frame)
+
+    processor.push_frame = push_frame
+    return processor, state_manager, pushed
+
+
+def _turn(text: str) -> LLMContextFrame:
+    return LLMContextFrame(LLMContext(messages=[{"role": "user", "content": text}]))
+
+
+class TestLocalIntentProcessor:
+    async def test_resume_in_qa_skips_the_llm(self):
+        processor, state_manager, pushed = _make_processor(State.QA)
+
+        await processor.process_frame(_turn("keep reading please"), FrameDirection.DOWNSTREAM)
+
+        assert pushed == []
+        (command, direction), _ = state_manager.queue_frame.await_args
+        assert isinstance(command, StartReadingFrame)
+        assert (command.book_id, command.chunk_index) == ("book_001", None)
+        assert direction == FrameDirection.DOWNSTREAM
+        assert processor.counts["resume"] == 1
+
+    async def test_goodbye_ends_with_a_farewell(self):
+        processor, state_manager, pushed = _make_processor(State.FINISHED)
+
+        await processor.process_frame(_turn("Bye bye!"), FrameDirection.DOWNSTREAM)
+
+        assert pushed == []
+        (command, _), _ = state_manager.queue_frame.await_args
+        assert isinstance(command, EndSessionFrame)
+        assert command.farewell == FAREWELL
+
+    async def test_command_already_answered_is_not_acted_on_again(self):
+        processor, state_manager, pushed = _make_processor(State.QA)
+        frame = LLMContextFrame(
+            LLMContext(
+                messages=[
+                    {"role": "user", "content": "keep reading"},
+                    {"role": "assistant", "content": "Okay, here we go!"},
+                ]
+            )
+        )
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+        state_manager.queue_frame.assert_not_awaited()
+
+    async def test_questions_go_to_the_llm(self):
+        processor, state_manager, pushed = _make_processor(State.QA)
+        frame = _turn("why did the rabbit go on?")
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+        state_manager.queue_frame.assert_not_awaited()
+        assert processor.counts["llm"] == 1
+
+    async def test_resume_after_the_book_is_the_llms_call(self):
+        processor, state_manager, pushed = _make_processor(State.FINISHED)
+        frame = _turn("keep reading")
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+        state_manager.queue_frame.assert_not_awaited()
+
+    async def test_book_selection_is_left_to_the_llm(self):
+        processor, state_manager, pushed = _make_processor(State.BOOK_SELECTION)
+        frame = _turn("bye")
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+        assert processor.counts == {"resume": 0, "end": 0, "llm": 0}
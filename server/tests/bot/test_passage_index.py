@@ -0,0 +1,66 @@
+"""Unit tests for the BM25 passage index."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bot.chunk_store import ChunkStore
+from bot.passage_index import PassageIndex, tokenize
+
+ALICE_CHUNKS = (
+    Path(__file__).parent.parent
+    / "workers"
+    / "recordings"
+    / "alice_in_wonderland"
+    / "expected_chunks.json"
+)
+
+
+@pytest.fixture(scope="module")
+def alice() -> ChunkStore:
+    return ChunkStore.from_rows(json.loads(ALICE_CHUNKS.read_text()))
+
+
+class TestTokenize:
+    def test_drops_stop_words_and_folds_plurals(self):
+        assert tokenize("What happened to the Rabbits?") == ["rabbit"]
+
+    def test_keeps_double_s(self):
+        assert tokenize("the Duchess") == ["duchess"]
+
+
+class TestPassageIndex:
+    def test_finds_the_matching_passage(self, alice):
+        index = PassageIndex(alice)
+        hits = index.search("what was in the bottle that said drink me", 3)
+        assert hits[0] == 7
+        assert "DRINK ME" in alice[7].chunk_hint
+
+    def test_ranks_best_first_and_caps_at_k(self, alice):
+        hits = PassageIndex(alice).search("who is the duchess", 2)
+        assert len(hits) == 2
+        assert all("Duchess" in alice[i].text for i in hits)
+
+    def test_nothing_past_up_to(self, alice):
+        index = PassageIndex(alice)
+        assert index.search("duchess baby pig", 3, up_to=10) == []
+        assert all(i <= 26 for i in index.search("duchess baby pig", 5, up_to=26))
+
+    def test_exclude_skips_chunks(self, alice):
+        index = PassageIndex(alice)
+        best = index.search("mouse tale", 1)[0]
+        assert best not in index.search("mouse tale", 3, exclude=frozenset({best}))
+
+    def test_no_matching_terms(self, alice):
+        assert PassageIndex(alice).search("the of and", 3) == []
+
+    def test_indices_are_absolute_for_a_partial_store(self):
+        rows = [
+            {"chunk_index": i, "chapter_title": "Ch", "text": text}
+            for i, text in enumerate(["A fox.", "A hen.", "A fox and a hen."])
+        ]
+        store = ChunkStore.from_rows(rows[1:], first_index=1)
+        assert sorted(PassageIndex(store).search("fox", 3)) == [2]
@@ -0,0 +1,39 @@
+"""Unit tests for PlaybackTracker."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from pipecat.frames.frames import TTSAudioRawFrame
+from pipecat.processors.frame_processor import FrameDirection
+
+from bot.processors.frames import ChunkPlayedFrame
+from bot.processors.playback_tracker import PlaybackTracker
+
+
+def _tracker():
+    state_manager = MagicMock()
+    state_manager.queue_frame = AsyncMock()
+    tracker = PlaybackTracker(state_manager)
+    tracker.push_frame = AsyncMock()
+    return tracker, state_manager
+
+
+async def test_played_chunk_goes_back_to_the_state_manager():
+    tracker, state_manager = _tracker()
+    frame = ChunkPlayedFrame(chunk_index=3, reading_run=1)
+
+    await tracker.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    state_manager.queue_frame.assert_awaited_once_with(frame, FrameDirection.DOWNSTREAM)
+    tracker.push_frame.assert_not_awaited()
+
+
+async def test_other_frames_pass_through():
+    tracker, state_manager = _tracker()
+    frame = TTSAudioRawFrame(audio=b"\x00\x00", sample_rate=16000, num_channels=1)
+
+    await tracker.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    tracker.push_frame.assert_awaited_once_with(frame, FrameDirection.DOWNSTREAM)
+    state_manager.queue_frame.assert_not_awaited()
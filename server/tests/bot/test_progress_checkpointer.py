@@ -0,0 +1,103 @@
+"""Unit tests for the write-behind ProgressCheckpointer."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from bot.progress_checkpointer import ProgressCheckpointer
+
+
+def _row(book_id: str, kid_id: str, chunk_index: int) -> dict:
+    return {"book_id": book_id, "kid_id": kid_id, "current_chunk_index": chunk_index}
+
+
+class TestProgressCheckpointer:
+    async def test_coalesces_per_book_and_kid(self):
+        mock_save = AsyncMock()
+        checkpointer = ProgressCheckpointer(flush_interval_secs=60.0)
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save):
+            for i in range(1, 6):
+                checkpointer.record("b1", "k1", i)
+            checkpointer.record("b2", "k1", 9)
+            checkpointer.record("b1", "k2", 3)
+            await checkpointer.flush()
+
+        mock_save.assert_awaited_once()
+        assert mock_save.await_args.args[0] == [
+            _row("b1", "k1", 5),
+            _row("b2", "k1", 9),
+            _row("b1", "k2", 3),
+        ]
+        stats = checkpointer.stats()
+        assert stats["recorded"] == 7
+        assert stats["coalesced"] == 4
+        assert stats["last_batch_size"] == 3
+        assert stats["rows_written"] == 3
+
+    async def test_flush_with_nothing_pending_skips_the_write(self):
+        mock_save = AsyncMock()
+        checkpointer = ProgressCheckpointer(flush_interval_secs=60.0)
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save):
+            await checkpointer.flush()
+        mock_save.assert_not_awaited()
+        assert checkpointer.stats()["flushes"] == 0
+
+    async def test_timer_flushes_in_background(self):
+        mock_save = AsyncMock()
+        checkpointer = ProgressCheckpointer(flush_interval_secs=0.01)
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save):
+            checkpointer.record("b1", "k1", 4)
+            await asyncio.sleep(0.05)
+        mock_save.assert_awaited_once_with([_row("b1", "k1", 4)])
+        assert checkpointer.pending == 0
+        assert checkpointer.stats()["last_flush_ms"] >= 0
+
+    async def test_failed_flush_keeps_rows_but_newer_position_wins(self):
+        checkpointer = ProgressCheckpointer(flush_interval_secs=60.0)
+        release = asyncio.Event()
+
+        async def failing_save(rows):
+            await release.wait()
+            raise RuntimeError("supabase down")
+
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", failing_save):
+            checkpointer.record("b1", "k1", 4)
+            checkpointer.record("b2", "k1", 7)
+            flush = asyncio.create_task(checkpointer.flush())
+            await asyncio.sleep(0)
+            checkpointer.record("b1", "k1", 5)  # arrives while the failing write is in flight
+            release.set()
+            await flush
+
+        assert checkpointer.stats()["failures"] == 1
+        mock_save = AsyncMock()
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", mock_save):
+            await checkpointer.flush()
+        assert sorted(mock_save.await_args.args[0], key=lambda r: r["book_id"]) == [
+            _row("b1", "k1", 5),
+            _row("b2", "k1", 7),
+        ]
+
+    async def test_survives_a_new_event_loop(self):
+        # The singleton outlives loops: its lock and timer must not stay bound to the first
+        checkpointer = ProgressCheckpointer(flush_interval_secs=60.0)
+        saved = []
+
+        async def slow_save(rows):
+            await asyncio.sleep(0.01)
+            saved.append(rows)
+
+        async def session(chunk_index: int) -> None:
+            checkpointer.record("b1", "k1", chunk_index)
+            flushes = [checkpointer.flush() for _ in range(2)]  # contend for the lock
+            await asyncio.gather(*flushes)
+
+        with patch("bot.progress_checkpointer.save_reading_progress_batch", slow_save):
+            await asyncio.to_thread(asyncio.run, session(4))
+            await session(5)
+
+        assert saved == [
+            [_row("b1", "k1", 4)],
+            [_row("b1", "k1", 5)],
+        ]
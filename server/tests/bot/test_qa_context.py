@@ -0,0 +1,108 @@
+"""Unit tests for the QAContextProcessor."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from pipecat.frames.frames import Frame, LLMContextFrame, LLMUpdateSettingsFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+from bot.processors.qa_context import QAContextProcessor, last_user_text
+
+
+def _make_processor(update: Frame | None):
+    state_manager = MagicMock()
+    state_manager.question_prompt = AsyncMock(return_value=update)
+    state_manager.answer_from_cache = AsyncMock(return_value=False)
+    processor = QAContextProcessor(state_manager)
+    pushed: list[Frame] = []
+
+    async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+        pushed.append(frame)
+
+    processor.push_frame = push_frame
+    return processor, state_manager, pushed
+
+
+def _context(*messages: dict) -> LLMContext:
+    return LLMContext(messages=list(messages))
+
+
+class TestLastUserText:
+    def test_latest_user_message(self):
+        context = _context(
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": "why is the rabbit late?"},
+        )
+        assert last_user_text(context) == "why is the rabbit late?"
+
+    def test_content_parts(self):
+        context = _context(
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": "who is"},
+                    {"type": "text", "text": "the cat?"},
+                ],
+            }
+        )
+        assert last_user_text(context) == "who is the cat?"
+
+    def test_no_user_message(self):
+        assert last_user_text(_context({"role": "system", "content": "hi"})) == ""
+
+    def test_last_message_not_from_the_user(self):
+        context = _context(
+            {"role": "user", "content": "why is the rabbit late?"},
+            {"role": "assistant", "content": "He overslept."},
+        )
+        assert last_user_text(context) == ""
+
+    def test_system_message_after_the_user_turn(self):
+        context = _context(
+            {"role": "user", "content": "why is the rabbit late?"},
+            {"role": "system", "content": "Chapter 2 starts here."},
+        )
+        assert last_user_text(context) == ""
+
+
+class TestQAContextProcessor:
+    async def test_pushes_prompt_update_before_context(self):
+        update = LLMUpdateSettingsFrame(delta=None)
+        processor, state_manager, pushed = _make_processor(update)
+        frame = LLMContextFrame(_context({"role": "user", "content": "where is Alice?"}))
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        state_manager.question_prompt.assert_awaited_once_with("where is Alice?")
+        assert pushed == [update, frame]
+
+    async def test_passes_context_through_when_no_update(self):
+        processor, _, pushed = _make_processor(None)
+        frame = LLMContextFrame(_context({"role": "user", "content": "hello"}))
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        assert pushed == [frame]
+
+    async def test_ignores_context_without_user_turn(self):
+        processor, state_manager, pushed = _make_processor(None)
+        frame = LLMContextFrame(_context({"role": "system", "content": "hi"}))
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        state_manager.question_prompt.assert_not_awaited()
+        assert pushed == [frame]
+
+    async def test_cached_answer_drops_the_llm_turn(self):
+        processor, state_manager, pushed = _make_processor(None)
+        state_manager.answer_from_cache.return_value = True
+        frame = LLMContextFrame(_context({"role": "user", "content": "who is the cat?"}))
+
+        await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+        state_manager.answer_from_cache.assert_awaited_once_with("who is the cat?")
+        state_manager.question_prompt.assert_not_awaited()
+        assert pushed == []
@@ -0,0 +1,68 @@
+"""Unit tests for session bootstrap timing."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from pipecat.frames.frames import BotStartedSpeakingFrame, TextFrame, TTSSpeakFrame
+
+from bot.session_timing import FirstSpeechObserver, SessionTimer
+
+
+def _pushed(frame, source=None):
+    return MagicMock(frame=frame, source=source)
+
+
+class TestSessionTimer:
+    def test_first_mark_wins(self):
+        timer = SessionTimer()
+        timer.mark("transport_ready")
+        first = timer.get("transport_ready")
+        timer.mark("transport_ready")
+        assert timer.get("transport_ready") == first
+
+    def test_preload_saved_is_fetch_time_not_spent_waiting(self):
+        timer = SessionTimer()
+        timer._marks["book_ready"] = 300.0
+        timer.add_duration("select_book_wait", 40.0)
+        timer.add_duration("select_book_wait", 500.0)  # a later, unrelated selection
+        assert timer.preload_saved_ms() == 260.0
+        assert "preload_saved=260ms" in timer.summary()
+
+    def test_no_preload_no_saving(self):
+        timer = SessionTimer()
+        timer.add_duration("select_book_wait", 40.0)
+        assert timer.preload_saved_ms() is None
+        assert "preload_saved" not in timer.summary()
+
+
+class TestFirstSpeechObserver:
+    async def test_marks_only_the_first_bot_speech(self):
+        timer = SessionTimer()
+        observer = FirstSpeechObserver(timer)
+
+        await observer.on_push_frame(_pushed(TextFrame(text="hi")))
+        assert timer.get("first_speech") is None
+
+        await observer.on_push_frame(_pushed(BotStartedSpeakingFrame()))
+        first = timer.get("first_speech")
+        await observer.on_push_frame(_pushed(BotStartedSpeakingFrame()))
+        assert first is not None
+        assert timer.get("first_speech") == first
+
+    async def test_marks_first_story_audio_after_the_story_is_queued(self):
+        timer = SessionTimer()
+        story_source = MagicMock(name="state_manager")
+        observer = FirstSpeechObserver(timer, story_source=story_source)
+
+        await observer.on_push_frame(_pushed(BotStartedSpeakingFrame()))  # the greeting
+        await observer.on_push_frame(_pushed(TTSSpeakFrame(text="Hello"), source=MagicMock()))
+        await observer.on_push_frame(_pushed(BotStartedSpeakingFrame()))
+        assert timer.get("first_story_audio") is None
+
+        await observer.on_push_frame(_pushed(TTSSpeakFrame(text="Once..."), source=story_source))
+        await observer.on_push_frame(_pushed(BotStartedSpeakingFrame()))
+        story = timer.get("first_story_audio")
+        assert story is not None
+        assert story >= timer.get("story_queued") >= timer.get("first_speech")
+        assert "first_story_audio=" in timer.summary()
@@ -2,26 +2,35 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from pipecat.frames.frames import (
     BotStoppedSpeakingFrame,
     Frame,
+    FunctionCallsStartedFrame,
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMMessagesAppendFrame,
     LLMTextFrame,
     LLMUpdateSettingsFrame,
+    MetricsFrame,
     TTSSpeakFrame,
     UserStartedSpeakingFrame,
 )
+from pipecat.metrics.metrics import LLMTokenUsage, LLMUsageMetricsData, TTFBMetricsData
 from pipecat.processors.aggregators.llm_context import LLMContext
 from pipecat.processors.frame_processor import FrameDirection
 
-from bot.library import Library
-from bot.processors.frames import EndSessionFrame, StartReadingFrame
-from bot.processors.state_manager import BookReadingStateManager, State
+from bot.library import BOOK_SHORTLIST_SIZE, Library, invalidate_book_list_cache
+from bot.processors.frames import (
+    CachedAnswerFrame,
+    ChunkPlayedFrame,
+    EndSessionFrame,
+    StartReadingFrame,
+)
+from bot.processors.state_manager import BookReadingStateManager, State, model_for_state
+from bot.prompt import QA_SYSTEM_PREFIX
 
 FAKE_BOOKS = [
     {"id": "book_001", "title": "The Rabbit", "status": "ready"},
@@ -49,16 +58,35 @@ FAKE_CHUNKS = [
 ]
 
 
-def _patch_supabase(progress: int = 0):
+FAKE_SUMMARIES = [
+    {
+        "chapter_index": 0,
+        "chapter_title": "Chapter I",
+        "first_chunk_index": 0,
+        "summary": "A rabbit shows up.",
+        "story_so_far": "Once, a rabbit showed up.",
+    },
+    {
+        "chapter_index": 1,
+        "chapter_title": "Chapter II",
+        "first_chunk_index": 2,
+        "summary": "The story ends.",
+        "story_so_far": "Once, a rabbit showed up, and then the story ended.",
+    },
+]
+
+
+def _patch_supabase(progress: int = 0, summaries=()):
     return patch.multiple(
         "bot.library",
-        list_books=MagicMock(return_value=FAKE_BOOKS),
-        get_book_metadata=MagicMock(return_value=FAKE_META),
-        get_book_chunks=MagicMock(return_value=FAKE_CHUNKS),
-        get_reading_progress=MagicMock(return_value=progress),
-        get_kid_progress=MagicMock(return_value=[]),
-        get_chunk_at=MagicMock(return_value=None),
-        save_reading_progress=MagicMock(),
+        get_kid_household_id=AsyncMock(return_value="hh1"),
+        list_books=AsyncMock(return_value=FAKE_BOOKS),
+        get_book_metadata=AsyncMock(return_value=FAKE_META),
+        get_book_chunk_count=AsyncMock(return_value=len(FAKE_CHUNKS)),
+        get_book_chunk_range=AsyncMock(return_value=FAKE_CHUNKS),
+        get_chapter_summaries=AsyncMock(return_value=list(summaries)),
+        get_reading_progress=AsyncMock(return_value=progress),
+        list_books_with_progress=AsyncMock(return_value=[]),
     )
 
 
@@ -98,23 +126,28 @@ def _make_llm_mock() -> MagicMock:
     def _settings_factory(**kwargs):
         settings = MagicMock(name="Settings")
         settings.system_instruction = kwargs.get("system_instruction")
+        settings.model = kwargs.get("model")
         return settings
 
     llm.Settings.side_effect = _settings_factory
     return llm
 
 
-def _make_state_manager(
-    progress: int = 0,
+async def _make_state_manager(
+    progress: int = 0, summaries=(), read_ahead_chunks: int = 0
 ) -> tuple[BookReadingStateManager, Library, _FrameCollector]:
+    """A state manager over the fake book; by default it reads each passage only
+    after BotStoppedSpeaking for the one before (no read-ahead)."""
     context = LLMContext()
     library = Library(kid_id="test_kid")
     llm = _make_llm_mock()
-    sm = BookReadingStateManager(library=library, context=context, llm=llm)
+    sm = BookReadingStateManager(
+        library=library, context=context, llm=llm, read_ahead_chunks=read_ahead_chunks
+    )
     collector = _FrameCollector()
     sm.push_frame = collector
-    with _patch_supabase(progress=progress):
-        library.initialize_book("book_001")
+    with _patch_supabase(progress=progress, summaries=summaries):
+        await library.initialize_book("book_001")
     return sm, library, collector
 
 
@@ -125,14 +158,14 @@ def _make_state_manager(
 
 @pytest.mark.asyncio
 async def test_greet_child_sets_state():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     await sm.greet_child()
     assert sm.state == State.BOOK_SELECTION
 
 
 @pytest.mark.asyncio
 async def test_greet_child_triggers_llm_greeting():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     await sm.greet_child()
     appends = [(f, d) for f, d in collector.frames if isinstance(f, LLMMessagesAppendFrame)]
     assert len(appends) == 1
@@ -141,6 +174,17 @@ async def test_greet_child_triggers_llm_greeting():
     assert frame.run_llm is True
 
 
+@pytest.mark.asyncio
+async def test_greet_child_carries_preloaded_book_status():
+    """A book loaded before the child joined is described in the first turn."""
+    sm, library, collector = await _make_state_manager()
+    await sm.greet_child('Book "The Rabbit" loaded. This is a new book — no prior progress.')
+    (frame,) = [f for f, _ in collector.frames if isinstance(f, LLMMessagesAppendFrame)]
+    content = frame.messages[0]["content"]
+    assert content.startswith("The child has joined.")
+    assert 'Book "The Rabbit" loaded.' in content
+
+
 # ======================================================================
 # Start reading
 # ======================================================================
@@ -148,7 +192,7 @@ async def test_greet_child_triggers_llm_greeting():
 
 @pytest.mark.asyncio
 async def test_start_reading_transitions_to_reading():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.BOOK_SELECTION
 
     await sm.process_frame(
@@ -164,7 +208,7 @@ async def test_start_reading_transitions_to_reading():
 
 @pytest.mark.asyncio
 async def test_start_reading_respects_chunk_index():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.BOOK_SELECTION
 
     await sm.process_frame(
@@ -179,7 +223,7 @@ async def test_start_reading_respects_chunk_index():
 
 @pytest.mark.asyncio
 async def test_start_reading_ignored_during_reading():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
 
     await sm.process_frame(
@@ -198,7 +242,7 @@ async def test_start_reading_ignored_during_reading():
 
 @pytest.mark.asyncio
 async def test_user_interrupt_switches_to_qa():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
 
     await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -209,7 +253,7 @@ async def test_user_interrupt_switches_to_qa():
 
 @pytest.mark.asyncio
 async def test_user_interrupt_updates_system_prompt():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
 
     await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -222,7 +266,7 @@ async def test_user_interrupt_updates_system_prompt():
 
 @pytest.mark.asyncio
 async def test_user_interrupt_outside_reading_passes_through():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.BOOK_SELECTION
 
     await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -239,7 +283,7 @@ async def test_user_interrupt_outside_reading_passes_through():
 
 @pytest.mark.asyncio
 async def test_start_reading_resumes_from_qa():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.QA
 
     await sm.process_frame(
@@ -255,7 +299,7 @@ async def test_start_reading_resumes_from_qa():
 
 @pytest.mark.asyncio
 async def test_start_reading_from_qa_preserves_chunk_position():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.QA
     library.current_chunk_index = 1
 
@@ -277,7 +321,7 @@ async def test_start_reading_from_qa_preserves_chunk_position():
 
 @pytest.mark.asyncio
 async def test_tts_stopped_advances_chunk():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
     sm._reading_tts_active = True
 
@@ -290,7 +334,7 @@ async def test_tts_stopped_advances_chunk():
 
 @pytest.mark.asyncio
 async def test_tts_stopped_after_interrupt_does_not_advance():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
     sm._reading_tts_active = True
 
@@ -308,7 +352,7 @@ async def test_tts_stopped_after_interrupt_does_not_advance():
 
 @pytest.mark.asyncio
 async def test_tts_stopped_passes_frame_upstream():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.BOOK_SELECTION
 
     await sm.process_frame(BotStoppedSpeakingFrame(), FrameDirection.UPSTREAM)
@@ -320,7 +364,7 @@ async def test_tts_stopped_passes_frame_upstream():
 
 @pytest.mark.asyncio
 async def test_end_of_book_enters_finished():
-    sm, library, collector = _make_state_manager(progress=2)
+    sm, library, collector = await _make_state_manager(progress=2)
     sm._state = State.READING
     sm._reading_tts_active = True
 
@@ -333,6 +377,100 @@ async def test_end_of_book_enters_finished():
     assert len(appends) >= 1
 
 
+# ======================================================================
+# Read-ahead (next passage queued while the current one plays)
+# ======================================================================
+
+
+async def _reading_ahead(progress: int = 0):
+    sm, library, collector = await _make_state_manager(progress=progress, read_ahead_chunks=1)
+    await sm.process_frame(
+        StartReadingFrame(book_id="book_001", chunk_index=None), FrameDirection.DOWNSTREAM
+    )
+    return sm, library, collector
+
+
+def _played_marks(collector) -> list[ChunkPlayedFrame]:
+    return collector._frames_of(ChunkPlayedFrame)
+
+
+async def test_read_ahead_queues_the_next_passage_behind_the_current_one():
+    sm, library, collector = await _reading_ahead()
+
+    assert collector.tts_texts() == ["Once upon a time.", "There was a rabbit."]
+    assert [m.chunk_index for m in _played_marks(collector)] == [0, 1]
+    # Nothing has been heard yet: progress stays on the passage playing
+    assert library.current_chunk_index == 0
+
+
+async def test_read_ahead_each_mark_follows_its_own_passage():
+    sm, library, collector = await _reading_ahead()
+
+    kinds = [type(f) for f, _ in collector.frames if not isinstance(f, LLMUpdateSettingsFrame)]
+    first_end = kinds.index(LLMFullResponseEndFrame)
+    assert kinds[first_end + 1] is ChunkPlayedFrame
+    assert kinds[-1] is ChunkPlayedFrame
+
+
+async def test_chunk_played_advances_and_queues_one_more():
+    sm, library, collector = await _reading_ahead()
+    first = _played_marks(collector)[0]
+    collector.clear()
+
+    await sm.process_frame(first, FrameDirection.DOWNSTREAM)
+
+    assert library.current_chunk_index == 1
+    assert collector.tts_texts() == ["The end."]
+    assert [m.chunk_index for m in _played_marks(collector)] == [2]
+
+
+async def test_bot_stopped_speaking_does_not_advance_in_read_ahead_mode():
+    sm, library, collector = await _reading_ahead()
+    collector.clear()
+
+    await sm.process_frame(BotStoppedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    assert library.current_chunk_index == 0
+    assert collector.tts_texts() == []
+
+
+async def test_interrupt_keeps_progress_on_the_passage_being_heard():
+    sm, library, collector = await _reading_ahead()
+    stale = _played_marks(collector)[0]
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    # A mark already past the output when the child spoke is ignored in QA
+    await sm.process_frame(stale, FrameDirection.DOWNSTREAM)
+
+    assert sm.state == State.QA
+    assert library.current_chunk_index == 0
+
+
+async def test_resume_ignores_marks_from_before_the_interruption():
+    sm, library, collector = await _reading_ahead()
+    stale = _played_marks(collector)[0]
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    await sm.process_frame(
+        StartReadingFrame(book_id="book_001", chunk_index=None), FrameDirection.DOWNSTREAM
+    )
+    collector.clear()
+
+    await sm.process_frame(stale, FrameDirection.DOWNSTREAM)
+
+    assert library.current_chunk_index == 0
+    assert collector.tts_texts() == []
+
+
+async def test_read_ahead_enters_finished_once_the_last_passage_is_heard():
+    sm, library, collector = await _reading_ahead(progress=2)
+    (last,) = _played_marks(collector)
+
+    with _patch_supabase():
+        await sm.process_frame(last, FrameDirection.DOWNSTREAM)
+
+    assert sm.state == State.FINISHED
+
+
 # ======================================================================
 # Pass-through
 # ======================================================================
@@ -340,7 +478,7 @@ async def test_end_of_book_enters_finished():
 
 @pytest.mark.asyncio
 async def test_llm_text_passes_through():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
 
     frame = LLMTextFrame(text="Hello there!")
     await sm.process_frame(frame, FrameDirection.DOWNSTREAM)
@@ -350,7 +488,7 @@ async def test_llm_text_passes_through():
 
 @pytest.mark.asyncio
 async def test_non_handled_frames_pass_through():
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
 
     frame = TTSSpeakFrame(text="test")
     await sm.process_frame(frame, FrameDirection.DOWNSTREAM)
@@ -366,7 +504,7 @@ async def test_non_handled_frames_pass_through():
 @pytest.mark.asyncio
 async def test_finished_allows_start_reading():
     """Re-reading from FINISHED goes directly to READING at chunk 0."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.FINISHED
 
     await sm.process_frame(
@@ -383,7 +521,7 @@ async def test_finished_allows_start_reading():
 @pytest.mark.asyncio
 async def test_finished_end_session_sets_shutdown_pending():
     """EndSessionFrame in FINISHED sets _shutdown_pending."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.FINISHED
 
     await sm.process_frame(
@@ -398,7 +536,7 @@ async def test_finished_end_session_sets_shutdown_pending():
 async def test_end_session_works_from_any_state():
     """EndSessionFrame sets _shutdown_pending regardless of current state."""
     for state in (State.BOOK_SELECTION, State.QA, State.READING, State.FINISHED):
-        sm, library, collector = _make_state_manager()
+        sm, library, collector = await _make_state_manager()
         sm._state = state
 
         await sm.process_frame(
@@ -409,10 +547,32 @@ async def test_end_session_works_from_any_state():
         assert sm._shutdown_pending is True, f"end_session should work in {state.value}"
 
 
+async def test_end_session_with_farewell_says_it_before_disconnecting():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.QA
+
+    await sm.process_frame(
+        EndSessionFrame(reason="user_goodbye", farewell="Bye for now!"),
+        FrameDirection.DOWNSTREAM,
+    )
+
+    assert sm._shutdown_pending is True
+    assert collector.tts_texts() == ["Bye for now!"]
+
+
+async def test_end_session_from_the_llm_says_nothing_more():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.QA
+
+    await sm.process_frame(EndSessionFrame(reason="user_goodbye"), FrameDirection.DOWNSTREAM)
+
+    assert collector.tts_texts() == []
+
+
 @pytest.mark.asyncio
 async def test_finished_bot_stopped_with_shutdown_calls_disconnect():
     """BotStoppedSpeaking + _shutdown_pending fires disconnect callback."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.FINISHED
     sm._shutdown_pending = True
 
@@ -433,7 +593,7 @@ async def test_finished_bot_stopped_with_shutdown_calls_disconnect():
 @pytest.mark.asyncio
 async def test_finished_user_speaking_resets_idle_event():
     """UserStartedSpeaking in FINISHED sets the idle event (resets timer)."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.FINISHED
 
     await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -448,7 +608,7 @@ async def test_finished_user_speaking_resets_idle_event():
 @pytest.mark.asyncio
 async def test_finished_system_prompt_contains_book_info():
     """FINISHED prompt includes book title and end_session hint."""
-    sm, library, collector = _make_state_manager(progress=2)
+    sm, library, collector = await _make_state_manager(progress=2)
     sm._state = State.READING
     sm._reading_tts_active = True
 
@@ -464,7 +624,7 @@ async def test_finished_system_prompt_contains_book_info():
 @pytest.mark.asyncio
 async def test_finished_with_multiple_books_shows_alternatives():
     """When multiple books exist, FINISHED prompt includes other book options."""
-    sm, library, collector = _make_state_manager(progress=2)
+    sm, library, collector = await _make_state_manager(progress=2)
     sm._state = State.READING
     sm._reading_tts_active = True
 
@@ -477,6 +637,26 @@ async def test_finished_with_multiple_books_shows_alternatives():
     assert "book_002" in system_instruction or "The Fox" in system_instruction
 
 
+@pytest.mark.asyncio
+async def test_finished_lists_a_shortlist_of_other_books():
+    """A large household only gets a shortlist in FINISHED, plus a pointer to title search."""
+    sm, library, collector = await _make_state_manager(progress=2)
+    sm._state = State.READING
+    sm._reading_tts_active = True
+    shelf = [{"id": "book_001", "title": "The Rabbit", "status": "ready"}] + [
+        {"id": f"other_{i}", "title": f"Other Book {i}", "status": "ready"} for i in range(12)
+    ]
+
+    with _patch_supabase(), patch("bot.library.list_books", AsyncMock(return_value=shelf)):
+        invalidate_book_list_cache()
+        await sm.process_frame(BotStoppedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    system_instruction = collector.latest_system_instruction()
+    listed = [f'"Other Book {i}"' in system_instruction for i in range(12)]
+    assert sum(listed) == BOOK_SHORTLIST_SIZE
+    assert f"any of {12 - BOOK_SHORTLIST_SIZE} more" in system_instruction
+
+
 # ======================================================================
 # system_instruction frame propagation
 # ======================================================================
@@ -485,7 +665,7 @@ async def test_finished_with_multiple_books_shows_alternatives():
 @pytest.mark.asyncio
 async def test_start_reading_pushes_system_instruction_frame():
     """Transitioning to READING pushes LLMUpdateSettingsFrame with READING_SYSTEM."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.BOOK_SELECTION
 
     await sm.process_frame(
@@ -507,7 +687,7 @@ async def test_start_reading_pushes_system_instruction_frame():
 @pytest.mark.asyncio
 async def test_qa_transition_pushes_system_instruction_frame():
     """Interrupt during READING pushes a QA system_instruction frame."""
-    sm, library, collector = _make_state_manager()
+    sm, library, collector = await _make_state_manager()
     sm._state = State.READING
 
     await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
@@ -517,3 +697,394 @@ async def test_qa_transition_pushes_system_instruction_frame():
     frame, direction = update_frames[0]
     assert direction == FrameDirection.UPSTREAM
     assert frame.delta.system_instruction is not None
+
+
+async def test_qa_prompt_names_current_chapter_instead_of_chapter_map():
+    sm, library, collector = await _make_state_manager()
+    library.current_chunk_index = 2
+    sm._state = State.READING
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    frame = next(f for f, _ in collector.frames if isinstance(f, LLMUpdateSettingsFrame))
+    prompt = frame.delta.system_instruction
+    assert 'chapter 2 of 2: "Chapter II"' in prompt
+    assert "chunk_id=" not in prompt
+
+
+# ======================================================================
+# Question-specific QA context
+# ======================================================================
+
+
+async def test_qa_prompt_carries_nearby_passages_not_the_whole_book():
+    sm, library, collector = await _make_state_manager(progress=1)
+    sm._state = State.READING
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    prompt = collector.latest_system_instruction()
+    assert "Once upon a time." in prompt
+    assert "There was a rabbit. (the passage the child was listening to)" in prompt
+    assert "The end." not in prompt
+
+
+async def test_question_prompt_adds_matching_earlier_passages():
+    sm, library, collector = await _make_state_manager(progress=2)
+    await library.full_text()
+    sm._state = State.QA
+
+    frame = await sm.question_prompt("what was the rabbit doing?")
+
+    prompt = frame.delta.system_instruction
+    assert "There was a rabbit." in prompt
+    assert "The end. (the passage the child was listening to)" in prompt
+
+
+async def test_question_prompt_never_reaches_past_the_current_passage():
+    sm, library, collector = await _make_state_manager(progress=0)
+    await library.full_text()
+    sm._state = State.QA
+
+    frame = await sm.question_prompt("is this the end?")
+
+    assert "The end." not in frame.delta.system_instruction
+
+
+async def test_question_prompt_is_none_while_reading():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.READING
+
+    assert await sm.question_prompt("what happens next?") is None
+
+
+async def test_finished_question_prompt_adds_passages():
+    sm, library, collector = await _make_state_manager(progress=2)
+    sm._state = State.READING
+    sm._reading_tts_active = True
+    with _patch_supabase():
+        await sm.process_frame(BotStoppedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    assert "There was a rabbit." not in collector.latest_system_instruction()
+
+    frame = await sm.question_prompt("I liked the rabbit")
+
+    prompt = frame.delta.system_instruction
+    assert "There was a rabbit." in prompt
+    assert "The Rabbit" in prompt
+
+
+# ======================================================================
+# Prompt prefixes and QA precompute
+# ======================================================================
+
+
+async def test_qa_prompts_share_a_byte_identical_prefix():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.QA
+
+    first = await sm._qa_prompt()
+    library.current_chunk_index = 2
+    second = await sm._qa_prompt()
+
+    prefix = QA_SYSTEM_PREFIX.format(title="The Rabbit")
+    assert first.startswith(prefix) and second.startswith(prefix)
+    assert first != second
+    assert "Once upon a time." not in prefix
+
+
+async def test_prompt_prefix_is_rendered_once_per_book_and_state():
+    sm, library, collector = await _make_state_manager()
+    other, _, _ = await _make_state_manager()
+
+    with patch.object(library, "outline", AsyncMock(return_value="- outline")) as outline:
+        finished = await sm._prompt_prefix(State.FINISHED)
+        assert await other._prompt_prefix(State.FINISHED) is finished
+    outline.assert_awaited_once()
+    assert await sm._prompt_prefix(State.QA) != finished
+
+
+async def test_reading_precomputes_the_qa_prompt_for_an_interrupt():
+    sm, library, collector = await _make_state_manager(progress=1)
+    await sm.process_frame(
+        StartReadingFrame(book_id="book_001", chunk_index=None), FrameDirection.DOWNSTREAM
+    )
+    await sm._qa_task
+    expected = await sm._qa_prompt()
+    collector.clear()
+
+    with patch.object(library, "current_chunk", AsyncMock()) as current_chunk:
+        await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    current_chunk.assert_not_awaited()
+    assert collector.latest_system_instruction() == expected
+
+
+async def test_precomputed_qa_prompt_for_another_position_is_not_used():
+    sm, library, collector = await _make_state_manager(progress=0)
+    await sm.process_frame(
+        StartReadingFrame(book_id="book_001", chunk_index=None), FrameDirection.DOWNSTREAM
+    )
+    await sm._qa_task
+    library.current_chunk_index = 1
+    collector.clear()
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    assert "There was a rabbit. (the passage the child was listening to)" in (
+        collector.latest_system_instruction()
+    )
+
+
+async def test_read_aloud_passages_are_recognised_for_compaction():
+    sm, library, collector = await _make_state_manager()
+    await sm.process_frame(
+        StartReadingFrame(book_id="book_001", chunk_index=0), FrameDirection.DOWNSTREAM
+    )
+
+    assert sm.read_aloud_chunk("Once upon a time.").chunk_index == 0
+    assert sm.read_aloud_chunk("There was a rabbit.") is None
+
+
+async def test_qa_prompt_windows_the_story_to_the_token_budget():
+    sm, library, collector = await _make_state_manager(progress=2)
+    await library.full_text()
+    sm._state = State.QA
+
+    sm._prompt_token_budget = 1_000
+    assert "Once upon a time." in await sm._qa_prompt()
+    sm._prompt_token_budget = library.story_so_far(2, 1_000)[-1].token_count
+    windowed = await sm._qa_prompt()
+    assert "Once upon a time." not in windowed
+    assert "There was a rabbit." not in windowed
+    assert "The end. (the passage the child was listening to)" in windowed
+
+
+async def test_qa_prompt_summarizes_past_chapters_and_quotes_the_current_one():
+    sm, library, collector = await _make_state_manager(progress=2, summaries=FAKE_SUMMARIES)
+    await library.full_text()
+    sm._state = State.QA
+
+    prompt = await sm._qa_prompt()
+
+    assert "Once, a rabbit showed up." in prompt
+    assert "Once upon a time." not in prompt
+    assert "The end. (the passage the child was listening to)" in prompt
+    assert "then the story ended" not in prompt  # the summary through the current chapter
+
+
+async def test_qa_prompt_without_summaries_has_no_summary_section():
+    sm, library, collector = await _make_state_manager(progress=2)
+    await library.full_text()
+    sm._state = State.QA
+
+    assert "in short" not in await sm._qa_prompt()
+
+
+async def test_finished_prompt_outlines_the_book_with_chapter_summaries():
+    sm, library, collector = await _make_state_manager(progress=2, summaries=FAKE_SUMMARIES)
+    await library.full_text()
+
+    prefix = await sm._prompt_prefix(State.FINISHED)
+
+    assert "Chapter I: A rabbit shows up.\nChapter II: The story ends." in prefix
+    assert "- The rabbit appears." not in prefix
+
+
+async def test_prompt_sizes_are_recorded_per_state():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.READING
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    await sm.question_prompt("who is the rabbit?")
+
+    stats = sm.prompt_token_stats["qa"]
+    assert stats["prompts"] == 2
+    assert 0 < stats["max"] <= stats["total"]
+
+
+# ======================================================================
+# QA answer cache
+# ======================================================================
+
+
+async def _asking_in_qa(progress: int):
+    """A session in QA at ``progress`` whose queued frames are recorded."""
+    sm, library, collector = await _make_state_manager(progress=progress)
+    sm._state = State.QA
+    sm.queue_frame = AsyncMock()
+    return sm, collector
+
+
+async def _llm_answers(sm, *parts: str, call_function: bool = False) -> None:
+    await sm.process_frame(LLMFullResponseStartFrame(), FrameDirection.DOWNSTREAM)
+    if call_function:
+        await sm.process_frame(
+            FunctionCallsStartedFrame(function_calls=[]), FrameDirection.DOWNSTREAM
+        )
+    for part in parts:
+        await sm.process_frame(LLMTextFrame(text=part), FrameDirection.DOWNSTREAM)
+    await sm.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+
+
+async def test_answer_is_cached_for_the_next_child_asking_at_the_same_point():
+    first, _ = await _asking_in_qa(progress=1)
+    assert await first.answer_from_cache("Who is the rabbit?") is False
+    await _llm_answers(first, "He is ", "a very busy rabbit.")
+
+    second, collector = await _asking_in_qa(progress=1)
+    assert await second.answer_from_cache("um, who is the rabbit") is True
+
+    (frame,) = [c.args[0] for c in second.queue_frame.await_args_list]
+    assert isinstance(frame, CachedAnswerFrame)
+    await second.process_frame(frame, FrameDirection.DOWNSTREAM)
+    assert collector.tts_texts() == ["He is a very busy rabbit."]
+    assert isinstance(collector.frames[-1][0], LLMFullResponseEndFrame)
+
+
+async def test_cached_answer_is_not_served_to_a_child_who_has_not_read_that_far():
+    ahead, _ = await _asking_in_qa(progress=1)
+    await ahead.answer_from_cache("who is the rabbit?")
+    await _llm_answers(ahead, "The rabbit who was late.")
+
+    behind, _ = await _asking_in_qa(progress=0)
+
+    assert await behind.answer_from_cache("who is the rabbit?") is False
+    assert behind._answer_cache.stats()["spoiler_guarded"] == 1
+
+
+async def test_answer_from_earlier_in_the_chapter_is_served_further_on():
+    first, _ = await _asking_in_qa(progress=0)
+    await first.answer_from_cache("who is the rabbit?")
+    await _llm_answers(first, "We don't know yet!")
+
+    later, _ = await _asking_in_qa(progress=1)
+
+    assert await later.answer_from_cache("who is the rabbit?") is True
+
+
+async def test_answers_are_cached_per_chapter():
+    first, _ = await _asking_in_qa(progress=1)
+    await first.answer_from_cache("who is the rabbit?")
+    await _llm_answers(first, "A busy rabbit.")
+
+    next_chapter, _ = await _asking_in_qa(progress=2)
+
+    assert await next_chapter.answer_from_cache("who is the rabbit?") is False
+
+
+async def test_turn_the_llm_acts_on_is_not_cached():
+    first, _ = await _asking_in_qa(progress=1)
+    await first.answer_from_cache("can we read chapter two")
+    await _llm_answers(first, "Sure!", call_function=True)
+
+    assert first._answer_cache.stats()["stores"] == 0
+
+
+async def test_interrupted_answer_is_not_cached():
+    first, _ = await _asking_in_qa(progress=1)
+    await first.answer_from_cache("who is the rabbit?")
+    await first.process_frame(LLMTextFrame(text="He is"), FrameDirection.DOWNSTREAM)
+    await first.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    await first.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+
+    assert first._answer_cache.stats()["stores"] == 0
+
+
+async def test_questions_about_the_conversation_are_not_cached():
+    first, _ = await _asking_in_qa(progress=1)
+    await first.answer_from_cache("why did he do that?")
+    await _llm_answers(first, "Because he was late.")
+
+    assert first._answer_cache.stats() == {
+        "hits": 0,
+        "misses": 0,
+        "spoiler_guarded": 0,
+        "stores": 0,
+        "evictions": 0,
+    }
+
+
+async def test_answer_cache_is_only_used_in_qa():
+    sm, library, collector = await _make_state_manager(progress=1)
+    sm._state = State.FINISHED
+
+    assert await sm.answer_from_cache("who is the rabbit?") is False
+    assert sm._answer_capture is None
+
+
+# ======================================================================
+# LLM model routing
+# ======================================================================
+
+
+def _settings_pushed(collector) -> list:
+    return [f.delta for f in collector._frames_of(LLMUpdateSettingsFrame)]
+
+
+def test_chit_chat_and_qa_run_on_different_models():
+    assert model_for_state(State.BOOK_SELECTION) != model_for_state(State.QA)
+    assert model_for_state(State.FINISHED) == model_for_state(State.BOOK_SELECTION)
+
+
+async def test_interrupt_switches_to_the_qa_model_with_the_qa_prompt():
+    sm, library, collector = await _make_state_manager()
+    await sm.process_frame(StartReadingFrame(book_id="book_001"), FrameDirection.DOWNSTREAM)
+    collector.clear()
+
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+
+    (delta,) = _settings_pushed(collector)
+    assert delta.model == model_for_state(State.QA)
+    assert "interrupted" in delta.system_instruction.lower()
+    assert sm.model == model_for_state(State.QA)
+
+
+async def test_model_is_only_sent_when_it_changes():
+    sm, library, collector = await _make_state_manager(progress=1)
+    sm._state = State.READING
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    collector.clear()
+
+    frame = await sm.question_prompt("who is the rabbit?")
+
+    assert frame.delta.model is None
+    assert frame.delta.system_instruction
+
+
+async def test_resuming_reading_switches_back_to_the_fast_model():
+    sm, library, collector = await _make_state_manager()
+    sm._state = State.READING
+    await sm.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+    collector.clear()
+
+    await sm.process_frame(StartReadingFrame(book_id="book_001"), FrameDirection.DOWNSTREAM)
+
+    assert _settings_pushed(collector)[0].model == model_for_state(State.READING)
+
+
+async def test_llm_metrics_are_recorded_per_model():
+    sm, library, collector = await _make_state_manager()
+    fast, strong = model_for_state(State.BOOK_SELECTION), model_for_state(State.QA)
+    usage = LLMTokenUsage(
+        prompt_tokens=900, completion_tokens=40, total_tokens=940, cache_read_input_tokens=800
+    )
+    frames = [
+        MetricsFrame(data=[TTFBMetricsData(processor="llm", model=fast, value=0.25)]),
+        MetricsFrame(data=[TTFBMetricsData(processor="llm", model=strong, value=0.5)]),
+        MetricsFrame(data=[TTFBMetricsData(processor="llm", model=strong, value=0.75)]),
+        MetricsFrame(data=[LLMUsageMetricsData(processor="llm", model=strong, value=usage)]),
+        MetricsFrame(data=[TTFBMetricsData(processor="tts", model="sonic-2", value=0.1)]),
+    ]
+    for frame in frames:
+        await sm.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    stats = sm.model_stats
+    assert set(stats) == {fast, strong}
+    assert stats[fast]["ttfb_samples"] == 1
+    assert stats[strong]["ttfb_samples"] == 2
+    assert stats[strong]["ttfb_ms_total"] == 1250.0
+    assert stats[strong]["ttfb_ms_max"] == 750.0
+    assert stats[strong]["prompt_tokens"] == 900
+    assert stats[strong]["completion_tokens"] == 40
+    assert stats[strong]["cached_prompt_tokens"] == 800
+    assert len(collector._frames_of(MetricsFrame)) == len(frames)
@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from bot.supabase_client import (
+    CHUNK_PAGE_SIZE,
+    download_book_bundle,
+    download_tts_audio,
+    get_book_chunk_range,
     get_book_chunks,
     get_book_metadata,
+    get_chapter_summaries,
+    get_kid_household_id,
     get_reading_progress,
+    list_books,
+    list_books_with_progress,
     save_reading_progress,
+    save_reading_progress_batch,
+    save_session_usage_batch,
+    upload_tts_audio,
 )
+from shared.config import settings
 
 
 def _mock_client():
@@ -24,80 +36,245 @@ def _mock_query_chain(client, table_name, data):
     """Set up a fluent query chain that returns data."""
     table = MagicMock()
     # Make every method return the same mock for chaining
-    for method in ("select", "eq", "order", "upsert"):
+    for method in ("select", "eq", "gte", "lt", "order", "upsert", "insert"):
         getattr(table, method).return_value = table
     resp = MagicMock()
     resp.data = data
-    table.execute.return_value = resp
+    table.execute = AsyncMock(return_value=resp)
     client.table.return_value = table
     return table
 
 
-@patch("bot.supabase_client.get_client")
-def test_get_book_metadata_found(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_get_book_metadata_found(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     _mock_query_chain(client, "books", [{"id": "b1", "title": "Alice", "status": "ready"}])
 
-    result = get_book_metadata("b1")
+    result = await get_book_metadata("b1")
     assert result == {"id": "b1", "title": "Alice", "status": "ready"}
 
 
-@patch("bot.supabase_client.get_client")
-def test_get_book_metadata_not_found(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_get_book_metadata_not_found(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     _mock_query_chain(client, "books", [])
 
-    result = get_book_metadata("missing")
+    result = await get_book_metadata("missing")
     assert result is None
 
 
-@patch("bot.supabase_client.get_client")
-def test_get_book_chunks(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_get_book_chunk_range(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     chunks = [
         {"chunk_index": 0, "text": "Hello"},
         {"chunk_index": 1, "text": "World"},
     ]
-    _mock_query_chain(client, "book_chunks", chunks)
+    table = _mock_query_chain(client, "book_chunks", chunks)
 
-    result = get_book_chunks("b1")
+    result = await get_book_chunk_range("b1", 0, 2)
     assert len(result) == 2
     assert result[0]["text"] == "Hello"
+    table.gte.assert_called_once_with("chunk_index", 0)
+    table.lt.assert_called_once_with("chunk_index", 2)
 
 
-@patch("bot.supabase_client.get_client")
-def test_get_reading_progress_default(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_get_book_chunks_pages_under_row_cap(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    table = _mock_query_chain(client, "book_chunks", [])
+    total = CHUNK_PAGE_SIZE * 2 + 5
+    count_resp = MagicMock(count=total)
+
+    def page(start):
+        return MagicMock(
+            data=[{"chunk_index": i} for i in range(start, min(start + CHUNK_PAGE_SIZE, total))]
+        )
+
+    table.execute = AsyncMock(
+        side_effect=[count_resp, page(0), page(CHUNK_PAGE_SIZE), page(CHUNK_PAGE_SIZE * 2)]
+    )
+
+    result = await get_book_chunks("b1")
+
+    assert [r["chunk_index"] for r in result] == list(range(total))
+    assert table.gte.call_count == 3
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_get_chapter_summaries_in_chapter_order(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    rows = [{"chapter_index": 0, "summary": "A rabbit appears."}]
+    table = _mock_query_chain(client, "book_chapter_summaries", rows)
+
+    assert await get_chapter_summaries("b1") == rows
+    client.table.assert_called_once_with("book_chapter_summaries")
+    table.order.assert_called_once_with("chapter_index")
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_get_reading_progress_default(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     _mock_query_chain(client, "reading_progress", [])
 
-    result = get_reading_progress("b1", "s1")
+    result = await get_reading_progress("b1", "s1")
     assert result == 0
 
 
-@patch("bot.supabase_client.get_client")
-def test_get_reading_progress_existing(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_get_reading_progress_existing(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     _mock_query_chain(client, "reading_progress", [{"current_chunk_index": 7}])
 
-    result = get_reading_progress("b1", "s1")
+    result = await get_reading_progress("b1", "s1")
     assert result == 7
 
 
-@patch("bot.supabase_client.get_client")
-def test_save_reading_progress(mock_get):
+@patch("bot.supabase_client.get_async_client")
+async def test_save_reading_progress(mock_get):
     client = _mock_client()
     mock_get.return_value = client
     table = _mock_query_chain(client, "reading_progress", None)
 
-    save_reading_progress("b1", "s1", 3)
+    await save_reading_progress("b1", "s1", 3)
 
     table.upsert.assert_called_once()
     call_args = table.upsert.call_args[0][0]
     assert call_args["book_id"] == "b1"
     assert call_args["kid_id"] == "s1"
     assert call_args["current_chunk_index"] == 3
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_save_reading_progress_batch_is_one_upsert(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    table = _mock_query_chain(client, "reading_progress", None)
+
+    await save_reading_progress_batch(
+        [
+            {"book_id": "b1", "kid_id": "k1", "current_chunk_index": 3},
+            {"book_id": "b2", "kid_id": "k1", "current_chunk_index": 8},
+        ]
+    )
+
+    table.upsert.assert_called_once()
+    rows = table.upsert.call_args[0][0]
+    assert [(r["book_id"], r["current_chunk_index"]) for r in rows] == [("b1", 3), ("b2", 8)]
+    assert table.upsert.call_args.kwargs["on_conflict"] == "book_id,kid_id"
+    table.execute.assert_awaited_once()
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_save_reading_progress_batch_empty_is_noop(mock_get):
+    await save_reading_progress_batch([])
+    mock_get.assert_not_called()
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_save_session_usage_batch_is_one_insert(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    table = _mock_query_chain(client, "session_usage", None)
+    rows = [
+        {"session_id": "s1", "state": "qa", "model": "gpt-4", "prompt_tokens": 900},
+        {"session_id": "s1", "state": "reading", "model": "sonic-2", "tts_characters": 400},
+    ]
+
+    await save_session_usage_batch(rows)
+
+    client.table.assert_called_once_with("session_usage")
+    table.insert.assert_called_once_with(rows)
+    table.execute.assert_awaited_once()
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_save_session_usage_batch_empty_is_noop(mock_get):
+    await save_session_usage_batch([])
+    mock_get.assert_not_called()
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_list_books_with_progress_calls_rpc_once(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    rows = [{"id": "b1", "title": "Alice", "status": "ready", "current_chunk_index": 4}]
+    client.rpc.return_value.execute = AsyncMock(return_value=MagicMock(data=rows))
+
+    result = await list_books_with_progress("k1")
+
+    assert result == rows
+    client.rpc.assert_called_once_with("get_books_with_progress", {"p_kid_id": "k1"})
+    client.table.assert_not_called()
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_list_books_filters_by_household_and_status(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    table = _mock_query_chain(client, "books", [{"id": "b1", "title": "Alice", "status": "ready"}])
+
+    result = await list_books("hh1")
+
+    assert result == [{"id": "b1", "title": "Alice", "status": "ready"}]
+    table.eq.assert_any_call("household_id", "hh1")
+    table.eq.assert_any_call("status", "ready")
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_get_kid_household_id(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    _mock_query_chain(client, "kids", [{"household_id": "hh1"}])
+
+    assert await get_kid_household_id("k1") == "hh1"
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_get_kid_household_id_unknown_kid(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    _mock_query_chain(client, "kids", [])
+
+    assert await get_kid_household_id("ghost") is None
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_download_book_bundle_reads_the_books_bucket(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    bucket = MagicMock()
+    bucket.download = AsyncMock(return_value=b"RMBK...")
+    client.storage.from_.return_value = bucket
+
+    assert await download_book_bundle("hh1/b1/bundle.v3.rmbk") == b"RMBK..."
+    client.storage.from_.assert_called_once_with(settings.supabase.books_bucket)
+    bucket.download.assert_awaited_once_with("hh1/b1/bundle.v3.rmbk")
+
+
+@patch("bot.supabase_client.get_async_client")
+async def test_tts_audio_goes_through_the_tts_cache_bucket(mock_get):
+    client = _mock_client()
+    mock_get.return_value = client
+    bucket = MagicMock()
+    bucket.download = AsyncMock(return_value=b"\x00\x01")
+    bucket.upload = AsyncMock()
+    client.storage.from_.return_value = bucket
+
+    with patch.object(settings.supabase, "tts_cache_bucket", "tts"):
+        assert await download_tts_audio("abc.pcm") == b"\x00\x01"
+        await upload_tts_audio("abc.pcm", b"\x00\x01")
+
+    assert [c.args for c in client.storage.from_.call_args_list] == [("tts",), ("tts",)]
+    bucket.download.assert_awaited_once_with("abc.pcm")
+    upload = bucket.upload.await_args.kwargs
+    assert upload["path"] == "abc.pcm"
+    assert upload["file"] == b"\x00\x01"
+    assert upload["file_options"]["upsert"] == "true"
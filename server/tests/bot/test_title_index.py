@@ -0,0 +1,73 @@
+"""Unit tests for the spoken-title TitleIndex."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.title_index import TitleIndex, _sound_key
+
+SHELF = [
+    ("b1", "The Very Hungry Caterpillar"),
+    ("b2", "The Gruffalo"),
+    ("b3", "We're Going on a Bear Hunt"),
+    ("b4", "Brown Bear, Brown Bear, What Do You See?"),
+    ("b5", "Alice's Adventures in Wonderland"),
+    ("b6", "Where the Wild Things Are"),
+    ("b7", "The Cat in the Hat"),
+    ("b8", "Green Eggs and Ham"),
+]
+
+
+@pytest.fixture
+def index() -> TitleIndex:
+    return TitleIndex(SHELF)
+
+
+class TestTitleIndex:
+    @pytest.mark.parametrize(
+        "spoken, book_id",
+        [
+            ("The Gruffalo", "b2"),
+            ("grufalo", "b2"),
+            ("the hungry catapiller one", "b1"),
+            ("wild fings", "b6"),
+            ("alice in wonderland", "b5"),
+            ("cat in a hat", "b7"),
+            ("bear hunt", "b3"),
+            ("GREEN EGGS!", "b8"),
+        ],
+    )
+    def test_resolves_what_a_child_says(self, index, spoken, book_id):
+        match = index.best(spoken)
+        assert match is not None
+        assert match.book_id == book_id
+
+    def test_exact_title_scores_one(self, index):
+        assert index.best("Where the Wild Things Are").score == 1.0
+
+    def test_ambiguous_title_is_not_guessed(self, index):
+        assert index.best("bear") is None
+        assert {m.book_id for m in index.search("bear")} == {"b3", "b4"}
+
+    @pytest.mark.parametrize("spoken", ["harry potter", "goodnight moon", "", "   "])
+    def test_unknown_title_has_no_match(self, index, spoken):
+        assert index.best(spoken) is None
+
+    def test_search_is_ranked_and_limited(self, index):
+        matches = index.search("the cat", limit=2)
+        assert len(matches) <= 2
+        assert matches[0].book_id == "b7"
+        assert matches == sorted(matches, key=lambda m: -m.score)
+
+    def test_by_id_passes_raw_ids_through(self, index):
+        assert index.by_id("b4").title == "Brown Bear, Brown Bear, What Do You See?"
+        assert index.by_id("missing") is None
+
+    def test_built_from_tracks_the_book_list(self, index):
+        assert index.built_from(SHELF)
+        assert not index.built_from(SHELF[:-1])
+
+    def test_sound_key_tolerates_child_pronunciation(self):
+        assert _sound_key("caterpillar") == _sound_key("catapiller")
+        assert _sound_key("things") == _sound_key("fings")
+        assert _sound_key("bears") == _sound_key("bear")
@@ -0,0 +1,171 @@
+"""Unit tests for the TTS audio cache and AudioCacheTTSMixin."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pipecat.frames.frames import (
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStoppedFrame,
+)
+from pipecat.services.settings import TTSSettings
+from pipecat.services.tts_service import TTSService
+from pipecat.tests.utils import run_test
+
+from bot.tts_cache import AudioCacheTTSMixin, TTSAudioCache, tts_cache_key
+
+SAMPLE_RATE = 16000
+
+
+class _FakeTTS(TTSService):
+    """Synthesizes each text as its bytes repeated, and records what it was asked to say."""
+
+    def __init__(self, voice: str = "narrator", **kwargs):
+        super().__init__(
+            sample_rate=SAMPLE_RATE,
+            push_start_frame=True,
+            push_stop_frames=True,
+            settings=TTSSettings(model="fake-1", voice=voice, language=None),
+            **kwargs,
+        )
+        self.requests: list[str] = []
+
+    async def run_tts(self, text: str, context_id: str):
+        self.requests.append(text)
+        yield TTSAudioRawFrame(
+            audio=_speech(text), sample_rate=SAMPLE_RATE, num_channels=1, context_id=context_id
+        )
+
+
+class _CachedFakeTTS(AudioCacheTTSMixin, _FakeTTS):
+    pass
+
+
+def _speech(text: str) -> bytes:
+    return text.encode() * 2  # an even number of bytes, like 16-bit PCM
+
+
+def _audio(frames) -> bytes:
+    return b"".join(f.audio for f in frames if isinstance(f, TTSAudioRawFrame))
+
+
+async def _say(tts: TTSService, *texts: str) -> list:
+    down, _ = await run_test(tts, frames_to_send=[TTSSpeakFrame(text=t) for t in texts])
+    return down
+
+
+@pytest.fixture
+def cache(tmp_path) -> TTSAudioCache:
+    return TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1 << 20)
+
+
+def test_key_depends_on_voice_model_rate_and_text():
+    key = tts_cache_key("narrator", "sonic-2", "en", 24000, "Once upon a time.")
+    assert key == tts_cache_key("narrator", "sonic-2", "en", 24000, "Once upon a time.")
+    assert key != tts_cache_key("pirate", "sonic-2", "en", 24000, "Once upon a time.")
+    assert key != tts_cache_key("narrator", "sonic-3", "en", 24000, "Once upon a time.")
+    assert key != tts_cache_key("narrator", "sonic-2", "en", 16000, "Once upon a time.")
+    assert key != tts_cache_key("narrator", "sonic-2", "en", 24000, "Once upon a time!")
+
+
+async def test_repeated_text_is_played_from_the_cache(cache):
+    first = _CachedFakeTTS(audio_cache=cache)
+    heard_first = _audio(await _say(first, "Once upon a time."))
+    await cache.drain()
+
+    second = _CachedFakeTTS(audio_cache=cache)
+    down = await _say(second, "Once upon a time.")
+
+    assert first.requests == ["Once upon a time."]
+    assert second.requests == []
+    assert _audio(down) == heard_first
+    assert any(isinstance(f, TTSStoppedFrame) for f in down)
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["seconds_served"] > 0
+
+
+async def test_other_voice_is_synthesized(cache):
+    await _say(_CachedFakeTTS(audio_cache=cache), "Once upon a time.")
+    await cache.drain()
+
+    pirate = _CachedFakeTTS(voice="pirate", audio_cache=cache)
+    await _say(pirate, "Once upon a time.")
+
+    assert pirate.requests == ["Once upon a time."]
+
+
+async def test_llm_speech_is_not_cached(cache):
+    tts = _CachedFakeTTS(audio_cache=cache)
+    turn = [
+        LLMFullResponseStartFrame(),
+        LLMTextFrame(text="Hello there."),
+        LLMFullResponseEndFrame(),
+    ]
+    await run_test(tts, frames_to_send=turn)
+    await cache.drain()
+
+    assert tts.requests == ["Hello there."]
+    assert cache.stats()["stores"] == 0
+    assert cache.stats()["misses"] == 0
+
+
+async def test_cache_survives_a_new_process(tmp_path):
+    first = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1 << 20)
+    first.put("k", b"\x01\x02")
+    await first.drain()
+
+    assert await TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1 << 20).get("k") == b"\x01\x02"
+
+
+async def test_disk_is_trimmed_least_recently_read_first(tmp_path):
+    cache = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=10)
+    cache.put("old", b"\x00" * 6)
+    await cache.drain()
+    cache.put("new", b"\x00" * 6)
+    await cache.drain()
+
+    assert await cache.get("old") is None
+    assert await cache.get("new") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_bucket_hit_is_kept_on_disk(tmp_path):
+    download = AsyncMock(return_value=b"\x01\x02")
+    with patch.multiple("bot.tts_cache", download_tts_audio=download, upload_tts_audio=AsyncMock()):
+        cache = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1 << 20, bucket=True)
+        assert await cache.get("k") == b"\x01\x02"
+        await cache.drain()
+        assert await cache.get("k") == b"\x01\x02"
+
+    download.assert_awaited_once_with("k.pcm")
+    assert cache.stats()["bucket_hits"] == 1
+    assert cache.stats()["disk_hits"] == 1
+
+
+async def test_bucket_miss_is_a_miss(tmp_path):
+    download = AsyncMock(side_effect=RuntimeError("Object not found"))
+    upload = AsyncMock()
+    with patch.multiple("bot.tts_cache", download_tts_audio=download, upload_tts_audio=upload):
+        cache = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1 << 20, bucket=True)
+        assert await cache.get("k") is None
+        cache.put("k", b"\x01\x02")
+        await cache.drain()
+
+    upload.assert_awaited_once_with("k.pcm", b"\x01\x02")
+    assert cache.stats()["misses"] == 1
+
+
+async def test_interrupted_synthesis_is_not_stored(cache):
+    tts = _CachedFakeTTS(audio_cache=cache)
+    key = tts.audio_cache_key("Once upon a time.")
+    tts._recording["ctx"] = (key, bytearray(b"\x01\x02"))
+
+    await tts.on_audio_context_interrupted("ctx")
+    await cache.drain()
+
+    assert await cache.get(key) is None
@@ -0,0 +1,204 @@
+"""Unit tests for the UsageMeter write-behind queue and the UsageObserver."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pipecat.frames.frames import (
+    EndFrame,
+    InputAudioRawFrame,
+    MetricsFrame,
+    TextFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import (
+    LLMTokenUsage,
+    LLMUsageMetricsData,
+    TTFBMetricsData,
+    TTSUsageMetricsData,
+)
+from pipecat.services.deepgram.stt import DeepgramSTTService
+
+from bot.processors.state_manager import State
+from bot.usage_meter import Usage, UsageKey, UsageMeter, UsageObserver
+
+
+def _key(state: str = "qa", model: str = "gpt-4", book_id: str | None = "b1") -> UsageKey:
+    return UsageKey("s1", "k1", "hh1", book_id, state, model)
+
+
+class TestUsageMeter:
+    async def test_sums_usage_per_key_into_one_row_each(self):
+        mock_save = AsyncMock()
+        meter = UsageMeter(flush_interval_secs=60.0)
+        with patch("bot.usage_meter.save_session_usage_batch", mock_save):
+            meter.record(_key(), Usage(prompt_tokens=900, completion_tokens=40))
+            meter.record(_key(), Usage(prompt_tokens=1000, completion_tokens=60))
+            meter.record(_key("reading", "sonic-2"), Usage(tts_characters=420))
+            await meter.flush()
+
+        mock_save.assert_awaited_once()
+        rows = mock_save.await_args.args[0]
+        assert len(rows) == 2
+        assert rows[0] == {
+            "session_id": "s1",
+            "kid_id": "k1",
+            "household_id": "hh1",
+            "book_id": "b1",
+            "state": "qa",
+            "model": "gpt-4",
+            "prompt_tokens": 1900,
+            "completion_tokens": 100,
+            "cached_prompt_tokens": 0,
+            "tts_characters": 0,
+            "stt_seconds": 0.0,
+        }
+        assert rows[1]["tts_characters"] == 420
+        assert meter.stats()["rows_written"] == 2
+        assert meter.pending == 0
+
+    async def test_failed_flush_adds_the_batch_back(self):
+        meter = UsageMeter(flush_interval_secs=60.0)
+        failing = AsyncMock(side_effect=RuntimeError("db down"))
+        with patch("bot.usage_meter.save_session_usage_batch", failing):
+            meter.record(_key(), Usage(prompt_tokens=100))
+            await meter.flush()
+        meter.record(_key(), Usage(prompt_tokens=50))
+
+        mock_save = AsyncMock()
+        with patch("bot.usage_meter.save_session_usage_batch", mock_save):
+            await meter.flush()
+
+        (row,) = mock_save.await_args.args[0]
+        assert row["prompt_tokens"] == 150
+        assert meter.stats()["failures"] == 1
+
+    async def test_flush_with_nothing_pending_skips_the_write(self):
+        mock_save = AsyncMock()
+        meter = UsageMeter(flush_interval_secs=60.0)
+        with patch("bot.usage_meter.save_session_usage_batch", mock_save):
+            await meter.flush()
+        mock_save.assert_not_awaited()
+
+
+def _pushed(frame, source=None, destination=None):
+    return MagicMock(frame=frame, source=source or MagicMock(), destination=destination)
+
+
+def _processor(name: str) -> MagicMock:
+    processor = MagicMock()
+    processor.name = name
+    return processor
+
+
+@pytest.fixture
+def session():
+    meter = UsageMeter(flush_interval_secs=60.0)
+    meter.record = MagicMock()
+    library = MagicMock()
+    library.resolve_household_id = AsyncMock(return_value="hh1")
+    state_source = MagicMock(book_id="b1", state=State.QA)
+    stt = DeepgramSTTService(api_key="test")
+    observer = UsageObserver(
+        meter,
+        session_id="s1",
+        kid_id="k1",
+        library=library,
+        state_source=state_source,
+        stt=stt,
+        stt_model="nova-3",
+    )
+    return observer, meter, library, state_source, stt
+
+
+class TestUsageObserver:
+    async def test_llm_tokens_are_counted_once_where_they_were_produced(self, session):
+        observer, meter, _, _, _ = session
+        llm = _processor("OpenAILLMService#0")
+        tokens = LLMTokenUsage(
+            prompt_tokens=900, completion_tokens=40, total_tokens=940, cache_read_input_tokens=700
+        )
+        frame = MetricsFrame(
+            data=[LLMUsageMetricsData(processor=llm.name, model="gpt-4", value=tokens)]
+        )
+
+        await observer.on_push_frame(_pushed(frame, source=llm))
+        await observer.on_push_frame(_pushed(frame, source=_processor("StateManager#0")))
+
+        meter.record.assert_called_once_with(
+            _key(),
+            Usage(prompt_tokens=900, completion_tokens=40, cached_prompt_tokens=700),
+        )
+
+    async def test_tts_characters_are_charged_to_the_current_state(self, session):
+        observer, meter, _, state_source, _ = session
+        state_source.state = State.READING
+        tts = _processor("CartesiaTTSService#0")
+        frame = MetricsFrame(
+            data=[TTSUsageMetricsData(processor=tts.name, model="sonic-2", value=420)]
+        )
+
+        await observer.on_push_frame(_pushed(frame, source=tts))
+
+        meter.record.assert_called_once_with(_key("reading", "sonic-2"), Usage(tts_characters=420))
+
+    async def test_stt_seconds_come_from_the_audio_sent_to_stt(self, session):
+        observer, meter, _, _, stt = session
+        quarter_second = InputAudioRawFrame(audio=b"\0\0" * 4000, sample_rate=16000, num_channels=1)
+
+        await observer.on_push_frame(_pushed(quarter_second, destination=stt))
+        await observer.on_push_frame(_pushed(quarter_second, destination=stt))
+        await observer.on_push_frame(_pushed(quarter_second, source=stt, destination=MagicMock()))
+        meter.record.assert_not_called()  # nothing is recorded per audio frame
+
+        await observer.on_push_frame(_pushed(UserStoppedSpeakingFrame()))
+        await observer.on_push_frame(_pushed(UserStoppedSpeakingFrame()))
+
+        meter.record.assert_called_once_with(_key(model="nova-3"), Usage(stt_seconds=0.5))
+        assert observer.totals["stt_seconds"] == 0.5
+
+    async def test_stt_seconds_left_at_the_end_are_recorded(self, session):
+        observer, meter, _, _, stt = session
+        frame = InputAudioRawFrame(audio=b"\0\0" * 1600, sample_rate=16000, num_channels=1)
+
+        await observer.on_push_frame(_pushed(frame, destination=stt))
+        await observer.on_push_frame(_pushed(EndFrame()))
+
+        meter.record.assert_called_once_with(_key(model="nova-3"), Usage(stt_seconds=0.1))
+
+    async def test_other_frames_and_metrics_are_ignored(self, session):
+        observer, meter, _, _, _ = session
+        llm = _processor("OpenAILLMService#0")
+        ttfb = MetricsFrame(data=[TTFBMetricsData(processor=llm.name, model="gpt-4", value=0.3)])
+
+        await observer.on_push_frame(_pushed(ttfb, source=llm))
+        await observer.on_push_frame(_pushed(TextFrame(text="hi")))
+
+        meter.record.assert_not_called()
+
+    async def test_usage_before_a_book_is_picked_has_no_book(self, session):
+        observer, meter, library, state_source, stt = session
+        state_source.book_id = ""
+        state_source.state = State.BOOK_SELECTION
+        frame = InputAudioRawFrame(audio=b"\0\0" * 160, sample_rate=16000, num_channels=1)
+
+        await observer.on_push_frame(_pushed(frame, destination=stt))
+        await observer.on_push_frame(_pushed(UserStoppedSpeakingFrame()))
+        await observer.on_push_frame(_pushed(frame, destination=stt))
+        await observer.on_push_frame(_pushed(UserStoppedSpeakingFrame()))
+
+        key = meter.record.call_args.args[0]
+        assert key.book_id is None
+        assert key.state == "book_selection"
+        library.resolve_household_id.assert_awaited_once()
+
+    async def test_household_lookup_failure_still_records_usage(self, session):
+        observer, meter, library, _, stt = session
+        library.resolve_household_id.side_effect = RuntimeError("db down")
+        frame = InputAudioRawFrame(audio=b"\0\0" * 160, sample_rate=16000, num_channels=1)
+
+        await observer.on_push_frame(_pushed(frame, destination=stt))
+        await observer.on_push_frame(_pushed(UserStoppedSpeakingFrame()))
+
+        assert meter.record.call_args.args[0].household_id is None
@@ -0,0 +1,20 @@
+"""Unit tests for the WriteBehindQueue base."""
+
+from __future__ import annotations
+
+import pytest
+
+from bot.write_behind import WriteBehindQueue
+
+
+class TestWriteBehindQueue:
+    def test_subclass_missing_a_hook_fails_when_built(self):
+        class NoRequeue(WriteBehindQueue[str, int]):
+            def _rows(self, batch):
+                return [{"key": k, "value": v} for k, v in batch.items()]
+
+            async def _save(self, rows):
+                pass
+
+        with pytest.raises(TypeError, match="_requeue"):
+            NoRequeue(flush_interval_secs=60.0)
@@ -0,0 +1,107 @@
+"""Tests for the compiled per-book bundle format."""
+
+import json
+import struct
+import zlib
+
+import pytest
+
+from shared.book_bundle import (
+    BUNDLE_SEPARATOR,
+    build_bundle,
+    bundle_path,
+    decode_bundle,
+    encode_bundle,
+)
+from shared.tokens import estimate_tokens
+
+ROWS = [
+    {
+        "chunk_index": i,
+        "chunk_kind": "chapter_title" if i % 3 == 0 else "content",
+        "chapter_title": f"Chapter {i // 3 + 1}",
+        "chunk_hint": f"Hint {i}",
+        "text": f"Text of chunk {i} — «quoted».",
+    }
+    for i in range(7)
+]
+
+
+class TestBookBundle:
+    def test_round_trip_keeps_every_field(self):
+        bundle = decode_bundle(encode_bundle(build_bundle("b1", 3, ROWS)))
+        assert (bundle.book_id, bundle.chunks_version, len(bundle)) == ("b1", 3, 7)
+        for i, row in enumerate(ROWS):
+            assert bundle.text[bundle.starts[i] : bundle.ends[i]] == row["text"]
+            assert bundle.kinds[i] == row["chunk_kind"]
+            assert bundle.chapters[bundle.chapter_ids[i]] == row["chapter_title"]
+            assert bundle.hints[i] == row["chunk_hint"]
+        assert bundle.text == BUNDLE_SEPARATOR.join(r["text"] for r in ROWS)
+
+    def test_token_counts_come_from_rows_or_estimates(self):
+        rows = [{**ROWS[0], "token_count": 42}, *ROWS[1:]]
+        bundle = decode_bundle(encode_bundle(build_bundle("b1", 1, rows)))
+        assert bundle.token_counts[0] == 42
+        assert bundle.token_counts[1] == estimate_tokens(ROWS[1]["text"])
+
+    def test_bundles_without_token_counts_are_estimated(self):
+        data = encode_bundle(build_bundle("b1", 1, ROWS))
+        fmt_header, body = data[:12], zlib.decompress(data[12:])
+        _, _, index_len = struct.unpack("<4sII", fmt_header)
+        index = json.loads(body[:index_len])
+        del index["token_counts"]
+        new_index = json.dumps(index).encode()
+        legacy = struct.pack("<4sII", b"RMBK", 1, len(new_index)) + zlib.compress(
+            new_index + body[index_len:]
+        )
+        bundle = decode_bundle(legacy)
+        assert bundle.token_counts == [estimate_tokens(r["text"]) for r in ROWS]
+
+    def test_summaries_round_trip_in_chapter_order(self):
+        summaries = [
+            {
+                "book_id": "b1",
+                "chapter_index": i,
+                "chapter_title": f"Chapter {i + 1}",
+                "first_chunk_index": 3 * i,
+                "summary": f"Chapter {i + 1} happens.",
+                "story_so_far": f"Chapters 1-{i + 1} happen.",
+            }
+            for i in (1, 0)
+        ]
+        bundle = decode_bundle(encode_bundle(build_bundle("b1", 1, ROWS, summaries)))
+        assert [s["chapter_index"] for s in bundle.summaries] == [0, 1]
+        assert "book_id" not in bundle.summaries[0]
+        assert decode_bundle(encode_bundle(build_bundle("b1", 1, ROWS))).summaries == []
+
+    def test_chapter_boundaries_point_at_first_chunk(self):
+        bundle = build_bundle("b1", 1, list(reversed(ROWS)))
+        assert bundle.chapter_boundaries == [(0, 0), (3, 1), (6, 2)]
+
+    def test_gaps_are_rejected(self):
+        with pytest.raises(ValueError, match="not contiguous"):
+            build_bundle("b1", 1, ROWS[1:])
+
+    def test_payload_is_compressed(self):
+        rows = [{**row, "text": "All work and no play. " * 50} for row in ROWS]
+        data = encode_bundle(build_bundle("b1", 1, rows))
+        assert len(data) < sum(len(r["text"]) for r in rows) / 4
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"NOPE" + b"\0" * 8,
+            struct.pack("<4sII", b"RMBK", 99, 0),
+            struct.pack("<4sII", b"RMBK", 1, 2) + zlib.compress(b"{}"),
+            struct.pack("<4sII", b"RMBK", 1, 0) + b"not zlib",
+        ],
+    )
+    def test_unreadable_data_raises_value_error(self, data):
+        with pytest.raises(ValueError):
+            decode_bundle(data)
+
+    def test_path_is_versioned_next_to_the_pdf(self):
+        assert bundle_path("households/h/books/b1/book.pdf", 4) == (
+            "households/h/books/b1/bundle.v4.rmbk"
+        )
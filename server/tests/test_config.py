@@ -5,7 +5,7 @@ import os
 import pytest
 from pydantic import field_validator
 
-from shared.config import LazySecretsSettings
+from shared.config import BotSettings, LazySecretsSettings, PricingSettings, Settings
 
 
 class SimpleSettings(LazySecretsSettings):
@@ -72,3 +72,12 @@ class TestListResolution:
     def test_default_value_used(self) -> None:
         s = ListSettings()
         assert s.origins == ["http://localhost"]
+
+
+class TestSettingsToml:
+    """settings.toml lists the tunables with the same values as the model defaults."""
+
+    def test_bot_and_pricing_match_the_defaults(self) -> None:
+        s = Settings()
+        assert s.bot == BotSettings()
+        assert s.pricing == PricingSettings()
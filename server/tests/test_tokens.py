@@ -0,0 +1,28 @@
+"""Unit tests for the shared token estimates."""
+
+from __future__ import annotations
+
+from shared.tokens import MESSAGE_OVERHEAD_TOKENS, estimate_message_tokens, estimate_tokens
+
+
+class TestEstimateTokens:
+    def test_rounds_up(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abc") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_message_adds_overhead(self):
+        message = {"role": "user", "content": "abcdefgh"}
+        assert estimate_message_tokens(message) == MESSAGE_OVERHEAD_TOKENS + 2
+
+    def test_message_with_content_parts(self):
+        message = {"role": "user", "content": [{"type": "text", "text": "abcd"}]}
+        assert estimate_message_tokens(message) == MESSAGE_OVERHEAD_TOKENS + 1
+
+    def test_message_counts_tool_calls(self):
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"function": {"name": "start_reading", "arguments": '{"b": "0"}'}}],
+        }
+        assert estimate_message_tokens(message) > MESSAGE_OVERHEAD_TOKENS
@@ -6,7 +6,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from workers.pdf_pipeline.models import Chapter, Chunk, Manuscript
+from shared.book_bundle import decode_bundle
+from shared.tokens import estimate_tokens
+from workers.pdf_pipeline.models import Chapter, ChapterSummary, Chunk, Manuscript
 from workers.pdf_pipeline.storage import (
     download_manuscript,
     download_pdf,
@@ -120,6 +122,111 @@ class TestUpsertChunks:
         table_mock.delete.assert_called()
         table_mock.insert.assert_called()
 
+    @patch("workers.pdf_pipeline.storage.get_client")
+    def test_rows_carry_token_counts(self, mock_get_client):
+        client, table_mock, _ = _mock_supabase()
+        mock_get_client.return_value = client
+        chunk = Chunk(
+            chunk_index=0,
+            chunk_kind="content",
+            chapter_title="Ch1",
+            chunk_hint="Opening.",
+            text="Once upon a time, in a land far away.",
+        )
+
+        upsert_chunks("book_001", [chunk])
+
+        (rows,) = table_mock.insert.call_args.args
+        assert rows[0]["token_count"] == estimate_tokens(chunk.text)
+
+    @patch("workers.pdf_pipeline.storage.get_client")
+    def test_bumps_chunks_version(self, mock_get_client):
+        client, table_mock, _ = _mock_supabase()
+        mock_get_client.return_value = client
+        table_mock.select.return_value.eq.return_value.execute.return_value.data = [
+            {"chunks_version": 4}
+        ]
+
+        upsert_chunks("book_001", [])
+
+        table_mock.update.assert_any_call({"status": "ready", "chunks_version": 5})
+
+    @patch("workers.pdf_pipeline.storage.get_client")
+    def test_publishes_bundle_before_bumping_version(self, mock_get_client):
+        client, table_mock, storage_mock = _mock_supabase()
+        mock_get_client.return_value = client
+        table_mock.select.return_value.eq.return_value.execute.return_value.data = [
+            {"chunks_version": 4, "storage_path": FAKE_BOOK_ROW["storage_path"]}
+        ]
+        calls = MagicMock()
+        calls.attach_mock(storage_mock.upload, "upload")
+        calls.attach_mock(table_mock.update, "update")
+        chunks = [
+            Chunk(
+                chunk_index=i,
+                chunk_kind="content",
+                chapter_title="Ch1",
+                chunk_hint=f"Part {i}.",
+                text=f"Text {i}.",
+            )
+            for i in range(3)
+        ]
+
+        upsert_chunks("book_001", chunks)
+
+        upload = storage_mock.upload.call_args.kwargs
+        assert upload["path"] == "households/hh1/books/book_001/bundle.v5.rmbk"
+        bundle = decode_bundle(upload["file"])
+        assert (bundle.book_id, bundle.chunks_version, len(bundle)) == ("book_001", 5, 3)
+        assert bundle.text == "Text 0.\n\nText 1.\n\nText 2."
+        assert [c[0] for c in calls.mock_calls][:2] == ["upload", "update"]
+        storage_mock.remove.assert_called_once_with(
+            ["households/hh1/books/book_001/bundle.v4.rmbk"]
+        )
+
+    @patch("workers.pdf_pipeline.storage.get_client")
+    def test_replaces_chapter_summaries_and_bundles_them(self, mock_get_client):
+        client, table_mock, storage_mock = _mock_supabase()
+        mock_get_client.return_value = client
+        table_mock.select.return_value.eq.return_value.execute.return_value.data = [
+            {"chunks_version": 0, "storage_path": FAKE_BOOK_ROW["storage_path"]}
+        ]
+        chunk = Chunk(
+            chunk_index=0, chunk_kind="content", chapter_title="Ch1", chunk_hint="", text="Hi."
+        )
+        summary = ChapterSummary(
+            chapter_index=0,
+            chapter_title="Ch1",
+            first_chunk_index=0,
+            summary="A greeting.",
+            story_so_far="Someone says hi.",
+        )
+
+        upsert_chunks("book_001", [chunk], summaries=[summary])
+
+        tables = [c.args[0] for c in client.table.call_args_list]
+        assert tables.count("book_chapter_summaries") == 2  # delete, then insert
+        (rows,) = table_mock.insert.call_args.args
+        assert rows == [{"book_id": "book_001", **summary.model_dump()}]
+        bundle = decode_bundle(storage_mock.upload.call_args.kwargs["file"])
+        assert bundle.summaries == [summary.model_dump()]
+
+    @patch("workers.pdf_pipeline.storage.get_client")
+    def test_failed_bundle_upload_still_marks_ready(self, mock_get_client):
+        client, table_mock, storage_mock = _mock_supabase()
+        mock_get_client.return_value = client
+        table_mock.select.return_value.eq.return_value.execute.return_value.data = [
+            {"chunks_version": 0, "storage_path": FAKE_BOOK_ROW["storage_path"]}
+        ]
+        storage_mock.upload.side_effect = RuntimeError("storage down")
+        chunk = Chunk(
+            chunk_index=0, chunk_kind="content", chapter_title="Ch1", chunk_hint="", text="Hi."
+        )
+
+        upsert_chunks("book_001", [chunk])
+
+        table_mock.update.assert_any_call({"status": "ready", "chunks_version": 1})
+
 
 class TestSetBookStatus:
     @patch("shared.books.get_client")
@@ -0,0 +1,47 @@
+"""Unit tests for chapter summarization."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from workers.pdf_pipeline.models import Chapter, LLMChapterSummary
+from workers.pdf_pipeline.summarize import summarize_chapter
+
+
+@patch(
+    "workers.pdf_pipeline.summarize._gemini_summarize",
+    return_value=LLMChapterSummary(
+        summary="Alice follows the rabbit.", story_so_far="Alice is bored, then follows a rabbit."
+    ),
+)
+def test_summarizes_chapter_with_previous_story(mock_gemini):
+    chapter = Chapter(title="Down the Rabbit-Hole", text="Alice was beginning to get very tired.")
+
+    result = summarize_chapter(chapter, 1, 12, "Alice is bored.")
+
+    mock_gemini.assert_called_once_with(chapter.text, "Alice is bored.")
+    assert result.chapter_index == 1
+    assert result.chapter_title == "Down the Rabbit-Hole"
+    assert result.first_chunk_index == 12
+    assert result.summary == "Alice follows the rabbit."
+    assert result.story_so_far == "Alice is bored, then follows a rabbit."
+
+
+@patch("workers.pdf_pipeline.summarize._gemini_summarize")
+def test_empty_chapter_carries_story_forward_without_llm(mock_gemini):
+    result = summarize_chapter(Chapter(title=None, text="  "), 2, 30, "So far.")
+
+    mock_gemini.assert_not_called()
+    assert (result.chapter_title, result.summary, result.story_so_far) == ("", "", "So far.")
+
+
+@patch("workers.pdf_pipeline.summarize.generate_structured")
+def test_prompt_marks_the_first_chapter(mock_generate):
+    mock_generate.return_value = LLMChapterSummary(summary="S.", story_so_far="S.")
+
+    summarize_chapter(Chapter(title="One", text="Once upon a time."), 0, 0, "")
+
+    prompt, schema = mock_generate.call_args.args
+    assert schema is LLMChapterSummary
+    assert "(This is the first chapter.)" in prompt
+    assert "Once upon a time." in prompt
@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 import pytest
 
-from workers.pdf_pipeline.models import Chapter, Chunk, Manuscript
+from workers.pdf_pipeline.models import Chapter, ChapterSummary, Chunk, Manuscript
 
 FAKE_MANUSCRIPT = Manuscript(
     book_id="book_001",
@@ -21,12 +21,25 @@ FAKE_MANUSCRIPT = Manuscript(
 )
 
 
+def _fake_summary(chapter, chapter_index, first_chunk_index, story_so_far):
+    return ChapterSummary(
+        chapter_index=chapter_index,
+        chapter_title=chapter.title or "",
+        first_chunk_index=first_chunk_index,
+        summary=f"Summary {chapter_index}.",
+        story_so_far=f"{story_so_far} Summary {chapter_index}.".strip(),
+    )
+
+
+@patch("workers.book_processor_jobs.summarize_chapter", side_effect=_fake_summary)
 @patch("workers.book_processor_jobs.upsert_chunks")
 @patch("workers.book_processor_jobs.chunk_chapter")
 @patch("workers.book_processor_jobs.upload_manuscript")
 @patch("workers.book_processor_jobs.extract_manuscript", return_value=FAKE_MANUSCRIPT)
 @patch("workers.book_processor_jobs.download_pdf", return_value=(b"%PDF", "Test Book"))
-def test_process_book_happy_path(mock_dl, mock_ext, mock_up, mock_chunk_chapter, mock_upsert):
+def test_process_book_happy_path(
+    mock_dl, mock_ext, mock_up, mock_chunk_chapter, mock_upsert, mock_summarize
+):
     from workers.book_processor_jobs import process_book_job
 
     # Return one chunk per chapter call (titled chapter emits 2 -> title + body; we simplify here)
@@ -72,6 +85,27 @@ def test_process_book_happy_path(mock_dl, mock_ext, mock_up, mock_chunk_chapter,
     _, passed_chunks = mock_upsert.call_args.args
     assert len(passed_chunks) == 3
     assert [c.chunk_index for c in passed_chunks] == [0, 1, 2]
+    # one summary per chapter, each carrying the story forward
+    summaries = mock_upsert.call_args.kwargs["summaries"]
+    assert [s.first_chunk_index for s in summaries] == [0, 2]
+    assert summaries[1].story_so_far == "Summary 0. Summary 1."
+    assert mock_summarize.call_args_list[1].args[3] == "Summary 0."
+
+
+@patch("workers.book_processor_jobs.upsert_chunks")
+@patch("workers.book_processor_jobs.chunk_chapter", return_value=[])
+@patch("workers.book_processor_jobs.download_manuscript", return_value=FAKE_MANUSCRIPT)
+def test_summary_failure_keeps_chunks_and_earlier_summaries(mock_dl, mock_chunk, mock_upsert):
+    from workers.book_processor_jobs import rechunk_book_job
+
+    with patch(
+        "workers.book_processor_jobs.summarize_chapter",
+        side_effect=[_fake_summary(FAKE_MANUSCRIPT.chapters[0], 0, 0, ""), RuntimeError("quota")],
+    ):
+        rechunk_book_job("book_001")
+
+    mock_upsert.assert_called_once()
+    assert [s.chapter_index for s in mock_upsert.call_args.kwargs["summaries"]] == [0]
 
 
 @patch("workers.book_processor_jobs.set_book_status")
@@ -87,10 +121,11 @@ def test_process_book_sets_error_on_failure(mock_dl, mock_upsert, mock_status):
     mock_upsert.assert_not_called()
 
 
+@patch("workers.book_processor_jobs.summarize_chapter", side_effect=_fake_summary)
 @patch("workers.book_processor_jobs.upsert_chunks")
 @patch("workers.book_processor_jobs.chunk_chapter")
 @patch("workers.book_processor_jobs.download_manuscript", return_value=FAKE_MANUSCRIPT)
-def test_rechunk_book_happy_path(mock_dl, mock_chunk_chapter, mock_upsert):
+def test_rechunk_book_happy_path(mock_dl, mock_chunk_chapter, mock_upsert, mock_summarize):
     from workers.book_processor_jobs import rechunk_book_job
 
     mock_chunk_chapter.side_effect = [
@@ -11,7 +11,7 @@ from unittest.mock import patch
 
 import pytest
 
-from workers.pdf_pipeline.models import LLMChunk
+from workers.pdf_pipeline.models import LLMChapterSummary, LLMChunk
 
 RECORDINGS_ROOT = Path(__file__).resolve().parent / "recordings"
 ALICE_DIR = RECORDINGS_ROOT / "alice_in_wonderland"
@@ -50,6 +50,10 @@ pytestmark = pytest.mark.skipif(
 
 @patch("workers.book_processor_jobs.upsert_chunks")
 @patch("workers.book_processor_jobs.upload_manuscript")
+@patch(
+    "workers.pdf_pipeline.summarize._gemini_summarize",
+    return_value=LLMChapterSummary(summary="S.", story_so_far="Story."),
+)
 @patch("workers.pdf_pipeline.chunk._gemini_chunk")
 @patch("workers.pdf_pipeline.extract._detect_chapters")
 @patch("workers.pdf_pipeline.extract._clean_batch")
@@ -59,6 +63,7 @@ def test_alice_end_to_end(
     mock_clean,
     mock_detect,
     mock_gemini_chunk,
+    mock_summarize,
     mock_upload,
     mock_upsert,
 ):
@@ -80,3 +85,5 @@ def test_alice_end_to_end(
     expected = _load_expected_chunks()
 
     assert actual == expected
+    summaries = mock_upsert.call_args.kwargs["summaries"]
+    assert len(summaries) == len(mock_detect.return_value)
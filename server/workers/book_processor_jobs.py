@@ -6,17 +6,35 @@ from workers.pdf_pipeline import (
     download_pdf,
     extract_manuscript,
     set_book_status,
+    summarize_chapter,
     upload_manuscript,
     upsert_chunks,
 )
-from workers.pdf_pipeline.models import Chunk, Manuscript
+from workers.pdf_pipeline.models import ChapterSummary, Chunk, Manuscript
 
 
-def _chapters_to_chunks(manuscript: Manuscript) -> list[Chunk]:
+def _chapters_to_chunks(manuscript: Manuscript) -> tuple[list[Chunk], list[ChapterSummary]]:
     all_chunks: list[Chunk] = []
-    for chapter in manuscript.chapters:
-        all_chunks.extend(chunk_chapter(chapter, starting_index=len(all_chunks)))
-    return all_chunks
+    summaries: list[ChapterSummary] = []
+    summarizing = True
+    for i, chapter in enumerate(manuscript.chapters):
+        first_chunk_index = len(all_chunks)
+        all_chunks.extend(chunk_chapter(chapter, starting_index=first_chunk_index))
+        if not summarizing:
+            continue
+        try:
+            story_so_far = summaries[-1].story_so_far if summaries else ""
+            summaries.append(summarize_chapter(chapter, i, first_chunk_index, story_so_far))
+        except Exception:
+            # Summaries only shrink QA prompts; the book reads fine without them.
+            # Each one builds on the last, so stop at the first failure.
+            logger.exception(
+                "Chapter summary failed, keeping {} | book_id={}",
+                len(summaries),
+                manuscript.book_id,
+            )
+            summarizing = False
+    return all_chunks, summaries
 
 
 def process_book_job(book_id: str) -> None:
@@ -25,8 +43,8 @@ def process_book_job(book_id: str) -> None:
         pdf_bytes, title = download_pdf(book_id)
         manuscript = extract_manuscript(book_id, title, pdf_bytes)
         upload_manuscript(book_id, manuscript)
-        chunks = _chapters_to_chunks(manuscript)
-        upsert_chunks(book_id, chunks)
+        chunks, summaries = _chapters_to_chunks(manuscript)
+        upsert_chunks(book_id, chunks, summaries=summaries)
         logger.info("Book processing complete | book_id={}", book_id)
     except Exception:
         logger.exception("Book processing failed | book_id={}", book_id)
@@ -38,8 +56,8 @@ def rechunk_book_job(book_id: str) -> None:
     logger.info("Starting rechunk | book_id={}", book_id)
     try:
         manuscript = download_manuscript(book_id)
-        chunks = _chapters_to_chunks(manuscript)
-        upsert_chunks(book_id, chunks)
+        chunks, summaries = _chapters_to_chunks(manuscript)
+        upsert_chunks(book_id, chunks, summaries=summaries)
         logger.info("Rechunk complete | book_id={}", book_id)
     except Exception:
         logger.exception("Rechunk failed | book_id={}", book_id)
@@ -9,6 +9,7 @@ from .storage import (
     upload_manuscript,
     upsert_chunks,
 )
+from .summarize import summarize_chapter
 
 __all__ = [
     "chunk_chapter",
@@ -16,6 +17,7 @@ __all__ = [
     "download_pdf",
     "extract_manuscript",
     "set_book_status",
+    "summarize_chapter",
     "upload_manuscript",
     "upsert_chunks",
 ]
@@ -54,3 +54,20 @@ class Chunk(BaseModel):
     chapter_title: str
     chunk_hint: str
     text: str
+
+
+class LLMChapterSummary(BaseModel):
+    """Raw summarizer output for one chapter."""
+
+    summary: str
+    story_so_far: str
+
+
+class ChapterSummary(BaseModel):
+    """Summary of one chapter and of the story up to its end. Used for DB insertion."""
+
+    chapter_index: int
+    chapter_title: str
+    first_chunk_index: int
+    summary: str
+    story_so_far: str
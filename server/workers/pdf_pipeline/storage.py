@@ -6,10 +6,12 @@ from pathlib import PurePosixPath
 
 from loguru import logger
 
+from shared.book_bundle import BUNDLE_CACHE_CONTROL, build_bundle, bundle_path, encode_bundle
 from shared.config import settings
 from shared.supabase import get_client
+from shared.tokens import estimate_tokens
 
-from .models import Chunk, Manuscript
+from .models import ChapterSummary, Chunk, Manuscript
 
 
 def _get_book_row(book_id: str) -> dict:
@@ -63,8 +65,48 @@ def download_manuscript(book_id: str) -> Manuscript:
     return Manuscript.model_validate_json(data)
 
 
-def upsert_chunks(book_id: str, chunks: list[Chunk]) -> None:
-    """Replace all chunks for a book, update status to 'ready', reset reading progress."""
+def _publish_bundle(
+    book_id: str,
+    storage_path: str,
+    version: int,
+    rows: list[dict],
+    summaries: list[dict] | None = None,
+) -> None:
+    """Upload the compiled bundle for ``version`` and drop the previous one.
+
+    Best-effort: the rows are the source of truth, and the bot falls back to
+    them when a book has no bundle.
+    """
+    storage = get_client().storage.from_(_bucket())
+    path = bundle_path(storage_path, version)
+    try:
+        data = encode_bundle(build_bundle(book_id, version, rows, summaries=summaries))
+        storage.upload(
+            path=path,
+            file=data,
+            file_options={
+                "content-type": "application/octet-stream",
+                "cache-control": BUNDLE_CACHE_CONTROL,
+                "upsert": "true",
+            },
+        )
+    except Exception:
+        logger.exception("Bundle upload failed, bot will load rows | book_id={}", book_id)
+        return
+    logger.info("Uploaded bundle | book_id={} path={} size={}", book_id, path, len(data))
+
+    if version > 1:
+        try:
+            storage.remove([bundle_path(storage_path, version - 1)])
+        except Exception:
+            logger.warning("Could not remove previous bundle | book_id={}", book_id)
+
+
+def upsert_chunks(
+    book_id: str, chunks: list[Chunk], summaries: list[ChapterSummary] | None = None
+) -> None:
+    """Replace all chunks and chapter summaries for a book, publish its bundle,
+    update status to 'ready', bump chunks_version, reset reading progress."""
     client = get_client()
 
     # 1. Delete existing chunks
@@ -81,21 +123,46 @@ def upsert_chunks(book_id: str, chunks: list[Chunk]) -> None:
             "chapter_title": c.chapter_title,
             "chunk_hint": c.chunk_hint,
             "text": c.text,
+            "token_count": estimate_tokens(c.text),
         }
         for c in chunks
     ]
     for i in range(0, len(rows), batch_size):
         client.table("book_chunks").insert(rows[i : i + batch_size]).execute()
 
-    # 3. Update book status
-    client.table("books").update({"status": "ready"}).eq("id", book_id).execute()
+    # 3. Replace chapter summaries (may be fewer than chapters if summarizing stopped)
+    client.table("book_chapter_summaries").delete().eq("book_id", book_id).execute()
+    summary_rows = [s.model_dump() for s in summaries or ()]
+    if summary_rows:
+        client.table("book_chapter_summaries").insert(
+            [{"book_id": book_id, **row} for row in summary_rows]
+        ).execute()
+
+    # 4. Publish the bundle under the next version before bumping it, so a bot
+    #    that sees the new version can always find its bundle
+    resp = client.table("books").select("chunks_version, storage_path").eq("id", book_id).execute()
+    book = resp.data[0] if resp.data else {}
+    version = book.get("chunks_version", 0) + 1
+    if book.get("storage_path") and rows:
+        _publish_bundle(book_id, book["storage_path"], version, rows, summary_rows)
+
+    # 5. Update book status and bump the content version (invalidates bot caches)
+    client.table("books").update({"status": "ready", "chunks_version": version}).eq(
+        "id", book_id
+    ).execute()
 
-    # 4. Reset reading progress
+    # 6. Reset reading progress
     client.table("reading_progress").update({"current_chunk_index": 0}).eq(
         "book_id", book_id
     ).execute()
 
-    logger.info("Upserted {} chunks, status=ready | book_id={}", len(chunks), book_id)
+    logger.info(
+        "Upserted {} chunks, {} summaries, status=ready chunks_version={} | book_id={}",
+        len(chunks),
+        len(summary_rows),
+        version,
+        book_id,
+    )
 
 
 from shared.books import set_book_status as set_book_status  # re-export from shared
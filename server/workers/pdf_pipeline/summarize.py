@@ -0,0 +1,56 @@
+"""Step 3: Summarize each chapter and the story so far, for compact QA context."""
+
+from __future__ import annotations
+
+from loguru import logger
+
+from ._gemini import generate_structured
+from .models import Chapter, ChapterSummary, LLMChapterSummary
+
+
+def _gemini_summarize(text: str, story_so_far: str) -> LLMChapterSummary:
+    """Send one chapter's body and the running summary to Gemini."""
+    previous = story_so_far or "(This is the first chapter.)"
+    prompt = f"""You are summarizing one chapter of a children's book so that a reading
+companion can talk with a child about the story without the full text.
+
+Instructions:
+- summary: 2-4 sentences on what happens in THIS chapter — who, where, what
+  changes. Plain language, no commentary.
+- story_so_far: rewrite the story so far below so it also covers this chapter,
+  in at most 8 sentences. Keep the main characters, places and turning points;
+  drop minor detail from early chapters first.
+- Only use what is in the text. Never mention later events.
+
+Story so far, before this chapter:
+
+{previous}
+
+Chapter text:
+
+{text}"""
+
+    return generate_structured(prompt, LLMChapterSummary)
+
+
+def summarize_chapter(
+    chapter: Chapter, chapter_index: int, first_chunk_index: int, story_so_far: str
+) -> ChapterSummary:
+    """Summarize one chapter, carrying ``story_so_far`` (the previous chapter's) forward."""
+    if chapter.text.strip():
+        result = _gemini_summarize(chapter.text, story_so_far)
+    else:
+        result = LLMChapterSummary(summary="", story_so_far=story_so_far)
+    logger.info(
+        "Summarized chapter | title={} summary_chars={} story_chars={}",
+        chapter.title or "(untitled)",
+        len(result.summary),
+        len(result.story_so_far),
+    )
+    return ChapterSummary(
+        chapter_index=chapter_index,
+        chapter_title=chapter.title or "",
+        first_chunk_index=first_chunk_index,
+        summary=result.summary,
+        story_so_far=result.story_so_far,
+    )
@@ -0,0 +1,35 @@
+-- Single round-trip "books with progress" listing for the reading bot.
+-- Replaces list_books + get_kid_progress + one get_chunk_at per started book.
+
+create index if not exists idx_reading_progress_kid_id on reading_progress (kid_id);
+
+create or replace function public.get_books_with_progress(p_kid_id text)
+returns table (
+    id text,
+    title text,
+    status text,
+    current_chunk_index integer,
+    chapter_title text,
+    chunk_text text
+)
+language sql
+stable
+as $$
+    select
+        b.id,
+        b.title,
+        b.status,
+        coalesce(rp.current_chunk_index, 0) as current_chunk_index,
+        bc.chapter_title,
+        bc.text as chunk_text
+    from books b
+    left join reading_progress rp
+        on rp.book_id = b.id
+        and rp.kid_id = p_kid_id
+    left join book_chunks bc
+        on bc.book_id = b.id
+        and bc.chunk_index = rp.current_chunk_index
+        and rp.current_chunk_index > 0
+    where b.status = 'ready'
+    order by b.created_at, b.id;
+$$;
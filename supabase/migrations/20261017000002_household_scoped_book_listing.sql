@@ -0,0 +1,41 @@
+-- Scope the bot's book listing to the kid's household.
+-- Filtering on books.household_id is served by idx_books_household_id.
+-- The return type gains household_id, so the function has to be recreated.
+
+drop function if exists public.get_books_with_progress(text);
+
+create function public.get_books_with_progress(p_kid_id text)
+returns table (
+    id text,
+    household_id uuid,
+    title text,
+    status text,
+    current_chunk_index integer,
+    chapter_title text,
+    chunk_text text
+)
+language sql
+stable
+as $$
+    select
+        b.id,
+        b.household_id,
+        b.title,
+        b.status,
+        coalesce(rp.current_chunk_index, 0) as current_chunk_index,
+        bc.chapter_title,
+        bc.text as chunk_text
+    from kids k
+    join books b
+        on b.household_id = k.household_id
+    left join reading_progress rp
+        on rp.book_id = b.id
+        and rp.kid_id = k.id
+    left join book_chunks bc
+        on bc.book_id = b.id
+        and bc.chunk_index = rp.current_chunk_index
+        and rp.current_chunk_index > 0
+    where k.id = p_kid_id
+        and b.status = 'ready'
+    order by b.created_at, b.id;
+$$;
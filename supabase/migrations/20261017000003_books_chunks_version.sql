@@ -0,0 +1,6 @@
+-- Content version for a book's chunks. upsert_chunks bumps it on every
+-- (re)chunk so bot containers can validate cached book content by comparing
+-- a single integer from the metadata row.
+
+alter table books
+    add column if not exists chunks_version integer not null default 0;
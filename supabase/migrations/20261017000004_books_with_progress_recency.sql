@@ -0,0 +1,45 @@
+-- Return when each book was added and when the kid last read it, so the bot can
+-- rank prefetch candidates (most recently read first, then newest). Menu order
+-- is unchanged. The return type changes, so the function has to be recreated.
+
+drop function if exists public.get_books_with_progress(text);
+
+create function public.get_books_with_progress(p_kid_id text)
+returns table (
+    id text,
+    household_id uuid,
+    title text,
+    status text,
+    created_at timestamptz,
+    current_chunk_index integer,
+    progress_updated_at timestamptz,
+    chapter_title text,
+    chunk_text text
+)
+language sql
+stable
+as $$
+    select
+        b.id,
+        b.household_id,
+        b.title,
+        b.status,
+        b.created_at,
+        coalesce(rp.current_chunk_index, 0) as current_chunk_index,
+        rp.updated_at as progress_updated_at,
+        bc.chapter_title,
+        bc.text as chunk_text
+    from kids k
+    join books b
+        on b.household_id = k.household_id
+    left join reading_progress rp
+        on rp.book_id = b.id
+        and rp.kid_id = k.id
+    left join book_chunks bc
+        on bc.book_id = b.id
+        and bc.chunk_index = rp.current_chunk_index
+        and rp.current_chunk_index > 0
+    where k.id = p_kid_id
+        and b.status = 'ready'
+    order by b.created_at, b.id;
+$$;
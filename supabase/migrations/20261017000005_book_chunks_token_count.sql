@@ -0,0 +1,6 @@
+-- Estimated LLM token count of each chunk's text, computed at ingestion so the
+-- bot can budget prompt text without tokenizing it. Null for chunks written
+-- before this column existed; the bot estimates those from the text.
+
+alter table book_chunks
+    add column if not exists token_count integer;
@@ -0,0 +1,13 @@
+-- Per-chapter summaries written at ingestion next to book_chunks: a short
+-- summary of each chapter plus a running "story so far" up to its end. The bot
+-- puts them in QA / FINISHED prompts in place of the text of past chapters.
+
+create table if not exists book_chapter_summaries (
+    book_id text not null references books(id) on delete cascade,
+    chapter_index integer not null,
+    chapter_title text not null default '',
+    first_chunk_index integer not null,
+    summary text not null,
+    story_so_far text not null,
+    primary key (book_id, chapter_index)
+);
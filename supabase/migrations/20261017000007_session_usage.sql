@@ -0,0 +1,72 @@
+-- LLM / TTS / STT usage of bot sessions, written in batches by the bot's
+-- UsageMeter. Each row is usage to add up: one session's spend in one state
+-- on one model since the previous flush. book_id is null before a book is
+-- picked, and has no foreign key so spend stays on record after a book is deleted.
+
+create table if not exists session_usage (
+    id bigint generated always as identity primary key,
+    session_id text not null,
+    kid_id text not null,
+    household_id uuid,
+    book_id text,
+    state text not null,
+    model text not null default '',
+    prompt_tokens integer not null default 0,
+    completion_tokens integer not null default 0,
+    cached_prompt_tokens integer not null default 0,
+    tts_characters integer not null default 0,
+    stt_seconds double precision not null default 0,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists idx_session_usage_household_book
+    on session_usage (household_id, book_id);
+create index if not exists idx_session_usage_book on session_usage (book_id);
+
+-- A household's usage per book, state and model, with the number of sessions
+-- that read each book. Rows written before the kid's household was known are
+-- matched through the book.
+create or replace function public.get_book_usage(p_household_id uuid)
+returns table (
+    book_id text,
+    title text,
+    book_sessions bigint,
+    state text,
+    model text,
+    prompt_tokens bigint,
+    completion_tokens bigint,
+    cached_prompt_tokens bigint,
+    tts_characters bigint,
+    stt_seconds double precision
+)
+language sql
+stable
+as $$
+    with usage as (
+        select su.*
+        from session_usage su
+        left join books b on b.id = su.book_id
+        where coalesce(su.household_id, b.household_id) = p_household_id
+    ),
+    sessions as (
+        select u.book_id, count(distinct u.session_id) as book_sessions
+        from usage u
+        group by u.book_id
+    )
+    select
+        u.book_id,
+        b.title,
+        s.book_sessions,
+        u.state,
+        u.model,
+        sum(u.prompt_tokens),
+        sum(u.completion_tokens),
+        sum(u.cached_prompt_tokens),
+        sum(u.tts_characters),
+        sum(u.stt_seconds)
+    from usage u
+    join sessions s on s.book_id is not distinct from u.book_id
+    left join books b on b.id = u.book_id
+    group by u.book_id, b.title, s.book_sessions, u.state, u.model
+    order by u.book_id, u.state, u.model;
+$$;